@@ -1,20 +1,36 @@
 # main.py en la raíz de ontester
+import sys
 import traceback
+import multiprocessing
 from pathlib import Path
 from datetime import datetime
-from src.backend.sua_client.local_db import init_db
 
 if __name__ == "__main__":
+    # Necesario para los procesos del render de certificados dentro del .exe
+    multiprocessing.freeze_support()
+
+    # --profile-startup: árbol de imports + tiempo al primer frame
+    profiler = None
+    if "--profile-startup" in sys.argv:
+        from src.Frontend.telemetry.startup_profiler import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.instalar()
+
     try:
         # Iniciar la db
+        from src.backend.sua_client.local_db import init_db
         init_db()
+        if profiler:
+            profiler.marca("init_db")
         # from src.backend.mixins.common_mixin import CommonMixin
         # cm = CommonMixin()
         # nets_all = cm.scan_wifi_windows(target_ssid=None, retries=3, delay=1.0, debug=True)
         # print("SSIDs vistos:", sorted({n["ssid"] for n in nets_all if n.get("ssid")}))
         # Correr interfaz
         from src.Frontend.ui.inicio_view import run_app
-        run_app()        
+        if profiler:
+            profiler.marca("import_inicio_view")
+        run_app(on_first_frame=profiler.primer_frame if profiler else None)
 
     except Exception as e:
         log_path = Path("C:/ONT/ontester_exe_error.log")
@@ -24,4 +40,4 @@ if __name__ == "__main__":
             f.write(f"Fecha/hora: {datetime.now().isoformat()}\n")
             f.write(f"Tipo: {type(e).__name__}\n")
             f.write(f"Mensaje: {e}\n\n")
-            traceback.print_exc(file=f)
\ No newline at end of file
+            traceback.print_exc(file=f)
@@ -0,0 +1,128 @@
+# src/Frontend/asset_cache.py
+"""
+Cache global (por proceso) de imágenes de la UI.
+- Cada archivo se decodifica con PIL una sola vez.
+- Los CTkImage se reutilizan por llave (path, size, theme).
+- Las imágenes de los modales de error se precargan en segundo plano al arrancar.
+- stats() / log_stats() reportan los aciertos del cache.
+"""
+import threading
+from pathlib import Path
+
+import customtkinter as ctk
+from PIL import Image
+
+ASSETS_DIR = Path(__file__).resolve().parent / "assets"
+ICONS_DIR = ASSETS_DIR / "icons"
+
+# Imágenes de los modales de error (tester_view._alerta_error)
+ERROR_MODAL_IMAGES = [
+    ASSETS_DIR / "error_login.png",
+    ASSETS_DIR / "desconexion.png",
+    ASSETS_DIR / "error_wifi_locked.png",
+    ASSETS_DIR / "error_pass_wifi.png",
+    ASSETS_DIR / "error_mac_locked.png",
+]
+
+_LOCK = threading.Lock()
+_PIL_CACHE = {}   # path -> PIL.Image ya decodificada
+_CTK_CACHE = {}   # (path, size, theme) -> CTkImage
+_STATS = {"pil_hits": 0, "pil_miss": 0, "ctk_hits": 0, "ctk_miss": 0}
+
+
+def _norm(path) -> str:
+    return str(Path(path).resolve())
+
+
+def _variante_tema(path: Path, theme):
+    """Si existe '<nombre>_<theme>.png' se usa esa; si no, la imagen base."""
+    if not theme:
+        return path
+    cand = path.with_name(f"{path.stem}_{theme}{path.suffix}")
+    return cand if cand.exists() else path
+
+
+def get_pil(path) -> Image.Image:
+    """Devuelve la imagen decodificada (se lee de disco una sola vez)."""
+    key = _norm(path)
+    with _LOCK:
+        img = _PIL_CACHE.get(key)
+        if img is not None:
+            _STATS["pil_hits"] += 1
+            return img
+        _STATS["pil_miss"] += 1
+
+    # Decodificar fuera del lock (puede tardar con PNG grandes)
+    with Image.open(key) as f:
+        f.load()
+        img = f.copy()
+
+    with _LOCK:
+        # Otro hilo pudo ganarnos; nos quedamos con la primera
+        return _PIL_CACHE.setdefault(key, img)
+
+
+def get_ctk_image(path, size, theme=None):
+    """
+    CTkImage compartido para (path, size, theme).
+    theme=None -> misma imagen para claro/oscuro.
+    Lanza excepción si el archivo no existe (igual que Image.open).
+    """
+    path = Path(path)
+    size = tuple(size)
+    key = (_norm(path), size, theme)
+    with _LOCK:
+        ctk_img = _CTK_CACHE.get(key)
+        if ctk_img is not None:
+            _STATS["ctk_hits"] += 1
+            return ctk_img
+        _STATS["ctk_miss"] += 1
+
+    if theme:
+        img = get_pil(_variante_tema(path, theme))
+        light = img if theme == "light" else get_pil(path)
+        dark = img if theme == "dark" else get_pil(path)
+    else:
+        light = dark = get_pil(path)
+
+    ctk_img = ctk.CTkImage(light_image=light, dark_image=dark, size=size)
+    with _LOCK:
+        return _CTK_CACHE.setdefault(key, ctk_img)
+
+
+def precargar(paths):
+    """Decodifica las imágenes indicadas (ignora las que no existan)."""
+    for p in paths:
+        try:
+            get_pil(p)
+        except Exception as e:
+            print(f"[ASSETS] No se pudo precargar {p}: {e}")
+
+
+def precargar_en_segundo_plano(paths=None):
+    """Precarga en un hilo daemon; por defecto, las imágenes de los modales de error."""
+    paths = list(paths) if paths is not None else list(ERROR_MODAL_IMAGES)
+    t = threading.Thread(target=precargar, args=(paths,), daemon=True, name="asset-preload")
+    t.start()
+    return t
+
+
+def stats() -> dict:
+    with _LOCK:
+        s = dict(_STATS)
+        s["pil_items"] = len(_PIL_CACHE)
+        s["ctk_items"] = len(_CTK_CACHE)
+    for tipo in ("pil", "ctk"):
+        total = s[f"{tipo}_hits"] + s[f"{tipo}_miss"]
+        s[f"{tipo}_hit_rate"] = (s[f"{tipo}_hits"] / total) if total else 0.0
+    return s
+
+
+def log_stats():
+    s = stats()
+    print(
+        f"[ASSETS] PIL {s['pil_hits']}/{s['pil_hits'] + s['pil_miss']} aciertos "
+        f"({s['pil_hit_rate']:.0%}, {s['pil_items']} imgs) | "
+        f"CTkImage {s['ctk_hits']}/{s['ctk_hits'] + s['ctk_miss']} aciertos "
+        f"({s['ctk_hit_rate']:.0%}, {s['ctk_items']} objs)"
+    )
@@ -1,7 +1,7 @@
 # src/Frontend/navigation/botones.py
 import customtkinter as ctk
 from pathlib import Path
-from PIL import Image
+from src.Frontend.asset_cache import get_ctk_image
 
 # Carpeta de iconos
 ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets" / "icons"
@@ -10,11 +10,7 @@ ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets" / "icons"
 def _cargar_icono(nombre_archivo: str, size=(20, 20)):
     ruta = ASSETS_DIR / nombre_archivo
     if ruta.exists():
-        return ctk.CTkImage(
-            light_image=Image.open(ruta),
-            dark_image=Image.open(ruta),
-            size=size,
-        )
+        return get_ctk_image(ruta, size)
     return None
 
 
@@ -0,0 +1,113 @@
+# src/Frontend/telemetry/startup_profiler.py
+# Perfilado de arranque (--profile-startup).
+# - Árbol de imports con tiempo acumulado / propio (equivalente a -X importtime,
+#   pero funciona también dentro del ejecutable de PyInstaller).
+# - Tiempo hasta el primer frame del teclado de inicio.
+import builtins
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_PATH = Path(r"C:\ONT\startup_profile.txt")
+
+
+class _Nodo:
+    __slots__ = ("nombre", "inicio", "total", "hijos")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.inicio = 0.0
+        self.total = 0.0
+        self.hijos = []
+
+    def propio(self) -> float:
+        return self.total - sum(h.total for h in self.hijos)
+
+
+class StartupProfiler:
+    def __init__(self, min_ms: float = 1.0):
+        self.t0 = time.perf_counter()
+        self.min_ms = min_ms
+        self.raiz = _Nodo("<main>")
+        self._pila = [self.raiz]
+        self._orig_import = None
+        self.marcas = []  # [(etiqueta, segundos desde t0)]
+
+    # ---------- hook de imports ----------
+    def instalar(self):
+        if self._orig_import is not None:
+            return
+        self._orig_import = builtins.__import__
+        orig = self._orig_import
+        prof = self
+
+        def _import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Solo medimos imports absolutos que aún no estén cargados;
+            # los que ya están en sys.modules no cuestan nada.
+            if level != 0 or name in sys.modules:
+                return orig(name, globals, locals, fromlist, level)
+            nodo = _Nodo(name)
+            prof._pila[-1].hijos.append(nodo)
+            prof._pila.append(nodo)
+            nodo.inicio = time.perf_counter()
+            try:
+                return orig(name, globals, locals, fromlist, level)
+            finally:
+                nodo.total = time.perf_counter() - nodo.inicio
+                prof._pila.pop()
+
+        builtins.__import__ = _import
+
+    def desinstalar(self):
+        if self._orig_import is not None:
+            builtins.__import__ = self._orig_import
+            self._orig_import = None
+
+    # ---------- marcas ----------
+    def marca(self, etiqueta: str):
+        self.marcas.append((etiqueta, time.perf_counter() - self.t0))
+
+    def primer_frame(self):
+        """Se llama desde Tk (after_idle) cuando el teclado ya se dibujó."""
+        self.marca("primer_frame")
+        self.desinstalar()
+        self.volcar()
+
+    # ---------- reporte ----------
+    def _lineas_arbol(self, nodo, nivel, out):
+        for h in sorted(nodo.hijos, key=lambda n: n.total, reverse=True):
+            ms = h.total * 1000
+            if ms < self.min_ms:
+                continue
+            out.append(f"{ms:9.1f} ms {h.propio() * 1000:9.1f} ms  {'  ' * nivel}{h.nombre}")
+            self._lineas_arbol(h, nivel + 1, out)
+
+    def reporte(self) -> str:
+        lineas = [
+            f"=== STARTUP PROFILE {datetime.now().isoformat(timespec='seconds')} ===",
+            f"frozen: {bool(getattr(sys, 'frozen', False))}",
+            "",
+            "--- Marcas ---",
+        ]
+        for etiqueta, seg in self.marcas:
+            lineas.append(f"{seg * 1000:9.1f} ms  {etiqueta}")
+
+        total_imports = sum(h.total for h in self.raiz.hijos)
+        lineas += [
+            "",
+            f"--- Imports (total top-level: {total_imports * 1000:.1f} ms, umbral {self.min_ms} ms) ---",
+            "acumulado      propio     módulo",
+        ]
+        self._lineas_arbol(self.raiz, 0, lineas)
+        return "\n".join(lineas) + "\n"
+
+    def volcar(self, path: Path = PROFILE_PATH):
+        texto = self.reporte()
+        print(texto)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(texto, encoding="utf-8")
+            print(f"[STARTUP] Perfil guardado en: {path}")
+        except Exception as e:
+            print(f"[STARTUP] No se pudo guardar el perfil: {e}")
@@ -2,7 +2,6 @@
 import customtkinter as ctk
 import sys
 from pathlib import Path
-from PIL import Image
 import queue
 
 # Para poder usar imports absolutos
@@ -13,6 +12,7 @@ sys.path.insert(0, str(root_path))
 from src.backend.endpoints.conexion import load_default_users, cargar_version
 from src.Frontend.telemetry.dispatcher import EventDispatcher
 from src.Frontend.theme_manager import ThemeManager  
+from src.Frontend.asset_cache import get_ctk_image, precargar_en_segundo_plano, log_stats
 
 # Extraer la version actual para mostrarla en UI
 # versRow = extraer_ultimo("catalog_meta")
@@ -437,8 +437,7 @@ class InicioView(ctk.CTkFrame):
         try:
             assets_dir = Path(__file__).parent.parent / "assets" / "icons"
             logo_path = assets_dir / "logo_tester.png"
-            img = Image.open(logo_path)
-            self.logo_image = ctk.CTkImage(light_image=img, dark_image=img, size=(150, 150))
+            self.logo_image = get_ctk_image(logo_path, (150, 150))
             self._logo_label.configure(image=self.logo_image)
         except Exception:
             self._logo_label.configure(text="")
@@ -561,7 +560,7 @@ class InicioView(ctk.CTkFrame):
 # =========================================================
 #                      RUN APP
 # =========================================================
-def run_app():
+def run_app(on_first_frame=None):
     # ✅ Theme manager global + persistencia
     theme = ThemeManager(config_path="config_ui.json")
     theme.apply()
@@ -602,6 +601,9 @@ def run_app():
     )
     app.dispatcher.start()
 
+    # Decodificar en segundo plano las imágenes de los modales de error
+    precargar_en_segundo_plano()
+
     view = InicioView(app)
     view.pack(fill="both", expand=True)
 
@@ -635,9 +637,26 @@ def run_app():
             clear_user_station()
         except Exception:
             pass
+        try:
+            # Los workers del post-proceso son daemon: esperar lo encolado antes de salir
+            from src.backend.core.postproceso import drenar
+            restantes = drenar(timeout=30.0)
+            if restantes:
+                from tkinter import messagebox
+                messagebox.showwarning(
+                    "Post-proceso pendiente",
+                    "No terminaron a tiempo y se perderán:\n" + "\n".join(restantes),
+                )
+        except Exception as e:
+            print(f"[POSTPROCESO] No se pudo drenar al cerrar: {e}")
+        log_stats()
         app.destroy()
 
     app.protocol("WM_DELETE_WINDOW", on_close)
+
+    # Perfilado de arranque: after_idle corre después del primer redibujado
+    if on_first_frame:
+        app.after(0, lambda: app.after_idle(on_first_frame))
     app.mainloop()
 
 
@@ -79,7 +79,7 @@ class MenuSuperiorDesplegable(ctk.CTkFrame):
             border_width=2,
             border_color="#6B9080",
             width=220,
-            height=250,  # + espacio por el toggle si lo quieres también dentro
+            height=300,  # + espacio por el toggle si lo quieres también dentro
         )
 
         # Contenedor interno
@@ -146,6 +146,20 @@ class MenuSuperiorDesplegable(ctk.CTkFrame):
         )
         self._btns_menu["otros"].pack(pady=5)
 
+        self._btns_menu["slots"] = ctk.CTkButton(
+            self.botones_container,
+            text="MULTI-SLOT",
+            width=190,
+            height=40,
+            corner_radius=8,
+            fg_color="#2C3E50",
+            hover_color="#1F2A36",
+            text_color="white",
+            font=ctk.CTkFont(size=12, weight="bold"),
+            command=self._go_slots,
+        )
+        self._btns_menu["slots"].pack(pady=5)
+
         # ✅ Aplicar tema actual si el root ya tiene theme
         if hasattr(self.root, "theme"):
             self.apply_theme(self.root.theme.palette())
@@ -220,6 +234,12 @@ class MenuSuperiorDesplegable(ctk.CTkFrame):
                 hover_color=p.get("primary_hover", "#3B82F6"),
                 text_color="white",
             )
+            # Multi-slot (gris)
+            self._btns_menu["slots"].configure(
+                fg_color="#1F2937",
+                hover_color="#273449",
+                text_color=t_text,
+            )
         else:
             # Volver a tus colores originales
             self._btns_menu["tester"].configure(
@@ -234,6 +254,9 @@ class MenuSuperiorDesplegable(ctk.CTkFrame):
             self._btns_menu["otros"].configure(
                 fg_color="#4EA5D9", hover_color="#3B8CC2", text_color="white"
             )
+            self._btns_menu["slots"].configure(
+                fg_color="#2C3E50", hover_color="#1F2A36", text_color="white"
+            )
 
     # ================== Menú ==================
 
@@ -337,3 +360,10 @@ class MenuSuperiorDesplegable(ctk.CTkFrame):
                 self._abrir_en_toplevel(TesterMainView, "OTROS - Propiedades", "1400x700")
         finally:
             self.cerrar_menu()
+
+    def _go_slots(self):
+        try:
+            from src.Frontend.ui.slots_view import SlotsView
+            self._abrir_en_toplevel(SlotsView, "MULTI-SLOT - Estación de varias ONTs", "1100x700")
+        finally:
+            self.cerrar_menu()
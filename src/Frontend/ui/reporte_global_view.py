@@ -1,7 +1,8 @@
 # src/Frontend/ui/reporte_global_view.py
 import customtkinter as ctk
 import sys
-import csv  # (si no lo usas, puedes quitarlo)
+import queue
+import threading
 from datetime import date
 from pathlib import Path
 
@@ -12,6 +13,8 @@ sys.path.insert(0, str(root_path))
 from src.Frontend.ui.panel_pruebas_view import PanelPruebasConexion
 from src.Frontend.ui.menu_superior_view import MenuSuperiorDesplegable
 
+FILTRO_TODOS = "TODOS"
+
 
 class ReporteGlobalView(ctk.CTkFrame):
     """
@@ -50,10 +53,16 @@ class ReporteGlobalView(ctk.CTkFrame):
         self._central_frame = None
         self._date_frame = None
         self._search_frame = None
+        self._filtros_frame = None
 
         # Day picker popup
         self._day_popup = None
 
+        # Export (filtro = lo que esté cargado en la tabla + combos modelo/status)
+        self._dia_cargado = None
+        self._export_thread = None
+        self._export_q = queue.Queue()
+
         # Layout principal
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=0)  # título
@@ -228,6 +237,8 @@ class ReporteGlobalView(ctk.CTkFrame):
             self._date_frame.configure(fg_color=bg)
         if self._search_frame:
             self._search_frame.configure(fg_color=bg)
+        if self._filtros_frame:
+            self._filtros_frame.configure(fg_color=bg)
 
         # Equipos frame
         if self._equipos_frame:
@@ -261,8 +272,14 @@ class ReporteGlobalView(ctk.CTkFrame):
         except Exception:
             pass
 
-        # mes/año combobox
-        for cb in (self.mes_combo, self.anio_combo):
+        for lbl in (self.modelo_label, self.valido_label):
+            try:
+                lbl.configure(text_color=text)
+            except Exception:
+                pass
+
+        # mes/año combobox + filtros del export
+        for cb in (self.mes_combo, self.anio_combo, self.modelo_combo, self.valido_combo):
             try:
                 cb.configure(
                     fg_color=entry_bg,
@@ -630,6 +647,46 @@ class ReporteGlobalView(ctk.CTkFrame):
         self.search_entry.pack()
         self.search_entry.bind("<KeyRelease>", self.buscar_serie)
 
+        # Filtros del export (modelo / status)
+        self._filtros_frame = ctk.CTkFrame(self._controls_frame, fg_color="#E8F4F8")
+        self._filtros_frame.grid(row=0, column=3, padx=10)
+
+        self.modelo_label = ctk.CTkLabel(
+            self._filtros_frame,
+            text="MODELO",
+            font=ctk.CTkFont(size=11, weight="bold")
+        )
+        self.modelo_label.grid(row=0, column=0, padx=5, sticky="w")
+        self.modelo_combo = ctk.CTkComboBox(
+            self._filtros_frame,
+            values=[FILTRO_TODOS],
+            width=120,
+            height=32,
+            fg_color="white",
+            border_color="#8FA3B0",
+            state="readonly",
+        )
+        self.modelo_combo.set(FILTRO_TODOS)
+        self.modelo_combo.grid(row=1, column=0, padx=5)
+
+        self.valido_label = ctk.CTkLabel(
+            self._filtros_frame,
+            text="STATUS",
+            font=ctk.CTkFont(size=11, weight="bold")
+        )
+        self.valido_label.grid(row=0, column=1, padx=5, sticky="w")
+        self.valido_combo = ctk.CTkComboBox(
+            self._filtros_frame,
+            values=[FILTRO_TODOS, "PASS", "FAIL"],
+            width=100,
+            height=32,
+            fg_color="white",
+            border_color="#8FA3B0",
+            state="readonly",
+        )
+        self.valido_combo.set(FILTRO_TODOS)
+        self.valido_combo.grid(row=1, column=1, padx=5)
+
         # Botón CARGAR BASE GLOBAL
         self.btn_cargar_global = ctk.CTkButton(
             self._controls_frame,
@@ -753,6 +810,7 @@ class ReporteGlobalView(ctk.CTkFrame):
         day = d.isoformat()  # 'YYYY-MM-DD'
         from src.backend.sua_client.dao import get_baseGlobal_por_dia
         data = get_baseGlobal_por_dia(day)
+        self._dia_cargado = day
 
         if not data:
             self._set_table_rows([])
@@ -794,6 +852,8 @@ class ReporteGlobalView(ctk.CTkFrame):
         print("Cargando base global...")
         from src.backend.sua_client.dao import get_baseGlobal_view
         data = get_baseGlobal_view()
+        self._dia_cargado = None
+        self._refrescar_modelos()
 
         if not data:
             self._set_table_rows([])
@@ -829,10 +889,101 @@ class ReporteGlobalView(ctk.CTkFrame):
             except Exception:
                 pass
 
+    def _refrescar_modelos(self):
+        """Llena el combo de modelo con los que hay en operations."""
+        try:
+            from src.backend.sua_client.dao import modelos_operaciones
+            modelos = modelos_operaciones()
+        except Exception as e:
+            print(f"[EXPORT] No se pudieron leer los modelos: {e}")
+            modelos = []
+        actual = self.modelo_combo.get()
+        self.modelo_combo.configure(values=[FILTRO_TODOS] + modelos)
+        if actual not in modelos:
+            self.modelo_combo.set(FILTRO_TODOS)
+
+    def _filtros_export(self):
+        """(modelo, valido) según los combos; None = sin filtro."""
+        modelo = self.modelo_combo.get()
+        modelo = None if modelo in ("", FILTRO_TODOS) else modelo
+        valido = {"PASS": True, "FAIL": False}.get(self.valido_combo.get())
+        return modelo, valido
+
     def generar_excel(self):
+        """
+        Exporta lo cargado en la tabla (día seleccionado o base global) a XLSX/CSV,
+        filtrado además por los combos de modelo y status.
+        Corre en un hilo; el progreso llega por self._export_q.
+        """
+        if self._export_thread and self._export_thread.is_alive():
+            print("[EXPORT] Ya hay un export en curso")
+            return
+
+        from tkinter import filedialog
+        modelo, valido = self._filtros_export()
+        sufijo = self._dia_cargado or "global"
+        if modelo:
+            sufijo += f"_{modelo}"
+        if valido is not None:
+            sufijo += "_PASS" if valido else "_FAIL"
+        ruta = filedialog.asksaveasfilename(
+            parent=self,
+            title="Guardar reporte",
+            defaultextension=".xlsx",
+            initialfile=f"reporte_{sufijo}.xlsx",
+            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv")],
+        )
+        if not ruta:
+            return
+
         print("Generando Excel...")
-        if self.viewmodel:
+        from src.backend.endpoints.exportar import exportar_operaciones
+        self.btn_excel.configure(state="disabled", text="Exportando...")
+        self._export_thread = threading.Thread(
+            target=exportar_operaciones,
+            args=(ruta,),
+            kwargs={
+                "desde": self._dia_cargado,
+                "hasta": self._dia_cargado,
+                "modelo": modelo,
+                "valido": valido,
+                "out_q": self._export_q,
+            },
+            daemon=True,
+        )
+        self._export_thread.start()
+        self.after(100, self._poll_export)
+
+    def _poll_export(self):
+        try:
+            while True:
+                kind, payload = self._export_q.get_nowait()
+                self.on_event(kind, payload)
+        except queue.Empty:
             pass
+        if self._export_thread and self._export_thread.is_alive():
+            self.after(100, self._poll_export)
+        elif not self._export_q.empty():
+            self.after(0, self._poll_export)
+
+    def on_event(self, kind, payload):
+        if kind == "export_progreso":
+            total = payload.get("total") or 0
+            hechas = payload.get("hechas") or 0
+            pct = int(hechas * 100 / total) if total else 100
+            self.btn_excel.configure(text=f"Exportando {pct}%")
+
+        elif kind == "export_fin":
+            self.btn_excel.configure(state="normal", text="Generar Excel")
+            from tkinter import messagebox
+            if payload.get("ok"):
+                messagebox.showinfo(
+                    "Reporte generado",
+                    f"{payload['filas']} registros exportados en {payload['segundos']:.1f}s\n{payload['ruta']}",
+                    parent=self,
+                )
+            else:
+                messagebox.showerror("Error al exportar", payload.get("error") or "Error desconocido", parent=self)
 
 
 # Test de la vista
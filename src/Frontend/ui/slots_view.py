@@ -0,0 +1,193 @@
+# src/Frontend/ui/slots_view.py
+"""
+Vista de la estación multi-slot: un panel por slot (tarjeta de red) con su
+conexión, modelo, último mensaje y último SN probado.
+
+Los slots vienen de C:\\ONT\\slots.json (ver src/backend/core/multislot.py) y
+mandan sus eventos como ("slot", {"slot", "kind", "payload"}) a la cola de esta vista.
+"""
+import queue
+
+import customtkinter as ctk
+
+
+class _PanelSlot(ctk.CTkFrame):
+    def __init__(self, parent, slot):
+        super().__init__(parent, corner_radius=10, border_width=2, border_color="#6B9080")
+        self.slot = slot
+
+        encabezado = f"{slot.nombre}  ·  {slot.interfaz or '-'}"
+        self.lbl_nombre = ctk.CTkLabel(self, text=encabezado, font=ctk.CTkFont(size=16, weight="bold"))
+        self.lbl_nombre.pack(anchor="w", padx=12, pady=(10, 2))
+        self.lbl_ips = ctk.CTkLabel(self, text=", ".join(slot.ips) or "sin IP fija",
+                                    font=ctk.CTkFont(size=11), text_color="#6B7280")
+        self.lbl_ips.pack(anchor="w", padx=12)
+
+        self.lbl_con = ctk.CTkLabel(self, text="DESCONECTADO", width=160, height=28, corner_radius=6,
+                                    fg_color="#9CA3AF", text_color="white",
+                                    font=ctk.CTkFont(size=12, weight="bold"))
+        self.lbl_con.pack(anchor="w", padx=12, pady=(8, 4))
+
+        self.lbl_modelo = ctk.CTkLabel(self, text="Modelo: -", font=ctk.CTkFont(size=12))
+        self.lbl_modelo.pack(anchor="w", padx=12)
+        self.lbl_sn = ctk.CTkLabel(self, text="Último SN: -", font=ctk.CTkFont(size=12))
+        self.lbl_sn.pack(anchor="w", padx=12)
+        self.lbl_resultado = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=13, weight="bold"))
+        self.lbl_resultado.pack(anchor="w", padx=12, pady=(2, 0))
+        self.lbl_log = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=11), wraplength=260, justify="left")
+        self.lbl_log.pack(anchor="w", padx=12, pady=(4, 10))
+
+    def on_event(self, kind, payload):
+        if kind == "con":
+            estado = str(payload)
+            if estado == "CONECTADO":
+                self.lbl_con.configure(text="CONECTADO", fg_color="#2E7D32")
+            elif estado == "DESCONECTADO2":
+                self.lbl_con.configure(text="REINICIANDO", fg_color="#F59E0B")
+            else:
+                self.lbl_con.configure(text="DESCONECTADO", fg_color="#9CA3AF")
+                self.lbl_modelo.configure(text="Modelo: -")
+        elif kind in ("log", "logSuper", "pruebas"):
+            self.lbl_log.configure(text=str(payload)[:160])
+        elif kind == "resultados":
+            res = payload or {}
+            info = res.get("info") or {}
+            self.lbl_sn.configure(text=f"Último SN: {info.get('sn') or '-'}")
+            if info.get("modelo"):
+                self.lbl_modelo.configure(text=f"Modelo: {info.get('modelo')}")
+            if res.get("valido"):
+                self.lbl_resultado.configure(text="PASS", text_color="#2E7D32")
+            else:
+                self.lbl_resultado.configure(text="FAIL", text_color="#C62828")
+        elif kind == "error_ont":
+            self.lbl_resultado.configure(text=f"ERROR: {payload}", text_color="#C62828")
+
+
+class SlotsView(ctk.CTkFrame):
+    def __init__(self, parent, config=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        from src.backend.core.multislot import SLOTS_CONFIG
+
+        self.config = config or SLOTS_CONFIG
+        self.event_q = queue.Queue()
+        self.slots = []
+        self.paneles = {}
+
+        barra = ctk.CTkFrame(self, fg_color="transparent")
+        barra.pack(fill="x", padx=16, pady=(12, 6))
+
+        ctk.CTkLabel(barra, text="ESTACIÓN MULTI-SLOT", font=ctk.CTkFont(size=20, weight="bold")).pack(side="left")
+
+        self.btn_detener = ctk.CTkButton(barra, text="DETENER", width=120, height=36, corner_radius=8,
+                                         fg_color="#C62828", hover_color="#A61E1E",
+                                         font=ctk.CTkFont(size=12, weight="bold"),
+                                         command=self.detener, state="disabled")
+        self.btn_detener.pack(side="right", padx=(6, 0))
+        self.btn_iniciar = ctk.CTkButton(barra, text="INICIAR", width=120, height=36, corner_radius=8,
+                                         fg_color="#6B9080", hover_color="#5A7A6A",
+                                         font=ctk.CTkFont(size=12, weight="bold"),
+                                         command=self.iniciar)
+        self.btn_iniciar.pack(side="right", padx=(6, 0))
+        self.chk_etiqueta = ctk.CTkCheckBox(barra, text="Solo etiqueta")
+        self.chk_etiqueta.pack(side="right", padx=12)
+
+        self.lbl_estado = ctk.CTkLabel(self, text=f"Configuración: {self.config}", anchor="w")
+        self.lbl_estado.pack(fill="x", padx=16)
+
+        self.grid_slots = ctk.CTkScrollableFrame(self, fg_color="transparent")
+        self.grid_slots.pack(fill="both", expand=True, padx=12, pady=12)
+
+        self._cargar()
+        self.after(100, self._poll)
+
+    def _cargar(self):
+        from src.backend.core.multislot import cargar_slots
+
+        try:
+            self.slots = cargar_slots(self.config)
+        except FileNotFoundError:
+            self.lbl_estado.configure(text=f"No existe {self.config} (ver src/backend/core/multislot.py)")
+            self.btn_iniciar.configure(state="disabled")
+            return
+        except Exception as e:
+            self.lbl_estado.configure(text=f"Configuración inválida: {e}")
+            self.btn_iniciar.configure(state="disabled")
+            return
+
+        columnas = 3 if len(self.slots) > 4 else 2
+        for i, slot in enumerate(self.slots):
+            panel = _PanelSlot(self.grid_slots, slot)
+            panel.grid(row=i // columnas, column=i % columnas, padx=8, pady=8, sticky="nsew")
+            self.paneles[slot.nombre] = panel
+        for c in range(columnas):
+            self.grid_slots.grid_columnconfigure(c, weight=1)
+        self.lbl_estado.configure(text=f"{len(self.slots)} slots en {self.config}")
+
+    def iniciar(self):
+        from src.backend.core.multislot import iniciar_slots, opciones_default
+
+        if not self.slots:
+            return
+        iniciar_slots(self.slots, opciones_default(bool(self.chk_etiqueta.get())), self.event_q)
+        self.btn_iniciar.configure(state="disabled")
+        self.btn_detener.configure(state="normal")
+        self.chk_etiqueta.configure(state="disabled")
+
+    def detener(self):
+        from src.backend.core.multislot import detener_slots
+        import threading
+
+        self.btn_detener.configure(state="disabled")
+        self.lbl_estado.configure(text="Deteniendo slots...")
+
+        # detener hace join de cada hilo; fuera del hilo de la UI
+        def _detener():
+            detener_slots(self.slots)
+            self.event_q.put(("detenido", None))
+
+        threading.Thread(target=_detener, daemon=True).start()
+
+    def _poll(self):
+        try:
+            while True:
+                kind, payload = self.event_q.get_nowait()
+                if kind == "slot":
+                    panel = self.paneles.get(payload.get("slot"))
+                    if panel is not None:
+                        panel.on_event(payload.get("kind"), payload.get("payload"))
+                elif kind == "detenido":
+                    self.lbl_estado.configure(text=f"{len(self.slots)} slots detenidos")
+                    self.btn_iniciar.configure(state="normal")
+                    self.chk_etiqueta.configure(state="normal")
+        except queue.Empty:
+            pass
+        if self.winfo_exists():
+            self.after(100, self._poll)
+
+    def destroy(self):
+        if any(s.vivo() for s in self.slots):
+            from src.backend.core.multislot import detener_slots
+            detener_slots(self.slots)
+        super().destroy()
+
+    def apply_theme(self, p: dict):
+        card = p.get("card", "#FFFFFF")
+        border = p.get("border", "#6B9080")
+        texto = p.get("text", "#111827")
+        for panel in self.paneles.values():
+            panel.configure(fg_color=card, border_color=border)
+            for lbl in (panel.lbl_nombre, panel.lbl_modelo, panel.lbl_sn, panel.lbl_log):
+                lbl.configure(text_color=texto)
+
+
+if __name__ == "__main__":
+    ctk.set_appearance_mode("light")
+    ctk.set_default_color_theme("blue")
+
+    app = ctk.CTk()
+    app.title("Multi-slot")
+    app.geometry("1100x700")
+
+    view = SlotsView(app)
+    view.pack(fill="both", expand=True)
+    app.mainloop()
@@ -1,10 +1,8 @@
 # src/Frontend/ui/tester_view.py
-from src.backend.endpoints.conexion import iniciar_testerConexion
 import customtkinter as ctk
 import sys
 from pathlib import Path
 from datetime import datetime
-from PIL import Image
 import threading
 import time
 
@@ -23,6 +21,9 @@ from src.Frontend.navigation.botones import (
 )
 
 from src.Frontend.ui.menu_superior_view import MenuSuperiorDesplegable
+from src.Frontend.asset_cache import get_ctk_image
+# Arranque de modos; ont_automatico se importa hasta que un modo corre
+from src.backend.endpoints import motor
 
 error_login_path = Path(__file__).parent.parent / "assets" / "error_login.png"
 desconexion_path = Path(__file__).parent.parent / "assets" / "desconexion.png"
@@ -96,11 +97,7 @@ class TesterView(ctk.CTkFrame):
 
         # ===== Logo circular superior =====
         try:
-            self.logo_image = ctk.CTkImage(
-                light_image=Image.open(logo_path),
-                dark_image=Image.open(logo_path),
-                size=(48, 48),
-            )
+            self.logo_image = get_ctk_image(logo_path, (48, 48))
         except Exception:
             self.logo_image = None
 
@@ -753,7 +750,7 @@ class TesterView(ctk.CTkFrame):
         resetFabrica, usb, fibra, wifi = self._get_loop_flags()
 
         self.tester_thread = threading.Thread(
-            target=iniciar_testerConexion,
+            target=motor.iniciar_tester,
             args=(resetFabrica, usb, fibra, wifi, self.master.event_q, self.stop_event),
             kwargs={
                 "dispatcher": self.master.dispatcher,
@@ -795,8 +792,7 @@ class TesterView(ctk.CTkFrame):
                     self.master.event_q.put(("log", "No se pudo detener el ciclo anterior. Ignorando unitaria."))
                     return
 
-                from src.backend.endpoints.conexion import iniciar_pruebaUnitariaConexion
-                iniciar_pruebaUnitariaConexion(
+                motor.iniciar_prueba_unitaria(
                     reset, soft, usb, fibra, wifi,
                     model=modelo,
                     out_q=self.master.event_q,
@@ -1005,6 +1001,17 @@ class TesterView(ctk.CTkFrame):
             auto = (modo in ("Testeo", "Retesteo"))
             self._start_loop(auto_test_on_detect=auto, start_in_monitor=True)
         
+        elif kind == "postproceso":
+            # Reportes / certificado / etiqueta generados en segundo plano
+            estado = payload.get("estado")
+            tarea = payload.get("tarea")
+            if estado == "REINTENTO":
+                self.panel_pruebas.set_texto_superior(f"Reintentando {tarea}...")
+            elif estado == "ERROR":
+                self.panel_pruebas.set_texto_superior(
+                    f"ERROR al generar {tarea} (SN {payload.get('sn') or '—'}): {payload.get('error')}"
+                )
+
         elif kind == "error_ont":
             if payload in "error_login":
                 self._alerta_error("ERROR EN EL LOGIN", error_login_path)
@@ -1037,11 +1044,7 @@ class TesterView(ctk.CTkFrame):
 
         win.geometry(f"{width}x{height}+{x}+{y}")
 
-        img_error = ctk.CTkImage(
-            light_image=Image.open(img_path),
-            dark_image=Image.open(img_path),
-            size=(500, 500),
-        )
+        img_error = get_ctk_image(img_path, (500, 500))
 
         labelAux = ctk.CTkLabel(win, text="", image=img_error)
         labelAux.pack()
@@ -1080,8 +1083,13 @@ class TesterView(ctk.CTkFrame):
         tests = payload.get("tests", {})
 
         if self.modo_var.get() == "Etiqueta" and not from_unit_test:
+            # La escritura del TXT va al post-proceso para no trabar la UI
             from src.backend.endpoints.conexion import generaEtiquetaTxt
-            generaEtiquetaTxt(payload)
+            from src.backend.core.postproceso import get_postproceso
+            get_postproceso().enviar(
+                "etiqueta_txt", generaEtiquetaTxt, payload,
+                sn=payload.get("info", {}).get("sn"), out_q=self.master.event_q,
+            )
 
         self.panel_pruebas.modelo = info.get("modelo", "—")
 
@@ -25,26 +25,58 @@ def _get_weasyprint():
         ) from e
 
 
-def generarCertificado(resultado: dict):
-    REPORTS_DIR.mkdir(exist_ok=True)
+# ==========================
+# Caches por proceso: el template se compila una vez y el CSS / fuentes se
+# parsean una vez (en el worker de renderer.py esto se hace al arrancar).
+# ==========================
+_ENV = None
+_TEMPLATE = None
+_CSS = None
+_FONT_CONFIG = None
+
+
+def _get_template():
+    global _ENV, _TEMPLATE
+    if _TEMPLATE is None:
+        _ENV = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)), auto_reload=False)
+        _TEMPLATE = _ENV.get_template("index.html")
+    return _TEMPLATE
+
+
+def _get_css():
+    """Hoja de estilos + FontConfiguration ya parseadas (WeasyPrint)."""
+    global _CSS, _FONT_CONFIG
+    if _CSS is None:
+        HTML, CSS = _get_weasyprint()
+        try:
+            from weasyprint.text.fonts import FontConfiguration  # type: ignore
+            _FONT_CONFIG = FontConfiguration()
+        except Exception:
+            _FONT_CONFIG = None
+        _CSS = CSS(filename=str(TEMPLATES_DIR / "estilos.css"), font_config=_FONT_CONFIG)
+    return _CSS, _FONT_CONFIG
+
+
+def precalentar():
+    """Compila el template y parsea CSS/fuentes. Devuelve False si WeasyPrint no carga."""
+    _get_template()
+    try:
+        _get_css()
+        return True
+    except RuntimeError as e:
+        print(f"[CERTIFICADO] {e}")
+        return False
+
 
+def _contexto(resultado: dict) -> dict:
     info = resultado.get("info", {})
     tests = resultado.get("tests", {})
-    valido = resultado.get("valido", False)
-
-    sn = info.get("sn", "SIN_SN")
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    nombre_pdf = f"certificado_{sn}_{timestamp}.pdf"
-    ruta_pdf = REPORTS_DIR / nombre_pdf
-
-    env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
-    template = env.get_template("index.html")
 
     fechaTest = info.get("fecha_test", "01/01/0001")
     try:
         dt = datetime.fromisoformat(fechaTest)
         fechaTest = dt.strftime("%d/%m/%Y")
-    except ValueError:
+    except (TypeError, ValueError):
         # Si el formato no es ISO, lo dejamos como venga
         pass
 
@@ -59,7 +91,7 @@ def generarCertificado(resultado: dict):
         else:
             sftUStatus = "FAIL"
 
-    contexto = {
+    return {
         # header
         "sn": info.get("sn", ""),
         "fecha_diagnostico": fechaTest,
@@ -87,13 +119,29 @@ def generarCertificado(resultado: dict):
         "fecha_certificado": fechaHoy,
     }
 
-    html_renderizado = template.render(**contexto)
-    tmp_html = TEMPLATES_DIR / "_tmp_render.html"
-    tmp_html.write_text(html_renderizado, encoding="utf-8")
+
+def nombre_certificado(resultado: dict) -> Path:
+    sn = resultado.get("info", {}).get("sn", "SIN_SN")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return REPORTS_DIR / f"certificado_{sn}_{timestamp}.pdf"
+
+
+def generarCertificado(resultado: dict, ruta_pdf=None, guardar_html: bool = True):
+    REPORTS_DIR.mkdir(exist_ok=True)
+    ruta_pdf = Path(ruta_pdf) if ruta_pdf else nombre_certificado(resultado)
+    ruta_pdf.parent.mkdir(parents=True, exist_ok=True)
+
+    template = _get_template()
+    html_renderizado = template.render(**_contexto(resultado))
+    if guardar_html:
+        # Copia del último HTML para depurar el template (en lote no se escribe)
+        tmp_html = TEMPLATES_DIR / "_tmp_render.html"
+        tmp_html.write_text(html_renderizado, encoding="utf-8")
 
     # Intentar usar WeasyPrint
     try:
-        HTML, CSS = _get_weasyprint()
+        HTML, _ = _get_weasyprint()
+        css, font_config = _get_css()
     except RuntimeError as e:
         # En modo exe, caerás aquí si faltan las DLL. No rompemos la app,
         # sólo devolvemos None y dejamos que la UI avise al usuario.
@@ -104,11 +152,11 @@ def generarCertificado(resultado: dict):
         string=html_renderizado,
         base_url=str(TEMPLATES_DIR),
     )
-    css = CSS(filename=str(TEMPLATES_DIR / "estilos.css"))
 
     html_obj.write_pdf(
         target=str(ruta_pdf),
         stylesheets=[css],
+        font_config=font_config,
     )
 
     return ruta_pdf
@@ -0,0 +1,216 @@
+# src/backend/certificado/lote.py
+"""
+Reemisión de certificados en lote desde la tabla operations.
+
+Uso:
+    python -m src.backend.certificado.lote --dia 2025-11-28
+    python -m src.backend.certificado.lote --desde 2025-11-01 --hasta 2025-11-30 --modelo HG6145F
+    python -m src.backend.certificado.lote --sn FHTT1234,ZTEG5678 --workers 4
+    python -m src.backend.certificado.lote --sn-file lote.txt --todos
+
+Por default solo se certifican operaciones válidas y solo la última operación
+de cada SN. En operations tx/rx/wifi ya quedaron como PASS/FAIL, así que los
+valores medidos (dBm / señal) se leen del reporte original vía results_index
+(archivo diario o JSON suelto) y se proyectan igual que en vivo; si el reporte
+no está, la fila cuenta como error y no se emite certificado. El nombre del PDF lleva un hash del contenido (payload + template),
+así que si ya existe se omite.
+"""
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+from src.backend.certificado.certificado import REPORTS_DIR, TEMPLATES_DIR
+
+# Columnas de prueba en operations -> llaves del payload de generarCertificado
+_TESTS = ("ping", "reset", "usb", "tx", "rx", "w24", "w5", "sftU")
+_SN_CHUNK = 500
+
+
+def fila_a_payload(row, columnas, tests: dict) -> dict:
+    """
+    Fila de operations (EXPORT_COLUMNS) + tests medidos (ver tests_medidos)
+    -> dict info/tests/valido. Solo salen las pruebas que la fila tiene ejecutadas;
+    si alguna de esas no viene en el reporte se lanza LookupError.
+    """
+    r = dict(zip(columnas, row))
+    info = {
+        "modelo": r.get("modelo") or "DESCONOCIDO",
+        "fecha_test": (r.get("fecha_test") or "").replace(" ", "T"),
+        "sn": r.get("sn") or "N/A",
+        "mac": r.get("mac") or "N/A",
+        "sftVer": r.get("sftVer") or "N/A",
+        "wifi24": r.get("wifi24") or "N/A",
+        "wifi5": r.get("wifi5") or "N/A",
+        "passWifi": r.get("passWifi") or "N/A",
+    }
+    medidos = {}
+    for k in _TESTS:
+        v = r.get(k)
+        if not v or v == "SIN_PRUEBA":
+            continue
+        if k not in tests:
+            raise LookupError(f"el reporte no trae la medición de {k}")
+        medidos[k] = tests[k]
+    return {"info": info, "tests": medidos, "valido": bool(r.get("valido"))}
+
+
+def tests_medidos(sn: str, fecha_test: str, umbrales: dict) -> dict:
+    """
+    tests del reporte original de la operación, proyectados como en vivo
+    (tx/rx en dBm). LookupError si el reporte no está indexado o ya no se puede leer.
+    """
+    from src.backend.sua_client.dao import resultado_indexado_de
+    from src.backend.core.indice_resultados import cargar
+    from src.backend.core.importador_historico import modelo_de, proyectar
+
+    row = resultado_indexado_de(sn, fecha_test)
+    if row is None:
+        raise LookupError("sin reporte indexado para esa fecha")
+    try:
+        tr = cargar(row["ruta"])
+    except Exception as e:
+        raise LookupError(f"no se pudo leer {row['ruta']}: {type(e).__name__}: {e}")
+    try:
+        payload = proyectar(tr, modelo_de(tr, row["ruta"]) or row["modelo"], umbrales)
+    except Exception as e:
+        raise LookupError(f"proyección: {type(e).__name__}: {e}")
+    if not payload or not payload.get("tests"):
+        raise LookupError("el reporte no trae pruebas proyectables")
+    return payload["tests"]
+
+
+def _hash_template() -> str:
+    h = hashlib.sha1()
+    for nombre in ("index.html", "estilos.css"):
+        p = TEMPLATES_DIR / nombre
+        if p.exists():
+            h.update(p.read_bytes())
+    return h.hexdigest()
+
+
+def hash_contenido(payload: dict, hash_template: str) -> str:
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(data + hash_template.encode("ascii")).hexdigest()[:12]
+
+
+def ruta_para(payload: dict, h: str, salida: Path) -> Path:
+    sn = "".join(c for c in payload["info"]["sn"] if c.isalnum() or c in ("-", "_")) or "SIN_SN"
+    return salida / f"certificado_{sn}_{h}.pdf"
+
+
+def seleccionar(desde=None, hasta=None, modelo=None, sns=None, solo_validos=True):
+    """
+    Última operación por SN que cumpla los filtros -> (payloads, sin_medicion).
+    sin_medicion = [(sn, motivo)] de las operaciones cuyo reporte original no se encontró.
+    """
+    from src.backend.sua_client.dao import EXPORT_COLUMNS, iter_operaciones_export
+    from src.backend.core.importador_historico import umbrales_config
+
+    valido = True if solo_validos else None
+    i_sn, i_fecha = EXPORT_COLUMNS.index("sn"), EXPORT_COLUMNS.index("fecha_test")
+    ultimos = {}
+    lotes_sn = [None]
+    if sns:
+        sns = list(dict.fromkeys(sns))
+        lotes_sn = [sns[i:i + _SN_CHUNK] for i in range(0, len(sns), _SN_CHUNK)]
+
+    for lote in lotes_sn:
+        # Vienen ordenadas por fecha: la última que se vea de cada SN es la más reciente
+        for row in iter_operaciones_export(desde, hasta, modelo, valido, sns=lote):
+            ultimos[row[i_sn]] = row
+
+    umbrales = umbrales_config()
+    payloads, sin_medicion = [], []
+    for sn, row in ultimos.items():
+        try:
+            payloads.append(fila_a_payload(row, EXPORT_COLUMNS, tests_medidos(sn, row[i_fecha], umbrales)))
+        except LookupError as e:
+            sin_medicion.append((sn, str(e)))
+    return payloads, sin_medicion
+
+
+def generar_lote(payloads, salida: Path = REPORTS_DIR, workers: int = None, forzar: bool = False) -> dict:
+    from src.backend.certificado.renderer import get_renderer
+
+    salida = Path(salida)
+    salida.mkdir(parents=True, exist_ok=True)
+    ht = _hash_template()
+
+    trabajos, omitidos = [], 0
+    for p in payloads:
+        ruta = ruta_para(p, hash_contenido(p, ht), salida)
+        if ruta.exists() and not forzar:
+            omitidos += 1
+            continue
+        trabajos.append((p, str(ruta)))
+
+    print(f"[LOTE] {len(payloads)} seleccionados | {omitidos} ya generados | {len(trabajos)} por generar")
+
+    def _progreso(hechos, total):
+        if hechos == total or hechos % 10 == 0:
+            print(f"[LOTE] {hechos}/{total}")
+
+    t0 = time.perf_counter()
+    rutas, errores = get_renderer().renderizar_lote(trabajos, workers=workers, on_progreso=_progreso)
+    seg = time.perf_counter() - t0
+    cps = (len(rutas) / seg) if seg > 0 else 0.0
+
+    for i, err in errores:
+        print(f"[LOTE] ERROR {trabajos[i][0]['info']['sn']}: {err}")
+    print(f"[LOTE] Generados {len(rutas)} en {seg:.1f}s ({cps:.2f} certificados/s), errores: {len(errores)}")
+    return {
+        "seleccionados": len(payloads),
+        "omitidos": omitidos,
+        "generados": len(rutas),
+        "errores": len(errores),
+        "segundos": seg,
+        "cert_por_seg": cps,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reemitir certificados desde la base local")
+    parser.add_argument("--dia", help="Día YYYY-MM-DD (equivale a --desde y --hasta)")
+    parser.add_argument("--desde", help="Desde YYYY-MM-DD (inclusive)")
+    parser.add_argument("--hasta", help="Hasta YYYY-MM-DD (inclusive)")
+    parser.add_argument("--modelo", help="Modelo exacto como está en operations")
+    parser.add_argument("--sn", help="Lista de SN separados por coma")
+    parser.add_argument("--sn-file", help="Archivo con un SN por línea")
+    parser.add_argument("--todos", action="store_true", help="Incluir operaciones no válidas")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos de render (default: núcleos - 1)")
+    parser.add_argument("--salida", default=str(REPORTS_DIR), help="Carpeta destino de los PDF")
+    parser.add_argument("--forzar", action="store_true", help="Regenerar aunque ya exista el PDF")
+    args = parser.parse_args(argv)
+
+    desde = args.dia or args.desde
+    hasta = args.dia or args.hasta
+    sns = []
+    if args.sn:
+        sns += [s.strip() for s in args.sn.split(",") if s.strip()]
+    if args.sn_file:
+        with open(args.sn_file, encoding="utf-8") as f:
+            sns += [ln.strip() for ln in f if ln.strip() and not ln.startswith("#")]
+
+    if not any([desde, hasta, args.modelo, sns]):
+        parser.error("Indica al menos --dia/--desde/--hasta, --modelo o --sn/--sn-file")
+
+    payloads, sin_medicion = seleccionar(desde, hasta, args.modelo, sns or None, solo_validos=not args.todos)
+    for sn, motivo in sin_medicion:
+        print(f"[LOTE] ERROR {sn}: {motivo}")
+    if not payloads:
+        print("[LOTE] No hay operaciones con esos filtros" if not sin_medicion
+              else f"[LOTE] {len(sin_medicion)} operaciones sin reporte original, nada que generar")
+        return 1 if sin_medicion else 0
+    res = generar_lote(payloads, Path(args.salida), workers=args.workers, forzar=args.forzar)
+    if sin_medicion:
+        print(f"[LOTE] {len(sin_medicion)} operaciones sin reporte original (no se generaron)")
+    return 1 if (res["errores"] or sin_medicion) else 0
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
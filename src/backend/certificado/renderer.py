@@ -0,0 +1,111 @@
+# src/backend/certificado/renderer.py
+"""
+Servicio de render de certificados en procesos aparte.
+
+- renderizar(resultado): un worker dedicado (1 proceso) que ya tiene el template
+  compilado y el CSS/fuentes parseados; el layout de WeasyPrint no compite con
+  Selenium por el GIL del proceso principal.
+- renderizar_lote(resultados): reparte muchos certificados entre varios procesos
+  (ej. todos los válidos de un día).
+
+En el .exe de PyInstaller main.py llama a multiprocessing.freeze_support().
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _init_worker():
+    # Corre una vez por proceso: deja listo template, CSS y fuentes.
+    # Si algo falla no se tumba el pool; el error sale en cada render.
+    try:
+        from src.backend.certificado.certificado import precalentar
+        precalentar()
+    except Exception as e:
+        print(f"[CERTIFICADO] No se pudo precalentar el worker: {e}")
+
+
+def _render_en_worker(resultado: dict, ruta_pdf=None):
+    from src.backend.certificado.certificado import generarCertificado
+    ruta = generarCertificado(resultado, ruta_pdf=ruta_pdf, guardar_html=False)
+    return str(ruta) if ruta else None
+
+
+class RendererCertificados:
+    def __init__(self):
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=1, initializer=_init_worker)
+            return self._pool
+
+    def _reiniciar_pool(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def renderizar(self, resultado: dict, ruta_pdf=None, timeout: float = 120):
+        """Renderiza un certificado en el worker dedicado y devuelve la ruta (o None)."""
+        try:
+            fut = self._get_pool().submit(_render_en_worker, resultado, ruta_pdf)
+            return fut.result(timeout=timeout)
+        except BrokenProcessPool:
+            # El worker murió (DLL de GTK, memoria...). Se recrea para la siguiente llamada
+            print("[CERTIFICADO] Worker de render caído, se reinicia")
+            self._reiniciar_pool()
+            raise
+
+    def renderizar_lote(self, trabajos, workers: int = None, on_progreso=None):
+        """
+        trabajos: lista de (resultado, ruta_pdf) o de payloads (ruta automática).
+        Devuelve (rutas_ok, errores) donde errores = [(indice, mensaje)].
+        on_progreso(hechos, total) se llama desde el hilo que invoca.
+        """
+        trabajos = [t if isinstance(t, tuple) else (t, None) for t in trabajos]
+        total = len(trabajos)
+        if not total:
+            return [], []
+
+        workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        workers = min(workers, total)
+        rutas, errores = [], []
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futs = {pool.submit(_render_en_worker, res, ruta): i for i, (res, ruta) in enumerate(trabajos)}
+            for hechos, fut in enumerate(as_completed(futs), start=1):
+                i = futs[fut]
+                try:
+                    ruta = fut.result()
+                    if ruta:
+                        rutas.append(ruta)
+                    else:
+                        errores.append((i, "WeasyPrint no disponible"))
+                except Exception as e:
+                    errores.append((i, f"{type(e).__name__}: {e}"))
+                if on_progreso:
+                    on_progreso(hechos, total)
+
+        seg = time.perf_counter() - t0
+        print(f"[CERTIFICADO] Lote: {len(rutas)}/{total} en {seg:.1f}s con {workers} procesos")
+        return rutas, errores
+
+    def cerrar(self):
+        self._reiniciar_pool()
+
+
+_RENDERER = None
+_RENDERER_LOCK = threading.Lock()
+
+
+def get_renderer() -> RendererCertificados:
+    global _RENDERER
+    with _RENDERER_LOCK:
+        if _RENDERER is None:
+            _RENDERER = RendererCertificados()
+        return _RENDERER
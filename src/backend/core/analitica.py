@@ -0,0 +1,474 @@
+# src/backend/core/analitica.py
+"""
+Analítica de potencia óptica (TX/RX dBm) y señal WiFi (%) sobre el historial.
+
+Fuente: el archivo diario de resultados (core/archivo_resultados). Para los
+JSON sueltos de antes, primero `archivo_resultados convertir`.
+
+Caché columnar en reports/analitica/ (un archivo binario por columna, solo
+se agregan renglones) que se abre con np.memmap: no se parsea JSON al
+consultar y el SO solo carga lo que se lee.
+
+    ts (int64, epoch s) | dia (int32, días desde 1970) | estacion (int32)
+    modelo (int16, índice en meta.json) | tx, rx, w24, w5 (float32, NaN = sin dato)
+
+actualizar() es incremental: por cada archivo del día guarda cuántas entradas
+del .idx ya procesó y solo lee las nuevas (con seek).
+
+Uso:
+    python -m src.backend.core.analitica actualizar
+    python -m src.backend.core.analitica resumen --campo rx --por estacion
+    python -m src.backend.core.analitica deriva --campo w5 --dias 30
+    python -m src.backend.core.analitica alertas
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+
+from src.backend.core.archivo_resultados import (
+    ARCHIVO_DIR, archivos, leer_indice, _compresion_de, _descomprimir_uno,
+)
+
+CACHE_DIR = Path("reports") / "analitica"
+COLUMNAS = {
+    "ts": np.int64,
+    "dia": np.int32,
+    "estacion": np.int32,
+    "modelo": np.int16,
+    "tx": np.float32,
+    "rx": np.float32,
+    "w24": np.float32,
+    "w5": np.float32,
+}
+MEDICIONES = ("tx", "rx", "w24", "w5")
+PERCENTILES = (5, 25, 50, 75, 95)
+_EPOCH = date(1970, 1, 1)
+
+
+# ---------- extracción por vendor ----------
+def _num(v):
+    """'-2.5 dBm' / '-18.3' / 87 -> float; lo demás (None, '--', False) -> NaN."""
+    if v is None or isinstance(v, bool):
+        return np.nan
+    if isinstance(v, (int, float)):
+        return float(v)
+    try:
+        return float(str(v).replace("dBm", "").replace("dB", "").replace("%", "").strip())
+    except ValueError:
+        return np.nan
+
+
+def _mejor_senal(redes):
+    vals = [n.get("signal_percent") for n in (redes or []) if isinstance(n, dict)]
+    vals = [v for v in vals if isinstance(v, (int, float))]
+    return float(max(vals)) if vals else np.nan
+
+
+def medir(test_results: dict):
+    """
+    (tx, rx, w24, w5) de un reporte, buscando donde lo deja cada vendor:
+      Fiberhome: metadata.base_info.tx_power_dbm / rx_power_dbm
+      ZTE:       tests.fibra.details.PON_OPTICALPARA.TxPower / RxPower
+      Huawei:    tests.hw_optical.data.tx_optical_power / rx_optical_power (parse_hw_optical)
+      WiFi:      tests.potencia_wifi.details.raw_24 / raw_5 (test_wifi_rssi_windows), la mejor red
+    """
+    tr = test_results or {}
+    tests = tr.get("tests") or {}
+    base_info = (tr.get("metadata") or {}).get("base_info") or {}
+    pon = ((tests.get("fibra") or {}).get("details") or {}).get("PON_OPTICALPARA") or {}
+    hw = (tests.get("hw_optical") or {}).get("data") or {}
+
+    tx = _num(base_info.get("tx_power_dbm"))
+    rx = _num(base_info.get("rx_power_dbm"))
+    if np.isnan(tx):
+        tx = _num(pon.get("TxPower")) if pon else _num(hw.get("tx_optical_power"))
+    if np.isnan(rx):
+        rx = _num(pon.get("RxPower")) if pon else _num(hw.get("rx_optical_power"))
+
+    det = (tests.get("potencia_wifi") or {}).get("details") or {}
+    return tx, rx, _mejor_senal(det.get("raw_24")), _mejor_senal(det.get("raw_5"))
+
+
+def _tiempo(ts: str):
+    """(epoch s, día) del timestamp ISO del reporte (hora local, sin zona)."""
+    try:
+        dt = datetime.fromisoformat(str(ts)[:19])
+    except ValueError:
+        return None, None
+    return int((dt - datetime(1970, 1, 1)).total_seconds()), (dt.date() - _EPOCH).days
+
+
+# ---------- caché ----------
+def _meta_path(cache_dir) -> Path:
+    return Path(cache_dir) / "meta.json"
+
+
+def _leer_meta(cache_dir) -> dict:
+    p = _meta_path(cache_dir)
+    if p.exists():
+        with p.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"filas": 0, "modelos": [], "fuentes": {}}
+
+
+def _guardar_meta(cache_dir, meta: dict):
+    p = _meta_path(cache_dir)
+    tmp = p.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(meta, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, p)
+
+
+def _recortar(cache_dir, filas: int):
+    """Si una actualización se cortó a media escritura, las columnas quedan en 'filas'."""
+    for col, dt in COLUMNAS.items():
+        p = Path(cache_dir) / f"{col}.bin"
+        esperado = filas * np.dtype(dt).itemsize
+        if p.exists() and p.stat().st_size != esperado:
+            with p.open("r+b") as f:
+                f.truncate(esperado)
+
+
+def _estaciones_por_sn() -> dict:
+    """sn -> id_station de la última operación (para registros sin estación)."""
+    try:
+        from src.backend.sua_client.local_db import get_conn
+        con = get_conn()
+        con.row_factory = None
+        try:
+            return dict(con.execute("SELECT sn, id_station FROM operations ORDER BY id;").fetchall())
+        finally:
+            con.close()
+    except Exception as e:
+        print(f"[ANALITICA] No se pudo leer estaciones de operations: {e}")
+        return {}
+
+
+def actualizar(base_dir=ARCHIVO_DIR, cache_dir=CACHE_DIR) -> int:
+    """Agrega al caché las mediciones nuevas del archivo diario. Regresa cuántas filas agregó."""
+    t0 = time.perf_counter()
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    meta = _leer_meta(cache_dir)
+    _recortar(cache_dir, meta["filas"])
+
+    modelos = {m: i for i, m in enumerate(meta["modelos"])}
+    nuevas = {c: [] for c in COLUMNAS}
+    por_sn = None
+
+    for ruta in archivos(base_dir):
+        idx = leer_indice(ruta)
+        hechos = meta["fuentes"].get(ruta.name, 0)
+        if len(idx) <= hechos:
+            continue
+        compresion = _compresion_de(ruta)
+        with open(ruta, "rb") as f:
+            for _sn, _modelo, _ts, offset, largo in idx[hechos:]:
+                f.seek(offset)
+                try:
+                    reg = json.loads(_descomprimir_uno(f.read(largo), compresion))
+                except Exception:
+                    continue
+                tx, rx, w24, w5 = medir(reg.get("test_results"))
+                if np.isnan(tx) and np.isnan(rx) and np.isnan(w24) and np.isnan(w5):
+                    continue
+                ts, dia = _tiempo(reg.get("ts"))
+                if ts is None:
+                    continue
+                estacion = reg.get("estacion")
+                if estacion is None:
+                    if por_sn is None:
+                        por_sn = _estaciones_por_sn()
+                    estacion = por_sn.get(reg.get("sn"), 0)
+                modelo = reg.get("modelo") or "?"
+                if modelo not in modelos:
+                    modelos[modelo] = len(modelos)
+                    meta["modelos"].append(modelo)
+
+                nuevas["ts"].append(ts)
+                nuevas["dia"].append(dia)
+                nuevas["estacion"].append(int(estacion or 0))
+                nuevas["modelo"].append(modelos[modelo])
+                nuevas["tx"].append(tx)
+                nuevas["rx"].append(rx)
+                nuevas["w24"].append(w24)
+                nuevas["w5"].append(w5)
+        meta["fuentes"][ruta.name] = len(idx)
+
+    n = len(nuevas["ts"])
+    if n:
+        for col, dt in COLUMNAS.items():
+            with open(cache_dir / f"{col}.bin", "ab") as f:
+                np.asarray(nuevas[col], dtype=dt).tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+        meta["filas"] += n
+    # meta al final: si algo falla antes, la siguiente corrida recorta y repite
+    _guardar_meta(cache_dir, meta)
+    print(f"[ANALITICA] {n} mediciones nuevas ({meta['filas']} en total) en {time.perf_counter() - t0:.2f}s")
+    return n
+
+
+class Historial:
+    """Columnas del caché como memmaps de solo lectura (h["rx"], h.n, h.modelos)."""
+
+    def __init__(self, cols: dict, modelos: list):
+        self.cols = cols
+        self.modelos = list(modelos)
+        self.n = len(cols["ts"])
+
+    def __getitem__(self, col):
+        return self.cols[col]
+
+    def filtro(self, desde: str = None, hasta: str = None, modelo: str = None):
+        """Máscara booleana por rango de días (YYYY-MM-DD) y modelo."""
+        m = np.ones(self.n, dtype=bool)
+        if desde:
+            m &= self.cols["dia"] >= (date.fromisoformat(desde) - _EPOCH).days
+        if hasta:
+            m &= self.cols["dia"] <= (date.fromisoformat(hasta) - _EPOCH).days
+        if modelo:
+            cod = self.modelos.index(modelo) if modelo in self.modelos else -1
+            m &= self.cols["modelo"] == cod
+        return m
+
+
+def cargar(cache_dir=CACHE_DIR) -> Historial:
+    cache_dir = Path(cache_dir)
+    meta = _leer_meta(cache_dir)
+    filas = meta["filas"]
+    cols = {}
+    for col, dt in COLUMNAS.items():
+        p = cache_dir / f"{col}.bin"
+        if filas and p.exists():
+            cols[col] = np.memmap(p, dtype=dt, mode="r", shape=(filas,))
+        else:
+            cols[col] = np.empty(0, dtype=dt)
+    return Historial(cols, meta["modelos"])
+
+
+# ---------- estadística por grupo (vectorizada) ----------
+def _densos(claves):
+    """
+    Las claves son enteros chicos (estación, día, código de modelo): en lugar de
+    np.unique (que ordena) se usa clave - mínimo y bincount.
+    Regresa (kk, kmin, cuentas_por_kk).
+    """
+    claves = np.asarray(claves)
+    if not len(claves):
+        return np.empty(0, dtype=np.int64), 0, np.empty(0, dtype=np.int64)
+    kmin = int(claves.min())
+    kk = claves.astype(np.int64) - kmin
+    return kk, kmin, np.bincount(kk)
+
+
+def percentiles_por_grupo(claves, valores, qs=PERCENTILES):
+    """
+    Percentiles de 'valores' agrupados por 'claves' sin ciclos por grupo.
+    Un solo np.sort sobre la clave compuesta (grupo * rango + valor) deja los grupos
+    contiguos y ordenados por valor; la posición de cada percentil sale por aritmética
+    de índices. Regresa (grupos, cuentas, matriz[len(grupos), len(qs)]). Los NaN se ignoran.
+    """
+    valores = np.asarray(valores)
+    ok = np.isfinite(valores)
+    k = np.asarray(claves)[ok]
+    v = valores[ok].astype(np.float64)
+    if not len(v):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty((0, len(qs)))
+    kk, kmin, cuentas = _densos(k)
+    vmin = float(v.min())
+    rango = float(v.max()) - vmin + 1.0
+    comp = kk * rango + (v - vmin)
+    comp.sort()
+
+    presentes = np.flatnonzero(cuentas)
+    cuenta = cuentas[presentes]
+    inicio = (np.cumsum(cuentas) - cuentas)[presentes]
+    q = np.asarray(qs, dtype=np.float64) / 100.0
+    pos = inicio[:, None] + (cuenta[:, None] - 1) * q[None, :]
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, (inicio + cuenta - 1)[:, None])
+    frac = pos - lo
+    desplaz = (presentes * rango - vmin)[:, None]
+    pct = (comp[lo] - desplaz) * (1.0 - frac) + (comp[hi] - desplaz) * frac
+    return presentes + kmin, cuenta, pct
+
+
+def _sumas_por_grupo(claves, *pesos):
+    """(grupos, n, [suma de cada peso]) con bincount sobre claves densas."""
+    kk, kmin, cuentas = _densos(claves)
+    presentes = np.flatnonzero(cuentas)
+    sumas = [np.bincount(kk, w, minlength=len(cuentas))[presentes] for w in pesos]
+    return presentes + kmin, cuentas[presentes].astype(np.float64), sumas
+
+
+def _momentos_por_grupo(claves, valores):
+    """(grupos, n, media, std) con bincount."""
+    ok = np.isfinite(valores)
+    v = np.asarray(valores)[ok].astype(np.float64)
+    grupos, n, (s, s2) = _sumas_por_grupo(np.asarray(claves)[ok], v, v * v)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media = s / n
+        std = np.sqrt(np.maximum(s2 / n - media * media, 0.0))
+    return grupos, n, media, std
+
+
+def _etiqueta(h: Historial, por: str, g):
+    if por == "modelo":
+        return h.modelos[int(g)] if 0 <= int(g) < len(h.modelos) else "?"
+    if por == "dia":
+        return date.fromordinal(_EPOCH.toordinal() + int(g)).isoformat()
+    return int(g)
+
+
+def distribucion(h: Historial, campo: str, por: str = "estacion", mascara=None, qs=PERCENTILES):
+    """Lista de {grupo, n, media, std, pXX...} de 'campo' agrupado por estacion/modelo/dia."""
+    m = mascara if mascara is not None else slice(None)
+    claves, valores = h[por][m], h[campo][m]
+    grupos, cuenta, pct = percentiles_por_grupo(claves, valores, qs)
+    _g, _n, media, std = _momentos_por_grupo(claves, valores)
+    out = []
+    for i, g in enumerate(grupos):
+        fila = {"grupo": _etiqueta(h, por, g), "n": int(cuenta[i]),
+                "media": round(float(media[i]), 2), "std": round(float(std[i]), 2)}
+        for j, q in enumerate(qs):
+            fila[f"p{q}"] = round(float(pct[i, j]), 2)
+        out.append(fila)
+    return out
+
+
+def deriva(h: Historial, campo: str, por: str = "estacion", dias: int = 30, mascara=None) -> dict:
+    """
+    Pendiente (unidades/día, mínimos cuadrados) de 'campo' por grupo en los últimos
+    'dias' del historial. Negativa en rx/w24/w5 = va bajando.
+    """
+    m = np.ones(h.n, dtype=bool) if mascara is None else mascara.copy()
+    if not m.any():
+        return {}
+    ultimo = int(h["dia"][m].max())
+    m &= h["dia"] > ultimo - dias
+    y = h[campo][m].astype(np.float64)
+    x = (h["dia"][m] - (ultimo - dias)).astype(np.float64)
+    ok = np.isfinite(y)
+    x, y = x[ok], y[ok]
+    grupos, n, (sx, sy, sxx, sxy) = _sumas_por_grupo(h[por][m][ok], x, y, x * x, x * y)
+    den = n * sxx - sx * sx
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pendiente = np.where(den > 0, (n * sxy - sx * sy) / den, np.nan)
+    return {_etiqueta(h, por, g): {"n": int(n[i]), "pendiente": float(pendiente[i])}
+            for i, g in enumerate(grupos)}
+
+
+def _residuo_por_modelo(h: Historial, campo: str, mascara):
+    """valor - mediana de su modelo: así una estación que prueba más X6 no parece degradada."""
+    v = h[campo][mascara].astype(np.float64)
+    mod = h["modelo"][mascara]
+    grupos, _n, med = percentiles_por_grupo(mod, v, (50,))
+    mediana = np.full(int(mod.max()) + 1 if len(mod) else 1, np.nan)
+    mediana[grupos.astype(np.int64)] = med[:, 0]
+    return v - mediana[mod.astype(np.int64)]
+
+
+# campo -> (caída mínima para alertar, causa probable)
+CAIDAS_ALERTA = {
+    "rx": (1.0, "patch cord / conector de fibra"),
+    "w24": (5.0, "antena / cable WiFi 2.4 GHz"),
+    "w5": (5.0, "antena / cable WiFi 5 GHz"),
+}
+
+
+def estaciones_degradadas(h: Historial, dias: int = 30, reciente: int = 7,
+                          min_mediciones: int = 20, caidas: dict = None) -> list:
+    """
+    Compara la mediana (ya sin efecto del modelo) de los últimos 'reciente' días contra
+    la de los días anteriores de la ventana, por estación. Marca las que bajaron más
+    de lo indicado en CAIDAS_ALERTA.
+    """
+    caidas = caidas or CAIDAS_ALERTA
+    if not h.n:
+        return []
+    ultimo = int(np.max(h["dia"]))
+    ventana = h["dia"] > ultimo - dias
+    alertas = []
+    for campo, (umbral, causa) in caidas.items():
+        if not ventana.any():
+            break
+        r = _residuo_por_modelo(h, campo, ventana)
+        est = h["estacion"][ventana].astype(np.int64)
+        es_reciente = (h["dia"][ventana] > ultimo - reciente).astype(np.int64)
+        grupos, cuenta, med = percentiles_por_grupo(est * 2 + es_reciente, r, (50,))
+        base = {int(g) // 2: (int(c), float(p)) for g, c, p in zip(grupos, cuenta, med[:, 0]) if g % 2 == 0}
+        rec = {int(g) // 2: (int(c), float(p)) for g, c, p in zip(grupos, cuenta, med[:, 0]) if g % 2 == 1}
+        pend = None
+        for estacion, (n_rec, m_rec) in rec.items():
+            if estacion not in base:
+                continue
+            n_base, m_base = base[estacion]
+            if n_rec < min_mediciones or n_base < min_mediciones:
+                continue
+            caida = m_base - m_rec
+            if caida >= umbral:
+                if pend is None:
+                    pend = deriva(h, campo, "estacion", dias)
+                alertas.append({
+                    "estacion": estacion, "campo": campo, "causa": causa,
+                    "caida": round(caida, 2), "n_base": n_base, "n_reciente": n_rec,
+                    "pendiente_dia": round(pend.get(estacion, {}).get("pendiente", float("nan")), 3),
+                })
+    alertas.sort(key=lambda a: -a["caida"])
+    return alertas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analítica de potencia óptica y WiFi")
+    parser.add_argument("--archivo", default=str(ARCHIVO_DIR), help="Carpeta del archivo diario")
+    parser.add_argument("--cache", default=str(CACHE_DIR), help="Carpeta del caché columnar")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("actualizar", help="Agregar mediciones nuevas al caché")
+
+    p = sub.add_parser("resumen", help="Percentiles por grupo")
+    p.add_argument("--campo", choices=MEDICIONES, default="rx")
+    p.add_argument("--por", choices=("estacion", "modelo", "dia"), default="estacion")
+    p.add_argument("--desde")
+    p.add_argument("--hasta")
+    p.add_argument("--modelo")
+
+    p = sub.add_parser("deriva", help="Pendiente por día de cada grupo")
+    p.add_argument("--campo", choices=MEDICIONES, default="rx")
+    p.add_argument("--por", choices=("estacion", "modelo"), default="estacion")
+    p.add_argument("--dias", type=int, default=30)
+
+    p = sub.add_parser("alertas", help="Estaciones con patch cord / antenas degradándose")
+    p.add_argument("--dias", type=int, default=30)
+    p.add_argument("--reciente", type=int, default=7)
+
+    args = parser.parse_args(argv)
+    if args.cmd == "actualizar":
+        actualizar(args.archivo, args.cache)
+        return 0
+
+    actualizar(args.archivo, args.cache)
+    h = cargar(args.cache)
+    t0 = time.perf_counter()
+    if args.cmd == "resumen":
+        res = distribucion(h, args.campo, args.por, h.filtro(args.desde, args.hasta, args.modelo))
+    elif args.cmd == "deriva":
+        res = deriva(h, args.campo, args.por, args.dias)
+    else:
+        res = estaciones_degradadas(h, args.dias, args.reciente)
+    print(json.dumps(res, indent=2, ensure_ascii=False))
+    print(f"[ANALITICA] {h.n} mediciones analizadas en {time.perf_counter() - t0:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
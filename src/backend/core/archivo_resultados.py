@@ -0,0 +1,489 @@
+# src/backend/core/archivo_resultados.py
+"""
+Archivo diario de resultados (append-only, comprimido).
+
+En lugar de un JSON con indent=2 por equipo, save_results / save_results2
+agregan un renglón compacto al archivo del día:
+
+    reports/resultados/resultados_YYYY-MM-DD.jsonl.gz   (o .jsonl.zst si hay zstandard)
+    reports/resultados/resultados_YYYY-MM-DD.idx         (índice: sn, modelo, ts, offset, largo)
+
+Cada registro es un miembro gzip (o frame zstd) independiente: el archivo
+completo se puede leer con gzip/zstd normal, y con el offset del .idx se
+lee un solo equipo con seek() sin descomprimir el resto.
+
+El fsync se hace por lotes (cada FSYNC_CADA registros o, con un timer, a los
+FSYNC_SEG segundos del primero pendiente aunque no llegue otro equipo); el
+flush es inmediato, así que si se cae la app no se pierde nada, solo un corte
+de luz podría llevarse el último lote. reindexar() reconstruye el .idx
+recorriendo los miembros si quedó desfasado.
+
+Cada append (miembro + renglón del .idx) se hace con un candado de archivo
+(resultados_YYYY-MM-DD.lock): `convertir` desde otro proceso puede escribir al
+mismo día que la app sin que se intercalen offsets ni renglones.
+
+Uso:
+    python -m src.backend.core.archivo_resultados buscar FHTT1234ABCD
+    python -m src.backend.core.archivo_resultados dia 2025-11-28 --modelo MOD002
+    python -m src.backend.core.archivo_resultados convertir reports test_mod002 --borrar
+    python -m src.backend.core.archivo_resultados reindexar reports/resultados/resultados_2025-11-28.jsonl.gz
+"""
+import argparse
+import atexit
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+ARCHIVO_DIR = Path("reports") / "resultados"
+PREFIJO = "resultados_"
+FSYNC_CADA = 20
+FSYNC_SEG = 5.0
+NIVEL_GZIP = 6
+NIVEL_ZSTD = 3
+
+
+def _get_zstd():
+    """zstandard es opcional; sin él se usa gzip (stdlib)."""
+    try:
+        import zstandard  # type: ignore
+        return zstandard
+    except Exception:
+        return None
+
+
+def _extension(compresion: str) -> str:
+    return ".jsonl.zst" if compresion == "zstd" else ".jsonl.gz"
+
+
+def compresion_default() -> str:
+    return "zstd" if _get_zstd() is not None else "gzip"
+
+
+def ruta_dia(dia: str, base_dir=ARCHIVO_DIR, compresion: str = None) -> Path:
+    return Path(base_dir) / f"{PREFIJO}{dia}{_extension(compresion or compresion_default())}"
+
+
+def ruta_indice(ruta_datos) -> Path:
+    ruta_datos = Path(ruta_datos)
+    return ruta_datos.with_name(ruta_datos.name.split(".jsonl")[0] + ".idx")
+
+
+def _comprimir(data: bytes, compresion: str) -> bytes:
+    if compresion == "zstd":
+        return _get_zstd().ZstdCompressor(level=NIVEL_ZSTD).compress(data)
+    # mtime=0: mismo contenido -> mismos bytes
+    return gzip.compress(data, compresslevel=NIVEL_GZIP, mtime=0)
+
+
+def _descomprimir_uno(blob: bytes, compresion: str) -> bytes:
+    if compresion == "zstd":
+        return _get_zstd().ZstdDecompressor().decompressobj().decompress(blob)
+    return zlib.decompressobj(wbits=31).decompress(blob)
+
+
+def ruta_candado(ruta_datos) -> Path:
+    return ruta_indice(ruta_datos).with_suffix(".lock")
+
+
+def _bloquear(f) -> None:
+    """Candado exclusivo entre procesos sobre el archivo .lock (espera a que se libere)."""
+    if os.name == "nt":
+        import msvcrt
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue  # LK_LOCK se rinde a los ~10 s; se sigue esperando
+    import fcntl
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _desbloquear(f) -> None:
+    if os.name == "nt":
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _compresion_de(ruta) -> str:
+    return "zstd" if str(ruta).endswith(".zst") else "gzip"
+
+
+def sn_y_modelo(test_results: dict):
+    from src.backend.core.indice_resultados import sn_de
+    meta = (test_results or {}).get("metadata", {}) or {}
+    return sn_de(test_results), meta.get("model")
+
+
+def _estacion_actual():
+    """id de la estación configurada (para analítica por estación); None si no hay bd."""
+    try:
+        from src.backend.sua_client.dao import extraer_ultimo
+        row = extraer_ultimo("stations")
+        return row["id"] if row else None
+    except Exception:
+        return None
+
+
+def dia_de(test_results: dict) -> str:
+    """YYYY-MM-DD del timestamp del reporte (o de hoy si no trae)."""
+    ts = ((test_results or {}).get("metadata", {}) or {}).get("timestamp") or ""
+    return ts[:10] if len(ts) >= 10 and ts[4] == "-" else datetime.now().strftime("%Y-%m-%d")
+
+
+class ArchivoResultados:
+    def __init__(self, base_dir=ARCHIVO_DIR, compresion: str = None,
+                 fsync_cada: int = FSYNC_CADA, fsync_seg: float = FSYNC_SEG):
+        self.base_dir = Path(base_dir)
+        self.compresion = compresion or compresion_default()
+        if self.compresion == "zstd" and _get_zstd() is None:
+            print("[ARCHIVO] zstandard no está instalado, se usa gzip")
+            self.compresion = "gzip"
+        self.fsync_cada = max(1, int(fsync_cada))
+        self.fsync_seg = float(fsync_seg)
+        self._lock = threading.Lock()
+        self._dia = None
+        self._f = None
+        self._idx = None
+        self._candado = None
+        self._pendientes = 0
+        self._ultimo_fsync = time.monotonic()
+        self._timer = None
+
+    # ---------- escritura ----------
+    def agregar(self, test_results: dict, origen: str = None, dia: str = None, estacion="actual") -> str:
+        """
+        Agrega el reporte al archivo del día y regresa la referencia "ruta#offset"
+        (la que se guarda en results_index). estacion="actual" -> la configurada en la bd.
+        """
+        dia = dia or dia_de(test_results)
+        sn, modelo = sn_y_modelo(test_results)
+        ts = ((test_results or {}).get("metadata", {}) or {}).get("timestamp") or ""
+        if estacion == "actual":
+            estacion = _estacion_actual()
+        linea = json.dumps(
+            {"sn": sn, "modelo": modelo, "ts": ts, "estacion": estacion, "origen": origen,
+             "test_results": test_results},
+            ensure_ascii=False, separators=(",", ":"), default=str,
+        ).encode("utf-8") + b"\n"
+        blob = _comprimir(linea, self.compresion)
+
+        with self._lock:
+            self._abrir(dia)
+            # Otro proceso (convertir) puede estar escribiendo el mismo día: el offset
+            # se toma y el .idx se escribe con el candado puesto
+            _bloquear(self._candado)
+            try:
+                offset = self._f.seek(0, os.SEEK_END)
+                self._f.write(blob)
+                self._f.flush()
+                self._idx.write(json.dumps([sn, modelo, ts, offset, len(blob)], ensure_ascii=False) + "\n")
+                self._idx.flush()
+            finally:
+                _desbloquear(self._candado)
+            self._pendientes += 1
+            if (self._pendientes >= self.fsync_cada
+                    or time.monotonic() - self._ultimo_fsync >= self.fsync_seg):
+                self._fsync()
+            elif self._timer is None:
+                # Si no llega otro registro, el lote se sincroniza solo a los fsync_seg
+                self._timer = threading.Timer(self.fsync_seg, self.sincronizar)
+                self._timer.daemon = True
+                self._timer.start()
+            return f"{self._f.name}#{offset}"
+
+    def sincronizar(self):
+        with self._lock:
+            self._fsync()
+
+    def cerrar(self):
+        with self._lock:
+            self._cerrar_actual()
+
+    # ---------- interno ----------
+    def _abrir(self, dia: str):
+        if self._dia == dia and self._f is not None:
+            return
+        self._cerrar_actual()
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        ruta = ruta_dia(dia, self.base_dir, self.compresion).resolve()
+        self._f = open(ruta, "ab")
+        self._idx = open(ruta_indice(ruta), "a", encoding="utf-8")
+        self._candado = open(ruta_candado(ruta), "a+b")
+        self._dia = dia
+
+    def _fsync(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._f is None or not self._pendientes:
+            return
+        # Primero los datos y luego el índice: el .idx nunca apunta a bytes que no existen
+        os.fsync(self._f.fileno())
+        os.fsync(self._idx.fileno())
+        self._pendientes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def _cerrar_actual(self):
+        if self._f is None:
+            return
+        try:
+            self._fsync()
+        finally:
+            self._f.close()
+            self._idx.close()
+            self._candado.close()
+            self._f = self._idx = self._candado = self._dia = None
+
+
+_ARCHIVO = None
+_ARCHIVO_LOCK = threading.Lock()
+
+
+def get_archivo() -> ArchivoResultados:
+    """Archivo único por proceso; se sincroniza y cierra al salir."""
+    global _ARCHIVO
+    with _ARCHIVO_LOCK:
+        if _ARCHIVO is None:
+            _ARCHIVO = ArchivoResultados()
+            atexit.register(_ARCHIVO.cerrar)
+        return _ARCHIVO
+
+
+# ---------- lectura ----------
+def leer_indice(ruta_datos):
+    """Entradas [sn, modelo, ts, offset, largo] del .idx (se ignora un renglón cortado al final)."""
+    p = ruta_indice(ruta_datos)
+    if not p.exists():
+        return []
+    out = []
+    with p.open("r", encoding="utf-8") as f:
+        for ln in f:
+            try:
+                out.append(json.loads(ln))
+            except ValueError:
+                continue
+    return out
+
+
+def leer(ref: str) -> dict:
+    """Lee un registro por referencia "ruta#offset" (la que regresa agregar)."""
+    ruta, _, off = ref.rpartition("#")
+    offset = int(off)
+    largo = next((e[4] for e in leer_indice(ruta) if e[3] == offset), None)
+    return _leer_en(ruta, offset, largo)
+
+
+def _leer_en(ruta, offset: int, largo: int = None) -> dict:
+    compresion = _compresion_de(ruta)
+    with open(ruta, "rb") as f:
+        f.seek(offset)
+        if largo is not None:
+            data = _descomprimir_uno(f.read(largo), compresion)
+        else:
+            # Sin índice: se descomprime solo hasta que termina el miembro
+            d = _get_zstd().ZstdDecompressor().decompressobj() if compresion == "zstd" else zlib.decompressobj(wbits=31)
+            partes = []
+            while True:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    break
+                partes.append(d.decompress(chunk))
+                if getattr(d, "eof", False):
+                    break
+            data = b"".join(partes)
+    return json.loads(data)
+
+
+def archivos(base_dir=ARCHIVO_DIR, desde: str = None, hasta: str = None):
+    """Archivos de datos del rango de días (ordenados por día)."""
+    base_dir = Path(base_dir)
+    if not base_dir.exists():
+        return []
+    out = []
+    for p in base_dir.iterdir():
+        if not p.name.startswith(PREFIJO) or ".jsonl" not in p.name:
+            continue
+        dia = p.name[len(PREFIJO):len(PREFIJO) + 10]
+        if (desde and dia < desde) or (hasta and dia > hasta):
+            continue
+        out.append(p)
+    return sorted(out)
+
+
+def buscar(sn: str, base_dir=ARCHIVO_DIR, desde: str = None, hasta: str = None):
+    """Registros de un SN (del más reciente al más viejo) usando solo los .idx + seek."""
+    encontrados = []
+    for ruta in reversed(archivos(base_dir, desde, hasta)):
+        for e in reversed(leer_indice(ruta)):
+            if e[0] == sn:
+                encontrados.append(_leer_en(ruta, e[3], e[4]))
+    return encontrados
+
+
+def iterar(base_dir=ARCHIVO_DIR, desde: str = None, hasta: str = None, modelo: str = None):
+    """Recorre en streaming todos los registros del rango (descomprime cada archivo de corrido)."""
+    for ruta in archivos(base_dir, desde, hasta):
+        if _compresion_de(ruta) == "zstd":
+            import io
+            f = io.TextIOWrapper(
+                _get_zstd().ZstdDecompressor().stream_reader(open(ruta, "rb"), read_across_frames=True),
+                encoding="utf-8",
+            )
+        else:
+            f = gzip.open(ruta, "rt", encoding="utf-8")
+        with f:
+            try:
+                for ln in f:
+                    try:
+                        reg = json.loads(ln)
+                    except ValueError:
+                        continue
+                    if modelo and reg.get("modelo") != modelo:
+                        continue
+                    yield reg
+            except (EOFError, zlib.error) as e:
+                # Último miembro cortado (corte de luz a media escritura)
+                print(f"[ARCHIVO] {ruta.name} termina incompleto: {e}")
+
+
+def reindexar(ruta_datos) -> int:
+    """Reconstruye el .idx recorriendo miembro por miembro. Regresa cuántos registros hay."""
+    ruta_datos = Path(ruta_datos)
+    compresion = _compresion_de(ruta_datos)
+    data = ruta_datos.read_bytes()
+    entradas, pos = [], 0
+    while pos < len(data):
+        d = _get_zstd().ZstdDecompressor().decompressobj() if compresion == "zstd" else zlib.decompressobj(wbits=31)
+        try:
+            linea = d.decompress(data[pos:])
+        except Exception:
+            break
+        if not getattr(d, "eof", True):
+            break  # miembro incompleto al final
+        largo = len(data) - pos - len(d.unused_data)
+        try:
+            reg = json.loads(linea)
+            entradas.append([reg.get("sn"), reg.get("modelo"), reg.get("ts"), pos, largo])
+        except ValueError:
+            pass
+        pos += largo
+    tmp = ruta_indice(ruta_datos).with_suffix(".idx.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for e in entradas:
+            f.write(json.dumps(e, ensure_ascii=False) + "\n")
+    os.replace(tmp, ruta_indice(ruta_datos))
+    print(f"[ARCHIVO] {ruta_datos.name}: {len(entradas)} registros reindexados")
+    return len(entradas)
+
+
+# ---------- conversión de JSON sueltos ----------
+def convertir(raices, base_dir=ARCHIVO_DIR, borrar: bool = False, compresion: str = None) -> dict:
+    """
+    Mete los JSON por equipo que ya existen al archivo diario (día = timestamp del
+    reporte) y actualiza results_index con la nueva referencia.
+    Con borrar=True se eliminan los originales una vez sincronizado el archivo.
+    Se puede correr con la app abierta: cada append toma el candado del día.
+    """
+    from src.backend.core.indice_resultados import registrar
+
+    pendientes = []
+    for raiz in raices:
+        raiz = Path(raiz)
+        if not raiz.exists():
+            continue
+        for dirpath, _dirs, files in os.walk(raiz):
+            for nombre in files:
+                if nombre.endswith(".json"):
+                    pendientes.append(Path(dirpath, nombre))
+
+    leidos = []
+    for p in pendientes:
+        try:
+            with p.open("r", encoding="utf-8") as f:
+                tr = json.load(f)
+        except Exception:
+            continue
+        if isinstance(tr, dict) and "tests" in tr:
+            leidos.append((dia_de(tr), p, tr))
+    # Agrupado por día para abrir cada archivo una sola vez
+    leidos.sort(key=lambda x: (x[0], str(x[1])))
+
+    arch = ArchivoResultados(base_dir, compresion=compresion, fsync_cada=500)
+    hechos = []
+    try:
+        for dia, p, tr in leidos:
+            # Los JSON viejos no traen estación; analitica la resuelve por SN desde operations
+            ref = arch.agregar(tr, origen=str(p.parent), dia=dia, estacion=None)
+            registrar(tr, ref)
+            hechos.append(p)
+    finally:
+        arch.cerrar()
+
+    borrados = 0
+    if borrar:
+        for p in hechos:
+            try:
+                p.unlink()
+                borrados += 1
+            except OSError as e:
+                print(f"[ARCHIVO] No se pudo borrar {p}: {e}")
+    print(f"[ARCHIVO] {len(hechos)} reportes convertidos, {borrados} JSON borrados")
+    return {"encontrados": len(pendientes), "convertidos": len(hechos), "borrados": borrados}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archivo diario de resultados (JSONL comprimido)")
+    parser.add_argument("--dir", default=str(ARCHIVO_DIR), help="Carpeta del archivo")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("buscar", help="Registros de un SN")
+    p.add_argument("sn")
+    p.add_argument("--desde")
+    p.add_argument("--hasta")
+
+    p = sub.add_parser("dia", help="Resumen de los registros de un día")
+    p.add_argument("dia")
+    p.add_argument("--modelo")
+
+    p = sub.add_parser("convertir", help="Pasar JSON sueltos al archivo")
+    p.add_argument("raices", nargs="+")
+    p.add_argument("--borrar", action="store_true", help="Borrar los JSON convertidos")
+
+    p = sub.add_parser("reindexar", help="Reconstruir el .idx de un archivo")
+    p.add_argument("archivo")
+
+    args = parser.parse_args(argv)
+    if args.cmd == "buscar":
+        regs = buscar(args.sn, args.dir, args.desde, args.hasta)
+        print(json.dumps(regs, indent=2, ensure_ascii=False))
+        return 0 if regs else 1
+    if args.cmd == "dia":
+        n = 0
+        for reg in iterar(args.dir, args.dia, args.dia, args.modelo):
+            n += 1
+            print(f"{reg.get('ts')}  {reg.get('modelo')}  {reg.get('sn')}  ({reg.get('origen')})")
+        print(f"[ARCHIVO] {n} registros")
+        return 0
+    if args.cmd == "convertir":
+        convertir(args.raices, args.dir, borrar=args.borrar)
+        return 0
+    if args.cmd == "reindexar":
+        reindexar(args.archivo)
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+# src/backend/core/auditoria.py
+"""
+Auditoría de flota: SN, firmware y niveles ópticos de muchas ONTs ya instaladas
+(o en rack) con IPs ruteadas distintas, sin UI y en paralelo.
+
+Solo lectura: nunca corre reset de fábrica, actualización de software ni pruebas
+de USB/WiFi, y lo que lee no entra al archivo diario ni a results_index
+(tester.guardar_resultados = False). Por host:
+  1. conexión TCP rápida al puerto 80 (si no contesta -> sin_respuesta)
+  2. detección por HTTP (_detect_device_type) -> tipo y modelo
+  3. extracción por HTTP donde el vendor la tiene:
+       FIBERHOME   -> _do_login_post + get_base_info (AJAX)
+       GRANDSTREAM -> _extract_grandstream_info
+     ZTE / Huawei (y Fiberhome sin sesión AJAX) solo tienen ruta con navegador:
+     con --navegador se corre run_all_tests en modo etiqueta + TX/RX, con un
+     pool de Chrome más chico que el de workers; sin él quedan como "parcial"
+     (tipo y modelo detectados).
+
+Cada host respeta un intervalo mínimo entre peticiones HTTP (adapter de la sesión
+del tester) para no saturar equipos en producción.
+
+Los resultados salen en streaming a un JSONL y a la tabla auditoria (init_db la crea).
+
+Uso:
+    python -m src.backend.core.auditoria 10.20.0.0/22 10.21.5.7 --workers 32 --salida flota.jsonl
+    python -m src.backend.core.auditoria --lista hosts.txt --navegador --navegadores 2
+    python -m src.backend.core.auditoria --resumen 20261019-153000
+"""
+import argparse
+import ipaddress
+import json
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+
+# Opciones de run_all_tests para la ruta con navegador: info + potencias, nada que escriba en el equipo
+OPCIONES_AUDITORIA = {
+    "info": {
+        "sn": True, "mac": True, "ssid_24ghz": False, "ssid_5ghz": False,
+        "software_version": True, "wifi_password": False, "model": True,
+    },
+    "tests": {
+        "ping": False, "factory_reset": False, "software_update": False, "usb_port": False,
+        "tx_power": True, "rx_power": True, "wifi_24ghz_signal": False, "wifi_5ghz_signal": False,
+    },
+}
+
+# Filas a juntar antes de escribir a SQLite
+LOTE_BD = 50
+# Cada cuánto imprimir el avance
+AVANCE_S = 2.0
+
+
+# ---------- objetivos ----------
+def expandir_objetivos(entradas) -> list:
+    """IPs, CIDRs (10.0.0.0/24 -> hosts) o nombres; sin duplicados y en orden."""
+    vistos, out = set(), []
+    for entrada in entradas:
+        entrada = entrada.split("#", 1)[0].strip()
+        if not entrada:
+            continue
+        if "/" in entrada:
+            red = ipaddress.ip_network(entrada, strict=False)
+            hosts = [str(h) for h in red.hosts()] if red.num_addresses > 1 else [str(red.network_address)]
+        else:
+            hosts = [entrada]
+        for h in hosts:
+            if h not in vistos:
+                vistos.add(h)
+                out.append(h)
+    return out
+
+
+def leer_lista(ruta) -> list:
+    return Path(ruta).read_text(encoding="utf-8").splitlines()
+
+
+# ---------- límite por host ----------
+class _AdapterLimitado(HTTPAdapter):
+    """Intervalo mínimo entre peticiones de la misma sesión (= mismo host)."""
+
+    def __init__(self, intervalo_s: float, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.intervalo_s = intervalo_s
+        self._ultimo = 0.0
+        self._lock = threading.Lock()
+
+    def send(self, request, *args, **kwargs):
+        if self.intervalo_s > 0:
+            with self._lock:
+                espera = self._ultimo + self.intervalo_s - time.monotonic()
+                if espera > 0:
+                    time.sleep(espera)
+                self._ultimo = time.monotonic()
+        return super().send(request, *args, **kwargs)
+
+
+def _limitar(tester, intervalo_s: float) -> None:
+    adapter = _AdapterLimitado(intervalo_s)
+    tester.session.mount("http://", adapter)
+    tester.session.mount("https://", adapter)
+
+
+# ---------- extracción por host ----------
+def _responde(host: str, timeout: float) -> bool:
+    h, _, puerto = host.partition(":")
+    try:
+        with socket.create_connection((h, int(puerto or 80)), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def _float(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _por_http(tester, tipo: str, fila: dict) -> bool:
+    """Llena la fila con la ruta HTTP del vendor. False si el vendor no tiene o no dio sesión."""
+    if tipo == "FIBERHOME":
+        tester.opcionesTest = {"info": {}, "tests": {}}   # get_base_info completo, sin reducir
+        # Algunos firmwares contestan get_base_info solo con Basic Auth; el login POST va después
+        base = tester._extract_base_info()
+        if not base and tester._do_login_post():
+            base = tester._extract_base_info()
+        if not base:
+            return False
+        fila["sn"] = base.get("serial_number_physical") or base.get("serial_number_logical")
+        fila["mac"] = base.get("mac_address")
+        fila["firmware"] = base.get("software_version")
+        fila["tx_dbm"] = _float(base.get("tx_power_dbm"))
+        fila["rx_dbm"] = _float(base.get("rx_power_dbm"))
+        return True
+    if tipo == "GRANDSTREAM":
+        info = tester._extract_grandstream_info() or {}
+        if not (info.get("serial_number") or info.get("mac_address")):
+            return False
+        fila["sn"] = info.get("serial_number")
+        fila["mac"] = info.get("mac_address")
+        fila["firmware"] = info.get("firmware_version")
+        return True
+    return False
+
+
+def _por_navegador(tester, fila: dict) -> bool:
+    from src.backend.core.resultados import copiar_opciones
+
+    tester.opcionesTest = copiar_opciones(OPCIONES_AUDITORIA)
+    pruebas = tester.run_all_tests()
+    if isinstance(pruebas, dict) and pruebas.get("error"):
+        fila["error"] = pruebas["error"]
+        return False
+    res = tester._resultados_finales() or {}
+    info, tests = res.get("info") or {}, res.get("tests") or {}
+    fila["sn"] = info.get("sn") if info.get("sn") != "N/A" else None
+    fila["mac"] = info.get("mac") if info.get("mac") != "N/A" else None
+    fila["firmware"] = info.get("sftVer") if info.get("sftVer") != "N/A" else None
+    fila["tx_dbm"] = _float(tests.get("tx"))
+    fila["rx_dbm"] = _float(tests.get("rx"))
+    return bool(fila["sn"])
+
+
+def auditar_host(host: str, intervalo_s: float = 0.2, timeout_s: float = 1.5, navegadores=None) -> dict:
+    """
+    Audita un host. navegadores: Semaphore que limita los Chrome simultáneos;
+    None = solo HTTP.
+    """
+    from src.backend.ont_automatico import ONTAutomatedTester
+
+    fila = {"host": host, "ts": datetime.now().isoformat(timespec="seconds"), "estado": "error",
+            "tipo": None, "modelo": None, "sn": None, "mac": None, "firmware": None,
+            "tx_dbm": None, "rx_dbm": None, "metodo": None, "seg": 0.0, "error": None}
+    t0 = time.perf_counter()
+    try:
+        if not _responde(host, timeout_s):
+            fila["estado"] = "sin_respuesta"
+            return fila
+
+        tester = ONTAutomatedTester(host, None)
+        # Se recorre la flota: no dejar un Chrome vivo por cada equipo
+        tester.guardar_sesion = False
+        # Ni al archivo diario ni a results_index: alimentarían retest, analítica y umbrales
+        tester.guardar_resultados = False
+        _limitar(tester, intervalo_s)
+        tipo = tester._detect_device_type()
+        fila["tipo"], fila["modelo"], fila["metodo"] = tipo, tester.model, "deteccion"
+        if tipo == "ONT" and not tester.model:
+            fila["estado"] = "no_identificado"
+            return fila
+
+        if _por_http(tester, tipo, fila):
+            fila["estado"], fila["metodo"] = "ok", "http"
+        elif navegadores is not None:
+            with navegadores:
+                ok = _por_navegador(tester, fila)
+            fila["estado"], fila["metodo"] = ("ok" if ok else "parcial"), "navegador"
+        else:
+            fila["estado"] = "parcial"
+    except Exception as e:
+        fila["estado"], fila["error"] = "error", f"{type(e).__name__}: {e}"
+    finally:
+        fila["seg"] = round(time.perf_counter() - t0, 2)
+    return fila
+
+
+# ---------- salida ----------
+class Sumidero:
+    """JSONL (una línea por host, con flush) + tabla auditoria en lotes."""
+
+    def __init__(self, corrida: str, salida=None, bd: bool = True):
+        self.corrida = corrida
+        self.bd = bd
+        self._lock = threading.Lock()
+        self._pendientes = []
+        self._f = None
+        if salida:
+            Path(salida).parent.mkdir(parents=True, exist_ok=True)
+            self._f = open(salida, "a", encoding="utf-8")
+
+    def escribir(self, fila: dict) -> None:
+        from src.backend.sua_client.dao import AUDITORIA_COLUMNS
+
+        with self._lock:
+            if self._f:
+                self._f.write(json.dumps({"corrida": self.corrida, **fila}, ensure_ascii=False) + "\n")
+                self._f.flush()
+            if self.bd:
+                self._pendientes.append(tuple({"corrida": self.corrida, **fila}[c] for c in AUDITORIA_COLUMNS))
+                if len(self._pendientes) >= LOTE_BD:
+                    self._vaciar()
+
+    def _vaciar(self) -> None:
+        from src.backend.sua_client.dao import insertar_auditoria
+
+        if not self._pendientes:
+            return
+        try:
+            insertar_auditoria(self._pendientes)
+        except Exception as e:
+            print(f"[AUDITORIA] No se pudo escribir a la BD ({len(self._pendientes)} filas): {e}")
+        self._pendientes = []
+
+    def cerrar(self) -> None:
+        with self._lock:
+            if self.bd:
+                self._vaciar()
+            if self._f:
+                self._f.close()
+                self._f = None
+
+
+class _Avance:
+    def __init__(self, total: int):
+        self.total = total
+        self.hechos = 0
+        self.por_estado = {}
+        self.t0 = time.monotonic()
+        self._ultimo = 0.0
+
+    def sumar(self, fila: dict) -> None:
+        self.hechos += 1
+        self.por_estado[fila["estado"]] = self.por_estado.get(fila["estado"], 0) + 1
+        ahora = time.monotonic()
+        if ahora - self._ultimo >= AVANCE_S or self.hechos == self.total:
+            self._ultimo = ahora
+            print(f"[AUDITORIA] {self.linea()}")
+
+    def linea(self) -> str:
+        seg = max(time.monotonic() - self.t0, 1e-6)
+        ritmo = self.hechos / seg
+        faltan = (self.total - self.hechos) / ritmo if ritmo > 0 else 0
+        estados = ", ".join(f"{k} {v}" for k, v in sorted(self.por_estado.items()))
+        return f"{self.hechos}/{self.total} ({estados}) {ritmo:.1f} hosts/s, faltan ~{int(faltan)} s"
+
+
+# ---------- corrida ----------
+def auditar(hosts, workers: int = 16, navegadores: int = 0, intervalo_s: float = 0.2,
+            timeout_s: float = 1.5, salida=None, bd: bool = True, corrida: str = None) -> dict:
+    corrida = corrida or datetime.now().strftime("%Y%m%d-%H%M%S")
+    sumidero = Sumidero(corrida, salida, bd)
+    sem = threading.BoundedSemaphore(navegadores) if navegadores > 0 else None
+    avance = _Avance(len(hosts))
+    resumen = {"corrida": corrida, "hosts": len(hosts), "estados": {}, "modelos": {}, "firmwares": {}}
+
+    print(f"[AUDITORIA] Corrida {corrida}: {len(hosts)} hosts, {workers} workers, "
+          f"{navegadores or 'sin'} navegadores, {intervalo_s:.2f} s entre peticiones por host")
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="auditoria") as ex:
+            futuros = [ex.submit(auditar_host, h, intervalo_s, timeout_s, sem) for h in hosts]
+            for fut in as_completed(futuros):
+                fila = fut.result()
+                sumidero.escribir(fila)
+                avance.sumar(fila)
+                if fila["modelo"]:
+                    resumen["modelos"][fila["modelo"]] = resumen["modelos"].get(fila["modelo"], 0) + 1
+                if fila["firmware"]:
+                    clave = f"{fila['modelo'] or '?'} {fila['firmware']}"
+                    resumen["firmwares"][clave] = resumen["firmwares"].get(clave, 0) + 1
+    finally:
+        sumidero.cerrar()
+    resumen["estados"] = dict(avance.por_estado)
+    resumen["seg"] = round(time.monotonic() - avance.t0, 1)
+    return resumen
+
+
+def _imprimir(resumen: dict) -> None:
+    print("\n" + "=" * 60)
+    print(f"[AUDITORIA] Corrida {resumen['corrida']}: {resumen['hosts']} hosts en {resumen['seg']} s")
+    for estado, n in sorted(resumen["estados"].items(), key=lambda kv: -kv[1]):
+        print(f"  {estado:<16} {n}")
+    if resumen["firmwares"]:
+        print("  Firmware por modelo:")
+        for clave, n in sorted(resumen["firmwares"].items(), key=lambda kv: -kv[1]):
+            print(f"      {clave:<40} {n}")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Auditoría de flota de ONTs (solo lectura)")
+    parser.add_argument("objetivos", nargs="*", help="IPs, CIDRs o nombres")
+    parser.add_argument("--lista", help="Archivo con un host/CIDR por línea (# comentarios)")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--navegador", action="store_true",
+                        help="Usar Chrome para ZTE/Huawei y Fiberhome sin sesión AJAX")
+    parser.add_argument("--navegadores", type=int, default=2, help="Chrome simultáneos con --navegador")
+    parser.add_argument("--intervalo", type=float, default=0.2, help="Segundos mínimos entre peticiones al mismo host")
+    parser.add_argument("--timeout", type=float, default=1.5, help="Timeout de la conexión inicial")
+    parser.add_argument("--salida", help="JSONL de resultados (se agrega al final)")
+    parser.add_argument("--sin-bd", action="store_true", help="No escribir en la tabla auditoria")
+    parser.add_argument("--resumen", metavar="CORRIDA", help="Solo mostrar el resumen de una corrida guardada")
+    args = parser.parse_args(argv)
+
+    if args.resumen:
+        from src.backend.sua_client.dao import resumen_auditoria
+        filas = resumen_auditoria(args.resumen)
+        for estado, tipo, modelo, firmware, n in filas:
+            print(f"{estado:<16} {tipo or '-':<12} {modelo or '-':<8} {firmware or '-':<30} {n}")
+        return 0 if filas else 1
+
+    entradas = list(args.objetivos)
+    if args.lista:
+        entradas += leer_lista(args.lista)
+    hosts = expandir_objetivos(entradas)
+    if not hosts:
+        parser.error("Sin objetivos: pasa IPs/CIDRs o --lista")
+
+    resumen = auditar(hosts, args.workers, args.navegadores if args.navegador else 0, args.intervalo,
+                      args.timeout, args.salida, not args.sin_bd)
+    _imprimir(resumen)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# src/backend/core/checkpoint.py
+"""
+Checkpoint por SN para reanudar corridas interrumpidas.
+
+Un reset de fábrica o una actualización de firmware reinician la ONT, y una
+desconexión inesperada (DisconnectMonitor) corta la corrida; al reconectar se
+empezaba otra vez desde el login sin recordar nada. Ahora cada paso terminado
+(extracción o prueba) se guarda en la tabla checkpoints con su resultado y la
+metadata del equipo. Cuando el mismo SN vuelve a aparecer (mismo modelo y mismas
+opciones, dentro de VIGENCIA_S) los pasos hechos se restauran en test_results y
+se saltan; la corrida sigue desde el primer paso pendiente.
+
+Solo aplica a las corridas que lo piden (tester.usar_checkpoint = True, hoy
+solo el auto-test de main_loop, que es el único que llama a cerrar). main,
+retest, etiqueta, prueba unitaria, auditoría y benchmark corren todo siempre;
+si no, una segunda corrida del mismo SN saltaría pasos con resultados viejos.
+
+Uso desde los mixins:
+    checkpoint.reanudar(tester, sn)         # en cuanto se conoce el SN
+    if not checkpoint.saltar(tester, paso):
+        ... correr el paso ...
+        checkpoint.marcar(tester, paso, clave)
+    checkpoint.cerrar(tester)               # la corrida terminó completa
+
+Nunca rompe la corrida: cualquier error de BD solo se imprime.
+"""
+import json
+import time
+
+from src.backend.core.indice_resultados import sn_de
+
+# Un checkpoint más viejo que esto ya no se reanuda (el equipo se volvió a probar desde cero)
+VIGENCIA_S = 2 * 3600
+# Metadata que es de esta corrida y no se restaura
+_META_PROPIA = ("host", "timestamp")
+
+
+def activo(tester) -> bool:
+    return bool(getattr(tester, "usar_checkpoint", False))
+
+
+def _detenido(tester) -> bool:
+    ev = getattr(tester, "stop_event", None)
+    return ev is not None and ev.is_set()
+
+
+def _estado(tester) -> dict:
+    st = getattr(tester, "_checkpoint", None)
+    if st is None:
+        st = {"sn": None, "cargado": False, "pasos": {}, "tests": {}, "previos": set()}
+        tester._checkpoint = st
+    return st
+
+
+def _opciones(tester) -> str:
+    return json.dumps(getattr(tester, "opcionesTest", None), sort_keys=True, default=str)
+
+
+def _emit(tester, kind, payload):
+    q = getattr(tester, "out_q", None)
+    if q:
+        q.put((kind, payload))
+
+
+def _guardar(tester) -> None:
+    st = _estado(tester)
+    sn = st["sn"] or sn_de(tester.test_results)
+    if not sn or not st["pasos"]:
+        return
+    st["sn"] = sn
+    try:
+        from src.backend.sua_client.dao import guardar_checkpoint
+        guardar_checkpoint(
+            sn, tester.model, _opciones(tester), time.time(),
+            json.dumps(st["pasos"]),
+            json.dumps(st["tests"], default=str),
+            json.dumps(tester.test_results.get("metadata", {}), default=str),
+        )
+    except Exception as e:
+        print(f"[CHECKPOINT] No se pudo guardar {sn}: {e}")
+
+
+def reanudar(tester, sn=None) -> list:
+    """
+    Carga el checkpoint del SN (una vez por tester) y restaura lo ya hecho.
+    Regresa la lista de pasos restaurados.
+    """
+    if not activo(tester):
+        return []
+    st = _estado(tester)
+    if st["cargado"]:
+        return []
+    sn = sn or sn_de(tester.test_results)
+    if not sn:
+        return []
+    st["sn"] = sn
+    st["cargado"] = True
+
+    try:
+        from src.backend.sua_client.dao import leer_checkpoint, borrar_checkpoint
+        row = leer_checkpoint(sn)
+        if row is None:
+            return []
+        if (row["modelo"] != tester.model or row["opciones"] != _opciones(tester)
+                or time.time() - float(row["actualizado"]) > VIGENCIA_S):
+            print(f"[CHECKPOINT] Checkpoint de {sn} no aplica (modelo/opciones/vigencia); se descarta")
+            borrar_checkpoint(sn)
+            return []
+        pasos = json.loads(row["pasos"] or "{}")
+        tests = json.loads(row["tests"] or "{}")
+        meta = json.loads(row["metadata"] or "{}")
+    except Exception as e:
+        print(f"[CHECKPOINT] No se pudo leer {sn}: {e}")
+        return []
+
+    # Lo hecho en esta corrida antes de conocer el SN tiene prioridad
+    restaurados = [p for p in pasos if p not in st["pasos"]]
+    for paso in restaurados:
+        st["pasos"][paso] = pasos[paso]
+        clave = pasos[paso].get("clave") or paso
+        if clave in tests:
+            st["tests"][clave] = tests[clave]
+            tester.test_results.setdefault("tests", {}).setdefault(clave, tests[clave])
+        tester._mark_executed_test(paso)
+    st["previos"].update(restaurados)
+
+    actual = tester.test_results.setdefault("metadata", {})
+    for k, v in meta.items():
+        if k not in _META_PROPIA and actual.get(k) in (None, "", {}, []):
+            actual[k] = v
+
+    if restaurados:
+        print(f"[CHECKPOINT] Reanudando {sn}: ya hechos {', '.join(restaurados)}")
+        _emit(tester, "log", f"Reanudando {sn} ({len(restaurados)} pasos ya hechos)")
+    return restaurados
+
+
+def saltar(tester, paso: str) -> bool:
+    """True si el paso ya se hizo en una corrida anterior de este SN (ya restaurado)."""
+    if not activo(tester):
+        return False
+    st = _estado(tester)
+    if paso not in st["previos"]:
+        return False
+    info = st["pasos"].get(paso) or {}
+    print(f"[CHECKPOINT] Saltando {paso} (hecho antes del corte)")
+    _emit(tester, "pruebas", f"Ya hecho: {paso}")
+    if info.get("status") is not None:
+        _emit(tester, "test_individual", {"name": info.get("clave") or paso, "status": info["status"]})
+    return True
+
+
+def marcar(tester, paso: str, clave: str = None, status=None) -> None:
+    """
+    Registra el paso como terminado (con el resultado guardado en tests[clave]) y persiste.
+    Si la corrida se canceló (stop_event) el paso pudo quedar a medias y no se marca.
+    """
+    if not activo(tester):
+        return
+    if _detenido(tester):
+        print(f"[CHECKPOINT] {paso} no se marca: corrida cancelada")
+        return
+    st = _estado(tester)
+    clave = clave or paso
+    st["pasos"][paso] = {"clave": clave, "status": status}
+    resultado = tester.test_results.get("tests", {}).get(clave)
+    if resultado is not None:
+        st["tests"][clave] = resultado
+    tester._mark_executed_test(paso)
+    if not st["cargado"]:
+        reanudar(tester)
+    _guardar(tester)
+
+
+def cerrar(tester) -> None:
+    """La corrida terminó: el checkpoint ya no sirve."""
+    if not activo(tester):
+        return
+    st = _estado(tester)
+    sn = st["sn"] or sn_de(tester.test_results)
+    if not sn:
+        return
+    try:
+        from src.backend.sua_client.dao import borrar_checkpoint, purgar_checkpoints
+        borrar_checkpoint(sn)
+        purgar_checkpoints(time.time() - VIGENCIA_S)
+    except Exception as e:
+        print(f"[CHECKPOINT] No se pudo cerrar {sn}: {e}")
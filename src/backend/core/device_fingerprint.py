@@ -0,0 +1,290 @@
+# src/backend/core/device_fingerprint.py
+"""
+Identificación de vendor y modelo de la ONT a partir de su página de login.
+
+La detección estaba copiada en _detect_device_type, consultaSN.detectar_modelo_por_http
+y _detect_model: cada una hacía su lower(), su copia sin espacios, varios
+any(k in html ...) por vendor, los regex de <title>/ProductName y (en
+_detect_model) ordenaba model_mapping por largo en cada llamada.
+
+Aquí las firmas son una tabla declarativa que se compila una sola vez:
+  - todas las palabras clave de todos los vendors en un solo regex (un recorrido
+    del HTML y otro de la cabecera Server; las de Huawei toleran espacios y
+    saltos de línea entre letras, como la copia "normalizada" de antes)
+  - los extractores de producto (<title>, var ProductName) precompilados
+  - las reglas producto -> código de modelo en orden de prioridad
+
+identificar() regresa Identidad(vendor, modelo, nombre, confianza, ...) en una
+pasada. Con la misma cabecera Server + ETag (+ OUI de la MAC si se conoce) la
+página es la misma y se regresa lo ya calculado sin volver a recorrerla; si el
+equipo no manda ETag la llave usa un hash del HTML (un solo recorrido barato en
+lugar de los regex).
+
+La prioridad entre vendors es la de siempre: Grandstream, Fiberhome, Huawei, ZTE.
+"""
+import hashlib
+import html as html_mod
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# Nombre comercial por código (el que se muestra en UI y certificado)
+NOMBRES_DISPLAY = {
+    "MOD003": "HG8145X6-10",  # Nombre comercial usado en la empresa (coloquialmente "X6")
+    "MOD001": "HG6145F",
+    "MOD008": "HG6145F1",
+    "MOD002": "F670L",
+    "MOD009": "F6600",
+    "MOD004": "HG8145V5",
+    "MOD005": "HG8145V5 SMALL",
+    "MOD006": "HT818",
+    "MOD007": "HG8145X6",
+}
+
+# Mapeo de ModelName (el que reporta el equipo por AJAX) a códigos de modelo.
+# Si no hay coincidencia exacta gana la clave más larga contenida en el nombre.
+NOMBRES_MODELO = {
+    # MOD005: HUAWEI EchoLife HG8145V5 SMALL
+    "HUAWEI ECHOLIFE HG8145V5 SMALL": "MOD005",
+    "ECHOLIFE HG8145V5 SMALL": "MOD005",
+    "HG8145V5 SMALL": "MOD005",
+
+    # MOD004: HUAWEI EchoLife HG8145V5 (menos específico que SMALL)
+    "HUAWEI ECHOLIFE HG8145V5": "MOD004",
+    "ECHOLIFE HG8145V5": "MOD004",
+    "HUAWEI HG8145V5": "MOD004",
+    "HG8145V5": "MOD004",
+
+    # MOD003: HUAWEI HG8145X6-10
+    # NOTA: El Huawei HG8145X6-10 reporta "HG6145F1" por firmware (bug del dispositivo)
+    # La etiqueta física dice "Huawei OptiXstar HG8145X6-10"
+    # En la empresa se conoce coloquialmente como "X6"
+    "HUAWEI HG8145X6-10": "MOD003",
+    "HG8145X6-10": "MOD003",
+    "HUAWEI HG8145X6": "MOD007",  # Nuevo modelo, MOD007
+    "HG8145X6": "MOD007",
+
+    # MOD002: ZTE ZXHN F670L
+    "ZTE ZXHN F670L": "MOD002",
+    "ZXHN F670L": "MOD002",
+    "ZTE F670L": "MOD002",
+    "F670L": "MOD002",
+
+    # MOD009: ZTE F6600
+    "ZTE ZXHN F6600": "MOD009",
+    "ZXHN F6600": "MOD009",
+    "ZTE F6600": "MOD009",
+    "F6600": "MOD009",
+
+    # MOD001: FIBERHOME HG6145F
+    "FIBERHOME HG6145F": "MOD001",
+    "HG6145F": "MOD001",
+    "HG6145F1": "MOD008",
+
+    # MOD006: GRANDSTREAM HT818
+    "GRANDSTREAM HT818": "MOD006",
+    "GS-HT818": "MOD006",
+    "HT818": "MOD006",
+}
+
+
+@dataclass(frozen=True)
+class Firma:
+    vendor: str
+    marcas: Tuple[str, ...]                 # marca/modelo en el HTML: confianza alta
+    campos: Tuple[str, ...] = ()            # ids del formulario de login: confianza media
+    cabecera: Tuple[str, ...] = ()          # en la cabecera Server
+    compacta: bool = False                  # tolera espacios/saltos entre letras
+    por_clave: Dict[str, str] = field(default_factory=dict)   # palabra clave -> código
+    extractores: Tuple[str, ...] = ()       # de dónde sale el nombre de producto
+    marcador: str = ""                      # si el producto no lo trae se prueba el siguiente extractor
+    reglas: Tuple[Tuple[Tuple[str, ...], str], ...] = ()      # (subcadenas del producto, código)
+    defecto: str = ""
+
+
+# Orden = prioridad
+FIRMAS = (
+    Firma("GRANDSTREAM", marcas=("grandstream", "ht818"), cabecera=("grandstream",),
+          defecto="MOD006"),
+    Firma("FIBERHOME", marcas=("fiberhome", "hg6145f", "hg6145f1"),
+          campos=("user_name", "loginpp", "fh-text-security"),
+          por_clave={"hg6145f1": "MOD008"}, defecto="MOD001"),
+    Firma("HUAWEI", marcas=("huawei", "hg8145"), campos=("txt_username", "txt_password"),
+          compacta=True, extractores=("title", "product_name"), marcador="HG8145",
+          reglas=((("HG8145X6-10",), "MOD003"),     # X6-10 (el del bug del guion)
+                  (("HG8145X6",), "MOD007"),
+                  (("HG8145V5", "SMALL"), "MOD005"),
+                  (("HG8145V5",), "MOD004")),
+          defecto="MOD004"),                          # Huawei desconocido: V5 como base segura
+    Firma("ZTE", marcas=("zte", "zxhn", "f670l", "f6600"), campos=("frm_username", "frm_password"),
+          extractores=("title",),
+          reglas=((("F6600",), "MOD009"),
+                  (("F670L",), "MOD002")),
+          defecto="MOD002"),
+)
+
+_RE_TITLE = re.compile(r"<title>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_RE_PRODUCT_NAME = re.compile(r"var\s+ProductName\s*=\s*['\"]([^'\"]+)['\"]", re.IGNORECASE)
+
+
+def _titulo(raw: str) -> str:
+    m = _RE_TITLE.search(raw)
+    return html_mod.unescape(m.group(1)).upper().strip() if m else ""
+
+
+def _product_name(raw: str) -> str:
+    m = _RE_PRODUCT_NAME.search(raw)
+    # El X6-10 trae el guion codificado (HG8145X6\x2d10 -> HG8145X6-10)
+    return m.group(1).upper().replace("\\X2D", "-").strip() if m else ""
+
+
+_EXTRACTORES = {"title": _titulo, "product_name": _product_name}
+
+
+class Identidad(NamedTuple):
+    vendor: str          # FIBERHOME | HUAWEI | ZTE | GRANDSTREAM | ONT
+    modelo: str          # MOD00X o "" si no se reconoció
+    nombre: str          # nombre comercial (o el producto leído si no hay código)
+    confianza: float     # 0.0 (nada) .. 1.0
+    producto: str = ""   # texto leído de la página (title/ProductName)
+    exacto: bool = False # el código salió de una regla y no del default del vendor
+
+
+DESCONOCIDO = Identidad("ONT", "", "", 0.0)
+
+
+# ---------- compilación ----------
+def _patron(palabra: str, compacta: bool) -> str:
+    if not compacta:
+        return re.escape(palabra)
+    return r"[ \n\t]*".join(re.escape(c) for c in palabra)
+
+
+def _compilar(palabras):
+    """Un solo regex con todas las palabras; el lookahead encuentra también las traslapadas."""
+    unicas = {}
+    for palabra, compacta in palabras:
+        unicas[palabra] = unicas.get(palabra, False) or compacta
+    # Las más largas primero: en la misma posición gana hg6145f1 sobre hg6145f
+    orden = sorted(unicas, key=len, reverse=True)
+    grupos = "|".join(f"(?P<k{i}>{_patron(p, unicas[p])})" for i, p in enumerate(orden))
+    return re.compile(f"(?=(?:{grupos}))"), {f"k{i}": p for i, p in enumerate(orden)}
+
+
+_CUERPO, _NOMBRES_CUERPO = _compilar(
+    (p, f.compacta) for f in FIRMAS for p in f.marcas + f.campos)
+_CABECERA, _NOMBRES_CABECERA = _compilar((p, False) for f in FIRMAS for p in f.cabecera)
+
+
+def _encontradas(regex, nombres, texto: str) -> set:
+    return {nombres[m.lastgroup] for m in regex.finditer(texto)} if texto else set()
+
+
+# ---------- cache ----------
+_MAX_CACHE = 256
+_lock = threading.Lock()
+_cache = OrderedDict()   # (server, etag o hash del HTML, oui) -> Identidad
+
+
+def _cabecera(headers, nombre: str) -> str:
+    if not headers:
+        return ""
+    valor = headers.get(nombre)
+    if valor is None:
+        valor = next((v for k, v in headers.items() if k.lower() == nombre.lower()), "")
+    return str(valor or "")
+
+
+def oui(mac: Optional[str]) -> str:
+    if not mac:
+        return ""
+    hexa = re.sub(r"[^0-9A-Fa-f]", "", mac).upper()
+    return hexa[:6] if len(hexa) >= 6 else ""
+
+
+def _llave(headers, mac, raw_html: str):
+    # Sin ETag la cabecera Server sola no distingue modelos del mismo vendor: se usa el cuerpo
+    etag = _cabecera(headers, "ETag")
+    if not etag:
+        if not raw_html:
+            return None
+        etag = "sha1:" + hashlib.sha1(raw_html.encode("utf-8", "ignore")).hexdigest()
+    return (_cabecera(headers, "Server").lower(), etag, oui(mac))
+
+
+def limpiar_cache() -> None:
+    with _lock:
+        _cache.clear()
+
+
+# ---------- identificación ----------
+def _resolver(firma: Firma, raw: str, claves: set) -> Identidad:
+    producto = ""
+    for nombre in firma.extractores:
+        if producto and (not firma.marcador or firma.marcador in producto):
+            break
+        producto = _EXTRACTORES[nombre](raw) or producto
+
+    modelo = next((c for k, c in firma.por_clave.items() if k in claves), "")
+    if not modelo and producto:
+        modelo = next((c for subs, c in firma.reglas if all(s in producto for s in subs)), "")
+    exacto = bool(modelo)
+    modelo = modelo or firma.defecto
+
+    confianza = 0.8 if claves & set(firma.marcas + firma.cabecera) else 0.5
+    if exacto:
+        confianza += 0.15
+    nombre = NOMBRES_DISPLAY.get(modelo, producto or modelo)
+    return Identidad(firma.vendor, modelo, nombre, round(confianza, 2), producto, exacto)
+
+
+def identificar(raw_html: str, headers=None, mac: str = None) -> Identidad:
+    """
+    Vendor y modelo de la página de login (HTML crudo + cabeceras de la
+    respuesta). mac es opcional; si se conoce, su OUI entra en la llave del cache.
+    """
+    llave = _llave(headers, mac, raw_html)
+    if llave is not None:
+        with _lock:
+            previa = _cache.get(llave)
+            if previa is not None:
+                _cache.move_to_end(llave)
+                return previa
+
+    raw = raw_html or ""
+    claves = _encontradas(_CUERPO, _NOMBRES_CUERPO, raw.lower())
+    claves |= _encontradas(_CABECERA, _NOMBRES_CABECERA, _cabecera(headers, "Server").lower())
+
+    identidad = DESCONOCIDO
+    for firma in FIRMAS:
+        if claves & set(firma.marcas + firma.campos + firma.cabecera):
+            identidad = _resolver(firma, raw, claves)
+            break
+
+    if llave is not None and identidad.vendor != "ONT":
+        with _lock:
+            _cache[llave] = identidad
+            while len(_cache) > _MAX_CACHE:
+                _cache.popitem(last=False)
+    return identidad
+
+
+# ---------- ModelName -> código ----------
+_NOMBRES_EXACTOS = {k.upper(): v for k, v in NOMBRES_MODELO.items()}
+_NOMBRES_POR_LARGO = tuple(sorted(_NOMBRES_EXACTOS.items(), key=lambda kv: len(kv[0]), reverse=True))
+
+
+@lru_cache(maxsize=128)
+def modelo_por_nombre(model_name: str) -> Optional[str]:
+    """Código del ModelName reportado (exacto o la clave más larga contenida) o None."""
+    nombre = (model_name or "").strip().upper()
+    if nombre in _NOMBRES_EXACTOS:
+        return _NOMBRES_EXACTOS[nombre]
+    return next((c for k, c in _NOMBRES_POR_LARGO if k in nombre), None)
+
+
+def nombre_display(model_code: str, reported_name: str = None) -> str:
+    return NOMBRES_DISPLAY.get(model_code, reported_name or model_code)
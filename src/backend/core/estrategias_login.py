@@ -0,0 +1,128 @@
+# src/backend/core/estrategias_login.py
+"""
+Selector aprendido de estrategias de login por modelo y página de login.
+
+El login prueba varias cosas en orden fijo: _do_login_post tiene tres
+estrategias, _login_ont_standard reintenta Selenium, y cada login Selenium
+recorre una lista de selectores de usuario con wait.until (cada selector que no
+existe cuesta el timeout completo; en Huawei el bueno es el sexto). Cada equipo
+pagaba todos los intentos fallidos antes del que sí funciona.
+
+Aquí se registra qué estrategia funcionó y cuánto tardó por (grupo, modelo,
+huella de la página de login) en la tabla login_estrategias, y se ordenan los
+candidatos: primero los que han funcionado, por menor costo esperado por éxito
+(ms promedio de un intento, contando lo que tardan los fallidos, / tasa de
+éxito), luego los nunca probados en su orden original y al final los que solo
+han fallado (los que fallan más rápido primero). Si no hay historia para la
+huella exacta se usa la del modelo.
+
+La versión de firmware no entra: al momento del login todavía no se ha leído
+(sale de páginas autenticadas) y la página previa no la expone de forma
+confiable. La huella es el único discriminador dentro del modelo: se calcula de
+la estructura de la página de login (ids, names y src de scripts, que cambian
+con el firmware), no del HTML completo, para que tokens y nonces no la cambien.
+"""
+import hashlib
+import re
+import time
+
+_RE_ESTRUCTURA = re.compile(r'\b(?:id|name|src)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def huella_pagina(html: str) -> str:
+    partes = sorted(set(_RE_ESTRUCTURA.findall(html or "")))
+    if not partes:
+        return ""
+    return hashlib.sha1("\n".join(partes).encode("utf-8", "ignore")).hexdigest()[:12]
+
+
+def _contexto(tester):
+    return (getattr(tester, "model", None) or "", getattr(tester, "_huella_login", "") or "")
+
+
+def _clave(candidato) -> str:
+    if isinstance(candidato, tuple):
+        return "=".join(str(x) for x in candidato)
+    return str(candidato)
+
+
+def _historia(grupo: str, modelo: str, huella: str) -> dict:
+    from src.backend.sua_client.dao import estadisticas_estrategias_login
+    # De la página exacta al modelo completo
+    for filtro in (huella, None):
+        stats = estadisticas_estrategias_login(grupo, modelo, filtro)
+        if any(s[0] for s in stats.values()):
+            return stats
+    return {}
+
+
+def ordenar(tester, grupo: str, candidatos) -> list:
+    """Candidatos en el orden aprendido para este equipo (sin historia: el original)."""
+    candidatos = list(candidatos)
+    try:
+        stats = _historia(grupo, *_contexto(tester))
+    except Exception as e:
+        print(f"[ESTRATEGIAS] Sin historia para {grupo}: {e}")
+        return candidatos
+
+    def _puntaje(item):
+        i, c = item
+        exitos, fallos, ms_ok, ms_fallo = stats.get(_clave(c), (0, 0, None, None))
+        if exitos:
+            tasa = exitos / (exitos + fallos)
+            intento = tasa * (ms_ok or 0.0) + (1 - tasa) * (ms_fallo or 0.0)
+            return (0, intento / tasa, i)
+        if fallos:
+            return (2, ms_fallo or 0.0, i)
+        return (1, 0.0, i)
+
+    orden = [c for _, c in sorted(enumerate(candidatos), key=_puntaje)]
+    if orden != candidatos:
+        print(f"[ESTRATEGIAS] {grupo}: primero {_clave(orden[0])} (aprendido)")
+    return orden
+
+
+def registrar(tester, grupo: str, candidato, ok: bool, ms: float) -> None:
+    modelo, huella = _contexto(tester)
+    try:
+        from src.backend.sua_client.dao import registrar_estrategia_login
+        registrar_estrategia_login(grupo, modelo, huella, _clave(candidato), ok, ms)
+    except Exception as e:
+        print(f"[ESTRATEGIAS] No se pudo registrar {grupo}/{_clave(candidato)}: {e}")
+
+
+def primera(tester, grupo: str, estrategias: dict):
+    """
+    Corre las estrategias {nombre: fn() -> bool} en el orden aprendido hasta que
+    una regrese True. Regresa el nombre de la que funcionó o None.
+    """
+    for nombre in ordenar(tester, grupo, estrategias):
+        t0 = time.perf_counter()
+        try:
+            ok = bool(estrategias[nombre]())
+        except Exception as e:
+            print(f"[ESTRATEGIAS] {grupo}/{nombre} falló: {e}")
+            ok = False
+        registrar(tester, grupo, nombre, ok, (time.perf_counter() - t0) * 1000)
+        if ok:
+            return nombre
+    return None
+
+
+def buscar(tester, grupo: str, selectores, encontrar, desc: str = None):
+    """
+    Recorre selectores (by, sel) en el orden aprendido con encontrar(by, sel);
+    regresa el primer elemento encontrado o None.
+    """
+    for by, selector in ordenar(tester, grupo, selectores):
+        t0 = time.perf_counter()
+        try:
+            el = encontrar(by, selector)
+        except Exception:
+            # Un selector que no existe cuesta el timeout completo: también cuenta
+            registrar(tester, grupo, (by, selector), False, (time.perf_counter() - t0) * 1000)
+            continue
+        registrar(tester, grupo, (by, selector), True, (time.perf_counter() - t0) * 1000)
+        print(f"[SELENIUM] Campo {desc or grupo} encontrado: {by}='{selector}'")
+        return el
+    return None
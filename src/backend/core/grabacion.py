@@ -0,0 +1,540 @@
+# src/backend/core/grabacion.py
+"""
+Grabación y reproducción de sesiones HTTP con el equipo (archivo tipo HAR).
+
+Grabar (con un equipo real conectado):
+    python -m src.backend.ont_automatico --host 192.168.100.1 --grabar C:\\ONT\\grabaciones
+
+  - requests: se envuelve HTTPAdapter.send (cubre self.session, requests.get suelto, etc.)
+  - navegador: cada webdriver.Chrome que se cree arranca con --proxy-server apuntando a
+    un proxy local que reenvía al equipo y guarda petición/respuesta con su tiempo
+
+Reproducir (sin red): el mismo tester contra el archivo, sin tocar el equipo:
+    python -m src.backend.ont_automatico --reproducir grabacion_MOD002_....har.json
+  requests se contesta desde el adaptador y Chrome desde el proxy local. El ping (ICMP)
+  no pasa por HTTP, así que esa prueba sigue dependiendo de la red.
+
+Con multislot (core/multislot) cada slot corre en su hilo con su enlace: lo grabado
+se separa por enlace (requests con el enlace del hilo; Chrome con un proxy por
+enlace que además reenvía por la tarjeta del slot) y tomar() solo vacía lo del
+enlace de quien llama.
+
+Presupuesto de latencia por firmware:
+    python -m src.backend.core.grabacion baseline C:\\ONT\\grabaciones --salida baseline.json
+    python -m src.backend.core.grabacion comparar nueva.har.json --baseline baseline.json
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from src.backend.utils.network_utils import con_enlace, enlace_actual
+
+GRABACIONES_DIR = Path(r"C:\ONT\grabaciones")
+MARGEN = 0.25
+
+# Cabeceras hop-by-hop / de transporte que no se guardan ni se reenvían
+_HOP = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "te", "trailer",
+        "upgrade", "proxy-authorization", "content-length", "content-encoding"}
+# Parámetros anti-caché (_=timestamp de Fiberhome, _<guid> de ZTE)
+_ANTICACHE = re.compile(r"^_[0-9a-fA-F\-]*$")
+# Parámetros que identifican el endpoint en el baseline (el resto se ignora)
+_CLAVES_ENDPOINT = ("ajaxmethod", "_tag", "_type", "pid")
+
+_lock = threading.Lock()
+_modo = None            # None | "grabar" | "reproducir"
+_entradas = {}          # enlace -> entradas HAR grabadas (grabar); None = sin multislot
+_reproductor = None     # Reproductor activo (reproducir)
+_proxies = {}           # enlace -> _ProxyNavegador
+_originales = {}        # (clase, atributo) -> función original
+
+
+def activo() -> str:
+    return _modo
+
+
+def habilitado_por_entorno():
+    """Carpeta de ONT_GRABAR (o None)."""
+    v = os.environ.get("ONT_GRABAR", "").strip()
+    return Path(v) if v else None
+
+
+# ---------- entradas HAR ----------
+def _cabeceras(items) -> list:
+    return [{"name": k, "value": v} for k, v in items if k.lower() not in _HOP]
+
+
+def _contenido(cuerpo: bytes, mime: str) -> dict:
+    try:
+        return {"size": len(cuerpo), "mimeType": mime, "text": cuerpo.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"size": len(cuerpo), "mimeType": mime, "text": base64.b64encode(cuerpo).decode("ascii"),
+                "encoding": "base64"}
+
+
+def _cuerpo(contenido: dict) -> bytes:
+    texto = contenido.get("text") or ""
+    if contenido.get("encoding") == "base64":
+        return base64.b64decode(texto)
+    return texto.encode("utf-8")
+
+
+def _entrada(fuente, metodo, url, req_headers, req_body, status, reason, resp_headers, resp_body, inicio, ms):
+    req_body = req_body or b""
+    if isinstance(req_body, str):
+        req_body = req_body.encode("utf-8")
+    tipo_req = dict((k.lower(), v) for k, v in req_headers).get("content-type", "")
+    tipo_resp = dict((k.lower(), v) for k, v in resp_headers).get("content-type", "")
+    e = {
+        "startedDateTime": datetime.fromtimestamp(inicio, timezone.utc).isoformat(),
+        "time": round(ms, 2),
+        "request": {
+            "method": metodo.upper(), "url": url, "httpVersion": "HTTP/1.1",
+            "headers": _cabeceras(req_headers),
+            "queryString": [{"name": k, "value": v} for k, v in parse_qsl(urlsplit(url).query, keep_blank_values=True)],
+        },
+        "response": {
+            "status": status, "statusText": reason or "", "httpVersion": "HTTP/1.1",
+            "headers": _cabeceras(resp_headers),
+            "content": _contenido(resp_body or b"", tipo_resp),
+        },
+        "timings": {"send": 0, "wait": round(ms, 2), "receive": 0},
+        "_fuente": fuente,
+    }
+    if req_body:
+        e["request"]["postData"] = {"mimeType": tipo_req, "text": req_body.decode("utf-8", "replace")}
+    return e
+
+
+def _registrar(entrada, enlace=None) -> None:
+    with _lock:
+        _entradas.setdefault(enlace, []).append(entrada)
+
+
+def _parametros(texto: str) -> list:
+    """Query / cuerpo urlencoded sin los parámetros que cambian en cada petición."""
+    return sorted((k, v) for k, v in parse_qsl(texto or "", keep_blank_values=True)
+                  if not _ANTICACHE.match(k) and k.lower() != "sessionid")
+
+
+def _url_normalizada(metodo: str, url: str, cuerpo: str = "") -> tuple:
+    p = urlsplit(url)
+    cuerpo = cuerpo or ""
+    if cuerpo and "=" in cuerpo and not cuerpo.lstrip().startswith(("{", "<")):
+        cuerpo = urlencode(_parametros(cuerpo))
+    return (metodo.upper(), p.path or "/", urlencode(_parametros(p.query)), cuerpo)
+
+
+def clave_endpoint(metodo: str, url: str, cuerpo: str = "") -> str:
+    """'GET /cgi-bin/ajax?ajaxmethod=get_base_info' (para baseline y reportes)."""
+    p = urlsplit(url)
+    texto = p.query + ("&" + cuerpo if cuerpo and "=" in cuerpo else "")
+    q = [(k, v) for k, v in parse_qsl(texto, keep_blank_values=True) if k in _CLAVES_ENDPOINT]
+    return f"{metodo.upper()} {p.path or '/'}" + (f"?{urlencode(sorted(q))}" if q else "")
+
+
+# ---------- reproducción ----------
+class Reproductor:
+    """
+    Contesta desde un archivo: busca (método, ruta, query sin anti-caché, cuerpo) y, si
+    la misma petición se repite, sirve las respuestas en el orden en que se grabaron
+    (la última se queda fija). Sin coincidencia exacta cae al endpoint (ruta +
+    ajaxmethod/_tag/pid de query o cuerpo), nunca a otro método AJAX.
+    """
+
+    def __init__(self, archivo: dict, escala: float = 0.0):
+        self.meta = archivo.get("_meta", {})
+        self.escala = escala
+        self._indice = {}
+        self._usos = {}
+        self._lock = threading.Lock()
+        self.servidas = 0
+        self.faltantes = []
+        for e in archivo.get("log", {}).get("entries", []):
+            r = e["request"]
+            cuerpo = (r.get("postData") or {}).get("text", "")
+            k = _url_normalizada(r["method"], r["url"], cuerpo)
+            for clave in (k, clave_endpoint(r["method"], r["url"], cuerpo)):
+                self._indice.setdefault(clave, []).append(e)
+
+    def buscar(self, metodo: str, url: str, cuerpo=b""):
+        if isinstance(cuerpo, bytes):
+            cuerpo = cuerpo.decode("utf-8", "replace")
+        k = _url_normalizada(metodo, url, cuerpo or "")
+        with self._lock:
+            lista = clave = None
+            for clave in (k, clave_endpoint(metodo, url, cuerpo or "")):
+                lista = self._indice.get(clave)
+                if lista:
+                    break
+            if not lista:
+                self.faltantes.append(f"{metodo.upper()} {url}")
+                return None
+            i = self._usos.get(clave, 0)
+            self._usos[clave] = i + 1
+            self.servidas += 1
+            entrada = lista[min(i, len(lista) - 1)]
+        if self.escala > 0:
+            time.sleep(entrada.get("time", 0) / 1000.0 * self.escala)
+        return entrada
+
+
+# ---------- capa requests ----------
+def _envolver_adapter(cls):
+    original = cls.send
+
+    def send(self, request, **kwargs):
+        if _modo == "reproducir" and _reproductor is not None:
+            return _respuesta_requests(self, request)
+        inicio = time.time()
+        t0 = time.perf_counter()
+        resp = original(self, request, **kwargs)
+        if _modo == "grabar":
+            # .content consume el stream; requests lo guarda y Session lo sigue usando igual
+            _registrar(_entrada("requests", request.method, request.url, request.headers.items(), request.body,
+                                resp.status_code, resp.reason, resp.headers.items(), resp.content,
+                                inicio, (time.perf_counter() - t0) * 1000), enlace_actual())
+        return resp
+
+    _originales[(cls, "send")] = original
+    cls.send = send
+
+
+def _respuesta_requests(adapter, request):
+    import requests
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+
+    entrada = _reproductor.buscar(request.method, request.url, request.body or b"")
+    if entrada is None:
+        raise requests.exceptions.ConnectionError(f"[GRABACION] Sin respuesta grabada para {request.method} {request.url}",
+                                                  request=request)
+    r = requests.Response()
+    resp = entrada["response"]
+    r.status_code = resp["status"]
+    r.reason = resp.get("statusText", "")
+    r.headers = CaseInsensitiveDict({h["name"]: h["value"] for h in resp["headers"]})
+    r._content = _cuerpo(resp["content"])
+    r.encoding = get_encoding_from_headers(r.headers)
+    r.url = request.url
+    r.request = request
+    r.connection = adapter
+    return r
+
+
+# ---------- capa navegador (proxy) ----------
+class _ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _atender(self):
+        url = self.path
+        largo = int(self.headers.get("Content-Length") or 0)
+        cuerpo = self.rfile.read(largo) if largo else b""
+        if _modo == "reproducir" and _reproductor is not None:
+            entrada = _reproductor.buscar(self.command, url, cuerpo)
+            if entrada is None:
+                return self._enviar(502, "Bad Gateway", [], b"")
+            resp = entrada["response"]
+            return self._enviar(resp["status"], resp.get("statusText", ""),
+                                [(h["name"], h["value"]) for h in resp["headers"]], _cuerpo(resp["content"]))
+
+        p = urlsplit(url)
+        cabeceras = [(k, v) for k, v in self.headers.items() if k.lower() not in _HOP and k.lower() != "accept-encoding"]
+        cabeceras.append(("Accept-Encoding", "identity"))
+        enlace = self.server.enlace
+        inicio = time.time()
+        t0 = time.perf_counter()
+        try:
+            con = http.client.HTTPConnection(p.hostname, p.port or 80, timeout=30)
+            ruta = (p.path or "/") + (f"?{p.query}" if p.query else "")
+            with con_enlace(enlace):
+                # Con multislot la conexión sale por la tarjeta del slot que creó este Chrome
+                con.putrequest(self.command, ruta, skip_host=True, skip_accept_encoding=True)
+                for k, v in cabeceras:
+                    con.putheader(k, v)
+                if cuerpo:
+                    con.putheader("Content-Length", str(len(cuerpo)))
+                con.endheaders(cuerpo or None)
+            r = con.getresponse()
+            datos = r.read()
+            resp_headers = r.getheaders()
+            status, reason = r.status, r.reason
+            con.close()
+        except OSError as e:
+            print(f"[GRABACION] Proxy sin respuesta de {p.netloc}: {e}")
+            return self._enviar(502, "Bad Gateway", [], b"")
+        if _modo == "grabar":
+            _registrar(_entrada("navegador", self.command, url, cabeceras, cuerpo, status, reason,
+                                resp_headers, datos, inicio, (time.perf_counter() - t0) * 1000), enlace)
+        self._enviar(status, reason, resp_headers, datos)
+
+    def _enviar(self, status, reason, cabeceras, datos: bytes):
+        self.send_response(status, reason)
+        for k, v in cabeceras:
+            if k.lower() not in _HOP:
+                self.send_header(k, v)
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(datos)
+
+    do_GET = do_POST = do_HEAD = do_PUT = do_DELETE = _atender
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ProxyNavegador:
+    def __init__(self, enlace=None):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _ProxyHandler)
+        self._server.daemon_threads = True
+        self._server.enlace = enlace
+        self.puerto = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="grabacion-proxy", daemon=True).start()
+
+    def detener(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _envolver_chrome(cls):
+    original = cls.__init__
+
+    def __init__(self, *args, **kwargs):
+        opciones = kwargs.get("options")
+        if opciones is None:
+            from selenium.webdriver.chrome.options import Options
+            opciones = kwargs["options"] = Options()
+        proxy = _proxy_de(enlace_actual()) if _modo else None
+        if proxy is not None:
+            opciones.add_argument(f"--proxy-server=http://127.0.0.1:{proxy.puerto}")
+            opciones.add_argument("--proxy-bypass-list=<-loopback>")
+        original(self, *args, **kwargs)
+
+    _originales[(cls, "__init__")] = original
+    cls.__init__ = __init__
+
+
+def _proxy_de(enlace) -> _ProxyNavegador:
+    """Proxy de navegador del enlace (se crea al primer Chrome de ese slot)."""
+    with _lock:
+        proxy = _proxies.get(enlace)
+        if proxy is None:
+            proxy = _proxies[enlace] = _ProxyNavegador(enlace)
+        return proxy
+
+
+# ---------- activar / desactivar ----------
+def _activar(modo: str) -> None:
+    global _modo
+    desactivar()
+    import requests.adapters
+    _envolver_adapter(requests.adapters.HTTPAdapter)
+    try:
+        from selenium import webdriver
+        _envolver_chrome(webdriver.Chrome)
+    except ImportError:
+        print("[GRABACION] Selenium no disponible, solo se cubre requests")
+    _modo = modo
+    return _proxy_de(enlace_actual())
+
+
+def grabar() -> None:
+    """Empieza a grabar todo lo HTTP (requests + Chrome) hasta tomar()/guardar()."""
+    proxy = _activar("grabar")
+    with _lock:
+        _entradas.clear()
+    print(f"[GRABACION] Grabando (proxy de navegador en 127.0.0.1:{proxy.puerto})")
+
+
+def reproducir(archivo, escala: float = 0.0) -> Reproductor:
+    """Sirve el archivo (ruta o dict) sin red. escala=1 respeta los tiempos grabados."""
+    global _reproductor
+    datos = cargar(archivo) if not isinstance(archivo, dict) else archivo
+    proxy = _activar("reproducir")
+    _reproductor = Reproductor(datos, escala)
+    n = len(datos.get("log", {}).get("entries", []))
+    print(f"[GRABACION] Reproduciendo {n} respuestas (proxy de navegador en 127.0.0.1:{proxy.puerto})")
+    return _reproductor
+
+
+def desactivar() -> None:
+    global _modo, _reproductor
+    for (cls, attr), fn in list(_originales.items()):
+        setattr(cls, attr, fn)
+    _originales.clear()
+    with _lock:
+        proxies = list(_proxies.values())
+        _proxies.clear()
+    for proxy in proxies:
+        proxy.detener()
+    _modo = None
+    _reproductor = None
+
+
+# ---------- archivo ----------
+def tomar() -> list:
+    """Vacía y regresa lo grabado en el enlace del hilo que llama (su slot)."""
+    with _lock:
+        return _entradas.pop(enlace_actual(), [])
+
+
+def archivo_har(entradas: list, **meta) -> dict:
+    entradas = sorted(entradas, key=lambda e: e["startedDateTime"])
+    return {
+        "log": {"version": "1.2", "creator": {"name": "ontester", "version": "1.0"}, "entries": entradas},
+        "_meta": {**meta, "fecha": datetime.now().isoformat(timespec="seconds"), "entradas": len(entradas)},
+    }
+
+
+def guardar_har(datos: dict, base_dir=None):
+    """Escribe el archivo en base_dir (ONT_GRABAR o GRABACIONES_DIR). Regresa la ruta o None."""
+    entradas = datos.get("log", {}).get("entries", [])
+    if not entradas:
+        return None
+    meta = datos.get("_meta", {})
+    base = Path(base_dir) if base_dir else (habilitado_por_entorno() or GRABACIONES_DIR)
+    try:
+        base.mkdir(parents=True, exist_ok=True)
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        equipo = meta.get("sn") or str(meta.get("host") or "NA").replace(":", "_")
+        ruta = base / f"grabacion_{meta.get('modelo') or 'NA'}_{equipo}_{ts}.har.json"
+        ruta.write_text(json.dumps(datos, ensure_ascii=False), encoding="utf-8")
+        print(f"[GRABACION] {len(entradas)} peticiones guardadas en {ruta}")
+        return str(ruta)
+    except Exception as e:
+        print(f"[GRABACION] No se pudo guardar la grabación: {e}")
+        return None
+
+
+def guardar_equipo(host: str, modelo: str = None, firmware: str = None, sn: str = None, base_dir=None):
+    """Guarda lo grabado del equipo (y vacía el buffer)."""
+    return guardar_har(archivo_har(tomar(), host=host, modelo=modelo, firmware=firmware, sn=sn), base_dir)
+
+
+def cargar(ruta) -> dict:
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ---------- presupuesto de latencia ----------
+def _percentil(valores, q: float) -> float:
+    orden = sorted(valores)
+    k = (len(orden) - 1) * q
+    i = int(k)
+    j = min(i + 1, len(orden) - 1)
+    return orden[i] + (orden[j] - orden[i]) * (k - i)
+
+
+def tiempos(datos: dict) -> dict:
+    """{endpoint: [ms, ...]} de un archivo."""
+    out = {}
+    for e in datos.get("log", {}).get("entries", []):
+        r = e["request"]
+        clave = clave_endpoint(r["method"], r["url"], (r.get("postData") or {}).get("text", ""))
+        out.setdefault(clave, []).append(e.get("time", 0))
+    return out
+
+
+def baseline(rutas) -> dict:
+    """
+    {"MODELO|firmware": {endpoint: {n, p50_ms, p95_ms}}} con todas las grabaciones
+    (archivos o carpetas). Sirve como presupuesto de latencia por versión de firmware.
+    """
+    acumulado = {}
+    for ruta in rutas:
+        p = Path(ruta)
+        archivos = sorted(p.glob("*.har.json")) if p.is_dir() else [p]
+        for a in archivos:
+            datos = cargar(a)
+            meta = datos.get("_meta", {})
+            grupo = acumulado.setdefault(f"{meta.get('modelo') or '?'}|{meta.get('firmware') or '?'}", {})
+            for k, ms in tiempos(datos).items():
+                grupo.setdefault(k, []).extend(ms)
+    return {
+        g: {k: {"n": len(v), "p50_ms": round(_percentil(v, 0.5), 1), "p95_ms": round(_percentil(v, 0.95), 1)}
+            for k, v in sorted(endpoints.items())}
+        for g, endpoints in acumulado.items()
+    }
+
+
+def comparar(datos: dict, base: dict, margen: float = MARGEN) -> dict:
+    """
+    Contra el baseline del mismo modelo/firmware (o del modelo si el firmware es nuevo):
+      lentos    -> p50 arriba del p95 del baseline + margen
+      nuevos    -> endpoints que antes no se pedían (la página cambió)
+      faltantes -> endpoints del baseline que ya no se piden
+    """
+    meta = datos.get("_meta", {})
+    grupo = f"{meta.get('modelo') or '?'}|{meta.get('firmware') or '?'}"
+    ref = base.get(grupo)
+    if ref is None:
+        # Firmware sin baseline: se compara con cualquier firmware del mismo modelo
+        candidatos = [g for g in base if g.split("|")[0] == (meta.get("modelo") or "?")]
+        ref = base[candidatos[-1]] if candidatos else {}
+        grupo = candidatos[-1] if candidatos else None
+    actual = tiempos(datos)
+    lentos = []
+    for k, ms in actual.items():
+        b = ref.get(k)
+        if not b:
+            continue
+        p50 = _percentil(ms, 0.5)
+        limite = b["p95_ms"] * (1 + margen)
+        if p50 > limite:
+            lentos.append({"endpoint": k, "p50_ms": round(p50, 1), "presupuesto_ms": round(limite, 1)})
+    lentos.sort(key=lambda x: -(x["p50_ms"] - x["presupuesto_ms"]))
+    return {
+        "grupo": grupo,
+        "lentos": lentos,
+        "nuevos": sorted(k for k in actual if k not in ref),
+        "faltantes": sorted(k for k in ref if k not in actual),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grabaciones HTTP de sesiones con ONTs")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("resumen", help="Endpoints y tiempos de una grabación")
+    p.add_argument("archivo")
+
+    p = sub.add_parser("baseline", help="Presupuesto de latencia por modelo/firmware")
+    p.add_argument("rutas", nargs="+", help="Archivos .har.json o carpetas")
+    p.add_argument("--salida")
+
+    p = sub.add_parser("comparar", help="Comparar una grabación contra el baseline")
+    p.add_argument("archivo")
+    p.add_argument("--baseline", required=True)
+    p.add_argument("--margen", type=float, default=MARGEN)
+
+    args = parser.parse_args(argv)
+    if args.cmd == "resumen":
+        datos = cargar(args.archivo)
+        res = {"meta": datos.get("_meta", {}),
+               "endpoints": {k: {"n": len(v), "total_ms": round(sum(v), 1)} for k, v in sorted(tiempos(datos).items())}}
+    elif args.cmd == "baseline":
+        res = baseline(args.rutas)
+        if args.salida:
+            Path(args.salida).write_text(json.dumps(res, indent=2, ensure_ascii=False), encoding="utf-8")
+            print(f"[GRABACION] Baseline guardado en {args.salida}")
+            return 0
+    else:
+        res = comparar(cargar(args.archivo), cargar(args.baseline), args.margen)
+        print(json.dumps(res, indent=2, ensure_ascii=False))
+        return 1 if res["lentos"] or res["nuevos"] or res["faltantes"] else 0
+    print(json.dumps(res, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+# src/backend/core/importador_historico.py
+"""
+Importador de reportes JSON históricos a la tabla operations.
+
+Recorre las carpetas donde save_results / save_results2 fueron dejando reportes:
+
+    reports/automated_tests/<dd_mm_yy>/*_automated_results.json
+    reports/<dd_mm_yy>_MODxxx/*/results.json
+    test_mod001_mod008/<YYYY-MM-DD>/*.json
+    test_mod002/..., test_mod003-mod005/...
+
+Cada archivo se proyecta con los mismos _resultadosFiber / _resultadosZTE /
+_resultadosHuawei que usa _resultados_finales (en procesos aparte), y el
+proceso principal inserta por lotes con executemany dentro de una transacción.
+
+Idempotente: la tabla imported_files guarda ruta + sha1 de cada archivo; con
+(ruta, size, mtime) iguales ni siquiera se vuelve a leer, y un sha1 ya visto
+(copia del mismo reporte) no vuelve a crear operación. Si el archivo de una
+ruta ya importada cambia, se actualiza la operación vinculada a esa ruta.
+
+Uso:
+    python -m src.backend.core.importador_historico
+    python -m src.backend.core.importador_historico reports test_mod002 --workers 6
+    python -m src.backend.core.importador_historico --usuario 3 --dry-run
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Carpetas por default (relativas al cwd, como las usa save_results2) + la de save_results
+RAICES_DEFAULT = (
+    Path("reports"),
+    BACKEND_DIR / "reports",
+    Path("test_mod001_mod008"),
+    Path("test_mod002"),
+    Path("test_mod003-mod005"),
+)
+
+LOTE = 5000
+CHUNK_WORKER = 256
+
+_MOD_RE = re.compile(r"MOD\d{3}")
+_FIBER = ("MOD001", "MOD008")
+_ZTE = ("MOD002", "MOD009")
+_HUAWEI = ("MOD003", "MOD004", "MOD005", "MOD007")
+
+
+# ---------- lado worker ----------
+_UMBRALES = {}
+
+
+def _init_worker(umbrales: dict):
+    global _UMBRALES
+    _UMBRALES = dict(umbrales or {})
+
+
+def _proyector():
+    # Import local: cada worker carga los mixins una sola vez
+    from src.backend.mixins.common_mixin import CommonMixin
+
+    class _Proyector(CommonMixin):
+        """Lo mínimo de ONTAutomatedTester para correr la proyección sobre un JSON ya guardado."""
+        def __init__(self, test_results, model, umbrales=None):
+            self.test_results = test_results
+            self.model = model
+            self.opcionesTest = {"info": {}, "tests": {}}  # vacío = todas las pruebas (default True)
+            self.resultado_ont = None
+            self._umbrales = _UMBRALES if umbrales is None else umbrales
+
+        def _getMinFibraTx(self):
+            return self._umbrales.get("mintx", -30)
+        def _getMaxFibraTx(self):
+            return self._umbrales.get("maxtx", 0)
+        def _getMinFibraRx(self):
+            return self._umbrales.get("minrx", -30)
+        def _getMaxFibraRx(self):
+            return self._umbrales.get("maxrx", 0)
+        def _getMinWifi24SignalPercent(self):
+            return self._umbrales.get("min24percent", 60)
+        def _getMinWifi5SignalPercent(self):
+            return self._umbrales.get("min5percent", 60)
+
+    return _Proyector
+
+
+_PROYECTOR = None
+_NULO = None
+
+
+def _nulo():
+    global _NULO
+    if _NULO is None:
+        _NULO = open(os.devnull, "w")
+    return _NULO
+
+
+def modelo_de(test_results: dict, ruta: Path):
+    """Código MODxxx del metadata; si no viene, del nombre de archivo/carpeta."""
+    model = ((test_results or {}).get("metadata") or {}).get("model") or ""
+    m = _MOD_RE.search(str(model)) or _MOD_RE.search(str(ruta))
+    return m.group(0) if m else None
+
+
+def proyectar(test_results: dict, modelo: str, umbrales: dict = None) -> dict:
+    """
+    Payload info/tests/valido de un reporte ya guardado, con las mismas
+    proyecciones que _resultados_finales (tx/rx en dBm, wifi contra umbral).
+    umbrales=None -> los del worker (_init_worker).
+    """
+    global _PROYECTOR
+    if _PROYECTOR is None:
+        _PROYECTOR = _proyector()
+    p = _PROYECTOR(test_results, modelo, umbrales)
+    # Las proyecciones imprimen umbrales por equipo; en masa solo estorba
+    with contextlib.redirect_stdout(_nulo()):
+        return p._resultados_finales()
+
+
+def _parsear(item):
+    """
+    item = (ruta, size, mtime_ns). Regresa
+      ("ok", ruta, size, mtime_ns, sha1, tipo, ts, payload, fallidos) |
+      ("omitido", ruta, motivo) | ("error", ruta, mensaje)
+    """
+    ruta, size, mtime_ns = item
+    try:
+        data = Path(ruta).read_bytes()
+        sha1 = hashlib.sha1(data).hexdigest()
+        tr = json.loads(data)
+    except Exception as e:
+        return ("error", ruta, f"{type(e).__name__}: {e}")
+
+    if not isinstance(tr, dict) or "tests" not in tr:
+        return ("omitido", ruta, "no es reporte de pruebas")
+
+    modelo = modelo_de(tr, ruta)
+    if modelo not in _FIBER + _ZTE + _HUAWEI:
+        return ("omitido", ruta, f"modelo sin proyección ({modelo})")
+
+    try:
+        payload = proyectar(tr, modelo)
+    except Exception as e:
+        return ("error", ruta, f"proyección {modelo}: {type(e).__name__}: {e}")
+    if not payload:
+        return ("omitido", ruta, "sin payload")
+
+    from src.backend.core.indice_resultados import fallidos_de
+    meta = tr.get("metadata") or {}
+    ts = meta.get("timestamp") or datetime.fromtimestamp(mtime_ns / 1e9).isoformat()
+    tipo = "RETEST" if "retest" in Path(ruta).name.lower() else "TESTEO"
+    payload["info"]["_modelo_cod"] = modelo
+    return ("ok", ruta, size, mtime_ns, sha1, tipo, ts, payload, fallidos_de(tr))
+
+
+# ---------- lado principal ----------
+def descubrir(raices, firmas: dict):
+    """Lista (ruta, size, mtime_ns) de los JSON que no están importados con la misma firma."""
+    vistos, pendientes, sin_cambio = set(), [], 0
+    for raiz in raices:
+        raiz = Path(raiz)
+        if not raiz.exists():
+            continue
+        for dirpath, _dirs, files in os.walk(raiz):
+            for nombre in files:
+                if not nombre.endswith(".json"):
+                    continue
+                ruta = str(Path(dirpath, nombre).resolve())
+                if ruta in vistos:
+                    continue
+                vistos.add(ruta)
+                try:
+                    st = os.stat(ruta)
+                except OSError:
+                    continue
+                if firmas.get(ruta) == (st.st_size, st.st_mtime_ns):
+                    sin_cambio += 1
+                    continue
+                pendientes.append((ruta, st.st_size, st.st_mtime_ns))
+    return pendientes, sin_cambio
+
+
+def umbrales_config(config: dict = None) -> dict:
+    """fibra + wifi de la config en un solo dict (lo que leen los getters del proyector)."""
+    if config is None:
+        from src.backend.endpoints.conexion import cargarConfig
+        config = cargarConfig()
+    umbrales = dict(config.get("fibra", {}))
+    umbrales.update(config.get("wifi", {}))
+    return umbrales
+
+
+def _contexto_bd(id_user=None):
+    """ids de station/settings/catalog_meta/user actuales y umbrales de config (una sola vez)."""
+    from src.backend.sua_client.dao import extraer_ultimo
+    from src.backend.endpoints.conexion import cargarConfig
+
+    station = extraer_ultimo("stations")
+    settings = extraer_ultimo("settings")
+    version = extraer_ultimo("catalog_meta")
+    if not station or not settings or not version:
+        raise RuntimeError("Falta configurar estación/settings/catálogo antes de importar")
+    if id_user is None:
+        us = extraer_ultimo("user_station")
+        if not us:
+            raise RuntimeError("No hay usuario en user_station; usa --usuario")
+        id_user = us["id_user"]
+
+    config = cargarConfig()
+    return {
+        "id_station": station["id"],
+        "id_user": int(id_user),
+        "id_settings": settings["id"],
+        "id_catalog_meta": version["id"],
+        "fibra": config.get("fibra", {}),
+        "umbrales": umbrales_config(config),
+    }
+
+
+def fila_operacion(ctx: dict, tipo: str, ts: str, payload: dict, modelo_cod: str = None) -> tuple:
+    """Misma normalización que insertar_operacion, sin ir a la bd por cada valor."""
+    from src.backend.endpoints.conexion import norm_result, norm_power
+    from src.backend.core.resultados import INFO_DEFAULTS
+
+    info = payload.get("info", {})
+    tests = payload.get("tests", {})
+
+    def _i(k):
+        return info.get(k) or INFO_DEFAULTS.get(k)
+
+    pruebas = (
+        norm_result(tests.get("ping")),
+        norm_result(tests.get("reset")),
+        norm_result(tests.get("usb")),
+        norm_power(tests.get("tx"), "tx", ctx["fibra"]),
+        norm_power(tests.get("rx"), "rx", ctx["fibra"]),
+        norm_result(tests.get("w24")),
+        norm_result(tests.get("w5")),
+        norm_result(tests.get("sftU")),
+    )
+    if modelo_cod in _FIBER:
+        # _resultadosFiber no calcula valido: en vivo lo pone dao.validar_por_modo
+        # después de insertar, con este mismo criterio sobre las columnas ya normalizadas
+        valido = all(v in ("PASS", "SIN_PRUEBA") for v in pruebas)
+    else:
+        valido = bool(payload.get("valido"))
+
+    return (
+        ctx["id_station"], ctx["id_user"], ctx["id_settings"], ctx["id_catalog_meta"], tipo,
+        info.get("fecha_test") or ts, _i("modelo"), _i("sn"), _i("mac"), _i("sftVer"),
+        info.get("wifi24"), info.get("wifi5"), info.get("passWifi"),
+        *pruebas,
+        int(valido),
+    )
+
+
+def importar(raices=RAICES_DEFAULT, workers: int = None, id_user=None, lote: int = LOTE,
+             dry_run: bool = False, on_progreso=None) -> dict:
+    from src.backend.sua_client.dao import archivos_importados, importar_lote_operaciones
+    from src.backend.sua_client.local_db import get_conn
+
+    t0 = time.perf_counter()
+    ctx = _contexto_bd(id_user)
+    hashes, firmas = archivos_importados()
+    pendientes, sin_cambio = descubrir(raices, firmas)
+    total = len(pendientes)
+    print(f"[IMPORTAR] {total} archivos por revisar | {sin_cambio} ya importados sin cambios")
+
+    res = {"revisados": total, "sin_cambio": sin_cambio, "importados": 0,
+           "duplicados": 0, "omitidos": 0, "errores": 0, "segundos": 0.0}
+    if not total:
+        return res
+
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    ahora = datetime.now().astimezone().isoformat(timespec="seconds")
+    ops, archivos, indice = [], [], []
+    con = None if dry_run else get_conn()
+
+    def _flush():
+        if (ops or archivos) and con is not None:
+            importar_lote_operaciones(con, ops, archivos, indice)
+        res["importados"] += len(ops)
+        ops.clear()
+        archivos.clear()
+        indice.clear()
+
+    try:
+        if con is not None:
+            con.execute("PRAGMA synchronous = NORMAL;")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(ctx["umbrales"],)) as pool:
+            for hechos, r in enumerate(pool.map(_parsear, pendientes, chunksize=CHUNK_WORKER), start=1):
+                estado = r[0]
+                if estado == "error":
+                    res["errores"] += 1
+                    print(f"[IMPORTAR] ERROR {r[1]}: {r[2]}")
+                elif estado == "omitido":
+                    res["omitidos"] += 1
+                else:
+                    _, ruta, size, mtime_ns, sha1, tipo, ts, payload, fallidos = r
+                    if sha1 in hashes:
+                        # Mismo contenido ya importado (copia o archivo tocado): solo se actualiza la firma
+                        res["duplicados"] += 1
+                        archivos.append((sha1, ruta, size, mtime_ns, ahora))
+                    else:
+                        hashes.add(sha1)
+                        modelo_cod = payload["info"].pop("_modelo_cod", None)
+                        ops.append((ruta, fila_operacion(ctx, tipo, ts, payload, modelo_cod)))
+                        archivos.append((sha1, ruta, size, mtime_ns, ahora))
+                        indice.append((payload["info"].get("sn"), modelo_cod, ts, ruta, json.dumps(fallidos)))
+                if len(archivos) >= lote:
+                    _flush()
+                if on_progreso and (hechos == total or hechos % 1000 == 0):
+                    on_progreso(hechos, total)
+            _flush()
+    finally:
+        if con is not None:
+            con.close()
+
+    res["segundos"] = time.perf_counter() - t0
+    fps = total / res["segundos"] if res["segundos"] > 0 else 0.0
+    print(f"[IMPORTAR] {res['importados']} importados, {res['duplicados']} duplicados, "
+          f"{res['omitidos']} omitidos, {res['errores']} errores en {res['segundos']:.1f}s ({fps:.0f} archivos/s)")
+    return res
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importar reportes JSON históricos a la base local")
+    parser.add_argument("raices", nargs="*", help="Carpetas a recorrer (default: reports y test_mod*)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos de parseo (default: núcleos - 1)")
+    parser.add_argument("--usuario", type=int, default=None, help="id_user de las operaciones (default: último user_station)")
+    parser.add_argument("--lote", type=int, default=LOTE, help="Filas por transacción")
+    parser.add_argument("--dry-run", action="store_true", help="Parsear y contar sin escribir en la bd")
+    args = parser.parse_args(argv)
+
+    def _progreso(hechos, total):
+        print(f"[IMPORTAR] {hechos}/{total}")
+
+    res = importar(args.raices or RAICES_DEFAULT, workers=args.workers, id_user=args.usuario,
+                   lote=args.lote, dry_run=args.dry_run, on_progreso=_progreso)
+    return 1 if res["errores"] else 0
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# src/backend/core/indice_resultados.py
+"""
+Índice "último resultado por equipo" para el modo retest.
+
+Cada vez que se guarda un reporte JSON (save_results / save_results2 / retest)
+se registra en la tabla results_index (sn, modelo, ts, ruta, fallidos).
+run_retest_mode consulta el índice por (sn, modelo) en lugar de recorrer
+reports/automated_tests y hacer stat() a cada archivo.
+"""
+import json
+from pathlib import Path
+
+
+def sn_de(test_results: dict):
+    """SN del reporte, probando las llaves que usa cada vendor."""
+    meta = (test_results or {}).get("metadata", {}) or {}
+    raw = (meta.get("base_info") or {}).get("raw_data") or {}
+    return (
+        meta.get("serial_number")
+        or meta.get("serial_number_physical")
+        or raw.get("gponsn")
+        or None
+    )
+
+
+def fallidos_de(test_results: dict) -> list:
+    return [
+        name for name, data in ((test_results or {}).get("tests", {}) or {}).items()
+        if isinstance(data, dict) and data.get("status") == "FAIL"
+    ]
+
+
+def registrar(test_results: dict, ruta) -> None:
+    """Agrega (o actualiza) el reporte en el índice. Nunca rompe el guardado."""
+    try:
+        from src.backend.sua_client.dao import indexar_resultado
+        meta = (test_results or {}).get("metadata", {}) or {}
+        indexar_resultado(
+            sn_de(test_results),
+            meta.get("model"),
+            meta.get("timestamp") or "",
+            str(Path(ruta).resolve()),
+            fallidos_de(test_results),
+        )
+    except Exception as e:
+        print(f"[INDICE] No se pudo indexar {ruta}: {e}")
+
+
+def ultimo_fallido(sn: str, modelo=None):
+    """
+    Regresa (ruta, fallidos) del último reporte del equipo, o (None, None).
+    Siempre por SN: sin él no hay forma de saber qué reporte es de este equipo.
+    """
+    from src.backend.sua_client.dao import ultimo_resultado_indexado
+    row = ultimo_resultado_indexado(sn, modelo)
+    if row is None:
+        return None, None
+    try:
+        fallidos = json.loads(row["fallidos"] or "[]")
+    except ValueError:
+        fallidos = []
+    return row["ruta"], fallidos
+
+
+def cargar(ruta: str) -> dict:
+    """
+    test_results de una entrada del índice: referencia al archivo diario
+    ("ruta.jsonl.gz#offset") o ruta de un JSON suelto.
+    """
+    if "#" in Path(ruta).name:
+        from src.backend.core.archivo_resultados import leer
+        return leer(ruta)["test_results"]
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def reconstruir(base_dirs, patron: str = "*.json") -> int:
+    """
+    Indexa los reportes que ya existen en disco (migración / índice vacío).
+    Se recorre cada carpeta una sola vez.
+    """
+    total = 0
+    for base in base_dirs:
+        base = Path(base)
+        if not base.exists():
+            continue
+        for f in base.rglob(patron):
+            try:
+                with f.open("r", encoding="utf-8") as fh:
+                    data = json.load(fh)
+            except Exception:
+                continue
+            if not isinstance(data, dict) or "tests" not in data:
+                continue
+            registrar(data, f)
+            total += 1
+    print(f"[INDICE] {total} reportes indexados")
+    return total
+
+
+def migrar_legado(base_dirs, patron: str = "*_automated_results.json") -> int:
+    """
+    Indexa una sola vez los JSON sueltos de antes del archivo diario, por carpeta.
+    La marca queda en la tabla migraciones: no depende de que results_index esté
+    vacío (en cuanto se guarda un reporte nuevo ya no lo estaría).
+    """
+    from src.backend.sua_client.dao import marcar_migracion, migracion_hecha
+    total = 0
+    for base in base_dirs:
+        base = Path(base)
+        if not base.exists():
+            continue
+        nombre = f"indice_legado:{base.resolve()}"
+        if migracion_hecha(nombre):
+            continue
+        print(f"[INDICE] Indexando reportes existentes en {base}...")
+        total += reconstruir([base], patron)
+        marcar_migracion(nombre)
+    return total
@@ -0,0 +1,410 @@
+# src/backend/core/multislot.py
+"""
+Estación multi-slot: varias ONTs con la misma IP (192.168.100.1 / 192.168.1.1)
+probándose a la vez, cada una en su propia tarjeta de red.
+
+Cada slot corre su propio main_loop (escaneo, pruebas, monitoreo) en un hilo con
+un "enlace" (network_utils.fijar_enlace): IPs locales de su tarjeta + interfaz.
+Con el enlace puesto:
+  - requests / urllib3: las conexiones salen desde la IP local de esa red
+    (y en Linux además con SO_BINDTODEVICE a la interfaz)
+  - ping: -S <ip local> en Windows, -I <interfaz> en Linux
+  - Chrome: cada webdriver.Chrome del slot arranca con --proxy-server hacia un
+    proxy local del slot, que reenvía al equipo por la tarjeta del slot
+
+Los eventos de cada slot llegan al out_q general como
+    ("slot", {"slot": "S1", "kind": "log", "payload": ...})
+y SlotsView (Frontend/ui/slots_view.py) pinta un panel por slot.
+
+Config (C:\\ONT\\slots.json):
+    {"slots": [
+        {"nombre": "S1", "interfaz": "Ethernet 2", "ips": ["192.168.100.11", "192.168.1.11"]},
+        {"nombre": "S2", "interfaz": "Ethernet 3", "ips": ["192.168.100.12", "192.168.1.12"]}
+    ]}
+En Windows cada tarjeta necesita una IP distinta en cada red (el modelo "strong host"
+hace que el bind a la IP local elija la tarjeta). En Linux basta la interfaz.
+
+Uso:
+    python -m src.backend.core.multislot correr --config C:\\ONT\\slots.json
+    python -m src.backend.core.multislot lab --slots 4 --modelos MOD004,MOD002     (netns + veth)
+"""
+import argparse
+import json
+import queue
+import shlex
+import socket
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from src.backend.utils.network_utils import con_enlace, enlace_actual, fijar_enlace, ip_origen
+
+SLOTS_CONFIG = Path(r"C:\ONT\slots.json")
+SO_BINDTODEVICE = getattr(socket, "SO_BINDTODEVICE", 25)
+# Pausa antes de re-armar un slot cuyo main_loop terminó (desconexión inesperada, error)
+REARME_S = 2.0
+
+_hilo = threading.local()      # .proxy = puerto del proxy Chrome del slot
+_originales = {}
+_lock = threading.Lock()
+
+
+# ---------- enlace a nivel socket ----------
+def _loopback(host: str) -> bool:
+    return host in ("localhost", "::1") or str(host).startswith("127.")
+
+
+def _opciones_interfaz(enlace) -> list:
+    if enlace and enlace[1] and sys.platform.startswith("linux"):
+        return [(socket.SOL_SOCKET, SO_BINDTODEVICE, enlace[1].encode())]
+    return []
+
+
+def _envolver_urllib3():
+    from urllib3.util import connection as u3
+    original = u3.create_connection
+
+    def create_connection(address, *args, **kwargs):
+        enlace = enlace_actual()
+        # args posicionales = (timeout,) en urllib3; source_address/socket_options van por nombre
+        if enlace and len(args) <= 1 and not _loopback(address[0]):
+            if not kwargs.get("source_address"):
+                origen = ip_origen(address[0], enlace)
+                if origen:
+                    kwargs["source_address"] = (origen, 0)
+            extra = _opciones_interfaz(enlace)
+            if extra:
+                kwargs["socket_options"] = list(kwargs.get("socket_options") or []) + extra
+        return original(address, *args, **kwargs)
+
+    _originales[(u3, "create_connection")] = original
+    u3.create_connection = create_connection
+
+
+def _envolver_socket():
+    original = socket.create_connection
+
+    def create_connection(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None, **kwargs):
+        enlace = enlace_actual()
+        if enlace and source_address is None and not _loopback(address[0]):
+            origen = ip_origen(address[0], enlace)
+            if origen:
+                source_address = (origen, 0)
+        return original(address, timeout, source_address, **kwargs)
+
+    _originales[(socket, "create_connection")] = original
+    socket.create_connection = create_connection
+
+
+def _envolver_chrome():
+    try:
+        from selenium import webdriver
+    except ImportError:
+        print("[MULTISLOT] Selenium no disponible: Chrome no se enruta por slot")
+        return
+    cls = webdriver.Chrome
+    original = cls.__init__
+
+    def __init__(self, *args, **kwargs):
+        puerto = getattr(_hilo, "proxy", None)
+        if puerto:
+            opciones = kwargs.get("options")
+            if opciones is None:
+                from selenium.webdriver.chrome.options import Options
+                opciones = kwargs["options"] = Options()
+            opciones.add_argument(f"--proxy-server=http://127.0.0.1:{puerto}")
+            opciones.add_argument("--proxy-bypass-list=<-loopback>")
+        original(self, *args, **kwargs)
+
+    _originales[(cls, "__init__")] = original
+    cls.__init__ = __init__
+
+
+def instalar() -> None:
+    """Envuelve urllib3, socket y webdriver.Chrome (idempotente). Sin enlace en el hilo no cambia nada."""
+    with _lock:
+        if _originales:
+            return
+        _envolver_urllib3()
+        _envolver_socket()
+        _envolver_chrome()
+
+
+def desinstalar() -> None:
+    with _lock:
+        for (obj, attr), fn in list(_originales.items()):
+            setattr(obj, attr, fn)
+        _originales.clear()
+
+
+# ---------- proxy de Chrome por slot ----------
+class _ProxySlotHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    _HOP = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "te", "trailer",
+            "upgrade", "proxy-authorization", "content-length"}
+
+    def _atender(self):
+        slot = self.server.slot
+        largo = int(self.headers.get("Content-Length") or 0)
+        cuerpo = self.rfile.read(largo) if largo else None
+        cabeceras = {k: v for k, v in self.headers.items() if k.lower() not in self._HOP}
+        host = urlsplit(self.path).hostname or ""
+        try:
+            r = slot.pool(host).request(self.command, self.path, body=cuerpo, headers=cabeceras,
+                                        redirect=False, retries=False, decode_content=False,
+                                        timeout=30)
+            datos, status, reason, resp_headers = r.data, r.status, r.reason, r.headers.items()
+        except Exception as e:
+            print(f"[MULTISLOT] {slot.nombre}: proxy sin respuesta de {host}: {e}")
+            datos, status, reason, resp_headers = b"", 502, "Bad Gateway", []
+        self.send_response(status, reason)
+        for k, v in resp_headers:
+            if k.lower() not in self._HOP:
+                self.send_header(k, v)
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(datos)
+
+    do_GET = do_POST = do_HEAD = do_PUT = do_DELETE = _atender
+
+    def log_message(self, format, *args):
+        pass
+
+
+# ---------- cola de eventos por slot ----------
+class _ColaSlot:
+    """Lo que main_loop manda a out_q.put((kind, payload)) sale etiquetado con el slot."""
+
+    def __init__(self, nombre: str, out_q):
+        self.nombre = nombre
+        self.out_q = out_q
+
+    def put(self, item, *args, **kwargs):
+        kind, payload = item
+        if self.out_q is not None:
+            self.out_q.put(("slot", {"slot": self.nombre, "kind": kind, "payload": payload}))
+
+
+# ---------- slot ----------
+@dataclass
+class Slot:
+    nombre: str
+    interfaz: Optional[str] = None
+    ips: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._detener = threading.Event()
+        self._stop_corrida = None
+        self._thread = None
+        self._proxy = None
+        self._pools = {}
+
+    @property
+    def enlace(self):
+        return (tuple(self.ips), self.interfaz) if (self.ips or self.interfaz) else None
+
+    def vivo(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def pool(self, host: str):
+        """PoolManager de urllib3 que sale por la tarjeta del slot (para el proxy de Chrome)."""
+        import urllib3
+        origen = ip_origen(host, self.enlace)
+        clave = origen or ""
+        with _lock:
+            pm = self._pools.get(clave)
+            if pm is None:
+                from urllib3.connection import HTTPConnection
+                opciones = list(HTTPConnection.default_socket_options) + _opciones_interfaz(self.enlace)
+                pm = urllib3.PoolManager(maxsize=8, source_address=(origen, 0) if origen else None,
+                                         socket_options=opciones)
+                self._pools[clave] = pm
+        return pm
+
+    def iniciar(self, opciones: dict, out_q=None, auto_test_on_detect: bool = True) -> "Slot":
+        if self.vivo():
+            return self
+        instalar()
+        self._detener.clear()
+        self._proxy = ThreadingHTTPServer(("127.0.0.1", 0), _ProxySlotHandler)
+        self._proxy.daemon_threads = True
+        self._proxy.slot = self
+        threading.Thread(target=self._proxy.serve_forever, name=f"slot-{self.nombre}-proxy", daemon=True).start()
+        self._thread = threading.Thread(target=self._correr, args=(opciones, _ColaSlot(self.nombre, out_q),
+                                                                   auto_test_on_detect),
+                                        name=f"slot-{self.nombre}", daemon=True)
+        self._thread.start()
+        return self
+
+    def detener(self, timeout: float = 5.0) -> None:
+        self._detener.set()
+        if self._stop_corrida:
+            self._stop_corrida.set()
+        if self._thread:
+            self._thread.join(timeout)
+        if self._proxy:
+            self._proxy.shutdown()
+            self._proxy.server_close()
+            self._proxy = None
+        for pm in self._pools.values():
+            pm.clear()
+        self._pools.clear()
+
+    def _correr(self, opciones, cola, auto_test_on_detect):
+        from src.backend.endpoints.motor import main_loop
+
+        fijar_enlace(self.ips, self.interfaz)
+        _hilo.proxy = self._proxy.server_address[1]
+        cola.put(("log", f"Slot {self.nombre} listo ({self.interfaz or '-'} {', '.join(self.ips) or ''})"))
+        # main_loop termina cuando su stop_event se activa (p. ej. el monitor detecta una
+        # desconexión inesperada); el slot lo vuelve a armar hasta que se pida detener.
+        while not self._detener.is_set():
+            self._stop_corrida = threading.Event()
+            try:
+                main_loop(opciones, cola, self._stop_corrida, dispatcher=None,
+                          auto_test_on_detect=auto_test_on_detect)
+            except Exception as e:
+                print(f"[MULTISLOT] {self.nombre}: main_loop terminó con error: {e}")
+                cola.put(("log", f"Error en slot: {e}"))
+            if self._detener.wait(REARME_S):
+                break
+        cola.put(("con", "DESCONECTADO"))
+        print(f"[MULTISLOT] Slot {self.nombre} detenido")
+
+
+def cargar_slots(ruta=SLOTS_CONFIG) -> List[Slot]:
+    datos = json.loads(Path(ruta).read_text(encoding="utf-8"))
+    slots = [Slot(s["nombre"], s.get("interfaz"), list(s.get("ips") or [])) for s in datos.get("slots", [])]
+    nombres = [s.nombre for s in slots]
+    if len(set(nombres)) != len(nombres):
+        raise ValueError("Nombres de slot repetidos en la configuración")
+    return slots
+
+
+def opciones_default(etiqueta: bool = False) -> dict:
+    """Mismo formato que arma endpoints/conexion (etiqueta = solo ping)."""
+    pruebas = not etiqueta
+    return {
+        "info": {"sn": True, "mac": True, "ssid_24ghz": True, "ssid_5ghz": True,
+                 "software_version": True, "wifi_password": True, "model": True},
+        "tests": {"ping": True, "factory_reset": pruebas, "software_update": pruebas, "usb_port": pruebas,
+                  "tx_power": pruebas, "rx_power": pruebas, "wifi_24ghz_signal": pruebas,
+                  "wifi_5ghz_signal": pruebas},
+    }
+
+
+def iniciar_slots(slots: List[Slot], opciones: dict, out_q=None, auto_test_on_detect: bool = True) -> List[Slot]:
+    for s in slots:
+        s.iniciar(opciones, out_q, auto_test_on_detect)
+    return slots
+
+
+def detener_slots(slots: List[Slot]) -> None:
+    for s in slots:
+        s._detener.set()
+        if s._stop_corrida:
+            s._stop_corrida.set()
+    for s in slots:
+        s.detener()
+
+
+# ---------- laboratorio Linux (netns + veth) ----------
+def comandos_lab(n: int, modelos: List[str], prefijo: str = "ont") -> List[str]:
+    """
+    Un namespace por slot con el emulador en la IP real del equipo, unido por un par
+    veth a una interfaz del host (slotN) que hace de "tarjeta" del slot.
+    """
+    from src.backend.emulador.perfiles import MODELOS
+    cmds = []
+    for i in range(1, n + 1):
+        modelo = modelos[(i - 1) % len(modelos)]
+        ip_equipo = "192.168.1.1" if MODELOS[modelo][0] == "ZTE" else "192.168.100.1"
+        red = ip_equipo.rsplit(".", 1)[0]
+        ns, lado_ns, lado_host = f"{prefijo}{i}", f"{prefijo}{i}-eq", f"slot{i}"
+        cmds += [
+            f"ip netns add {ns}",
+            f"ip link add {lado_host} type veth peer name {lado_ns}",
+            f"ip link set {lado_ns} netns {ns}",
+            f"ip netns exec {ns} ip addr add {ip_equipo}/24 dev {lado_ns}",
+            f"ip netns exec {ns} ip link set {lado_ns} up",
+            f"ip netns exec {ns} ip link set lo up",
+            f"ip addr add {red}.{10 + i}/24 dev {lado_host}",
+            f"ip link set {lado_host} up",
+            f"ip netns exec {ns} {sys.executable} -m src.backend.emulador "
+            f"--modelo {modelo} --indice {i} --host {ip_equipo} --puerto 80 &",
+        ]
+    return cmds
+
+
+def config_lab(n: int, modelos: List[str]) -> dict:
+    from src.backend.emulador.perfiles import MODELOS
+    slots = []
+    for i in range(1, n + 1):
+        modelo = modelos[(i - 1) % len(modelos)]
+        red = "192.168.1" if MODELOS[modelo][0] == "ZTE" else "192.168.100"
+        slots.append({"nombre": f"S{i}", "interfaz": f"slot{i}", "ips": [f"{red}.{10 + i}"]})
+    return {"slots": slots}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estación multi-slot (varias ONTs a la vez)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("correr", help="Correr todos los slots de la configuración")
+    p.add_argument("--config", default=str(SLOTS_CONFIG))
+    p.add_argument("--etiqueta", action="store_true", help="Solo extraer etiqueta (sin pruebas)")
+
+    p = sub.add_parser("lab", help="Laboratorio Linux con netns + veth y el emulador")
+    p.add_argument("--slots", type=int, default=4)
+    p.add_argument("--modelos", default="MOD004,MOD001,MOD002")
+    p.add_argument("--config", help="Escribir aquí la configuración de slots del laboratorio")
+    p.add_argument("--aplicar", action="store_true", help="Ejecutar los comandos (requiere root)")
+
+    args = parser.parse_args(argv)
+    if args.cmd == "lab":
+        modelos = [m.strip().upper() for m in args.modelos.split(",") if m.strip()]
+        cmds = comandos_lab(args.slots, modelos)
+        if args.config:
+            Path(args.config).write_text(json.dumps(config_lab(args.slots, modelos), indent=2), encoding="utf-8")
+            print(f"[MULTISLOT] Configuración del laboratorio en {args.config}")
+        if not args.aplicar:
+            print("\n".join(cmds))
+            return 0
+        for c in cmds:
+            fondo = c.endswith("&")
+            partes = shlex.split(c.rstrip("& "))
+            if fondo:
+                subprocess.Popen(partes)
+            else:
+                subprocess.run(partes, check=True)
+        return 0
+
+    slots = cargar_slots(args.config)
+    out_q = queue.Queue()
+    iniciar_slots(slots, opciones_default(args.etiqueta), out_q)
+    print(f"[MULTISLOT] {len(slots)} slots corriendo (Ctrl+C para detener)")
+    try:
+        while any(s.vivo() for s in slots):
+            try:
+                _, ev = out_q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if ev["kind"] in ("log", "con", "logSuper", "pruebas"):
+                print(f"[{ev['slot']}] {ev['kind']}: {ev['payload']}")
+            elif ev["kind"] == "resultados":
+                info = (ev["payload"] or {}).get("info", {})
+                print(f"[{ev['slot']}] resultados: SN {info.get('sn')} valido={ev['payload'].get('valido')}")
+    except KeyboardInterrupt:
+        pass
+    detener_slots(slots)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+# src/backend/core/perfil_webdriver.py
+"""
+Perfil de round trips de Selenium y requests (opt-in).
+
+Cada find_element, switch_to.frame, click, .text, page_source, execute_script...
+termina en WebDriver.execute(); cada GET/POST de requests en Session.request().
+Con activar() se envuelven esos dos puntos (a nivel clase, así cubre también los
+drivers que los mixins crean como variable local) y se cuenta/mide cada comando por:
+
+  - slot:    tester que hizo la llamada (el 'self' más cercano en el stack); los
+             testers de un mismo equipo comparten tester.perfil_slot (nuevo_slot())
+  - sitio:   primera función del repo en el stack (find_element_anywhere, nav_wifi...)
+  - flujo:   mixin del fabricante que originó la llamada (ZTE, Huawei, Fiberhome...)
+  - objetivo: locator / url / frame (td3_2, /getpage.gch?pid=..., etc.)
+
+Al terminar un equipo, tomar(slot) saca sus contadores en el hilo de pruebas
+(antes de que otro equipo empiece a sumar) y guardar() escribe el reporte:
+    find_element_anywhere  findElement  td3_2   48 round trips   7.20 s
+
+La llave es el slot y no la IP: todas las ONT contestan en 192.168.1.1 /
+192.168.100.1, así que dos estaciones (o el siguiente equipo en la misma)
+sumarían en el mismo contador.
+
+Se activa con la variable de entorno ONT_PERFIL=1 (main_loop) o --perfil en el CLI.
+"""
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+PERFIL_DIR = Path(r"C:\ONT\perfil")
+TOP = 15
+
+_REPO = os.sep + "src" + os.sep + "backend" + os.sep
+# Envolturas propias (este módulo y los spans de core/trazas) no cuentan como sitio
+_OMITIR = {os.path.abspath(__file__), os.path.join(os.path.dirname(os.path.abspath(__file__)), "trazas.py")}
+_MAX_ELEMENTOS = 5000
+
+FLUJOS = {
+    "zte_mixin": "ZTE",
+    "huawei_mixin": "Huawei",
+    "fiber_mixin": "Fiberhome",
+    "grandstream_mixin": "Grandstream",
+}
+
+_lock = threading.Lock()
+_stats = {}          # slot -> {(sitio, flujo, comando, objetivo): [n, seg]}
+_hosts = {}          # slot -> host del tester
+_modelos = {}        # slot -> último modelo visto
+_elementos = {}      # id de WebElement -> locator con el que se encontró
+_originales = {}     # (clase, atributo) -> función original
+
+
+def activo() -> bool:
+    return bool(_originales)
+
+
+def habilitado_por_entorno() -> bool:
+    return os.environ.get("ONT_PERFIL", "").strip().lower() in ("1", "true", "si", "sí")
+
+
+_slots = itertools.count(1)
+SIN_SLOT = "?"   # llamadas sin tester en el stack
+
+
+def nuevo_slot() -> str:
+    """Llave para juntar los contadores de los testers de un mismo equipo (escaneo + pruebas)."""
+    return f"slot{next(_slots)}"
+
+
+def slot_de(tester) -> str:
+    """tester.perfil_slot o, si no tiene, una llave propia de esa instancia."""
+    return getattr(tester, "perfil_slot", None) or f"{tester.host}#{id(tester):x}"
+
+
+# ---------- contexto de la llamada ----------
+def _contexto():
+    """(slot, host, modelo, sitio, flujo) a partir del stack, sin formatear nada caro."""
+    f = sys._getframe(2)
+    sitio = flujo = None
+    slot = host = modelo = None
+    while f is not None:
+        code = f.f_code
+        ruta = code.co_filename
+        if _REPO in ruta and ruta not in _OMITIR:
+            if sitio is None:
+                nombre = getattr(code, "co_qualname", code.co_name)
+                # Helpers anidados (search_in_frames dentro de find_element_anywhere) cuentan para el de afuera
+                nombre = nombre.split(".<locals>")[0].rsplit(".", 1)[-1]
+                sitio = nombre
+            if flujo is None:
+                flujo = FLUJOS.get(os.path.splitext(os.path.basename(ruta))[0])
+            if host is None:
+                obj = f.f_locals.get("self")
+                if obj is not None and hasattr(obj, "host") and hasattr(obj, "model"):
+                    slot, host, modelo = slot_de(obj), obj.host, obj.model
+            if flujo is not None and host is not None:
+                break
+        f = f.f_back
+    return slot or SIN_SLOT, host, modelo, sitio or "?", flujo or "común"
+
+
+def _registrar(ctx, comando, objetivo, dur):
+    slot, host, modelo, sitio, flujo = ctx
+    clave = (sitio, flujo, comando, objetivo or "")
+    with _lock:
+        por_equipo = _stats.setdefault(slot, {})
+        acc = por_equipo.get(clave)
+        if acc is None:
+            por_equipo[clave] = [1, dur]
+        else:
+            acc[0] += 1
+            acc[1] += dur
+        # El tester del escaneo (0.0.0.0) no tapa la IP real del equipo en el mismo slot
+        if host and (host != "0.0.0.0" or slot not in _hosts):
+            _hosts[slot] = host
+        if modelo:
+            _modelos[slot] = modelo
+
+
+# ---------- objetivos ----------
+def _id_elemento(valor):
+    if isinstance(valor, dict):
+        for k, v in valor.items():
+            if k.startswith("element-") or k == "ELEMENT":
+                return v
+    return None
+
+
+def _objetivo_webdriver(params: dict):
+    if not params:
+        return ""
+    if "value" in params and "using" in params:
+        return str(params["value"])[:80]
+    if "url" in params:
+        return _objetivo_url(params["url"])
+    if "script" in params:
+        return " ".join(str(params["script"]).split())[:60]
+    if "id" in params:
+        v = params["id"]
+        if v is None:
+            return "default_content"
+        el = _id_elemento(v) if isinstance(v, dict) else v
+        # switch_to.frame(elemento) o comandos sobre un elemento: usar el locator con el que se encontró
+        if isinstance(el, str) and el in _elementos:
+            return _elementos[el]
+        return "" if isinstance(el, str) else str(v)[:40]
+    return ""
+
+
+def _recordar_elementos(params, respuesta):
+    if not params or "value" not in params or "using" not in params or not isinstance(respuesta, dict):
+        return
+    valor = respuesta.get("value")
+    ids = valor if isinstance(valor, list) else [valor]
+    loc = str(params["value"])[:80]
+    with _lock:
+        if len(_elementos) > _MAX_ELEMENTOS:
+            _elementos.clear()
+        for v in ids:
+            el = _id_elemento(v)
+            if el:
+                _elementos[el] = loc
+
+
+def _objetivo_url(url):
+    try:
+        p = urlsplit(str(url))
+        return (p.path or "/") + (("?" + p.query[:50]) if p.query else "")
+    except Exception:
+        return str(url)[:80]
+
+
+# ---------- envolturas ----------
+def _envolver_execute(cls):
+    original = cls.execute
+
+    def execute(self, driver_command, params=None):
+        ctx = _contexto()
+        t0 = time.perf_counter()
+        try:
+            respuesta = original(self, driver_command, params)
+        finally:
+            _registrar(ctx, str(driver_command), _objetivo_webdriver(params), time.perf_counter() - t0)
+        _recordar_elementos(params, respuesta)
+        return respuesta
+
+    _originales[(cls, "execute")] = original
+    cls.execute = execute
+
+
+def _envolver_request(cls):
+    original = cls.request
+
+    def request(self, method, url, *args, **kwargs):
+        ctx = _contexto()
+        t0 = time.perf_counter()
+        try:
+            return original(self, method, url, *args, **kwargs)
+        finally:
+            _registrar(ctx, f"HTTP {str(method).upper()}", _objetivo_url(url), time.perf_counter() - t0)
+
+    _originales[(cls, "request")] = original
+    cls.request = request
+
+
+def activar() -> bool:
+    """Envuelve WebDriver.execute y requests.Session.request. Idempotente."""
+    if activo():
+        return True
+    try:
+        from selenium.webdriver.remote.webdriver import WebDriver
+        _envolver_execute(WebDriver)
+    except ImportError:
+        print("[PERFIL] Selenium no disponible, solo se mide requests")
+    try:
+        import requests
+        _envolver_request(requests.Session)
+    except ImportError:
+        pass
+    if activo():
+        print("[PERFIL] Perfil de round trips activo")
+    return activo()
+
+
+def desactivar() -> None:
+    for (cls, attr), fn in list(_originales.items()):
+        setattr(cls, attr, fn)
+    _originales.clear()
+
+
+# ---------- reporte ----------
+def tomar(slot: str, *otros) -> dict:
+    """
+    Saca (y reinicia) los contadores de un slot. 'otros' son más slots que se
+    suman al mismo reporte. Llamar desde el hilo del equipo al terminar sus pruebas.
+    Las llamadas sin tester en el stack (slot SIN_SLOT) se suman al slot que se
+    tome en ese momento; si no, se quedarían acumulando para siempre.
+    """
+    if SIN_SLOT not in (slot, *otros):
+        otros = (*otros, SIN_SLOT)
+    with _lock:
+        stats = _stats.pop(slot, {})
+        host = _hosts.pop(slot, None)
+        modelo = _modelos.pop(slot, None)
+        for s in otros:
+            for clave, (n, seg) in _stats.pop(s, {}).items():
+                acc = stats.setdefault(clave, [0, 0.0])
+                acc[0] += n
+                acc[1] += seg
+            h, m = _hosts.pop(s, None), _modelos.pop(s, None)
+            # El tester del escaneo vive en 0.0.0.0: se prefiere la IP real del equipo
+            if h and (host is None or host == "0.0.0.0"):
+                host = h
+            modelo = modelo or m
+    return {"host": host or "?", "modelo": modelo, "stats": stats}
+
+
+def hot_spots(datos: dict, top: int = TOP) -> list:
+    """Top por tiempo: sitio + objetivo agrupan los comandos (find + click + text sobre td3_2)."""
+    grupos = {}
+    for (sitio, flujo, comando, objetivo), (n, seg) in datos["stats"].items():
+        g = grupos.setdefault((sitio, flujo, objetivo), {"n": 0, "seg": 0.0, "comandos": {}})
+        g["n"] += n
+        g["seg"] += seg
+        g["comandos"][comando] = g["comandos"].get(comando, 0) + n
+    filas = [
+        {"sitio": s, "flujo": f, "objetivo": o, "round_trips": g["n"], "seg": round(g["seg"], 3),
+         "comandos": dict(sorted(g["comandos"].items(), key=lambda kv: -kv[1]))}
+        for (s, f, o), g in grupos.items()
+    ]
+    filas.sort(key=lambda x: -x["seg"])
+    return filas[:top]
+
+
+def por_flujo(datos: dict) -> dict:
+    out = {}
+    for (_, flujo, comando, _), (n, seg) in datos["stats"].items():
+        acc = out.setdefault(flujo, {"round_trips": 0, "seg": 0.0})
+        acc["round_trips"] += n
+        acc["seg"] = round(acc["seg"] + seg, 3)
+    return out
+
+
+def reporte(datos: dict, top: int = TOP) -> str:
+    total_n = sum(n for n, _ in datos["stats"].values())
+    total_s = sum(s for _, s in datos["stats"].values())
+    lineas = [f"[PERFIL] {datos['host']} ({datos.get('modelo') or '?'}): "
+              f"{total_n} round trips, {total_s:.1f} s"]
+    for flujo, acc in sorted(por_flujo(datos).items(), key=lambda kv: -kv[1]["seg"]):
+        lineas.append(f"  flujo {flujo}: {acc['round_trips']} round trips, {acc['seg']:.1f} s")
+    for h in hot_spots(datos, top):
+        obj = f" en {h['objetivo']}" if h["objetivo"] else ""
+        lineas.append(f"  {h['sitio']}{obj}: {h['round_trips']} round trips, {h['seg']:.2f} s "
+                      f"[{h['flujo']}] {h['comandos']}")
+    return "\n".join(lineas)
+
+
+def guardar(datos: dict, sn: str = None, top: int = TOP):
+    """Imprime el reporte de un tomar() y lo guarda en PERFIL_DIR (JSON). Regresa la ruta o None."""
+    if not datos["stats"]:
+        return None
+    host = datos["host"]
+    print(reporte(datos, top))
+    try:
+        PERFIL_DIR.mkdir(parents=True, exist_ok=True)
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        ruta = PERFIL_DIR / f"perfil_{datos.get('modelo') or 'NA'}_{sn or host}_{ts}.json"
+        ruta.write_text(json.dumps({
+            "host": host, "sn": sn, "modelo": datos.get("modelo"), "fecha": ts,
+            "flujos": por_flujo(datos),
+            "hot_spots": hot_spots(datos, top),
+            "comandos": [
+                {"sitio": s, "flujo": f, "comando": c, "objetivo": o, "n": n, "seg": round(seg, 4)}
+                for (s, f, c, o), (n, seg) in sorted(datos["stats"].items(), key=lambda kv: -kv[1][1])
+            ],
+        }, indent=2, ensure_ascii=False), encoding="utf-8")
+        return str(ruta)
+    except Exception as e:
+        print(f"[PERFIL] No se pudo guardar el reporte: {e}")
+        return None
+
+
+def volcar_equipo(slot: str, sn: str = None, top: int = TOP):
+    """tomar + guardar en el mismo hilo (CLI, un solo equipo)."""
+    return guardar(tomar(slot), sn, top)
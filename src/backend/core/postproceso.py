@@ -0,0 +1,146 @@
+# src/backend/core/postproceso.py
+"""
+Pipeline de post-proceso en segundo plano.
+
+Cuando termina la FASE 2, el hilo de pruebas solo emite "resultados" y encola
+aquí lo que genera archivos (reporte JSON, certificado PDF, etiqueta TXT...).
+Así la detección del siguiente equipo no espera a WeasyPrint ni al disco.
+
+- Pool acotado: N hilos y una cola con tope (si se llena, enviar() bloquea).
+- Reintentos con espera creciente.
+- Cada tarea reporta por out_q:
+    ("postproceso", {"tarea", "sn", "estado": OK|REINTENTO|ERROR, "intento", "error"})
+- Los hilos son daemon: al cerrar la app o terminar main_loop se llama
+  drenar(timeout) para no perder en silencio lo que siga en cola.
+"""
+import queue
+import threading
+import time
+import traceback
+
+WORKERS = 2
+MAX_PENDIENTES = 16
+REINTENTOS = 3
+ESPERA_S = 2.0
+
+
+class _Tarea:
+    __slots__ = ("nombre", "fn", "args", "kwargs", "sn", "out_q")
+
+    def __init__(self, nombre, fn, args, kwargs, sn, out_q):
+        self.nombre = nombre
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.sn = sn
+        self.out_q = out_q
+
+
+class PostProceso:
+    def __init__(self, workers: int = WORKERS, max_pendientes: int = MAX_PENDIENTES,
+                 reintentos: int = REINTENTOS, espera_s: float = ESPERA_S):
+        self.reintentos = max(1, int(reintentos))
+        self.espera_s = float(espera_s)
+        self._q = queue.Queue(maxsize=max_pendientes)
+        self._lock = threading.Lock()
+        self._en_curso = []     # tareas encoladas o corriendo (para reportar al cerrar)
+        self._hilos = []
+        for i in range(max(1, int(workers))):
+            t = threading.Thread(target=self._worker, name=f"postproceso-{i}", daemon=True)
+            t.start()
+            self._hilos.append(t)
+
+    def enviar(self, nombre, fn, *args, sn=None, out_q=None, **kwargs):
+        """Encola fn(*args, **kwargs). Bloquea solo si ya hay MAX_PENDIENTES en espera."""
+        print(f"[POSTPROCESO] Encolando '{nombre}' (sn={sn}, en cola={self._q.qsize()})")
+        tarea = _Tarea(nombre, fn, args, kwargs, sn, out_q)
+        with self._lock:
+            self._en_curso.append(tarea)
+        self._q.put(tarea)
+
+    def pendientes(self) -> int:
+        return self._q.unfinished_tasks
+
+    def detalle_pendientes(self) -> list:
+        """["nombre (sn)", ...] de lo que no ha terminado."""
+        with self._lock:
+            return [f"{t.nombre} ({t.sn or 'sin SN'})" for t in self._en_curso]
+
+    def esperar(self, timeout: float = None) -> bool:
+        """Espera a que se vacíe la cola. True si terminó todo a tiempo."""
+        limite = None if timeout is None else time.time() + timeout
+        while self._q.unfinished_tasks:
+            if limite is not None and time.time() >= limite:
+                return False
+            time.sleep(0.1)
+        return True
+
+    # ---------- interno ----------
+    def _emit(self, tarea, estado, intento, error=None):
+        if tarea.out_q:
+            tarea.out_q.put(("postproceso", {
+                "tarea": tarea.nombre,
+                "sn": tarea.sn,
+                "estado": estado,
+                "intento": intento,
+                "error": error,
+            }))
+
+    def _worker(self):
+        while True:
+            tarea = self._q.get()
+            try:
+                self._ejecutar(tarea)
+            finally:
+                with self._lock:
+                    if tarea in self._en_curso:
+                        self._en_curso.remove(tarea)
+                self._q.task_done()
+
+    def _ejecutar(self, tarea):
+        for intento in range(1, self.reintentos + 1):
+            try:
+                tarea.fn(*tarea.args, **tarea.kwargs)
+                print(f"[POSTPROCESO] '{tarea.nombre}' OK (sn={tarea.sn}, intento {intento})")
+                self._emit(tarea, "OK", intento)
+                return
+            except Exception as e:
+                err = f"{type(e).__name__}: {e}"
+                if intento < self.reintentos:
+                    print(f"[POSTPROCESO] '{tarea.nombre}' falló (intento {intento}): {err}. Reintentando...")
+                    self._emit(tarea, "REINTENTO", intento, err)
+                    time.sleep(self.espera_s * intento)
+                else:
+                    print(f"[POSTPROCESO] '{tarea.nombre}' falló definitivamente: {err}")
+                    traceback.print_exc()
+                    self._emit(tarea, "ERROR", intento, err)
+
+
+_PIPELINE = None
+_PIPELINE_LOCK = threading.Lock()
+
+
+def get_postproceso() -> PostProceso:
+    """Pipeline único por proceso (se crea al primer uso)."""
+    global _PIPELINE
+    with _PIPELINE_LOCK:
+        if _PIPELINE is None:
+            _PIPELINE = PostProceso()
+        return _PIPELINE
+
+
+def drenar(timeout: float = 30.0) -> list:
+    """
+    Espera (acotado) a que termine lo encolado. Regresa lo que quedó pendiente
+    (vacío si terminó todo o si el pipeline nunca se usó).
+    """
+    with _PIPELINE_LOCK:
+        pp = _PIPELINE
+    if pp is None or not pp.pendientes():
+        return []
+    print(f"[POSTPROCESO] Esperando {pp.pendientes()} tarea(s) pendientes (máx {timeout:g} s)...")
+    if pp.esperar(timeout):
+        return []
+    restantes = pp.detalle_pendientes()
+    print(f"[POSTPROCESO] Sin terminar al cerrar: {', '.join(restantes)}")
+    return restantes
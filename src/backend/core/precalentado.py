@@ -0,0 +1,205 @@
+# src/backend/core/precalentado.py
+"""
+Pre-calentado especulativo del navegador y la config al detectar enlace.
+
+Hoy la FASE 2 crea el tester, corre run_all_tests y hasta login() arranca
+Chrome (1-4 s) y carga la página de login. Con esto, en cuanto el escaneo ve
+que la IP responde (antes de la detección del modelo) se lanzan en paralelo:
+  - Chrome con las mismas opciones que usó el último login de ese modelo en
+    esa IP (el modelo se adivina con el último equipo visto ahí; la estación
+    prueba lotes del mismo modelo) y la página de login abierta
+  - la config de umbrales (cargarConfig) leída de la BD
+
+Cuando la detección confirma el modelo: si se adivinó bien no se hace nada;
+si no, se tira ese Chrome y se lanza el del modelo correcto.
+
+El login de cada vendor pide su driver con CommonMixin._crear_driver: si hay uno
+pre-calentado para ese host/modelo con exactamente las mismas opciones se lo
+lleva (esperando a que termine de arrancar); si no, crea uno como siempre y deja
+la "receta" para el siguiente equipo. Lo que no se use se cierra con descartar().
+"""
+import copy
+import sys
+import threading
+import time
+
+from src.backend.utils.network_utils import con_enlace, enlace_actual
+
+# Cuánto esperar a un Chrome que sigue arrancando antes de crear otro
+ESPERA_DRIVER_S = 20.0
+# Vigencia de la config pre-cargada
+VIGENCIA_CONFIG_S = 60.0
+
+_lock = threading.Lock()
+_recetas = {}           # (modelo, enlace) -> (args, opciones_copia, ruta_chromedriver)
+_ultimo_modelo = {}     # (ip, enlace) -> modelo
+_actual = {}            # enlace -> _Calentando (uno por slot)
+_config = None          # (t, dict)
+
+
+# ---------- URL de login por vendor ----------
+def url_login(ip: str, modelo: str) -> str:
+    if modelo in ("MOD001", "MOD008"):
+        return f"http://{ip}/html/login_inter.html"
+    return f"http://{ip}/"
+
+
+def _proxy_slot():
+    """Puerto del proxy Chrome del slot del hilo actual (multi-slot), si hay."""
+    ms = sys.modules.get("src.backend.core.multislot")
+    return getattr(ms._hilo, "proxy", None) if ms else None
+
+
+class _Calentando:
+    def __init__(self, ip: str, modelo: str, enlace):
+        self.ip = ip
+        self.modelo = modelo
+        self.enlace = enlace
+        self.args = None
+        self.driver = None
+        self.error = None
+        self.listo = threading.Event()
+        self.descartado = False
+        self._hilo = None
+
+    def lanzar(self, receta) -> "_Calentando":
+        self.args = receta[0]
+        proxy = _proxy_slot()
+        self._hilo = threading.Thread(target=self._correr, args=(receta, proxy),
+                                      name=f"precalentado-{self.ip}", daemon=True)
+        self._hilo.start()
+        return self
+
+    def _correr(self, receta, proxy):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        _, opciones, ruta = receta
+        if proxy:
+            sys.modules["src.backend.core.multislot"]._hilo.proxy = proxy
+        t0 = time.perf_counter()
+        try:
+            with con_enlace(self.enlace):
+                driver = webdriver.Chrome(service=Service(ruta), options=copy.deepcopy(opciones))
+                try:
+                    driver.set_page_load_timeout(15)
+                    driver.get(url_login(self.ip, self.modelo))
+                except Exception as e:
+                    print(f"[PRECALENTADO] Login de {self.ip} no cargó todavía: {e}")
+            self.driver = driver
+            print(f"[PRECALENTADO] Chrome listo para {self.modelo} en {self.ip} ({time.perf_counter() - t0:.1f} s)")
+        except Exception as e:
+            self.error = e
+            print(f"[PRECALENTADO] No se pudo arrancar Chrome: {e}")
+        finally:
+            self.listo.set()
+            if self.descartado:
+                self._cerrar()
+
+    def _cerrar(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def descartar(self):
+        self.descartado = True
+        if self.listo.is_set():
+            self._cerrar()
+
+
+# ---------- config ----------
+def _cargar_config():
+    global _config
+    try:
+        from src.backend.endpoints.conexion import cargarConfig
+        _config = (time.monotonic(), cargarConfig())
+    except Exception as e:
+        print(f"[PRECALENTADO] Config no pre-cargada: {e}")
+
+
+def tomar_config():
+    """Config pre-cargada (una sola vez) o None."""
+    global _config
+    with _lock:
+        cfg, _config = _config, None
+    if cfg and time.monotonic() - cfg[0] <= VIGENCIA_CONFIG_S:
+        return cfg[1]
+    return None
+
+
+# ---------- ciclo de vida ----------
+def _arrancar(ip: str, modelo: str, enlace):
+    """Con _lock tomado. Regresa el pre-calentado anterior para cerrarlo fuera del lock."""
+    previo = _actual.pop(enlace, None)
+    receta = _recetas.get((modelo, enlace))
+    if receta is not None:
+        print(f"[PRECALENTADO] Arrancando Chrome para {modelo} en {ip}")
+        _actual[enlace] = _Calentando(ip, modelo, enlace).lanzar(receta)
+    return previo
+
+
+def iniciar(ip: str, modelo: str = None) -> None:
+    """La IP respondió: Chrome del modelo esperado + config, en paralelo a la detección."""
+    enlace = enlace_actual()
+    previo = None
+    with _lock:
+        modelo = modelo or _ultimo_modelo.get((ip, enlace))
+        actual = _actual.get(enlace)
+        if modelo and not (actual and actual.ip == ip and actual.modelo == modelo and not actual.descartado):
+            previo = _arrancar(ip, modelo, enlace)
+    if previo is not None:
+        previo.descartar()
+    threading.Thread(target=_cargar_config, name="precalentado-config", daemon=True).start()
+
+
+def confirmar(ip: str, modelo: str) -> None:
+    """La detección dio el modelo real; si la apuesta falló se corrige."""
+    if not modelo:
+        return
+    enlace = enlace_actual()
+    with _lock:
+        _ultimo_modelo[(ip, enlace)] = modelo
+        actual = _actual.get(enlace)
+        if actual is not None and actual.ip == ip and actual.modelo == modelo:
+            return
+        previo = _arrancar(ip, modelo, enlace)
+    if previo is not None:
+        previo.descartar()
+
+
+def tomar_driver(host: str, modelo: str, opciones):
+    """Driver pre-calentado para este login o None. Las opciones deben coincidir exactamente."""
+    enlace = enlace_actual()
+    with _lock:
+        actual = _actual.get(enlace)
+        if actual is None or actual.descartado or actual.ip != host or actual.modelo != modelo:
+            return None
+        if list(opciones.arguments) != actual.args:
+            print("[PRECALENTADO] Opciones de Chrome distintas: se crea uno nuevo")
+            return None
+        del _actual[enlace]
+    if not actual.listo.wait(ESPERA_DRIVER_S) or actual.driver is None:
+        actual.descartar()
+        return None
+    driver, actual.driver = actual.driver, None
+    print(f"[PRECALENTADO] Usando Chrome pre-calentado para {host}")
+    return driver
+
+
+def recordar(modelo: str, opciones, ruta_chromedriver: str) -> None:
+    """Receta del login que se acaba de hacer (opciones antes de que nadie las toque)."""
+    if not modelo:
+        return
+    with _lock:
+        _recetas[(modelo, enlace_actual())] = (list(opciones.arguments), copy.deepcopy(opciones), ruta_chromedriver)
+
+
+def descartar() -> None:
+    """Cierra el Chrome pre-calentado de este enlace si nadie lo tomó."""
+    with _lock:
+        actual = _actual.pop(enlace_actual(), None)
+    if actual is not None:
+        actual.descartar()
@@ -0,0 +1,163 @@
+# src/backend/core/resultados.py
+"""
+Modelo tipado de resultados de una ONT.
+
+Los mixins siguen escribiendo sus capturas crudas en `test_results` (cada
+vendor con sus llaves); aquí vive la proyección normalizada que consume la UI,
+la BD y el certificado:
+
+    {"info": {...}, "tests": {...}, "valido": bool}
+
+Los registros usan __slots__ (dataclass(slots=True)) para que cada equipo
+ocupe poco y no se arrastren dicts anidados entre capas.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional
+
+SIN_PRUEBA = "SIN PRUEBA"
+
+# Límites duros de calcular_valido (independientes de fibra_set): TX > 0 dBm y RX > -28 dBm
+TX_MIN_VALIDO = 0.0
+RX_MIN_VALIDO = -28.0
+
+# Orden de las llaves de "tests" en el payload
+CLAVES_PRUEBAS = ("ping", "reset", "usb", "tx", "rx", "w24", "w5", "sftU")
+
+# Defaults que usaba _resultados_json_corto cuando falta un dato
+INFO_DEFAULTS = {
+    "modelo": "DESCONOCIDO",
+    "sn": "N/A",
+    "mac": "N/A",
+    "sftVer": "N/A",
+    "wifi24": "N/A",
+    "wifi5": "N/A",
+    "passWifi": "N/A",
+}
+
+
+@dataclass(slots=True)
+class InfoDispositivo:
+    modelo: Optional[str] = None
+    fecha_test: Optional[str] = None
+    sn: Optional[str] = None
+    mac: Optional[str] = None
+    sftVer: Optional[str] = None
+    wifi24: Optional[str] = None
+    wifi5: Optional[str] = None
+    passWifi: Optional[str] = None
+
+    def to_dict(self, con_defaults: bool = True) -> Dict[str, Any]:
+        """
+        con_defaults=True  -> siempre trae todas las llaves (N/A si falta).
+        con_defaults=False -> solo las llaves con valor (estilo Fiberhome), salvo
+                              "sn", que siempre sale (None si no se leyó), como
+                              lo armaba _resultadosFiber antes del registro tipado.
+        """
+        out = {}
+        for f in fields(self):
+            v = getattr(self, f.name)
+            if con_defaults:
+                out[f.name] = v or INFO_DEFAULTS.get(f.name, v)
+            elif v or f.name == "sn":
+                out[f.name] = v
+        return out
+
+
+@dataclass(slots=True)
+class ResultadoPrueba:
+    """
+    valor: lo que espera la UI para esa prueba. Puede ser "PASS"/"FAIL",
+    bool, el valor de potencia en dBm, o SIN_PRUEBA si no se ejecutó.
+    """
+    clave: str
+    valor: Any = SIN_PRUEBA
+
+    @property
+    def ejecutada(self) -> bool:
+        return self.valor != SIN_PRUEBA
+
+
+@dataclass(slots=True)
+class CapturaCruda:
+    """Referencia (sin copiar) a lo que el vendor dejó en test_results["tests"]."""
+    nombre: str
+    datos: Any = None
+
+
+@dataclass(slots=True)
+class ResultadosONT:
+    info: InfoDispositivo = field(default_factory=InfoDispositivo)
+    pruebas: Dict[str, ResultadoPrueba] = field(default_factory=dict)
+    capturas: List[CapturaCruda] = field(default_factory=list)
+    valido: bool = False
+    # True -> las pruebas en SIN_PRUEBA no salen en el payload (ZTE/Huawei)
+    omitir_sin_prueba: bool = True
+    # True -> info con N/A por default; False -> solo llaves con valor (Fiberhome)
+    info_con_defaults: bool = True
+
+    def set(self, clave: str, valor: Any):
+        self.pruebas[clave] = ResultadoPrueba(clave, valor)
+
+    def get(self, clave: str, default: Any = SIN_PRUEBA) -> Any:
+        p = self.pruebas.get(clave)
+        return p.valor if p is not None else default
+
+    def capturar(self, tests_crudos: Optional[dict]):
+        """Guarda referencias a las capturas crudas del vendor."""
+        self.capturas = [CapturaCruda(k, v) for k, v in (tests_crudos or {}).items()]
+
+    def calcular_valido(self) -> bool:
+        """Mismo criterio que tenía _resultados_json_corto."""
+        def _f(v):
+            try:
+                return float(v)
+            except (TypeError, ValueError):
+                return None
+
+        tx = _f(self.get("tx"))
+        rx = _f(self.get("rx"))
+        self.valido = bool(
+            self.get("ping") == "PASS"
+            and self.get("reset") == "PASS"
+            and self.get("usb") == "PASS"
+            and tx is not None and tx > TX_MIN_VALIDO
+            and rx is not None and rx > RX_MIN_VALIDO
+            and bool(self.get("w24"))
+            and bool(self.get("w5"))
+        )
+        return self.valido
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Proyección única al dict info/tests/valido que usa el resto de la app."""
+        tests = {}
+        for clave in CLAVES_PRUEBAS:
+            p = self.pruebas.get(clave)
+            if p is None:
+                continue
+            if self.omitir_sin_prueba and clave != "ping" and not p.ejecutada:
+                continue
+            tests[clave] = p.valor
+        return {
+            "info": self.info.to_dict(con_defaults=self.info_con_defaults),
+            "tests": tests,
+            "valido": self.valido,
+        }
+
+
+def serializar(resultado: ResultadosONT, incluir_capturas: bool = False, indent: Optional[int] = None) -> str:
+    """JSON del payload; con incluir_capturas agrega los datos crudos del vendor."""
+    data = resultado.to_payload()
+    if incluir_capturas:
+        data["raw"] = {c.nombre: c.datos for c in resultado.capturas}
+    return json.dumps(data, indent=indent, ensure_ascii=False, default=str)
+
+
+def copiar_opciones(opciones: Optional[dict]) -> dict:
+    """
+    Copia de opcionesTest para una corrida. Son dos niveles de bools
+    ({"info": {...}, "tests": {...}}), así que no hace falta deepcopy.
+    """
+    return {k: (dict(v) if isinstance(v, dict) else v) for k, v in (opciones or {}).items()}
@@ -0,0 +1,202 @@
+# src/backend/core/sesiones.py
+"""
+Registro de sesiones autenticadas por equipo.
+
+pruebaUnitariaONT y cada ciclo de main_loop crean un ONTAutomatedTester nuevo
+(requests.Session nueva) y vuelven a hacer login. En Fiberhome y Huawei eso
+además choca con el "usuario ya logueado" de la sesión anterior
+(_wait_not_busy_login_page hasta 180 s, _router_logout_best_effort...).
+
+Al terminar, el login de cada vendor deja aquí su sesión (cookies, sessionid y
+el Chrome ya logueado) en lugar de cerrarla. La llave es (enlace, IP) y la
+identidad del equipo se confirma con la MAC (tabla ARP) y el SN: si en esa IP
+ya hay otro equipo la sesión se tira. El siguiente tester que haga login en ese
+equipo la toma si pasa la prueba barata del vendor (una página autenticada);
+solo si la sesión expiró se hace el login completo.
+
+Sobreviven a los cambios de modo (main_loop se detiene y se vuelve a lanzar);
+se tiran cuando el equipo se desconecta, cuando consultaSN hace su propio login
+y al salir de la app. Cada Chrome guardado son cientos de MB: por enlace solo
+queda la última sesión, el registro no pasa de MAX_SESIONES y las vencidas se
+cierran en cada guardar. Quien recorre muchos equipos (auditoría, benchmark)
+pone tester.guardar_sesion = False y el driver se cierra como antes.
+
+Uso desde los mixins:
+    sesion = sesiones.tomar(self, self._xx_sesion_viva)   # antes de loguearse
+    sesiones.guardar(self, driver, logout=...)           # en lugar de cerrar
+"""
+import atexit
+import platform
+import re
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from src.backend.core.indice_resultados import sn_de
+from src.backend.utils import presencia
+from src.backend.utils.network_utils import enlace_actual
+
+# Una sesión sin usar más de esto ya no se intenta (el router la expira antes)
+VIGENCIA_S = 600
+# Tope del registro (una por enlace en la práctica; varias NIC = varias estaciones)
+MAX_SESIONES = 4
+
+CREATE_NO_WINDOW = 0x08000000
+
+_lock = threading.Lock()
+_registro = {}   # (enlace, host) -> Sesion
+
+
+@dataclass
+class Sesion:
+    host: str
+    modelo: Optional[str]
+    mac: Optional[str]
+    sn: Optional[str]
+    enlace: Any
+    driver: Any = None
+    session: Any = None                 # requests.Session con las cookies
+    session_id: Optional[str] = None
+    logout: Optional[Callable] = None   # logout(driver) best effort al tirarla
+    usada: float = field(default_factory=time.monotonic)
+
+    def cerrar(self, logout: bool = True):
+        if self.driver is None:
+            return
+        if logout and self.logout is not None:
+            try:
+                self.logout(self.driver)
+            except Exception as e:
+                print(f"[SESIONES] Logout de {self.host} falló: {e}")
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.driver = None
+
+
+def mac_de(host: str) -> Optional[str]:
+    """MAC del equipo según la tabla ARP del sistema (sin tocar el router)."""
+    # La fuente de presencia ya la trae de los eventos ARP
+    mac = presencia.mac_conocida(host)
+    if mac:
+        return mac
+    try:
+        if platform.system() == "Windows":
+            out = subprocess.run(["arp", "-a", host], capture_output=True, text=True,
+                                 creationflags=CREATE_NO_WINDOW, timeout=3).stdout
+        else:
+            with open("/proc/net/arp", encoding="utf-8") as f:
+                out = "\n".join(l for l in f if l.split()[:1] == [host])
+        m = re.search(r"([0-9A-Fa-f]{2}[-:]){5}[0-9A-Fa-f]{2}", out)
+        if m and m.group(0) not in ("00:00:00:00:00:00", "00-00-00-00-00-00"):
+            return m.group(0).replace("-", ":").upper()
+    except Exception as e:
+        print(f"[SESIONES] No se pudo leer ARP de {host}: {e}")
+    return None
+
+
+def guardar(tester, driver, logout: Callable = None) -> bool:
+    """
+    Deja la sesión del tester lista para el siguiente. False si no se pudo
+    (sin driver) o el tester no guarda sesiones; entonces quien llama cierra como antes.
+    """
+    if driver is None or not getattr(tester, "guardar_sesion", True):
+        return False
+    sesion = Sesion(
+        host=tester.host,
+        modelo=tester.model,
+        mac=mac_de(tester.host),
+        sn=sn_de(getattr(tester, "test_results", None)),
+        enlace=enlace_actual(),
+        driver=driver,
+        session=getattr(tester, "session", None),
+        session_id=getattr(tester, "session_id", None),
+        logout=logout,
+    )
+    with _lock:
+        sobran = _podar(sesion.enlace)
+        _registro[(sesion.enlace, sesion.host)] = sesion
+    for previa in sobran:
+        if previa.driver is not driver:
+            previa.cerrar()
+    print(f"[SESIONES] Sesión de {sesion.host} ({sesion.sn or sesion.mac or 'sin id'}) guardada")
+    return True
+
+
+def _podar(enlace) -> list:
+    """
+    Saca del registro (con _lock tomado) lo que ya no debe quedarse al guardar
+    una sesión nueva en `enlace`: la anterior de ese enlace, las vencidas y,
+    si aún sobran, las menos usadas. Regresa las sesiones a cerrar.
+    """
+    ahora = time.monotonic()
+    fuera = [k for k, s in _registro.items() if k[0] == enlace or ahora - s.usada > VIGENCIA_S]
+    sobran = [_registro.pop(k) for k in fuera]
+    if len(_registro) >= MAX_SESIONES:
+        viejas = sorted(_registro, key=lambda k: _registro[k].usada)[:len(_registro) - MAX_SESIONES + 1]
+        sobran += [_registro.pop(k) for k in viejas]
+    return sobran
+
+
+def tomar(tester, probar: Callable) -> Optional[Sesion]:
+    """
+    Sesión viva para este equipo o None. probar(driver) -> bool es la prueba
+    barata del vendor. Si pasa, el tester queda con la session/sessionid y el
+    driver de la sesión; si no, se cierra y toca login completo.
+    """
+    with _lock:
+        sesion = _registro.pop((enlace_actual(), tester.host), None)
+    if sesion is None:
+        return None
+
+    motivo = None
+    if tester.model and sesion.modelo and tester.model != sesion.modelo:
+        motivo = f"otro modelo ({sesion.modelo})"
+    elif time.monotonic() - sesion.usada > VIGENCIA_S:
+        motivo = "vencida"
+    else:
+        mac = mac_de(tester.host)
+        if mac and sesion.mac and mac != sesion.mac:
+            motivo = f"otro equipo en la IP (MAC {mac})"
+    if motivo is None:
+        try:
+            if not probar(sesion.driver):
+                motivo = "expirada en el equipo"
+        except Exception as e:
+            motivo = f"prueba falló: {e}"
+    if motivo is not None:
+        print(f"[SESIONES] Sesión de {tester.host} descartada: {motivo}")
+        # Si expiró o es otro equipo el logout no sirve; solo se libera Chrome
+        sesion.cerrar(logout=False)
+        return None
+
+    if sesion.session is not None:
+        tester.session = sesion.session
+    if sesion.session_id:
+        tester.session_id = sesion.session_id
+    tester.driver = sesion.driver
+    print(f"[SESIONES] Reusando sesión de {tester.host} ({sesion.sn or sesion.mac or 'sin id'}); sin login")
+    return sesion
+
+
+def descartar(host: str = None, logout: bool = False) -> None:
+    """Cierra las sesiones de este enlace (de un host o todas): el equipo se fue u otro va a loguearse."""
+    enlace = enlace_actual()
+    with _lock:
+        llaves = [k for k in _registro if k[0] == enlace and (host is None or k[1] == host)]
+        sesiones = [_registro.pop(k) for k in llaves]
+    for sesion in sesiones:
+        sesion.cerrar(logout=logout)
+
+
+@atexit.register
+def _al_salir():
+    # Al cerrar la app no se deja la sesión abierta en el equipo ni Chrome colgado
+    with _lock:
+        sesiones = list(_registro.values())
+        _registro.clear()
+    for sesion in sesiones:
+        sesion.cerrar()
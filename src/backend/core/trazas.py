@@ -0,0 +1,347 @@
+# src/backend/core/trazas.py
+"""
+Trazas por fase (spans) para saber en qué se van los minutos de cada equipo.
+
+    from src.backend.core.trazas import span, trazar, etiquetas
+
+    with etiquetas(host=ip, modelo="MOD002", estacion=3):
+        with span("descubrimiento", cat="descubrimiento"):
+            ...
+
+    @trazar(cat="reinicio")
+    def wait_for_reconnect(...): ...
+
+instrumentar_clase(ONTAutomatedTester) envuelve por prefijo los métodos de los
+mixins (login, nav_*, parse_*, test_*, reset/espera de reinicio, guardado...)
+y les pone host/modelo del propio tester.
+
+Los spans van a un ring buffer en memoria (si se llena se pierden los más
+viejos); volcar() los pasa a la tabla `timings` y a un JSON diario en formato
+Chrome trace-event (abrir en chrome://tracing o ui.perfetto.dev).
+
+Uso:
+    python -m src.backend.core.trazas resumen --modelo MOD002 --dias 7
+    python -m src.backend.core.trazas exportar --desde 2025-11-01 --salida trace.json
+"""
+import argparse
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ACTIVO = True
+CAPACIDAD = 20000
+TRAZAS_DIR = Path(r"C:\ONT\trazas")
+
+# (prefijo o nombre exacto del método, categoría). Gana la primera que coincida.
+REGLAS = (
+    ("_scan_for_device", "descubrimiento"),
+    ("_check_network_configuration", "descubrimiento"),
+    ("_detect_", "deteccion"),
+    ("login", "login"),
+    ("_login_", "login"),
+    ("_selenium_login", "login"),
+    ("_do_login_post", "login"),
+    ("nav_", "nav"),
+    ("parse_", "parse"),
+    ("test_", "prueba"),
+    ("_reset_factory_", "reinicio"),
+    ("wait_for_router", "reinicio"),
+    ("_wait_not_busy_login_page", "reinicio"),
+    ("huawei_info", "flujo"),
+    ("zte_info", "flujo"),
+    ("info_zte_basic", "flujo"),
+    ("_resultados_finales", "proyeccion"),
+    ("save_results", "archivo"),
+    ("saveBDiaria", "bd"),
+)
+
+
+class Tracer:
+    def __init__(self, capacidad: int = CAPACIDAD):
+        self._buf = deque(maxlen=capacidad)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.descartados = 0
+
+    # ---------- etiquetas por hilo ----------
+    def tags(self) -> dict:
+        return getattr(self._local, "tags", {})
+
+    @contextmanager
+    def etiquetas(self, **tags):
+        """Etiquetas (host, modelo, estacion, sn...) que heredan los spans de este hilo."""
+        prev = self.tags()
+        self._local.tags = {**prev, **{k: v for k, v in tags.items() if v is not None}}
+        try:
+            yield
+        finally:
+            self._local.tags = prev
+
+    def fijar(self, **tags):
+        """
+        Agrega etiquetas al contexto actual de este hilo (p. ej. el SN en cuanto
+        se conoce tras el login). Duran hasta que cierra el etiquetas() que las
+        contiene; los spans que siguen abiertos también las llevan. Sin un
+        etiquetas() abierto no hace nada, para que no queden pegadas al hilo.
+        """
+        actuales = self.tags()
+        if not actuales:
+            return
+        self._local.tags = {**actuales, **{k: v for k, v in tags.items() if v is not None}}
+
+    # ---------- spans ----------
+    @contextmanager
+    def span(self, nombre: str, cat: str = "general", **tags):
+        if not ACTIVO:
+            yield
+            return
+        inicio = time.time()
+        t0 = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            dur = time.perf_counter() - t0
+            etiquetas = self.tags()
+            if tags:
+                etiquetas = {**etiquetas, **{k: v for k, v in tags.items() if v is not None}}
+            self._agregar((int(inicio * 1e6), int(dur * 1e6), nombre, cat, etiquetas,
+                           threading.get_ident(), error))
+
+    def _agregar(self, registro):
+        with self._lock:
+            if len(self._buf) == self._buf.maxlen:
+                self.descartados += 1
+            self._buf.append(registro)
+
+    def pendientes(self) -> int:
+        return len(self._buf)
+
+    # ---------- volcado ----------
+    def tomar(self) -> list:
+        """Saca (y vacía) los spans del buffer: (inicio_us, dur_us, nombre, cat, tags, hilo, error)."""
+        with self._lock:
+            spans = list(self._buf)
+            self._buf.clear()
+            descartados, self.descartados = self.descartados, 0
+        if descartados:
+            print(f"[TRAZAS] {descartados} spans descartados (buffer lleno)")
+        return spans
+
+    def volcar(self, bd: bool = True, chrome: bool = True) -> int:
+        """Saca todo el buffer a la tabla timings y al JSON Chrome del día. Nunca lanza."""
+        spans = self.tomar()
+        if not spans:
+            return 0
+        if bd:
+            try:
+                from src.backend.sua_client.dao import insertar_timings
+                insertar_timings([
+                    (ini, dur / 1000.0, nombre, cat, t.get("host"), t.get("modelo"),
+                     t.get("estacion"), t.get("sn"), hilo, error)
+                    for ini, dur, nombre, cat, t, hilo, error in spans
+                ])
+            except Exception as e:
+                print(f"[TRAZAS] No se pudo guardar en timings: {e}")
+        if chrome:
+            try:
+                _anexar_chrome(spans)
+            except Exception as e:
+                print(f"[TRAZAS] No se pudo escribir la traza Chrome: {e}")
+        return len(spans)
+
+
+def _evento_chrome(ini, dur, nombre, cat, tags, hilo, error, pid=None):
+    args = dict(tags)
+    if error:
+        args["error"] = error
+    return {"name": nombre, "cat": cat, "ph": "X", "ts": ini, "dur": dur,
+            "pid": pid if pid is not None else os.getpid(), "tid": hilo, "args": args}
+
+
+_chrome_lock = threading.Lock()
+
+
+def _anexar_chrome(spans):
+    """
+    Formato "JSON array" de trace-event: el ] final es opcional, así que se puede
+    ir agregando al archivo del día sin reescribirlo. Con el lock dos volcar()
+    a la vez (post-proceso y atexit) no escriben los dos el [ inicial ni mezclan eventos.
+    """
+    texto = "".join(json.dumps(_evento_chrome(*s), ensure_ascii=False, default=str) + ",\n" for s in spans)
+    TRAZAS_DIR.mkdir(parents=True, exist_ok=True)
+    ruta = TRAZAS_DIR / f"trace_{datetime.now().strftime('%Y-%m-%d')}.json"
+    with _chrome_lock:
+        nuevo = not ruta.exists()
+        with ruta.open("a", encoding="utf-8") as f:
+            if nuevo:
+                f.write("[\n")
+            f.write(texto)
+
+
+_TRACER = Tracer()
+atexit.register(_TRACER.volcar)
+
+
+def get_tracer() -> Tracer:
+    return _TRACER
+
+
+def span(nombre: str, cat: str = "general", **tags):
+    return _TRACER.span(nombre, cat, **tags)
+
+
+def etiquetas(**tags):
+    return _TRACER.etiquetas(**tags)
+
+
+def fijar(**tags):
+    _TRACER.fijar(**tags)
+
+
+def _tags_de(args) -> dict:
+    # Métodos del tester: host / modelo salen de self
+    obj = args[0] if args else None
+    if obj is None or not hasattr(obj, "host"):
+        return {}
+    return {"host": getattr(obj, "host", None), "modelo": getattr(obj, "model", None)}
+
+
+def trazar(nombre: str = None, cat: str = "general"):
+    """Decorador: un span por llamada (con host/modelo si es método del tester)."""
+    def deco(fn):
+        if getattr(fn, "__trazado__", False):
+            return fn
+        etiqueta = nombre or fn.__name__
+
+        @functools.wraps(fn)
+        def envoltura(*args, **kwargs):
+            if not ACTIVO:
+                return fn(*args, **kwargs)
+            with _TRACER.span(etiqueta, cat, **_tags_de(args)):
+                return fn(*args, **kwargs)
+
+        envoltura.__trazado__ = True
+        return envoltura
+    return deco
+
+
+def instrumentar_clase(cls, reglas=REGLAS) -> int:
+    """Envuelve los métodos de cls (y sus mixins) cuyo nombre coincide con REGLAS."""
+    n = 0
+    for nombre in dir(cls):
+        if nombre.startswith("__"):
+            continue
+        fn = getattr(cls, nombre, None)
+        if not callable(fn) or isinstance(fn, type) or getattr(fn, "__trazado__", False):
+            continue
+        for prefijo, cat in reglas:
+            if nombre == prefijo or nombre.startswith(prefijo):
+                setattr(cls, nombre, trazar(nombre, cat)(fn))
+                n += 1
+                break
+    return n
+
+
+# ---------- consultas ----------
+def _us(dia: str, fin: bool = False) -> int:
+    d = datetime.strptime(dia, "%Y-%m-%d")
+    if fin:
+        d += timedelta(days=1)
+    return int(d.timestamp() * 1e6)
+
+
+def resumen(desde: str = None, hasta: str = None, modelo: str = None, top: int = 25) -> list:
+    """Ruta crítica: (modelo, categoría, nombre) ordenados por tiempo total."""
+    from src.backend.sua_client.dao import resumen_timings
+    rows = resumen_timings(
+        _us(desde) if desde else None,
+        _us(hasta, fin=True) if hasta else None,
+        modelo,
+    )
+    return [dict(zip(("modelo", "cat", "nombre", "n", "prom_ms", "max_ms", "total_s"), r)) for r in rows[:top]]
+
+
+def comparar(dias: int = 7, modelo: str = None, umbral: float = 0.2) -> list:
+    """Regresiones: promedio de los últimos 'dias' contra los 'dias' anteriores (más de umbral = 20%)."""
+    hoy = datetime.now().date()
+    reciente = resumen((hoy - timedelta(days=dias - 1)).isoformat(), hoy.isoformat(), modelo, top=10**6)
+    previo = resumen((hoy - timedelta(days=2 * dias - 1)).isoformat(),
+                     (hoy - timedelta(days=dias)).isoformat(), modelo, top=10**6)
+    base = {(r["modelo"], r["cat"], r["nombre"]): r for r in previo}
+    out = []
+    for r in reciente:
+        b = base.get((r["modelo"], r["cat"], r["nombre"]))
+        if not b or not b["prom_ms"]:
+            continue
+        delta = (r["prom_ms"] - b["prom_ms"]) / b["prom_ms"]
+        if delta >= umbral:
+            out.append({**r, "prom_ms_previo": b["prom_ms"], "delta": round(delta, 3)})
+    out.sort(key=lambda x: -x["delta"])
+    return out
+
+
+def exportar_chrome(ruta, desde: str = None, hasta: str = None, modelo: str = None) -> int:
+    """Traza Chrome ({"traceEvents": [...]}) desde la tabla timings; un pid por equipo (host/modelo)."""
+    from src.backend.sua_client.dao import iter_timings
+    pids, eventos = {}, []
+    for ini, dur_ms, nombre, cat, host, mod, estacion, sn, hilo, error in iter_timings(
+            _us(desde) if desde else None, _us(hasta, fin=True) if hasta else None, modelo):
+        clave = f"{mod or '?'} {host or ''}".strip()
+        if clave not in pids:
+            pids[clave] = len(pids) + 1
+            eventos.append({"name": "process_name", "ph": "M", "pid": pids[clave], "args": {"name": clave}})
+        tags = {k: v for k, v in (("host", host), ("modelo", mod), ("estacion", estacion), ("sn", sn)) if v is not None}
+        eventos.append(_evento_chrome(ini, int(dur_ms * 1000), nombre, cat, tags, hilo, error, pid=pids[clave]))
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, f, ensure_ascii=False, default=str)
+    print(f"[TRAZAS] {len(eventos)} eventos exportados a {ruta}")
+    return len(eventos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempos por fase (tabla timings)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("resumen", help="Ruta crítica por modelo")
+    p.add_argument("--modelo")
+    p.add_argument("--dias", type=int, default=7)
+    p.add_argument("--top", type=int, default=25)
+
+    p = sub.add_parser("regresiones", help="Pasos que se volvieron más lentos")
+    p.add_argument("--modelo")
+    p.add_argument("--dias", type=int, default=7)
+    p.add_argument("--umbral", type=float, default=0.2)
+
+    p = sub.add_parser("exportar", help="Exportar a JSON de Chrome trace")
+    p.add_argument("--desde")
+    p.add_argument("--hasta")
+    p.add_argument("--modelo")
+    p.add_argument("--salida", default="trace.json")
+
+    args = parser.parse_args(argv)
+    if args.cmd == "resumen":
+        desde = (datetime.now().date() - timedelta(days=args.dias - 1)).isoformat()
+        res = resumen(desde, None, args.modelo, args.top)
+    elif args.cmd == "regresiones":
+        res = comparar(args.dias, args.modelo, args.umbral)
+    else:
+        exportar_chrome(args.salida, args.desde, args.hasta, args.modelo)
+        return 0
+    print(json.dumps(res, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
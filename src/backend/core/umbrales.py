@@ -0,0 +1,342 @@
+# src/backend/core/umbrales.py
+"""
+Recomendación de umbrales (fibra_set / wifi_set) a partir de lo medido.
+
+En lugar de escribir a mano en propiedades_view los límites de TX/RX y el
+porcentaje mínimo de WiFi, se proponen a partir de la distribución real por
+modelo (core/analitica) para un rendimiento objetivo, p. ej. 98 % de equipos
+aprobados:
+
+1. Histogramas por modelo de tx, rx y min(w24, w5), acumulados de forma
+   incremental (solo se agregan las filas nuevas del caché).
+2. Cuantiles desde el histograma acumulado: cada cola (tx bajo/alto,
+   rx bajo/alto, wifi bajo) recibe una parte del rechazo permitido.
+3. Simulación del porcentaje de aprobados que habría dado el candidato sobre
+   el historial (criterio conjunto, por equipo) y ajuste hasta llegar al objetivo.
+4. Los candidatos nunca salen de los límites duros de calcular_valido
+   (TX > 0 dBm, RX > -28 dBm) ni de la sobrecarga del receptor.
+
+Los umbrales en la bd son globales (un solo fibra_set / wifi_set), así que lo
+que se aplica con guardarConfig es la propuesta global; la de cada modelo se
+muestra como referencia.
+
+Uso:
+    python -m src.backend.core.umbrales proponer --rendimiento 0.98
+    python -m src.backend.core.umbrales proponer --modelo MOD002 --dias 90
+    python -m src.backend.core.umbrales proponer --aplicar --usuario 1
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.backend.core.analitica import CACHE_DIR, Historial, actualizar, cargar
+from src.backend.core.resultados import RX_MIN_VALIDO, TX_MIN_VALIDO
+
+HIST_FILE = "umbrales_hist.npz"
+
+# campo -> (mínimo, máximo, ancho de bin). Lo que cae fuera se va al primer/último bin.
+BINS = {
+    "tx": (-10.0, 10.0, 0.05),
+    "rx": (-40.0, 0.0, 0.05),
+    "wifi": (0.0, 101.0, 1.0),
+}
+# Límites físicos / de validez para no proponer algo que calcular_valido rechace
+LIMITES = {
+    "tx_min": TX_MIN_VALIDO,
+    "rx_min": RX_MIN_VALIDO,
+    "rx_max": -8.0,  # sobrecarga del receptor GPON (clase B+)
+    "min_percent": (0, 100),
+}
+RENDIMIENTO = 0.98
+COLAS = 5  # tx bajo, tx alto, rx bajo, rx alto, wifi bajo
+
+
+def _n_bins(campo):
+    lo, hi, paso = BINS[campo]
+    return int(round((hi - lo) / paso))
+
+
+def _bin_de(campo, valores):
+    lo, _hi, paso = BINS[campo]
+    b = np.floor((valores - lo) / paso).astype(np.int64)
+    return np.clip(b, 0, _n_bins(campo) - 1)
+
+
+def _wifi_min(w24, w5):
+    # El equipo necesita las dos bandas arriba del mínimo; si solo hay una, cuenta esa
+    return np.fmin(w24, w5)
+
+
+# ---------- histogramas incrementales ----------
+class Histogramas:
+    """hist[campo] = matriz (modelos, bins) de conteos; filas = cuántas filas del caché ya se sumaron."""
+
+    def __init__(self, filas=0, hist=None):
+        self.filas = int(filas)
+        self.hist = hist or {c: np.zeros((0, _n_bins(c)), dtype=np.int64) for c in BINS}
+
+    @classmethod
+    def cargar(cls, cache_dir=CACHE_DIR):
+        p = Path(cache_dir) / HIST_FILE
+        if not p.exists():
+            return cls()
+        with np.load(p) as z:
+            return cls(int(z["filas"]), {c: z[c] for c in BINS})
+
+    def guardar(self, cache_dir=CACHE_DIR):
+        p = Path(cache_dir) / HIST_FILE
+        tmp = p.with_name(p.stem + ".tmp.npz")
+        np.savez(tmp, filas=np.int64(self.filas), **self.hist)
+        tmp.replace(p)
+
+    def actualizar(self, h: Historial) -> int:
+        """Suma solo las filas nuevas del caché (O(filas nuevas))."""
+        if h.n < self.filas:
+            # El caché se reconstruyó: se empieza de cero
+            self.__init__()
+        nuevas = slice(self.filas, h.n)
+        n = h.n - self.filas
+        if n <= 0:
+            return 0
+        n_mod = max(len(h.modelos), 1)
+        mod = h["modelo"][nuevas].astype(np.int64)
+        valores = {
+            "tx": h["tx"][nuevas],
+            "rx": h["rx"][nuevas],
+            "wifi": _wifi_min(h["w24"][nuevas], h["w5"][nuevas]),
+        }
+        for campo, v in valores.items():
+            nb = _n_bins(campo)
+            ok = np.isfinite(v)
+            plano = np.bincount(mod[ok] * nb + _bin_de(campo, v[ok]), minlength=n_mod * nb)
+            actual = self.hist[campo]
+            if actual.shape[0] < n_mod:
+                actual = np.vstack([actual, np.zeros((n_mod - actual.shape[0], nb), dtype=np.int64)])
+            self.hist[campo] = actual + plano.reshape(n_mod, nb)
+        self.filas = h.n
+        return n
+
+    def de(self, campo, modelo_cod=None):
+        """Histograma de un modelo (código) o de todos sumados."""
+        m = self.hist[campo]
+        if modelo_cod is None:
+            return m.sum(axis=0)
+        return m[modelo_cod] if modelo_cod < m.shape[0] else np.zeros(m.shape[1], dtype=np.int64)
+
+
+def cuantil(hist, campo, q):
+    """Cuantil q (0..1) desde un histograma; regresa el borde del bin correspondiente."""
+    total = hist.sum()
+    if not total:
+        return None
+    lo, _hi, paso = BINS[campo]
+    acum = np.cumsum(hist)
+    i = int(np.searchsorted(acum, q * total, side="left"))
+    # q bajo -> borde inferior del bin, q alto -> borde superior (así el bin entero queda dentro)
+    return lo + (i if q < 0.5 else i + 1) * paso
+
+
+def _acotar(c: dict) -> dict:
+    c["tx_min"] = max(c["tx_min"], LIMITES["tx_min"])
+    c["rx_min"] = max(c["rx_min"], LIMITES["rx_min"])
+    c["rx_max"] = min(c["rx_max"], LIMITES["rx_max"])
+    c["tx_max"] = max(c["tx_max"], c["tx_min"])
+    c["rx_max"] = max(c["rx_max"], c["rx_min"])
+    lo, hi = LIMITES["min_percent"]
+    c["min_percent"] = int(min(max(c["min_percent"], lo), hi))
+    for k in ("tx_min", "tx_max", "rx_min", "rx_max"):
+        c[k] = round(float(c[k]), 1)
+    return c
+
+
+def candidato(hs: Histogramas, alfa: float, modelo_cod=None):
+    """Límites que dejan fuera 'alfa' de cada cola."""
+    tx, rx, wf = hs.de("tx", modelo_cod), hs.de("rx", modelo_cod), hs.de("wifi", modelo_cod)
+    if not tx.sum() and not rx.sum() and not wf.sum():
+        return None
+    c = {
+        "tx_min": cuantil(tx, "tx", alfa),
+        "tx_max": cuantil(tx, "tx", 1 - alfa),
+        "rx_min": cuantil(rx, "rx", alfa),
+        "rx_max": cuantil(rx, "rx", 1 - alfa),
+        "min_percent": cuantil(wf, "wifi", alfa),
+    }
+    defaults = {"tx_min": LIMITES["tx_min"], "tx_max": 5.0, "rx_min": LIMITES["rx_min"],
+                "rx_max": LIMITES["rx_max"], "min_percent": 0}
+    return _acotar({k: (v if v is not None else defaults[k]) for k, v in c.items()})
+
+
+# ---------- simulación ----------
+def simular(h: Historial, c: dict, mascara=None) -> dict:
+    """
+    Porcentaje de equipos que habrían pasado con los límites 'c' (criterio conjunto).
+    Una medición ausente (NaN) no reprueba: esa prueba no se corrió.
+    """
+    m = slice(None) if mascara is None else mascara
+    tx, rx = h["tx"][m], h["rx"][m]
+    wf = _wifi_min(h["w24"][m], h["w5"][m])
+    n = len(tx)
+    if not n:
+        return {"n": 0, "aprobados": None}
+    with np.errstate(invalid="ignore"):
+        f_tx = (tx < c["tx_min"]) | (tx > c["tx_max"])
+        f_rx = (rx < c["rx_min"]) | (rx > c["rx_max"])
+        f_wf = wf < c["min_percent"]
+    falla = f_tx | f_rx | f_wf
+    return {
+        "n": int(n),
+        "aprobados": round(1.0 - float(falla.mean()), 4),
+        "rechazo_tx": round(float(f_tx.mean()), 4),
+        "rechazo_rx": round(float(f_rx.mean()), 4),
+        "rechazo_wifi": round(float(f_wf.mean()), 4),
+    }
+
+
+def _ajustar(h, hs, rendimiento, modelo_cod=None, mascara=None, iteraciones=8):
+    """Reparte el rechazo entre colas y lo reduce hasta que el conjunto llega al objetivo."""
+    alfa = (1.0 - rendimiento) / COLAS
+    mejor = None
+    for _ in range(iteraciones):
+        c = candidato(hs, alfa, modelo_cod)
+        if c is None:
+            return None, None
+        sim = simular(h, c, mascara)
+        mejor = (c, sim)
+        if sim["aprobados"] is None or sim["aprobados"] >= rendimiento:
+            break
+        # El rechazo conjunto salió mayor que el permitido: se abren las colas en proporción
+        exceso = (1.0 - sim["aprobados"]) / max(1.0 - rendimiento, 1e-6)
+        alfa = alfa / max(exceso, 1.01)
+    return mejor
+
+
+def config_actual() -> dict:
+    from src.backend.endpoints.conexion import cargarConfig
+    cfg = cargarConfig()
+    f, w = cfg.get("fibra", {}), cfg.get("wifi", {})
+    return {
+        "tx_min": f.get("mintx"), "tx_max": f.get("maxtx"),
+        "rx_min": f.get("minrx"), "rx_max": f.get("maxrx"),
+        "min_percent": w.get("min24percent"),
+        "_wifi": w,
+    }
+
+
+def proponer(rendimiento: float = RENDIMIENTO, modelo: str = None, dias: int = None,
+             cache_dir=CACHE_DIR, actualizar_cache: bool = True) -> dict:
+    """
+    Propuesta global (la que se puede aplicar) + una por modelo, cada una con su
+    simulación sobre el historial y la de la configuración actual.
+    """
+    t0 = time.perf_counter()
+    if actualizar_cache:
+        actualizar(cache_dir=cache_dir)
+    h = cargar(cache_dir)
+    hs = Histogramas.cargar(cache_dir)
+    if hs.actualizar(h):
+        hs.guardar(cache_dir)
+
+    mascara = None
+    if dias and h.n:
+        mascara = np.asarray(h["dia"]) > int(np.max(h["dia"])) - dias
+    if modelo:
+        mm = h.filtro(modelo=modelo)
+        mascara = mm if mascara is None else (mascara & mm)
+
+    # Con ventana de días los histogramas acumulados no sirven: se arman al vuelo de esa ventana
+    hs_uso = hs
+    if dias:
+        hs_uso = Histogramas()
+        sub = Historial({k: np.asarray(v)[mascara] for k, v in h.cols.items()}, h.modelos)
+        hs_uso.actualizar(sub)
+
+    cod = h.modelos.index(modelo) if modelo and modelo in h.modelos else None
+    global_c, global_sim = _ajustar(h, hs_uso, rendimiento, cod, mascara)
+
+    por_modelo = {}
+    for i, nombre in enumerate(h.modelos):
+        if modelo and nombre != modelo:
+            continue
+        mm = h["modelo"] == i
+        if dias:
+            mm = mm & mascara
+        c, sim = _ajustar(h, hs_uso, rendimiento, i, mm)
+        if c is not None:
+            por_modelo[nombre] = {"limites": c, "simulacion": sim}
+
+    actual = None
+    try:
+        cfg = config_actual()
+        if cfg["tx_min"] is not None:
+            actual = {"limites": {k: v for k, v in cfg.items() if not k.startswith("_")},
+                      "simulacion": simular(h, cfg, mascara)}
+    except Exception as e:
+        print(f"[UMBRALES] No se pudo leer la configuración actual: {e}")
+
+    seg = time.perf_counter() - t0
+    print(f"[UMBRALES] Propuesta para {rendimiento:.1%} sobre {h.n} mediciones en {seg:.2f}s")
+    return {
+        "rendimiento": rendimiento,
+        "global": {"limites": global_c, "simulacion": global_sim} if global_c else None,
+        "por_modelo": por_modelo,
+        "actual": actual,
+    }
+
+
+def aplicar(limites: dict, user_id) -> None:
+    """Escribe los límites aceptados con guardarConfig (mismo dict que propiedades_view.confirmar)."""
+    from src.backend.endpoints.conexion import guardarConfig
+    wifi = {}
+    try:
+        wifi = config_actual().get("_wifi", {})
+    except Exception:
+        pass
+    resultado = {
+        "tx_min": float(limites["tx_min"]),
+        "tx_max": float(limites["tx_max"]),
+        "rx_min": float(limites["rx_min"]),
+        "rx_max": float(limites["rx_max"]),
+        # RSSI (dBm) no se mide en el historial: se conservan los actuales
+        "rssi24_min": float(wifi.get("rssi24_min", -80)),
+        "rssi24_max": float(wifi.get("rssi24_max", -5)),
+        "rssi50_min": float(wifi.get("rssi5_min", -80)),
+        "rssi50_max": float(wifi.get("rssi5_max", -5)),
+        "busquedas": int(limites["min_percent"]),
+    }
+    guardarConfig(resultado, "valores", user_id)
+    print(f"[UMBRALES] Configuración aplicada: {resultado}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recomendar umbrales de fibra / WiFi desde el historial")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("proponer")
+    p.add_argument("--rendimiento", type=float, default=RENDIMIENTO, help="Fracción objetivo de aprobados (0-1)")
+    p.add_argument("--modelo", help="Solo un modelo (MODxxx)")
+    p.add_argument("--dias", type=int, default=None, help="Solo los últimos N días")
+    p.add_argument("--cache", default=str(CACHE_DIR))
+    p.add_argument("--aplicar", action="store_true", help="Guardar la propuesta global con guardarConfig")
+    p.add_argument("--usuario", type=int, default=None, help="id_user para guardarConfig")
+    args = parser.parse_args(argv)
+
+    res = proponer(args.rendimiento, args.modelo, args.dias, args.cache)
+    print(json.dumps(res, indent=2, ensure_ascii=False))
+    if args.aplicar:
+        if not res["global"]:
+            print("[UMBRALES] No hay mediciones; nada que aplicar")
+            return 1
+        if args.modelo:
+            print("[UMBRALES] Los umbrales son globales; no se aplica una propuesta de un solo modelo")
+            return 1
+        if args.usuario is None:
+            parser.error("--aplicar requiere --usuario")
+        aplicar(res["global"]["limites"], args.usuario)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+# Paquete emulador (ONTs offline para benchmarks)
+from .perfiles import MODELOS, PerfilEquipo, generar
+from .servidor import EmuladorONT
+
+__all__ = ['EmuladorONT', 'MODELOS', 'PerfilEquipo', 'generar']
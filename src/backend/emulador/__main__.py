@@ -0,0 +1,6 @@
+# python -m src.backend.emulador --modelo MOD004 --host 192.168.100.1 --puerto 80
+import sys
+
+from src.backend.emulador.servidor import main
+
+sys.exit(main())
@@ -0,0 +1,221 @@
+# src/backend/emulador/benchmark.py
+"""
+Benchmark de punta a punta contra ONTs emuladas: levanta N emuladores por modelo,
+corre ONTAutomatedTester contra cada uno (detección + run_all_tests + proyección)
+y reporta latencia por fase y equipos por hora.
+
+Las fases salen de los mismos spans de core/trazas (login, nav, parse, prueba,
+reinicio...), así que el número es comparable con la tabla timings de producción.
+
+Uso:
+    python -m src.backend.emulador.benchmark --modelos MOD001,MOD002,MOD004 --equipos 5 --paralelo 2
+    python -m src.backend.emulador.benchmark --modelos MOD002 --latencia 5-40 --reset --salida bench.json
+
+Requiere Chrome + Selenium igual que una corrida real (los flujos usan el navegador).
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from src.backend.emulador.perfiles import MODELOS
+from src.backend.emulador.servidor import EmuladorONT
+
+# Opciones de prueba por default: sin actualización de software ni señal WiFi (no hay
+# firmware ni radio que emular); el reset de fábrica se activa con --reset.
+OPCIONES = {
+    "info": {
+        "sn": True, "mac": True, "ssid_24ghz": True, "ssid_5ghz": True,
+        "software_version": True, "wifi_password": True, "model": True,
+    },
+    "tests": {
+        "ping": True, "factory_reset": False, "software_update": False, "usb_port": True,
+        "tx_power": True, "rx_power": True, "wifi_24ghz_signal": False, "wifi_5ghz_signal": False,
+    },
+}
+
+
+def _percentil(valores, q: float) -> float:
+    if not valores:
+        return 0.0
+    orden = sorted(valores)
+    k = (len(orden) - 1) * q
+    i = int(k)
+    j = min(i + 1, len(orden) - 1)
+    return orden[i] + (orden[j] - orden[i]) * (k - i)
+
+
+def _latencia(texto: str):
+    lo, _, hi = str(texto).partition("-")
+    return (float(lo), float(hi or lo))
+
+
+def correr_equipo(emu: EmuladorONT, opciones: dict) -> dict:
+    """Un equipo completo como en main_loop (FASE 1 detección, FASE 2 pruebas, proyección)."""
+    from src.backend.core.resultados import copiar_opciones
+    from src.backend.core.trazas import etiquetas, span
+    from src.backend.ont_automatico import ONTAutomatedTester
+
+    out = {"host": emu.direccion, "modelo": emu.modelo, "sn": emu.perfil.sn, "ok": False, "error": None}
+    t0 = time.perf_counter()
+    try:
+        with etiquetas(host=emu.direccion, modelo=emu.modelo, estacion="benchmark"):
+            with span("equipo", cat="fase"):
+                det = ONTAutomatedTester(emu.direccion, None)
+                with span("descubrimiento", cat="descubrimiento"):
+                    det._detect_device_type()
+                out["modelo_detectado"] = det.model
+
+                tester = ONTAutomatedTester(emu.direccion, det.model or emu.modelo)
+                tester.opcionesTest = copiar_opciones(opciones)
+                tester.guardar_sesion = False   # cada emulador es otro equipo: cerrar su Chrome
+                tester.guardar_resultados = False   # equipos emulados: fuera del archivo de producción
+                with span("pruebas", cat="fase"):
+                    pruebas = tester.run_all_tests()
+                if isinstance(pruebas, dict) and pruebas.get("error"):
+                    out["error"] = pruebas["error"]
+                else:
+                    resultados = tester._resultados_finales() or {}
+                    out["sn_leido"] = (resultados.get("info") or {}).get("sn")
+                    out["ok"] = out["sn_leido"] == emu.perfil.sn
+    except Exception as e:
+        out["error"] = f"{type(e).__name__}: {e}"
+    out["seg"] = round(time.perf_counter() - t0, 3)
+    out["emulador"] = emu.estado()
+    return out
+
+
+def _fases(spans) -> dict:
+    """
+    {host: {cat: seg}} con los spans del tracer. Un span metido dentro de otro de la
+    misma categoría (login -> _login_huawei) no se vuelve a sumar.
+    """
+    por_host = {}
+    fin_ultimo = {}
+    for ini, dur, nombre, cat, tags, hilo, error in sorted(spans, key=lambda s: (s[0], -s[1])):
+        host = tags.get("host")
+        if not host or cat == "fase":
+            continue
+        clave = (host, cat, hilo)
+        if ini + dur <= fin_ultimo.get(clave, 0):
+            continue
+        fin_ultimo[clave] = ini + dur
+        acc = por_host.setdefault(host, {})
+        acc[cat] = acc.get(cat, 0.0) + dur / 1e6
+    return por_host
+
+
+def reporte(equipos: list, spans: list, pared_s: float) -> dict:
+    fases = _fases(spans)
+    por_modelo = {}
+    for eq in equipos:
+        por_modelo.setdefault(eq["modelo"], []).append(eq)
+
+    modelos = {}
+    for modelo, lista in sorted(por_modelo.items()):
+        tiempos = [eq["seg"] for eq in lista]
+        cats = {}
+        for eq in lista:
+            for cat, seg in fases.get(eq["host"], {}).items():
+                cats.setdefault(cat, []).append(seg)
+        modelos[modelo] = {
+            "equipos": len(lista),
+            "ok": sum(1 for eq in lista if eq["ok"]),
+            "p50_s": round(_percentil(tiempos, 0.5), 2),
+            "p95_s": round(_percentil(tiempos, 0.95), 2),
+            "fases": {
+                cat: {"p50_s": round(_percentil(v, 0.5), 3), "p95_s": round(_percentil(v, 0.95), 3)}
+                for cat, v in sorted(cats.items(), key=lambda kv: -sum(kv[1]))
+            },
+            "errores": sorted({eq["error"] for eq in lista if eq["error"]}),
+        }
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "equipos": len(equipos),
+        "ok": sum(1 for eq in equipos if eq["ok"]),
+        "pared_s": round(pared_s, 2),
+        "equipos_hora": round(len(equipos) / pared_s * 3600, 1) if pared_s > 0 else 0.0,
+        "modelos": modelos,
+        "detalle": equipos,
+    }
+
+
+def correr(modelos, equipos: int = 1, paralelo: int = 1, latencia_ms=(0, 0), reinicio_s: float = 5.0,
+           opciones: dict = None, semilla: int = 0) -> dict:
+    from src.backend.core import archivo_resultados
+    from src.backend.core.trazas import get_tracer
+
+    opciones = opciones or OPCIONES
+    # Lo que guarden los flujos (save_results) va a una carpeta temporal, no al archivo de la estación
+    tmp = tempfile.mkdtemp(prefix="ont_bench_")
+    archivo_resultados._ARCHIVO = archivo_resultados.ArchivoResultados(base_dir=tmp)
+
+    emus = [
+        EmuladorONT(m, indice=i, latencia_ms=latencia_ms, reinicio_s=reinicio_s, semilla=semilla).iniciar()
+        for m in modelos for i in range(equipos)
+    ]
+    tracer = get_tracer()
+    tracer.tomar()   # lo que hubiera antes no es del benchmark
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, paralelo), thread_name_prefix="bench") as ex:
+            resultados = list(ex.map(lambda e: correr_equipo(e, opciones), emus))
+    finally:
+        pared = time.perf_counter() - t0
+        for e in emus:
+            e.detener()
+        archivo_resultados._ARCHIVO.cerrar()
+        archivo_resultados._ARCHIVO = None
+    print(f"[BENCH] Resultados temporales en {tmp}")
+    return reporte(resultados, tracer.tomar(), pared)
+
+
+def _imprimir(res: dict) -> None:
+    print("\n" + "=" * 60)
+    print(f"[BENCH] {res['ok']}/{res['equipos']} equipos OK en {res['pared_s']:.1f} s "
+          f"-> {res['equipos_hora']:.1f} equipos/hora")
+    for modelo, m in res["modelos"].items():
+        nombre = MODELOS.get(modelo, ("", ""))[1]
+        print(f"  {modelo} {nombre}: {m['ok']}/{m['equipos']} OK, p50 {m['p50_s']} s, p95 {m['p95_s']} s")
+        for cat, f in m["fases"].items():
+            print(f"      {cat:<15} p50 {f['p50_s']:>8.3f} s   p95 {f['p95_s']:>8.3f} s")
+        for err in m["errores"]:
+            print(f"      error: {err}")
+    print("=" * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de ONTAutomatedTester contra ONTs emuladas")
+    parser.add_argument("--modelos", default="MOD001,MOD002,MOD004",
+                        help=f"Códigos separados por coma ({','.join(MODELOS)})")
+    parser.add_argument("--equipos", type=int, default=1, help="Equipos emulados por modelo")
+    parser.add_argument("--paralelo", type=int, default=1, help="Equipos probándose a la vez")
+    parser.add_argument("--latencia", default="0", help="Latencia por petición en ms (p. ej. 5-40)")
+    parser.add_argument("--reinicio", type=float, default=5.0, help="Segundos que tarda el reinicio emulado")
+    parser.add_argument("--reset", action="store_true", help="Incluir la prueba de reset de fábrica")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="Guardar el reporte completo en JSON")
+    args = parser.parse_args(argv)
+
+    modelos = [m.strip().upper() for m in args.modelos.split(",") if m.strip()]
+    faltan = [m for m in modelos if m not in MODELOS]
+    if faltan:
+        parser.error(f"Modelos sin emulador: {', '.join(faltan)}")
+
+    opciones = {k: dict(v) for k, v in OPCIONES.items()}
+    opciones["tests"]["factory_reset"] = args.reset
+    res = correr(modelos, args.equipos, args.paralelo, _latencia(args.latencia), args.reinicio,
+                 opciones, args.semilla)
+    _imprimir(res)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(res, f, indent=2, ensure_ascii=False, default=str)
+        print(f"[BENCH] Reporte guardado en {args.salida}")
+    return 0 if res["ok"] == res["equipos"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+# src/backend/emulador/paginas.py
+"""
+HTML / XML que sirve el emulador por fabricante.
+
+Los ids, atributos y rutas son los mismos que buscan los mixins (user_name/loginpp,
+Frm_Username/LoginId, txt_Username/loginbutton, menuIframe, td3_2, bindtext=..., etc.).
+Fiberhome usa las páginas capturadas de data/html_snapshots y los JS de data/js_files;
+ZTE y Huawei se arman con plantillas mínimas que respetan la estructura del equipo.
+"""
+import html
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from src.backend.emulador.perfiles import DATA_DIR, PerfilEquipo
+
+
+@lru_cache(maxsize=None)
+def snapshot(nombre: str) -> str:
+    ruta = DATA_DIR / "html_snapshots" / nombre
+    crudo = ruta.read_bytes()
+    if crudo[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        return crudo.decode("utf-16")
+    return crudo.decode("utf-8", errors="replace")
+
+
+@lru_cache(maxsize=None)
+def js(nombre: str) -> bytes:
+    """JS capturado (data/js_files); los que no se capturaron se sirven vacíos."""
+    ruta = DATA_DIR / "js_files" / nombre
+    try:
+        return ruta.read_bytes()
+    except OSError:
+        return b""
+
+
+def _inyectar(pagina: str, script: str) -> str:
+    bloque = f"<script type=\"text/javascript\">{script}</script>"
+    i = pagina.lower().rfind("</body>")
+    return pagina[:i] + bloque + pagina[i:] if i >= 0 else pagina + bloque
+
+
+# ===========================
+# FIBERHOME
+# ===========================
+# El login real cifra la contraseña con aes.js (no capturado). Este shim corre en fase
+# de captura, antes que los handlers de login_inter.js, y hace el do_login en claro.
+_FH_LOGIN_SHIM = """
+(function(){
+  function emuLogin(ev){
+    if (ev) { ev.preventDefault(); ev.stopImmediatePropagation(); }
+    var u = document.getElementById('user_name').value;
+    var p = document.getElementById('loginpp').value;
+    var x = new XMLHttpRequest();
+    x.open('POST', '/cgi-bin/ajax', false);
+    x.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded');
+    x.send('ajaxmethod=do_login&username=' + encodeURIComponent(u) + '&loginpd=' + encodeURIComponent(p));
+    var r = {};
+    try { r = JSON.parse(x.responseText); } catch (e) {}
+    if (r.login_result == 0) { window.location.href = '/html/main_inter.html'; return; }
+    var h = document.getElementById('login_error_hint');
+    if (h) { h.innerText = r.msg || 'Login failed'; h.style.display = ''; }
+  }
+  document.addEventListener('click', function(ev){
+    if (ev.target && ev.target.id === 'login_btn') emuLogin(ev);
+  }, true);
+  document.addEventListener('keydown', function(ev){
+    if (ev.key === 'Enter' && ev.target && ev.target.id === 'loginpp') emuLogin(ev);
+  }, true);
+})();
+"""
+
+
+def fh_index() -> str:
+    return snapshot("index_page.html")
+
+
+def fh_login() -> str:
+    return _inyectar(snapshot("login_page.html"), _FH_LOGIN_SHIM)
+
+
+def fh_main(p: PerfilEquipo) -> str:
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(p.nombre)}</title>
+<script type="text/javascript">
+function ajaxPost(m){{
+  var x = new XMLHttpRequest(); x.open('POST', '/cgi-bin/ajax', false);
+  x.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded');
+  x.send('ajaxmethod=' + m); return x.responseText;
+}}
+function showPage(id){{
+  var ps = document.querySelectorAll('.page');
+  for (var i = 0; i < ps.length; i++) ps[i].style.display = (ps[i].id === id) ? '' : 'none';
+}}
+</script></head>
+<body>
+<div id="top">
+  <span id="device_name">{html.escape(p.nombre)}</span>
+  <a id="logout" href="/cgi-bin/do_logout">Logout</a>
+</div>
+<ul id="first_menu">
+  <li><a id="first_menu_status" href="javascript:void(0)" onclick="showPage('page_status')">Status</a></li>
+  <li><a id="first_menu_manage" href="javascript:void(0)" onclick="showPage('page_manage')">Management</a></li>
+</ul>
+<div id="page_status" class="page">
+  <table><tr><td>Model</td><td id="model_name">{html.escape(p.nombre)}</td></tr>
+  <tr><td>Serial Number</td><td id="sn">{html.escape(p.sn)}</td></tr></table>
+</div>
+<div id="page_manage" class="page" style="display:none">
+  <span id="span_device_admin" onclick="showPage('page_device_admin')">Device Admin</span>
+  <a href="javascript:void(0)" onclick="showPage('page_upgrade')">Local Upgrade</a>
+</div>
+<div id="page_device_admin" class="page" style="display:none">
+  <input type="button" id="Restart_button" value="Restart"
+         onclick="if (confirm('Restart?')) {{ ajaxPost('do_reboot'); }}">
+  <input type="button" id="Restore_button" value="Restore"
+         onclick="if (confirm('Restore factory settings?')) {{ ajaxPost('do_restore'); }}">
+</div>
+<div id="page_upgrade" class="page" style="display:none">
+  <form action="/cgi-bin/upload" method="post" enctype="multipart/form-data">
+    <input type="file" id="file" name="file"><input type="submit" id="upgrade_btn" value="Upgrade">
+  </form>
+</div>
+</body></html>"""
+
+
+# ===========================
+# ZTE
+# ===========================
+def zte_login(p: PerfilEquipo, error: str = "") -> str:
+    aviso = f'<div id="errmsg" class="errorTip">{html.escape(error)}</div>' if error else ""
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(p.nombre)}</title></head>
+<body>
+<div id="login">
+  <form id="fLogin" method="post" action="/">
+    <input type="hidden" name="action" value="login">
+    <input type="text" id="Frm_Username" name="Frm_Username">
+    <input type="password" id="Frm_Password" name="Frm_Password">
+    <input type="submit" id="LoginId" value="Login">
+  </form>
+  {aviso}
+</div>
+</body></html>"""
+
+
+def zte_main(p: PerfilEquipo) -> str:
+    def menu(id_, texto, tag="a", **attrs):
+        extra = "".join(f' {k}="{html.escape(v)}"' for k, v in attrs.items())
+        return f'<{tag} id="{id_}" href="javascript:void(0)"{extra}>{html.escape(texto)}</{tag}>'
+
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(p.nombre)}</title>
+<script type="text/javascript">
+function restore(){{
+  var x = new XMLHttpRequest();
+  x.open('POST', '/?_type=menuData&_tag=devmgr_restoremgr_lua.lua', false);
+  x.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded');
+  x.send('IF_ACTION=Restore');
+}}
+</script></head>
+<body>
+<div id="mainNavigator">
+  {menu("homePage", "Home", menupage="homePage")}
+  {menu("internet", "Internet", title="Internet")}
+  {menu("localnet", "Local Network", menupage="localNetStatus")}
+  {menu("mgrAndDiag", "Management & Diagnosis", title="Management & Diagnosis")}
+  <a id="logout" href="/logout.html">Logout</a>
+</div>
+<div id="subMenu">
+  {menu("localNetStatus", "Status", menupage="localNetStatus", title="Status")}
+  {menu("wlanConfig", "WLAN", menupage="wlanBasic", title="WLAN")}
+  <p id="ponopticalinfo" menupage="ponopticalinfo">PON Inform</p>
+  <p id="ethWanStatus" menupage="ethWanStatus">WAN</p>
+  {menu("devMgr", "Device Management", menuclass="devMgr")}
+  {menu("firmwareUpgr", "Software Upgrade")}
+  <p id="versionUpload" menupage="versionUpload">Version Upload</p>
+  {menu("rebootAndReset", "Reboot and Reset", title="Reboot and Reset")}
+</div>
+<div id="content">
+  <h1 id="EthStateDevBar">WAN Connection Status</h1>
+  <h1 id="WLANSSIDConfBar">WLAN SSID Configuration</h1>
+  <h1 id="ResetManagBar">Factory Reset Management</h1>
+  <div id="home_category_usb"><a href="javascript:void(0)">USB Devices</a></div>
+  <input type="password" id="KeyPassphrase:0" name="KeyPassphrase:0" value="{html.escape(p.psk)}">
+  <input type="button" id="Btn_reset" value="Factory Reset"
+         onclick="document.getElementById('confirmOK').style.display='';">
+  <input type="button" id="confirmOK" value="OK" style="display:none" onclick="restore();">
+  <input type="file" id="Frm_UploadFile" name="UploadFile">
+</div>
+</body></html>"""
+
+
+def _zte_instancia(campos: dict) -> str:
+    partes = []
+    for k, v in campos.items():
+        partes.append(f"<ParaName>{escape(str(k))}</ParaName><ParaValue>{escape(str(v))}</ParaValue>")
+    return "<Instance>" + "".join(partes) + "</Instance>"
+
+
+def zte_xml(p: PerfilEquipo, tag: str, sesion: bool = True) -> str:
+    """Respuesta de /?_type=menuData&_tag=<tag> (formato ajax_response_xml_root del equipo)."""
+    error = "SUCC" if sesion else "SessionTimeout"
+    objetos = {}
+    if sesion:
+        if tag.startswith("devmgr_statusmgr_lua"):
+            objetos["OBJ_DEVINFO_ID"] = [{
+                "ManuFacturer": "ZTE", "ModelName": p.nombre, "SerialNumber": p.sn,
+                "HardwareVer": p.hardware, "SoftwareVer": p.software, "BootVer": "V4.0.12",
+            }]
+        elif tag.startswith("usb_homepage_lua"):
+            if p.usb:
+                objetos["OBJ_USBDEV_ID"] = [{"_InstID": "USBDEV0", "DevName": "sda1", "Status": "Connected"}]
+        elif tag.startswith("status_lan_info_lua"):
+            objetos["OBJ_ETH_ID"] = [
+                {"_InstID": f"DEV.ETH.IF{i}", "Alias": f"LAN{i}", "Status": "Up" if i == 1 else "NoLink", "Speed": "1000"}
+                for i in range(1, 5)
+            ]
+        elif tag.startswith("wlan_wlansssidconf_lua"):
+            objetos["OBJ_WLANAP_ID"] = [
+                {"_InstID": "DEV.WIFI.AP1", "ESSID": p.ssid24, "Enable": "1"},
+                {"_InstID": "DEV.WIFI.AP5", "ESSID": p.ssid5, "Enable": "1"},
+                {"_InstID": "DEV.WIFI.AP2", "ESSID": "SSID2", "Enable": "0"},
+                {"_InstID": "DEV.WIFI.AP6", "ESSID": "SSID6", "Enable": "0"},
+            ]
+        elif tag.startswith("optical_info_lua"):
+            objetos["OBJ_PON_OPTICALPARA_ID"] = [{
+                "RxPower": f"{p.rx:.2f}", "TxPower": f"{p.tx:.2f}", "Temp": "45.1",
+                "Volt": "3300", "Current": "12.0",
+            }]
+        elif tag.startswith("wan_internetstatus_lua"):
+            objetos["ID_WAN_COMFIG"] = [
+                {"_InstID": "DEV.IP.IF4", "WANCName": "omci_ipv4_pppoe_1", "ConnTrigger": "AlwaysOn", "WorkIFMac": p.mac},
+                {"_InstID": "DEV.IP.IF5", "WANCName": "omci_ipv4_dhcp_2", "ConnTrigger": "Manual", "WorkIFMac": p.mac},
+            ]
+    cuerpo = "".join(
+        f"<{nombre}>" + "".join(_zte_instancia(i) for i in instancias) + f"</{nombre}>"
+        for nombre, instancias in objetos.items()
+    )
+    return ("<ajax_response_xml_root>"
+            "<IF_ERRORPARAM>SUCC</IF_ERRORPARAM>"
+            "<IF_ERRORTYPE>SUCC</IF_ERRORTYPE>"
+            f"<IF_ERRORSTR>{error}</IF_ERRORSTR>"
+            f"<IF_ERRORID>{0 if sesion else -1}</IF_ERRORID>"
+            f"{cuerpo}</ajax_response_xml_root>")
+
+
+# ===========================
+# HUAWEI
+# ===========================
+# Páginas del iframe menuIframe: id del menú -> ruta
+HW_MENUS = {
+    "name_deviceinfo": "/html/ssmp/deviceinfo/deviceinfo.asp",
+    "name_opticinfo": "/html/amp/opticinfo/opticinfo.asp",
+    "name_ethinfo": "/html/amp/ethinfo/ethinfo.asp",
+    "name_wlaninfo": "/html/amp/wlaninfo/wlaninfo.asp",
+    "name_wlancoverinfo": "/html/bbsp/wlancoverinfo/wlancoverinfo.asp",
+    "wlan2basic": "/html/amp/wlanbasic/WlanBasic.asp?2G",
+    "wlan5basic": "/html/amp/wlanbasic/WlanBasic.asp?5G",
+    "name_application": "/html/bbsp/usb/usbapplication.asp",
+    "name_maintaininfo": "/html/ssmp/fwupgrade/fwupgrade.asp",
+    "RestartIcon": "/html/ssmp/reset/reset.asp",
+}
+
+
+def hw_login(p: PerfilEquipo, error: str = "") -> str:
+    # El X6-10 trae el guion escapado en ProductName (\x2d), igual que el equipo real
+    producto = p.nombre.replace("-", "\\x2d")
+    titulo = p.nombre if "-" not in p.nombre else "HUAWEI"
+    aviso = (f'<div id="loginfail"><img id="errorImg"><span id="errorMsg">{html.escape(error)}</span></div>'
+             if error else "")
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(titulo)}</title>
+<script type="text/javascript">var ProductName = '{producto}';</script></head>
+<body>
+<form id="loginform" method="post" action="/login.cgi">
+  <input type="text" id="txt_Username" name="txt_Username">
+  <input type="password" id="txt_Password" name="txt_Password">
+  <button type="submit" id="loginbutton">Login</button>
+</form>
+{aviso}
+</body></html>"""
+
+
+def hw_index(p: PerfilEquipo) -> str:
+    def item(id_, texto):
+        destino = HW_MENUS.get(id_)
+        click = f" onclick=\"document.getElementById('menuIframe').src='{destino}'\"" if destino else ""
+        return f'<div id="{id_}" class="SecondMenuTitle"{click}>{html.escape(texto)}</div>'
+
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(p.nombre)}</title></head>
+<body>
+<div id="headerLogout"><a id="logout" href="/logout.cgi">Logout</a></div>
+<div id="RestartIcon" onclick="document.getElementById('menuIframe').src='{HW_MENUS["RestartIcon"]}'">RESET</div>
+<div id="menu">
+  <div id="name_Systeminfo" class="menuContTitle">System Information</div>
+  <div id="pointer_Systeminfo" class="menuContTitle">System Information</div>
+  {item("name_deviceinfo", "Device")}
+  {item("name_opticinfo", "Optical")}
+  {item("name_ethinfo", "Eth Port")}
+  {item("name_wlaninfo", "WLAN")}
+  {item("name_wlancoverinfo", "Home Network")}
+  <div id="name_addconfig" name="m1div_wan" class="menuContTitle">Advanced</div>
+  <div id="name_wlanconfig" class="SecondMenuTitle">WLAN</div>
+  {item("wlan2basic", "2.4G Basic Network Settings")}
+  {item("wlan5basic", "5G Basic Network Settings")}
+  {item("name_application", "Application")}
+  {item("name_maintaininfo", "Maintenance Diagnosis")}
+</div>
+<iframe id="menuIframe" name="menuIframe" src="{HW_MENUS['name_deviceinfo']}" width="100%" height="600"></iframe>
+</body></html>"""
+
+
+def _hw_frame(cuerpo: str, script: str = "") -> str:
+    js_ = f"<script type=\"text/javascript\">{script}</script>" if script else ""
+    return f"<!DOCTYPE html><html><head><meta charset=\"utf-8\">{js_}</head><body>{cuerpo}</body></html>"
+
+
+def hw_frame(p: PerfilEquipo, ruta: str, query: str = "") -> str:
+    """Contenido del iframe menuIframe; None si la ruta no existe."""
+    e = html.escape
+    if ruta == "/html/ssmp/deviceinfo/deviceinfo.asp":
+        return _hw_frame(f"""<table id="deviceinfo">
+<tr><td id="td1_1">Product Name:</td><td id="td1_2">{e(p.nombre)}</td></tr>
+<tr><td id="td3_1">SN:</td><td id="td3_2">{e(p.sn)} (HWTC{e(p.sn[-8:])})</td></tr>
+<tr><td id="td4_1">Hardware Version:</td><td id="td4_2">{e(p.hardware)}</td></tr>
+<tr><td id="td5_1">Software Version:</td><td id="td5_2">{e(p.software)}</td></tr>
+</table>""")
+    if ruta == "/html/amp/opticinfo/opticinfo.asp":
+        return _hw_frame(f"""<table id="opticinfo">
+<tr><td bindtext="amp_optic_txpower">TX Optical Power:</td><td>{p.tx:.2f} dBm</td></tr>
+<tr><td bindtext="amp_optic_rxpower">RX Optical Power:</td><td>{p.rx:.2f} dBm</td></tr>
+<tr><td bindtext="amp_optic_voltage">Working Voltage:</td><td>3300 mV</td></tr>
+</table>""")
+    if ruta == "/html/amp/ethinfo/ethinfo.asp":
+        filas = "".join(
+            f'<tr class="tabal_0{1 if i % 2 else 2}"><td>{i}</td><td>Full-duplex</td>'
+            f'<td>{"1000 Mbit/s" if i == 1 else "--"}</td><td>{"Up" if i == 1 else "Down"}</td></tr>'
+            for i in range(1, 5)
+        )
+        return _hw_frame(f'<table id="ethinfo">{filas}</table>')
+    if ruta == "/html/amp/wlaninfo/wlaninfo.asp":
+        if p.extra.get("wifi_bloqueado"):
+            # Equipo "full locked" por el operador: lo que busca comprobe_locked
+            return _hw_frame('<img id="errorImg" src="/images/error.png">'
+                             '<span id="errorMsg">Cannot perform the operation.</span>')
+        script = (f"function band(v){{document.getElementById('wlan_ssidinfo_table_0_1').innerText ="
+                  f" (v == 2) ? '{e(p.ssid5)}' : '{e(p.ssid24)}';}}")
+        return _hw_frame(f"""<input type="radio" name="WlanMethod" value="1" checked onclick="band(1)">2.4G
+<input type="radio" name="WlanMethod" value="2" onclick="band(2)">5G
+<table id="wlan_ssidinfo_table"><tr><td id="LANStatusVal">Enabled</td>
+<td id="wlan_ssidinfo_table_0_1">{e(p.ssid24)}</td></tr></table>""", script)
+    if ruta == "/html/bbsp/wlancoverinfo/wlancoverinfo.asp":
+        return _hw_frame(f"<div>Home Network Information</div><div>MAC: {e(p.mac)}</div>")
+    if ruta == "/html/amp/wlanbasic/WlanBasic.asp":
+        script = ("function showPsk(){var f=document.getElementById('twlWpaPsk');"
+                  "f.type=(f.type=='password')?'text':'password';}")
+        return _hw_frame(f"""<input type="checkbox" id="hidewlWpaPsk" onclick="showPsk()">
+<input type="password" id="twlWpaPsk" value="{e(p.psk)}">""", script)
+    if ruta == "/html/bbsp/usb/usbapplication.asp":
+        opcion = '<option value="USB1">USB1 (sda1)</option>' if p.usb else '<option value="">No USB Device</option>'
+        return _hw_frame(f'<select id="SrvClDevType">{opcion}</select>')
+    if ruta == "/html/ssmp/fwupgrade/fwupgrade.asp":
+        return _hw_frame("""<form method="post" action="/html/ssmp/fwupgrade/upload.cgi" enctype="multipart/form-data">
+<input type="file" id="t_file" name="t_file"><input type="submit" id="btnSubmit" value="Update">
+</form>""")
+    if ruta == "/html/ssmp/reset/reset.asp":
+        script = ("function restore(){if(confirm('Restore default settings?')){"
+                  "var x=new XMLHttpRequest();x.open('POST','/html/ssmp/reset/restoredefcfg.cgi',false);x.send('');}}")
+        return _hw_frame('<input type="button" id="btnRestoreDftCfg" value="Restore Defaults" onclick="restore()">', script)
+    return None
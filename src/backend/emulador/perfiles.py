@@ -0,0 +1,159 @@
+# src/backend/emulador/perfiles.py
+"""
+Datos de cada equipo emulado (SN, MAC, SSIDs, potencias...).
+
+Todo sale de un random.Random sembrado con (semilla, modelo, indice): el mismo
+benchmark genera siempre los mismos equipos. Las respuestas AJAX de Fiberhome
+parten de lo capturado en data/analysis_results/ajax_methods_analysis.json.
+"""
+import json
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any
+
+DATA_DIR = Path(__file__).resolve().parents[3] / "data"
+
+MODELOS = {
+    "MOD001": ("FIBERHOME", "HG6145F"),
+    "MOD008": ("FIBERHOME", "HG6145F1"),
+    "MOD002": ("ZTE", "F670L"),
+    "MOD009": ("ZTE", "F6600"),
+    "MOD003": ("HUAWEI", "HG8145X6-10"),
+    "MOD004": ("HUAWEI", "HG8145V5"),
+    "MOD005": ("HUAWEI", "HG8145V5 SMALL"),
+    "MOD007": ("HUAWEI", "HG8145X6"),
+}
+
+# Credenciales que aceptan los equipos (las que usan los mixins: usuario normal y super admin)
+CREDENCIALES = {
+    "FIBERHOME": {("root", "admin")},
+    "ZTE": {("root", "admin"), ("admin", "Zgs12O5TSa2l3o9")},
+    "HUAWEI": {("root", "admin"), ("telecomadmin", "F0xB734Fr3@j%YEP")},
+}
+
+# Prefijo del SN por fabricante
+_PREFIJO_SN = {"FIBERHOME": "FHTT", "ZTE": "ZTEG", "HUAWEI": "48575443"}
+
+
+@dataclass
+class PerfilEquipo:
+    modelo: str
+    fabricante: str
+    nombre: str
+    sn: str
+    sn_fisico: str
+    mac: str
+    software: str
+    hardware: str
+    ssid24: str
+    ssid5: str
+    psk: str
+    tx: float
+    rx: float
+    usb: bool
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def credenciales(self):
+        return CREDENCIALES[self.fabricante]
+
+
+def generar(modelo: str, indice: int = 0, semilla: int = 0) -> PerfilEquipo:
+    if modelo not in MODELOS:
+        raise ValueError(f"Modelo sin emulador: {modelo}")
+    fabricante, nombre = MODELOS[modelo]
+    rnd = random.Random(f"{semilla}:{modelo}:{indice}")
+
+    def hexa(n):
+        return "".join(rnd.choice("0123456789ABCDEF") for _ in range(n))
+
+    sufijo = hexa(8)
+    sn = _PREFIJO_SN[fabricante] + sufijo
+    mac = ":".join([("%02X" % rnd.randrange(256)) for _ in range(6)])
+    ssid_base = {"FIBERHOME": "Totalplay", "ZTE": "INFINITUM", "HUAWEI": "HUAWEI"}[fabricante]
+    etiqueta = hexa(4)
+    return PerfilEquipo(
+        modelo=modelo,
+        fabricante=fabricante,
+        nombre=nombre,
+        sn=sn,
+        # Fiberhome reporta un SN lógico y el físico (gponsn) distinto
+        sn_fisico=("FHTT" + hexa(8)) if fabricante == "FIBERHOME" else sn,
+        mac=mac,
+        software={"FIBERHOME": "RP4423", "ZTE": "V9.0.11P1N12", "HUAWEI": "V5R020C10S115"}[fabricante],
+        hardware={"FIBERHOME": "WKE2.134.285F1G", "ZTE": "V9.0", "HUAWEI": "15AD.A"}[fabricante],
+        ssid24=f"{ssid_base}-{etiqueta}",
+        ssid5=f"{ssid_base}-{etiqueta}-5G",
+        psk=hexa(10).lower(),
+        tx=round(rnd.uniform(1.0, 3.5), 2),
+        rx=round(rnd.uniform(-24.0, -15.0), 2),
+        usb=rnd.random() < 0.9,
+    )
+
+
+_CAPTURAS = None
+
+
+def capturas_fiberhome() -> Dict[str, dict]:
+    """{ajaxmethod: data} de las respuestas JSON capturadas en un HG6145F1 real."""
+    global _CAPTURAS
+    if _CAPTURAS is None:
+        _CAPTURAS = {}
+        ruta = DATA_DIR / "analysis_results" / "ajax_methods_analysis.json"
+        try:
+            for item in json.loads(ruta.read_text(encoding="utf-8")).get("accessible", []):
+                if item.get("type") == "json" and isinstance(item.get("data"), dict):
+                    _CAPTURAS[item["method"]] = item["data"]
+        except (OSError, ValueError) as e:
+            print(f"[EMULADOR] Sin capturas Fiberhome ({e}), se usan respuestas sintéticas")
+    return _CAPTURAS
+
+
+def ajax_fiberhome(perfil: PerfilEquipo, metodo: str, sesion: str = None) -> dict:
+    """
+    Respuesta de /cgi-bin/ajax?ajaxmethod=<metodo>. Sin sesión válida solo contestan
+    los métodos públicos (igual que el equipo: el resto regresa session_valid=0).
+    """
+    capt = dict(capturas_fiberhome().get(metodo) or {})
+    publicos = {
+        "get_device_name": {"ModelName": perfil.nombre},
+        "get_operator": {"SerialNumber": perfil.sn, "operator_name": "MEX_TP", "operators_code": "INTL",
+                         "area_code": "Trunk", "UI_Flag": "0", "pldt_logo_flag": "0"},
+        "get_refresh_sessionid": {},
+        "get_heartbeat": {},
+    }
+    if metodo in publicos:
+        capt.update(publicos[metodo])
+        capt["sessionid"] = sesion or capt.get("sessionid", "")
+        capt["session_valid"] = 1 if sesion else capt.get("session_valid", 0)
+        return capt
+    if not sesion:
+        return {"session_valid": 0}
+
+    datos = {
+        "get_base_info": {
+            "ModelName": perfil.nombre, "Manufacturer": "FiberHome", "ManufacturerOUI": "001E73",
+            "HardwareVersion": perfil.hardware, "SoftwareVersion": perfil.software,
+            "SerialNumber": perfil.sn, "gponsn": perfil.sn_fisico,
+            "brmac": perfil.mac, "tr069_mac": perfil.mac,
+            "txpower": f"{perfil.tx:.2f}", "rxpower": f"{perfil.rx:.2f}",
+            "usb_port_num": "1", "usb_status": "Active" if perfil.usb else "Inactive",
+            "lan_port_num": "4", "voice_port_num": "1", "wifi_device": "2",
+            "pon_reg_state": "5", "ponmode": "GPON", "uptime": "3600",
+            "transceivertemperature": "45.2", "supplyvottage": "3.30", "biascurrent": "12.5",
+        },
+        "get_pon_info": {"txpower": f"{perfil.tx:.2f}", "rxpower": f"{perfil.rx:.2f}", "pon_reg_state": "5"},
+        "get_wifi_info": {"SSID": perfil.ssid24, "PreSharedKey": perfil.psk, "Channel": "6", "Enable": "1"},
+        "get_5g_wifi_info": {"SSID": perfil.ssid5, "PreSharedKey": perfil.psk, "Channel": "36", "Enable": "1"},
+        "get_wifi_status": {"wifi_status": []},
+        "get_usb_info": {"usb_status": "Active" if perfil.usb else "Inactive"},
+        "get_ftpclient_info": {"UsbList": "sda1" if perfil.usb else ""},
+        "get_allwan_info_broadBand": {"wan": [{"MACAddress": perfil.mac, "ConnectionStatus": "Connected"}]},
+    }.get(metodo)
+    if datos is None:
+        return {"session_valid": 1, "error": "unsupported"}
+    capt.update(datos)
+    capt["session_valid"] = 1
+    capt["sessionid"] = sesion
+    return capt
@@ -0,0 +1,365 @@
+# src/backend/emulador/servidor.py
+"""
+Servidor HTTP que se hace pasar por una ONT (Fiberhome, ZTE o Huawei).
+
+    from src.backend.emulador import EmuladorONT
+
+    with EmuladorONT("MOD002", latencia_ms=(5, 40)) as emu:
+        tester = ONTAutomatedTester(emu.direccion, "MOD002")   # "127.0.0.1:54321"
+        tester.run_all_tests()
+
+Comportamiento del equipo que se emula:
+  - latencia por petición (rango en ms, uniforme)
+  - sesión por cookie; sin sesión los datos no salen (session_valid=0 / SessionTimeout)
+  - bloqueo tras N logins fallidos durante bloqueo_s segundos
+  - reinicio (reset de fábrica o /__emu/reiniciar): durante reinicio_s se cortan las
+    conexiones sin respuesta, igual que cuando el equipo está arrancando
+
+GET /__emu/estado regresa contadores por ruta, logins, reinicios y bloqueos.
+
+Un solo equipo desde consola (p. ej. dentro de un netns del laboratorio multi-slot):
+    python -m src.backend.emulador --modelo MOD004 --host 192.168.100.1 --puerto 80
+"""
+import argparse
+import json
+import random
+import secrets
+import sys
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.backend.emulador import paginas
+from src.backend.emulador.perfiles import PerfilEquipo, ajax_fiberhome, generar
+
+COOKIE = "emu_sid"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ONT-Emulador/1.0"
+
+    def do_GET(self):
+        self.server.emu._atender(self, "GET")
+
+    def do_POST(self):
+        self.server.emu._atender(self, "POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class EmuladorONT:
+    def __init__(self, modelo: str, indice: int = 0, host: str = "127.0.0.1", puerto: int = 0,
+                 latencia_ms=(0, 0), reinicio_s: float = 5.0, intentos_bloqueo: int = 3,
+                 bloqueo_s: float = 60.0, semilla: int = 0, wifi_bloqueado: bool = False):
+        self.perfil: PerfilEquipo = generar(modelo, indice, semilla)
+        self.perfil.extra["wifi_bloqueado"] = wifi_bloqueado
+        self.host = host
+        self.puerto = puerto
+        self.latencia_ms = tuple(latencia_ms)
+        self.reinicio_s = reinicio_s
+        self.intentos_bloqueo = intentos_bloqueo
+        self.bloqueo_s = bloqueo_s
+
+        self._rnd = random.Random(f"latencia:{semilla}:{modelo}:{indice}")
+        self._lock = threading.Lock()
+        self._sesiones = set()
+        self._fallos = 0
+        self._bloqueado_hasta = 0.0
+        self._reiniciando_hasta = 0.0
+        self._server = None
+        self._hilo = None
+        self.contadores = {}
+        self.logins = {"ok": 0, "fallidos": 0, "bloqueados": 0}
+        self.reinicios = 0
+
+    # ---------- ciclo de vida ----------
+    @property
+    def modelo(self) -> str:
+        return self.perfil.modelo
+
+    @property
+    def direccion(self) -> str:
+        """host:puerto para ONTAutomatedTester(host=...)."""
+        return f"{self.host}:{self.puerto}"
+
+    def iniciar(self) -> "EmuladorONT":
+        if self._server is not None:
+            return self
+        self._server = ThreadingHTTPServer((self.host, self.puerto), _Handler)
+        self._server.daemon_threads = True
+        self._server.emu = self
+        self.puerto = self._server.server_address[1]
+        self._hilo = threading.Thread(target=self._server.serve_forever, name=f"emu-{self.modelo}-{self.puerto}",
+                                      daemon=True)
+        self._hilo.start()
+        print(f"[EMULADOR] {self.modelo} ({self.perfil.nombre}) SN {self.perfil.sn} en http://{self.direccion}")
+        return self
+
+    def detener(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+        return False
+
+    # ---------- estado del equipo ----------
+    def reiniciar(self, segundos: float = None) -> None:
+        """Simula el reinicio: se pierden las sesiones y no contesta durante 'segundos'."""
+        seg = self.reinicio_s if segundos is None else segundos
+        with self._lock:
+            self._sesiones.clear()
+            self._fallos = 0
+            self._reiniciando_hasta = time.monotonic() + seg
+            self.reinicios += 1
+        print(f"[EMULADOR] {self.direccion} reiniciando ({seg:.1f} s)")
+
+    def reiniciando(self) -> bool:
+        return time.monotonic() < self._reiniciando_hasta
+
+    def bloqueado(self) -> bool:
+        return time.monotonic() < self._bloqueado_hasta
+
+    def estado(self) -> dict:
+        with self._lock:
+            return {
+                "modelo": self.modelo, "nombre": self.perfil.nombre, "sn": self.perfil.sn,
+                "direccion": self.direccion, "sesiones": len(self._sesiones),
+                "reiniciando": self.reiniciando(), "bloqueado": self.bloqueado(),
+                "reinicios": self.reinicios, "logins": dict(self.logins),
+                "rutas": dict(self.contadores),
+            }
+
+    def _intentar_login(self, usuario: str, clave: str):
+        """(token o None, mensaje de error)."""
+        with self._lock:
+            if self.bloqueado():
+                self.logins["bloqueados"] += 1
+                restante = int(self._bloqueado_hasta - time.monotonic()) + 1
+                return None, f"Too many failed attempts. Try again in {restante} seconds."
+            if (usuario, clave) in self.perfil.credenciales:
+                self._fallos = 0
+                token = secrets.token_hex(16)
+                self._sesiones.add(token)
+                self.logins["ok"] += 1
+                return token, ""
+            self._fallos += 1
+            self.logins["fallidos"] += 1
+            if self.intentos_bloqueo and self._fallos >= self.intentos_bloqueo:
+                self._fallos = 0
+                self._bloqueado_hasta = time.monotonic() + self.bloqueo_s
+                return None, f"Too many failed attempts. Try again in {int(self.bloqueo_s)} seconds."
+            return None, "Incorrect user name or password."
+
+    def _sesion(self, req) -> str:
+        crudo = req.headers.get("Cookie")
+        if not crudo:
+            return None
+        try:
+            c = SimpleCookie(crudo)
+        except Exception:
+            return None
+        token = c[COOKIE].value if COOKIE in c else None
+        with self._lock:
+            return token if token in self._sesiones else None
+
+    def _cerrar_sesion(self, token) -> None:
+        with self._lock:
+            self._sesiones.discard(token)
+
+    # ---------- HTTP ----------
+    def _atender(self, req, metodo: str) -> None:
+        partes = urlsplit(req.path)
+        ruta = partes.path or "/"
+        query = {k: v[-1] for k, v in parse_qs(partes.query, keep_blank_values=True).items()}
+        cuerpo = b""
+        largo = int(req.headers.get("Content-Length") or 0)
+        if largo:
+            cuerpo = req.rfile.read(largo)
+        form = {}
+        if cuerpo and "multipart" not in (req.headers.get("Content-Type") or ""):
+            form = {k: v[-1] for k, v in parse_qs(cuerpo.decode("utf-8", "replace"), keep_blank_values=True).items()}
+
+        if ruta.startswith("/__emu/"):
+            return self._admin(req, ruta, query)
+
+        if self.reiniciando():
+            # Equipo arrancando: se corta la conexión sin contestar
+            req.close_connection = True
+            return
+
+        clave = ruta if "_tag" not in query else f"{ruta}?_tag={query['_tag']}"
+        with self._lock:
+            self.contadores[clave] = self.contadores.get(clave, 0) + 1
+
+        lo, hi = self.latencia_ms
+        if hi > 0:
+            time.sleep(self._rnd.uniform(lo, hi) / 1000.0)
+
+        despachar = {"FIBERHOME": self._fiberhome, "ZTE": self._zte, "HUAWEI": self._huawei}[self.perfil.fabricante]
+        try:
+            despachar(req, metodo, ruta, query, form)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _admin(self, req, ruta, query):
+        if ruta == "/__emu/estado":
+            return _responder(req, 200, json.dumps(self.estado()), "application/json")
+        if ruta == "/__emu/reiniciar":
+            self.reiniciar(float(query["s"]) if "s" in query else None)
+            return _responder(req, 200, '{"ok": true}', "application/json")
+        return _responder(req, 404, "not found")
+
+    # ---------- Fiberhome ----------
+    def _fiberhome(self, req, metodo, ruta, query, form):
+        sesion = self._sesion(req)
+        if ruta == "/":
+            # El equipo manda la raíz directo al login; index.html es la página capturada
+            return _redirigir(req, "/html/login_inter.html")
+        if ruta == "/index.html":
+            return _responder(req, 200, paginas.fh_index())
+        if ruta == "/html/login_inter.html":
+            return _responder(req, 200, paginas.fh_login())
+        if ruta == "/html/main_inter.html":
+            if not sesion:
+                return _redirigir(req, "/html/login_inter.html")
+            return _responder(req, 200, paginas.fh_main(self.perfil))
+        if ruta in ("/cgi-bin/do_logout", "/html/logout.html", "/logout"):
+            self._cerrar_sesion(sesion)
+            return _redirigir(req, "/html/login_inter.html")
+        if ruta.startswith("/js/") or ruta.startswith("/html/js/"):
+            return _responder(req, 200, paginas.js(ruta.rsplit("/", 1)[-1]), "application/javascript")
+        if ruta.endswith(".css"):
+            return _responder(req, 200, "", "text/css")
+        if ruta == "/cgi-bin/ajax":
+            datos = {**query, **form}
+            accion = datos.get("ajaxmethod", "")
+            if accion == "do_login":
+                token, error = self._intentar_login(datos.get("username", ""), datos.get("loginpd", ""))
+                if not token:
+                    return _json(req, {"login_result": 1, "msg": error})
+                return _json(req, {"login_result": 0, "sessionid": token}, cookie=token)
+            if accion in ("do_reboot", "do_restore"):
+                if not sesion:
+                    return _json(req, {"session_valid": 0})
+                _json(req, {"session_valid": 1, "result": 0})
+                return self.reiniciar()
+            return _json(req, ajax_fiberhome(self.perfil, accion, sesion))
+        return _responder(req, 404, "Not Found")
+
+    # ---------- ZTE ----------
+    def _zte(self, req, metodo, ruta, query, form):
+        sesion = self._sesion(req)
+        if ruta == "/" and query.get("_type") == "menuData":
+            tag = query.get("_tag", "")
+            if tag.startswith("devmgr_restoremgr_lua") and metodo == "POST" and sesion:
+                _responder(req, 200, paginas.zte_xml(self.perfil, tag), "text/xml")
+                if form.get("IF_ACTION") == "Restore":
+                    self.reiniciar()
+                return
+            return _responder(req, 200, paginas.zte_xml(self.perfil, tag, sesion=bool(sesion)), "text/xml")
+        if ruta == "/":
+            if metodo == "POST" and form.get("action") == "login":
+                token, error = self._intentar_login(form.get("Frm_Username", ""), form.get("Frm_Password", ""))
+                if not token:
+                    return _responder(req, 200, paginas.zte_login(self.perfil, error))
+                return _redirigir(req, "/", cookie=token)
+            if not sesion:
+                return _responder(req, 200, paginas.zte_login(self.perfil))
+            return _responder(req, 200, paginas.zte_main(self.perfil))
+        if ruta == "/logout.html":
+            self._cerrar_sesion(sesion)
+            return _redirigir(req, "/")
+        return _responder(req, 404, "Not Found")
+
+    # ---------- Huawei ----------
+    def _huawei(self, req, metodo, ruta, query, form):
+        sesion = self._sesion(req)
+        if ruta == "/":
+            if sesion:
+                return _redirigir(req, "/index.asp")
+            return _responder(req, 200, paginas.hw_login(self.perfil))
+        if ruta == "/login.cgi" and metodo == "POST":
+            token, error = self._intentar_login(form.get("txt_Username", ""), form.get("txt_Password", ""))
+            if not token:
+                return _responder(req, 200, paginas.hw_login(self.perfil, error))
+            return _redirigir(req, "/index.asp", cookie=token)
+        if ruta == "/logout.cgi":
+            self._cerrar_sesion(sesion)
+            return _redirigir(req, "/")
+        if not sesion:
+            return _redirigir(req, "/")
+        if ruta == "/index.asp":
+            return _responder(req, 200, paginas.hw_index(self.perfil))
+        if ruta == "/html/ssmp/reset/restoredefcfg.cgi":
+            _responder(req, 200, "SUCCESS")
+            return self.reiniciar()
+        if ruta == "/html/ssmp/fwupgrade/upload.cgi":
+            return _responder(req, 200, "<html><body>Upgrade OK</body></html>")
+        contenido = paginas.hw_frame(self.perfil, ruta, urlsplit(req.path).query)
+        if contenido is None:
+            return _responder(req, 404, "Not Found")
+        return _responder(req, 200, contenido)
+
+
+def _responder(req, codigo: int, cuerpo, tipo: str = "text/html", cabeceras=None) -> None:
+    datos = cuerpo if isinstance(cuerpo, bytes) else str(cuerpo).encode("utf-8")
+    req.send_response(codigo)
+    req.send_header("Content-Type", f"{tipo}; charset=utf-8")
+    req.send_header("Content-Length", str(len(datos)))
+    req.send_header("Cache-Control", "no-cache")
+    for k, v in (cabeceras or {}).items():
+        req.send_header(k, v)
+    req.end_headers()
+    if req.command != "HEAD":
+        req.wfile.write(datos)
+
+
+def _cookie(token) -> dict:
+    return {"Set-Cookie": f"{COOKIE}={token}; Path=/; HttpOnly"} if token else {}
+
+
+def _redirigir(req, destino: str, cookie: str = None) -> None:
+    _responder(req, 302, "", cabeceras={"Location": destino, **_cookie(cookie)})
+
+
+def _json(req, datos: dict, cookie: str = None) -> None:
+    _responder(req, 200, json.dumps(datos, ensure_ascii=False), "application/json", _cookie(cookie))
+
+
+def main(argv=None):
+    from src.backend.emulador.perfiles import MODELOS
+    parser = argparse.ArgumentParser(description="Servir una ONT emulada")
+    parser.add_argument("--modelo", required=True, choices=sorted(MODELOS))
+    parser.add_argument("--indice", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=80)
+    parser.add_argument("--latencia", default="0", help="ms por petición (p. ej. 5-40)")
+    parser.add_argument("--reinicio", type=float, default=5.0)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    lo, _, hi = args.latencia.partition("-")
+    emu = EmuladorONT(args.modelo, args.indice, args.host, args.puerto, (float(lo), float(hi or lo)),
+                      args.reinicio, semilla=args.semilla).iniciar()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    emu.detener()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,10 @@ from pathlib import Path
 import threading
 import time
 from datetime import date, datetime
-from src.backend.ont_automatico import main_loop
 import math
 
+from src.backend.endpoints import motor
+
 _UNIT_RUNNING = threading.Event()
 _UNIT_LOCK = threading.Lock()
 
@@ -160,15 +161,17 @@ def norm_result(v, *, false_means: str = "FAIL") -> str:
 
     return "SIN_PRUEBA"
 
-def norm_power(valor, tipo):
+def norm_power(valor, tipo, fibra_cfg=None):
+    # fibra_cfg: config["fibra"] ya cargada (importaciones masivas); si no viene se lee de la bd
     def _to_float_safe(v):
         try:
             return float(v)
         except (TypeError, ValueError):
             return "FAIL"
-    from src.backend.endpoints.conexion import cargarConfig
-    config = cargarConfig()
-    fibra_cfg = config.get("fibra", {})
+    if fibra_cfg is None:
+        from src.backend.endpoints.conexion import cargarConfig
+        config = cargarConfig()
+        fibra_cfg = config.get("fibra", {})
     mintx = float(fibra_cfg.get("mintx", 0.0))
     maxtx = float(fibra_cfg.get("maxtx", 1.0))
     minrx = float(fibra_cfg.get("minrx", 0.0))
@@ -284,8 +287,8 @@ def iniciar_testerConexion(resetFabrica, usb, fibra, wifi, out_q = None, stop_ev
     
     emit("log", "Iniciando pruebas...")
     # print("CONEXION: wifi: "+str(wifi))
-    # Mandar a llamar al main loop de ont_automatico
-    main_loop(opcionesTest, out_q, stop_event, dispatcher, auto_test_on_detect=auto_test_on_detect, start_in_monitor=start_in_monitor)
+    # Mandar a llamar al main loop de ont_automatico (import diferido en endpoints/motor)
+    motor.main_loop(opcionesTest, out_q, stop_event, dispatcher, auto_test_on_detect=auto_test_on_detect, start_in_monitor=start_in_monitor)
     # Se hará desde dentro del main_loop
     # from src.backend.mixins.common_mixin import _resultados_finales
     # resultados = _resultados_finales()  # función de resultados finales
@@ -349,8 +352,7 @@ def iniciar_pruebaUnitariaConexion(resetFabrica, sftU, usb, fibra, wifi, model,
         emit("log", f"Iniciando prueba unitaria: {prueba_nombre}")
 
         # Mandar a llamar una prueba unitaria
-        from src.backend.ont_automatico import pruebaUnitariaONT
-        pruebaUnitariaONT(opcionesTest=opcionesTest, out_q=out_q, modelo=model, stop_event=stop_event)
+        motor.prueba_unitaria(opcionesTest=opcionesTest, out_q=out_q, modelo=model, stop_event=stop_event)
         
         # Emitir finalización (solo si no fue cancelado)
         if not (stop_event and stop_event.is_set()):
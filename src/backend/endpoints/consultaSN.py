@@ -1,9 +1,7 @@
 import time
-import re, html
 import requests
 from typing import Tuple
 from typing import Dict
-from src.backend.ont_automatico import _ping_once 
 from datetime import datetime
 from selenium.webdriver.chrome.options import Options
 import sys
@@ -696,63 +694,10 @@ def detectar_modelo_por_http(ip: str, timeout: int = 3) -> Tuple[str, str, str]:
 
     r = s.get(base_url, timeout=timeout, verify=False, allow_redirects=True)
 
-    raw_html = r.text or ""
-    html_lower = raw_html.lower()
-    server_header = (r.headers.get("Server") or "").lower()
-    html_normalized = html_lower.replace(" ", "").replace("\n", "").replace("\t", "")
-
-    # 1) GRANDSTREAM
-    if "grandstream" in html_lower or "grandstream" in server_header or "ht818" in html_lower:
-        return ("GRANDSTREAM", "", "HT818")
-
-    # 2) FIBERHOME
-    if any(k in html_lower for k in ["fiberhome", "hg6145f", "user_name", "loginpp", "fh-text-security"]):
-        model_code = "MOD001"
-        if "hg6145f1" in html_lower:
-            model_code = "MOD008"
-        # si quieres regresar nombre:
-        return ("FIBERHOME", model_code, "HG6145F" if "hg6145f" in html_lower else "HG6145F1")
-
-    # 3) HUAWEI
-    if any(k in html_normalized for k in ["huawei", "hg8145", "txt_username", "txt_password"]):
-        product_name = ""
-
-        m = re.search(r"<title>(.*?)</title>", raw_html, re.IGNORECASE)
-        if m:
-            product_name = m.group(1).upper().strip()
-
-        if "HG8145" not in product_name:
-            js = re.search(r"var\s+ProductName\s*=\s*['\"]([^'\"]+)['\"]", raw_html, re.IGNORECASE)
-            if js:
-                raw_js = js.group(1).upper()
-                product_name = raw_js.replace("\\X2D", "-").replace("\\x2d", "-").strip()
-
-        if "HG8145X6-10" in product_name:
-            model_code = "MOD003"
-        elif "HG8145X6" in product_name:
-            model_code = "MOD007"
-        elif "HG8145V5" in product_name:
-            model_code = "MOD005" if "SMALL" in product_name else "MOD004"
-        else:
-            model_code = "MOD004"
-
-        return ("HUAWEI", model_code, product_name)
-
-    # 4) ZTE
-    if any(k in html_lower for k in ["zte", "zxhn", "f670l", "f6600", "frm_username", "frm_password"]):
-        zte_title = ""
-        m = re.search(r"<title>(.*?)</title>", raw_html, re.IGNORECASE)
-        if m:
-            zte_title = html.unescape(m.group(1)).upper().strip()
-
-        if "F6600" in zte_title:
-            model_code = "MOD009"
-        elif "F670L" in zte_title:
-            model_code = "MOD002"
-        else:
-            model_code = "MOD002"
-
-        return ("ZTE", model_code, zte_title)
+    from src.backend.core import device_fingerprint
+    identidad = device_fingerprint.identificar(r.text or "", r.headers)
+    if identidad.vendor != "ONT":
+        return (identidad.vendor, identidad.modelo, identidad.producto or identidad.nombre)
 
     # fallback por segmento
     if ip == "192.168.100.1":
@@ -773,51 +718,56 @@ def snFinal(out_q=None, stop_event=None) -> str:
         if out_q:
             out_q.put((kind, payload))
     
+    # La consulta hace su propio login: soltar (con logout) las sesiones que dejó el tester
+    from src.backend.core import sesiones
+    sesiones.descartar(logout=True)
+
     # Hacer emit de que se está comenzando a buscar la IP
     emit("log", "Buscando IP...")
 
+    from src.backend.utils import presencia
+    pres = presencia.fuente(COMMON_IPS)
     last_state = None
     current_ip = None
 
-    while True:
-        if stop_event and stop_event.is_set():
-            emit("log", "Consulta cancelada por cambio de modo")
-            return
-
-        # 1) detectar si hay equipo (ping a IPs)
-        found_ip = None
-        for ip in COMMON_IPS:
-            if _ping_once(ip, timeout_ms=500):
-                found_ip = ip
-                break
-
-        # 2) estado
-        connected = found_ip is not None
-
-        # 3) emitir solo si cambia el estado (anti-spam)
-        if connected and (last_state != "connected" or current_ip != found_ip):
-            current_ip = found_ip
-            last_state = "connected"
-            emit("con", "Dispositivo Conectado")
-            # Marcar PING como PASS automáticamente al detectar conexión
-            emit("individual_show", {"name": "ping", "status": "PASS"})
-            emit("log", f"Conectado: {current_ip}")
-
-            # Buscar el modelo
-            fabricante, modelo = mostrarModelo(current_ip)
-            emit("logSuper", modelo)
-            emit("pruebas", f"Fabricante: {fabricante}")
-            # Login + extraccion de sn
-            sn = mostrarSN(fabricante, modelo)
-            emit("sn", sn)
-
-        if (not connected) and last_state != "disconnected":
-            current_ip = None
-            last_state = "disconnected"
-            emit("con", "DESCONECTADO") 
-            emit("log", "Desconectado")
-
-        time.sleep(0.5)
+    try:
+        while True:
+            if stop_event and stop_event.is_set():
+                emit("log", "Consulta cancelada por cambio de modo")
+                return
+
+            # 1) detectar si hay equipo (enlace/ARP por eventos)
+            found_ip = pres.alguna()
+
+            # 2) estado
+            connected = found_ip is not None
+
+            # 3) emitir solo si cambia el estado (anti-spam)
+            if connected and (last_state != "connected" or current_ip != found_ip):
+                current_ip = found_ip
+                last_state = "connected"
+                emit("con", "Dispositivo Conectado")
+                # Marcar PING como PASS automáticamente al detectar conexión
+                emit("individual_show", {"name": "ping", "status": "PASS"})
+                emit("log", f"Conectado: {current_ip}")
+
+                # Buscar el modelo
+                fabricante, modelo = mostrarModelo(current_ip)
+                emit("logSuper", modelo)
+                emit("pruebas", f"Fabricante: {fabricante}")
+                # Login + extraccion de sn
+                sn = mostrarSN(fabricante, modelo)
+                emit("sn", sn)
+
+            if (not connected) and last_state != "disconnected":
+                current_ip = None
+                last_state = "disconnected"
+                emit("con", "DESCONECTADO") 
+                emit("log", "Desconectado")
+
+            pres.esperar_cambio(0.5)
+    finally:
+        presencia.soltar(pres)
     return ""
 
 # Funciones adicionales necesarias
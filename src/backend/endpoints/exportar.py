@@ -0,0 +1,140 @@
+# src/backend/endpoints/exportar.py
+# Export de la tabla operations a XLSX / CSV en streaming.
+# Las filas salen del cursor de SQLite por lotes y se escriben directo al archivo,
+# así la memoria no crece con el número de registros.
+import csv
+import os
+import time
+from pathlib import Path
+
+PROGRESS_EVERY = 5000  # filas entre eventos de progreso
+
+
+def _ruta_temporal(ruta: Path) -> Path:
+    """
+    Temporal en la misma carpeta (os.replace es atómico dentro del mismo volumen).
+    Conserva la extensión para que openpyxl / csv no se quejen.
+    """
+    return ruta.with_name(f".{ruta.stem}.tmp{ruta.suffix}")
+
+
+def _get_openpyxl():
+    """
+    openpyxl es opcional (no viene en requirements). Si no está, el llamador
+    cae a CSV.
+    """
+    try:
+        from openpyxl import Workbook  # type: ignore
+        return Workbook
+    except Exception as e:
+        raise RuntimeError("openpyxl no está instalado; no se puede generar .xlsx") from e
+
+
+class _CsvWriter:
+    def __init__(self, ruta: Path, headers):
+        # utf-8-sig para que Excel abra bien los acentos
+        self._f = ruta.open("w", encoding="utf-8-sig", newline="")
+        self._w = csv.writer(self._f)
+        self._w.writerow(headers)
+
+    def write(self, row):
+        self._w.writerow(row)
+
+    def close(self):
+        self._f.close()
+
+
+class _XlsxWriter:
+    def __init__(self, ruta: Path, headers):
+        Workbook = _get_openpyxl()
+        self._ruta = ruta
+        # write_only: las filas se van a un temporal, no se guardan en memoria
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet("operations")
+        self._ws.append(headers)
+
+    def write(self, row):
+        self._ws.append(list(row))
+
+    def close(self):
+        self._wb.save(str(self._ruta))
+
+
+def exportar_operaciones(ruta, desde=None, hasta=None, modelo=None, valido=None,
+                         out_q=None, stop_event=None):
+    """
+    Exporta operations a `ruta` (.xlsx o .csv según la extensión).
+    Se escribe a un temporal junto a `ruta` y solo se renombra al terminar bien;
+    si se cancela o falla, el temporal se borra y `ruta` queda como estaba.
+    Pensado para correr en un hilo: reporta por out_q
+      ("export_progreso", {"hechas", "total"})
+      ("export_fin", {"ok", "ruta", "filas", "segundos", "error"})
+    """
+    from src.backend.sua_client.dao import (
+        EXPORT_COLUMNS, contar_operaciones_export, iter_operaciones_export,
+    )
+
+    def emit(kind, payload):
+        if out_q:
+            out_q.put((kind, payload))
+
+    ruta = Path(ruta)
+    t0 = time.perf_counter()
+    filas = 0
+    writer = None
+    filas_it = None
+    tmp = None
+    try:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        if ruta.suffix.lower() == ".xlsx":
+            try:
+                tmp = _ruta_temporal(ruta)
+                writer = _XlsxWriter(tmp, EXPORT_COLUMNS)
+            except RuntimeError as e:
+                print(f"[EXPORT] {e}. Se exporta como CSV.")
+                ruta = ruta.with_suffix(".csv")
+        if writer is None:
+            tmp = _ruta_temporal(ruta)
+            writer = _CsvWriter(tmp, EXPORT_COLUMNS)
+
+        total = contar_operaciones_export(desde, hasta, modelo, valido)
+        emit("export_progreso", {"hechas": 0, "total": total})
+        print(f"[EXPORT] Exportando {total} registros a {ruta}")
+
+        filas_it = iter_operaciones_export(desde, hasta, modelo, valido)
+        for row in filas_it:
+            if stop_event and stop_event.is_set():
+                raise RuntimeError("Export cancelado")
+            writer.write(row)
+            filas += 1
+            if filas % PROGRESS_EVERY == 0:
+                emit("export_progreso", {"hechas": filas, "total": total})
+
+        writer.close()
+        writer = None
+        os.replace(tmp, ruta)
+        tmp = None
+        seg = time.perf_counter() - t0
+        print(f"[EXPORT] Listo: {filas} filas en {seg:.1f}s")
+        emit("export_progreso", {"hechas": filas, "total": total})
+        emit("export_fin", {"ok": True, "ruta": str(ruta), "filas": filas, "segundos": seg, "error": None})
+    except Exception as e:
+        print(f"[EXPORT] Error: {e}")
+        emit("export_fin", {
+            "ok": False, "ruta": str(ruta), "filas": filas,
+            "segundos": time.perf_counter() - t0, "error": str(e),
+        })
+    finally:
+        if filas_it is not None:
+            filas_it.close()
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:
+                pass
+        if tmp is not None:
+            # export incompleto: no se deja nada a medias en la carpeta destino
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
@@ -1,6 +1,5 @@
 # Esto se usará para unicamente mostrar conectado  desconectado
-import time
-from src.backend.ont_automatico import _ping_once  
+from src.backend.utils import presencia
 
 COMMON_IPS = ["192.168.100.1", "192.168.1.1"]
 
@@ -10,40 +9,41 @@ def iniciar_monitoreo(out_q=None, stop_event=None):
             out_q.put((kind, payload))
 
     emit("log", "[MON] Iniciando monitoreo...")
+    # Enlace/ARP por eventos (o ping compartido si no hay netlink)
+    pres = presencia.fuente(COMMON_IPS)
     last_state = None
     current_ip = None
 
-    while True:
-        if stop_event and stop_event.is_set():
-            emit("log", "[MON] Monitoreo cancelado por cambio de modo")
-            return
+    try:
+        while True:
+            if stop_event and stop_event.is_set():
+                emit("log", "[MON] Monitoreo cancelado por cambio de modo")
+                return
 
-        # 1) detectar si hay equipo (ping a IPs)
-        found_ip = None
-        for ip in COMMON_IPS:
-            if _ping_once(ip, timeout_ms=500):
-                found_ip = ip
-                break
+            # 1) detectar si hay equipo
+            found_ip = pres.alguna()
 
-        # 2) estado
-        connected = found_ip is not None
+            # 2) estado
+            connected = found_ip is not None
 
-        # 3) emitir solo si cambia el estado (anti-spam)
-        if connected and (last_state != "connected" or current_ip != found_ip):
-            current_ip = found_ip
-            last_state = "connected"
-            emit("con", "Dispositivo Conectado")
-            # Marcar PING como PASS automáticamente al detectar conexión
-            emit("individual_show", {"name": "ping", "status": "PASS"})
-            emit("log", f"[MON] Conectado: {current_ip}")
+            # 3) emitir solo si cambia el estado (anti-spam)
+            if connected and (last_state != "connected" or current_ip != found_ip):
+                current_ip = found_ip
+                last_state = "connected"
+                emit("con", "Dispositivo Conectado")
+                # Marcar PING como PASS automáticamente al detectar conexión
+                emit("individual_show", {"name": "ping", "status": "PASS"})
+                emit("log", f"[MON] Conectado: {current_ip} ({pres.mac(current_ip) or 'MAC ?'})")
 
-        if (not connected) and last_state != "disconnected":
-            current_ip = None
-            last_state = "disconnected"
-            emit("con", "DESCONECTADO")
-            emit("log", "[MON] Desconectado")
+            if (not connected) and last_state != "disconnected":
+                current_ip = None
+                last_state = "disconnected"
+                emit("con", "DESCONECTADO")
+                emit("log", "[MON] Desconectado")
 
-        time.sleep(0.5)
+            pres.esperar_cambio(0.5)
+    finally:
+        presencia.soltar(pres)
 
 """
 ⢯⡹⣇⢯⡳⣝⢮⡝⢧⠯⣝⢮⢳⡎⣗⢳⡒⢧⣚⠴⣍⠶⣙⢮⡱⣍⡜⣣⢏⡼⡘⠃⠉⠈⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠐⠌⣆⠳⡘⢤⠓⣌⠲⡡⢎⠒⡤⢒⡌⠦⠱⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀⠀
@@ -0,0 +1,30 @@
+# src/backend/endpoints/motor.py
+# Punto único de entrada al motor de pruebas (ont_automatico).
+# ont_automatico arrastra selenium, mixins, bs4, jinja2... y no debe cargarse
+# hasta que realmente arranca un modo de prueba. El import diferido vive aquí;
+# la UI y los endpoints importan este módulo (solo stdlib) al cargar.
+
+
+def _ont():
+    from src.backend import ont_automatico
+    return ont_automatico
+
+
+# ---------- motor (ont_automatico) ----------
+def main_loop(*args, **kwargs):
+    return _ont().main_loop(*args, **kwargs)
+
+
+def prueba_unitaria(*args, **kwargs):
+    return _ont().pruebaUnitariaONT(*args, **kwargs)
+
+
+# ---------- modos desde la UI (arman opcionesTest en endpoints/conexion) ----------
+def iniciar_tester(*args, **kwargs):
+    from src.backend.endpoints.conexion import iniciar_testerConexion
+    return iniciar_testerConexion(*args, **kwargs)
+
+
+def iniciar_prueba_unitaria(*args, **kwargs):
+    from src.backend.endpoints.conexion import iniciar_pruebaUnitariaConexion
+    return iniciar_pruebaUnitariaConexion(*args, **kwargs)
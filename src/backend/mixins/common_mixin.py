@@ -14,6 +14,8 @@ from typing import Dict, Any, List, Optional
 import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
+from src.backend.core import estrategias_login
+from src.backend.core.resultados import ResultadosONT, InfoDispositivo, SIN_PRUEBA
 try:
     from selenium import webdriver
     from selenium.webdriver.common.by import By
@@ -88,6 +90,9 @@ class CommonMixin:
     
     def save_results(self, output_dir: str = None):
         """Guarda los resultados en archivos organizados por fecha"""
+        if not getattr(self, "guardar_resultados", True):
+            print("[RESULT] Reporte no guardado (guardar_resultados = False)")
+            return
         timestamp = datetime.now().strftime("%d_%m_%y_%H%M%S")
         date_folder = datetime.now().strftime("%d_%m_%y")
         
@@ -108,10 +113,12 @@ class CommonMixin:
         # Crear directorio por fecha si no existe
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Guardar JSON
-        json_file = output_dir / f"{timestamp}_{self.model}_automated_results.json"
-        with open(json_file, "w") as f:
-            json.dump(self.test_results, f, indent=2)
+        # JSON al archivo diario comprimido (un renglón por equipo, ya no un archivo por equipo)
+        from src.backend.core.archivo_resultados import get_archivo
+        json_file = get_archivo().agregar(self.test_results, origen=str(output_dir))
+        # Registrar en el índice de retest (sn, modelo)
+        from src.backend.core.indice_resultados import registrar
+        registrar(self.test_results, json_file)
         
         # Guardar reporte de texto
         txt_file = output_dir / f"{timestamp}_{self.model}_automated_report.txt"
@@ -196,34 +203,50 @@ class CommonMixin:
         print(f"[DEBUG] chrome binary = {chrome_binary}  exists={chrome_binary.exists()}")
         return str(chrome_binary)
 
-    def save_results2(self, base_dir: str):
+    def save_results2(self, base_dir: str, test_results: dict = None):
         """
-        Guarda self.test_results en:
-            base_dir/YYYY-MM-DD/HHMMSS_model_sn.json
+        Agrega self.test_results (o la copia test_results) al archivo diario comprimido
+        (core/archivo_resultados: reports/resultados/resultados_YYYY-MM-DD.jsonl.gz).
 
-        - base_dir: carpeta raíz del modelo (p.ej. 'test_mod002', 'test_hg8145v5')
+        - base_dir: carpeta raíz del modelo (p.ej. 'test_mod002', 'test_hg8145v5');
+          se guarda como "origen" del registro.
+        Regresa la referencia "archivo#offset" (None si el tester no guarda resultados).
         """
-        meta = self.test_results.get("metadata", {})
-
-        today = datetime.now().strftime("%Y-%m-%d")
-        out_dir = Path(base_dir) / today
-        out_dir.mkdir(parents=True, exist_ok=True)
-
-        ts    = datetime.now().strftime("%H%M%S")
-        model = meta.get("model", "unknown_model")
-        sn    = meta.get("serial_number") or "noSN"
-
-        # Limpiar SN para que no meta espacios / caracteres raros en el filename
-        sn_clean = "".join(c for c in sn if c.isalnum() or c in ("-", "_"))
-
-        filename = f"{ts}_{model}_{sn_clean}.json"
-        out_file = out_dir / filename
-
-        with out_file.open("w", encoding="utf-8") as f:
-            json.dump(self.test_results, f, indent=2, ensure_ascii=False)
-
-        print(f"[RESULT] Reporte guardado en: {out_file}")
-        return str(out_file)
+        if not getattr(self, "guardar_resultados", True):
+            print("[RESULT] Reporte no guardado (guardar_resultados = False)")
+            return None
+        if test_results is None:
+            test_results = self.test_results
+        from src.backend.core.archivo_resultados import get_archivo
+        ref = get_archivo().agregar(test_results, origen=str(base_dir))
+        from src.backend.core.indice_resultados import registrar
+        registrar(test_results, ref)
+
+        print(f"[RESULT] Reporte guardado en: {ref}")
+        return ref
+
+    def encolar_resultados(self, base_dir: str):
+        """
+        save_results2 en core/postproceso (archivo diario + results_index) en lugar
+        del hilo de pruebas. Se encola una copia de test_results: el tester se sigue usando.
+        """
+        if not getattr(self, "guardar_resultados", True):
+            print("[RESULT] Reporte no guardado (guardar_resultados = False)")
+            return
+        from src.backend.core.indice_resultados import sn_de
+        from src.backend.core.postproceso import get_postproceso
+        copia = json.loads(json.dumps(self.test_results, default=str))
+        get_postproceso().enviar("reporte_json", self.save_results2, base_dir, copia,
+                                 sn=sn_de(copia), out_q=self.out_q)
+
+    def _crear_driver(self, service, chrome_options):
+        """webdriver.Chrome para los logins: usa el pre-calentado si coincide (core/precalentado)"""
+        from src.backend.core import precalentado
+        driver = precalentado.tomar_driver(self.host, self.model, chrome_options)
+        if driver is None:
+            precalentado.recordar(self.model, chrome_options, service.path)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        return driver
 
     def _selenium_login(self, headless: bool = True, timeout: int = 10) -> bool:
         """Automatiza login web usando Selenium para obtener sessionid válido
@@ -264,7 +287,7 @@ class CommonMixin:
             # service = Service(ChromeDriverManager().install())
             driver_path = self._get_chromedriver_path()
             service = Service(driver_path)
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver = self._crear_driver(service, chrome_options)
             driver.set_page_load_timeout(timeout)
             self.driver = driver
             # Navegar a la página principal (el router redirigirá al login)
@@ -326,14 +349,12 @@ class CommonMixin:
             username_field = None
             password_field = None
             
-            # Encontrar campo de usuario
-            for by, selector in username_selectors:
-                try:
-                    username_field = wait.until(EC.presence_of_element_located((by, selector)))
-                    print(f"[SELENIUM] Campo username encontrado: {by}='{selector}'")
-                    break
-                except:
-                    continue
+            # Encontrar campo de usuario (en el orden aprendido para este modelo, core/estrategias_login)
+            username_field = estrategias_login.buscar(
+                self, "usuario", username_selectors,
+                lambda by, selector: wait.until(EC.presence_of_element_located((by, selector))),
+                desc="username",
+            )
             
             if not username_field:
                 print("[ERROR] No se encontro campo de usuario en el formulario")
@@ -473,6 +494,18 @@ class CommonMixin:
     
     def _do_login_post(self) -> bool:
         """Realiza login POST completo para obtener sessionid válido"""
+        # Las tres estrategias en el orden que mejor ha funcionado para este modelo/firmware
+        ganadora = estrategias_login.primera(self, "login_post", {
+            "form": self._login_post_form,
+            "ajax": self._login_post_ajax,
+            "main_html": self._login_post_main_html,
+        })
+        if ganadora is None:
+            print(f"[AUTH] Todas las estrategias de login POST fallaron")
+            return False
+        return True
+
+    def _login_post_form(self) -> bool:
         # Estrategia 1: Intentar login via formulario HTML tradicional
         try:
             login_url = f"{self.base_url}/login.html"
@@ -506,7 +539,9 @@ class CommonMixin:
                     return True
         except Exception as e:
             print(f"[DEBUG] Estrategia 1 (form login) fall\u00f3: {e}")
-        
+        return False
+
+    def _login_post_ajax(self) -> bool:
         # Estrategia 2: Intentar do_login via AJAX POST
         try:
             login_data = {
@@ -522,7 +557,9 @@ class CommonMixin:
                 return True
         except Exception as e:
             print(f"[DEBUG] Estrategia 2 (AJAX do_login) fall\u00f3: {e}")
-        
+        return False
+
+    def _login_post_main_html(self) -> bool:
         # Estrategia 3: Acceder a la p\u00e1gina principal autenticada y extraer sessionid
         try:
             response = self.session.get(
@@ -548,8 +585,6 @@ class CommonMixin:
                         return True
         except Exception as e:
             print(f"[DEBUG] Estrategia 3 (main.html parsing) fall\u00f3: {e}")
-        
-        print(f"[AUTH] Todas las estrategias de login POST fallaron")
         return False
 
     # ==================== NETWORK CONNECTIVITY TESTS ==================== 
@@ -714,23 +749,32 @@ class CommonMixin:
             # matar el hilo
             return False
 
-        # ESTRATEGIA 1: Intentar Selenium para login automático (método más confiable)
+        # ESTRATEGIA 1: Selenium (método más confiable) / ESTRATEGIA 2: Basic Auth directo.
+        # Se prueban en el orden que mejor ha funcionado para este modelo (core/estrategias_login)
+        estrategias = {}
         if SELENIUM_AVAILABLE:
-            print("[AUTH] Intentando login automático con Selenium...")
-            if self._selenium_login(headless=True, timeout=15):
-                print("[AUTH] OK - Login Selenium exitoso")
-                selenium_success = True
-                # NO retornar aquí - continuar para extraer info del dispositivo
-            else:
-                print("[AUTH] WARNING - Selenium fallo, intentando metodos alternativos...")
-                # Recursión con 1 reintento sino gg
-                reintento += 1
-                return self._login_ont_standard(reintento)
+            estrategias["selenium"] = lambda: self._selenium_login(headless=True, timeout=15)
         else:
             print("[AUTH] WARNING - Selenium no disponible (pip install selenium webdriver-manager)")
-        
-        # ESTRATEGIA 2: Obtener información del dispositivo (prueba de conectividad)
-        device_info = self._ajax_get('get_device_name')
+
+        device_info = {}
+        def _basic_auth():
+            nonlocal device_info
+            device_info = self._ajax_get('get_device_name')
+            return bool(device_info.get('ModelName'))
+        estrategias["basic_auth"] = _basic_auth
+
+        ganadora = estrategias_login.primera(self, "ont_standard", estrategias)
+        if ganadora == "selenium":
+            print("[AUTH] OK - Login Selenium exitoso")
+            selenium_success = True
+            # NO retornar aquí - continuar para extraer info del dispositivo
+            device_info = self._ajax_get('get_device_name')
+        elif ganadora is None and SELENIUM_AVAILABLE:
+            print("[AUTH] WARNING - Selenium fallo, intentando metodos alternativos...")
+            # Recursión con 1 reintento sino gg
+            reintento += 1
+            return self._login_ont_standard(reintento)
         
         if device_info.get('success') == False:
             print(f"[AUTH] Error en conexion: {device_info.get('error', 'Unknown')}")
@@ -1146,52 +1190,23 @@ class CommonMixin:
             return str(item)
         return None
 
-    def _resultados_json_corto(self, fecha, modelo, sn, mac, sftVer, wifi24, wifi5, passWifi, ping, reset, usb, tx, rx, w24, w5, sftU):
-        # Validar si ha pasado los tests
-        valido = (
-            ping == "PASS"
-            and reset == "PASS"
-            and usb == "PASS"
-            and float(tx) > 0
-            and float(rx) > -28
-            and bool(w24)
-            and bool(w5)
+    def _registro_corto(self, fecha, modelo, sn, mac, sftVer, wifi24, wifi5, passWifi, ping, reset, usb, tx, rx, w24, w5, sftU) -> ResultadosONT:
+        """Arma el registro tipado (ZTE / Huawei). Los tests en SIN PRUEBA no salen en el payload."""
+        reg = ResultadosONT(
+            info=InfoDispositivo(
+                modelo=modelo, fecha_test=fecha, sn=sn, mac=mac, sftVer=sftVer,
+                wifi24=wifi24, wifi5=wifi5, passWifi=passWifi,
+            ),
         )
+        for clave, valor in (("ping", ping), ("reset", reset), ("usb", usb), ("tx", tx),
+                             ("rx", rx), ("w24", w24), ("w5", w5), ("sftU", sftU)):
+            reg.set(clave, valor)
+        reg.capturar(self.test_results.get("tests"))
+        reg.calcular_valido()
+        return reg
 
-        resultado = {
-            "info": {
-                "modelo": modelo or "DESCONOCIDO",
-                "fecha_test": fecha,
-                "sn": sn or "N/A",
-                "mac": mac or "N/A",
-                "sftVer": sftVer or "N/A",
-                "wifi24": wifi24 or "N/A",
-                "wifi5": wifi5 or "N/A",
-                "passWifi": passWifi or "N/A"
-            },
-            "tests": {
-                "ping": ping
-            },
-            "valido": valido
-        }
-
-        # Solo incluir tests que realmente se ejecutaron (no "SIN PRUEBA")
-        if reset != "SIN PRUEBA":
-            resultado["tests"]["reset"] = reset
-        if usb != "SIN PRUEBA":
-            resultado["tests"]["usb"] = usb
-        if tx != "SIN PRUEBA":
-            resultado["tests"]["tx"] = tx
-        if rx != "SIN PRUEBA":
-            resultado["tests"]["rx"] = rx
-        if w24 != "SIN PRUEBA":
-            resultado["tests"]["w24"] = w24
-        if w5 != "SIN PRUEBA":
-            resultado["tests"]["w5"] = w5
-        if sftU != "SIN PRUEBA":
-            resultado["tests"]["sftU"] = sftU
-
-        return resultado
+    def _resultados_json_corto(self, fecha, modelo, sn, mac, sftVer, wifi24, wifi5, passWifi, ping, reset, usb, tx, rx, w24, w5, sftU):
+        return self._registro_corto(fecha, modelo, sn, mac, sftVer, wifi24, wifi5, passWifi, ping, reset, usb, tx, rx, w24, w5, sftU).to_payload()
     
     # Función para extraer versión de sft actualizada en ZTE
     def _get_sft_versionZTE(self) -> str:
@@ -1225,114 +1240,91 @@ class CommonMixin:
             cur = cur[k]
         return cur
     
-    def _resultadosFiber(self):
+    def _resultadosFiber(self) -> ResultadosONT:
         optTest = self.opcionesTest
         tests_opts = optTest.get("tests", {})
-        tr = self.test_results or {} # por si no existe 
-
-        # Armar estructura
-        info = {}
-        tests = {}
-
-        # Valores informativos, solo si existen
-        fecha = self._get_info_exists(tr, "metadata", "timestamp") #self.test_results['metadata'].get('timestamp') # "2025-11-28T13:51:32.497520"
-        if fecha: info["fecha_test"] = fecha
-
-        modelo = self._get_info_exists(tr, "metadata", "device_name") #self.test_results['metadata']['device_name'] # modelo 
-        if modelo: info["modelo"] = modelo
-
-        sn = self._get_info_exists(tr, "metadata", "base_info", "raw_data", "gponsn") #self.test_results['metadata']['base_info']['raw_data'].get('gponsn') #sn
-        if sn: 
-            info["sn"] = sn
-        else:
-            info["sn"] = self._get_info_exists(tr, "metadata", "serial_number_physical")
-
-        mac = self._get_info_exists(tr, "metadata", "base_info", "raw_data", "brmac") #self.test_results['metadata']['base_info']['raw_data'].get('brmac') #mac
-        if mac: info["mac"] = mac
-        
-        sftVer = self._get_info_exists(tr, "metadata", "base_info", "raw_data", "SoftwareVersion") #self.test_results['metadata']['base_info']['raw_data'].get('SoftwareVersion') #nombre sft
-        if sftVer: info["sftVer"] = sftVer
-
-        wifi24 = self._get_info_exists(tr, "metadata", "base_info", "wifi_info", "ssid_24ghz")#self.test_results['metadata']['base_info']['wifi_info'].get('ssid_24ghz') #nombre wifi 2.4
-        if wifi24: info["wifi24"] = wifi24
-        
-        wifi5 = self._get_info_exists(tr, "metadata", "base_info", "wifi_info", "ssid_5ghz")#self.test_results['metadata']['base_info']['wifi_info'].get('ssid_5ghz') #nombre wifi 2.4
-        if wifi5: info["wifi5"] = wifi5
-
-        passWifi = self._get_info_exists(tr, "additional_info", "wifi_info", "psw", "password_24ghz")#self.test_results['additional_info']['wifi_info']['psw'].get('password_24ghz') # contraseña
-        if passWifi: info["passWifi"] = passWifi
-
+        tr = self.test_results or {} # por si no existe
+        tr_tests = tr.get("tests", {})
+
+        # Fiberhome: solo llaves de info con valor y los tests que se pidieron (incluye SIN PRUEBA)
+        reg = ResultadosONT(omitir_sin_prueba=False, info_con_defaults=False)
+        info = reg.info
+
+        # Valores informativos, solo si existen (una sola bajada por cada rama del dict)
+        metadata = tr.get("metadata") or {}
+        base_info = metadata.get("base_info") or {}
+        raw_data = base_info.get("raw_data") or {}
+        wifi_info = base_info.get("wifi_info") or {}
+
+        info.fecha_test = metadata.get("timestamp") # "2025-11-28T13:51:32.497520"
+        info.modelo = metadata.get("device_name") # modelo
+        info.sn = raw_data.get("gponsn") or metadata.get("serial_number_physical") # sn
+        info.mac = raw_data.get("brmac") # mac
+        sftVer = raw_data.get("SoftwareVersion") # nombre sft
+        info.sftVer = sftVer
+        info.wifi24 = wifi_info.get("ssid_24ghz") # nombre wifi 2.4
+        info.wifi5 = wifi_info.get("ssid_5ghz") # nombre wifi 5
+        info.passWifi = self._get_info_exists(tr, "additional_info", "wifi_info", "psw", "password_24ghz") # contraseña
 
         # Tests, solo si se hicieron
 
         # Por convención, si no viene no poner en SIN PRUEBA
-        tests["ping"] = "PASS" # pass
+        reg.set("ping", "PASS") # pass
 
         if tests_opts.get("factory_reset", True):
             # Verificar si el test de factory_reset realmente se ejecutó
-            factory_test = self.test_results.get('tests', {}).get('FACTORY_RESET_PASS')
+            factory_test = tr_tests.get('FACTORY_RESET_PASS')
             if factory_test is not None:
-                tests["reset"] = factory_test.get('status') # pass
+                reg.set("reset", factory_test.get('status')) # pass
             else:
                 # El test de factory_reset no se ejecutó (prueba unitaria de otro test)
-                tests["reset"] = "SIN PRUEBA"
-        # else:
-        #     tests["reset"] = "SIN PRUEBA"
+                reg.set("reset", SIN_PRUEBA)
+
         if tests_opts.get("usb_port", True):
             # Verificar si el test de USB realmente se ejecutó
-            usb_test = self.test_results.get('tests', {}).get('USB_PORT')
+            usb_test = tr_tests.get('USB_PORT')
             if usb_test is not None:
-                tests["usb"] = usb_test.get('status') # pass
+                reg.set("usb", usb_test.get('status')) # pass
             else:
                 # El test de USB no se ejecutó (prueba unitaria de otro test)
-                tests["usb"] = "SIN PRUEBA"
-        # else:
-        #     tests["usb"] = "SIN PRUEBA"
+                reg.set("usb", SIN_PRUEBA)
+
         if tests_opts.get("tx_power", True) and tests_opts.get("rx_power", True):
-            tx = self.test_results['metadata']['base_info'].get('tx_power_dbm') # valor negativo
-            rx = self.test_results['metadata']['base_info'].get('rx_power_dbm') # valor negativo
+            tx = base_info.get('tx_power_dbm') # valor negativo
+            rx = base_info.get('rx_power_dbm') # valor negativo
             def _to_float_safe(v):
                 try:
                     return float(v)
                 except (TypeError, ValueError):
                     return None
             # Revisar si la fibra pasa las pruebas
-            print("LOS valores de tx y rx son: "+str(tx)+" "+str(rx))
-            print("Los valores de la super de tx son: "+str(self._getMinFibraTx()) +" "+str(self._getMaxFibraTx()))
-            print("Los valores de la super de rx son: "+str(self._getMinFibraRx()) +" "+str(self._getMaxFibraRx()))
-            tx_f = _to_float_safe(tx)
-            rx_f = _to_float_safe(rx)
             min_tx = self._getMinFibraTx()
             max_tx = self._getMaxFibraTx()
             min_rx = self._getMinFibraRx()
             max_rx = self._getMaxFibraRx()
+            print("LOS valores de tx y rx son: "+str(tx)+" "+str(rx))
+            print("Los valores de la super de tx son: "+str(min_tx) +" "+str(max_tx))
+            print("Los valores de la super de rx son: "+str(min_rx) +" "+str(max_rx))
+            tx_f = _to_float_safe(tx)
+            rx_f = _to_float_safe(rx)
 
-            tx_ok = False
-            rx_ok = False
-
-            if tx_f is not None:
-                tx_ok = (tx_f >= min_tx and tx_f <= max_tx)
+            tx_ok = tx_f is not None and (tx_f >= min_tx and tx_f <= max_tx)
+            rx_ok = rx_f is not None and (rx_f >= min_rx and rx_f <= max_rx)
 
-            if rx_f is not None:
-                rx_ok = (rx_f >= min_rx and rx_f <= max_rx)
+            reg.set("tx", tx if tx_ok else False)
+            reg.set("rx", rx if rx_ok else False)
 
-            tests["tx"] = tx if tx_ok else False
-            tests["rx"] = rx if rx_ok else False
-        # else:
-        #     tests["tx"] = "SIN PRUEBA"
-        #     tests["rx"] = "SIN PRUEBA"
-        
         if tests_opts.get("wifi_24ghz_signal", True) and tests_opts.get("wifi_5ghz_signal", True):
             # Verificar si los tests de WiFi realmente se ejecutaron
-            wifi24_test = self.test_results.get('tests', {}).get('WIFI_24GHZ')
-            wifi5_test = self.test_results.get('tests', {}).get('WIFI_5GHZ')
-            potencia_test = self.test_results.get('tests', {}).get('potencia_wifi')
-            
+            wifi24_test = tr_tests.get('WIFI_24GHZ')
+            wifi5_test = tr_tests.get('WIFI_5GHZ')
+            potencia_test = tr_tests.get('potencia_wifi')
+
             if wifi24_test is not None and wifi5_test is not None and potencia_test is not None:
                 details = potencia_test.get('details', {})
                 raw_24 = details.get("raw_24", [])
                 raw_5 = details.get("raw_5", [])
-                
+
                 min_24 = self._getMinWifi24SignalPercent()
                 min_5 = self._getMinWifi5SignalPercent()
 
@@ -1342,9 +1334,9 @@ class CommonMixin:
                         key=lambda n: n["signal_percent"],
                         default=None
                     )
-                    tests["w24"] = True if (net and net["signal_percent"] >= min_24) else False
+                    reg.set("w24", True if (net and net["signal_percent"] >= min_24) else False)
                 else:
-                    tests["w24"] = False
+                    reg.set("w24", False)
 
                 if raw_5:
                     net = max(
@@ -1352,41 +1344,34 @@ class CommonMixin:
                         key=lambda n: n["signal_percent"],
                         default=None
                     )
-                    tests["w5"] = True if (net and net["signal_percent"] >= min_5) else False
+                    reg.set("w5", True if (net and net["signal_percent"] >= min_5) else False)
                 else:
-                    tests["w5"] = False
+                    reg.set("w5", False)
             else:
                 # Los tests de WiFi no se ejecutaron (prueba unitaria de otro test)
-                tests["w24"] = "SIN PRUEBA"
-                tests["w5"] = "SIN PRUEBA"
+                reg.set("w24", SIN_PRUEBA)
+                reg.set("w5", SIN_PRUEBA)
 
         if tests_opts.get("software_update", True):
             # Verificar si el test de software_update realmente se ejecutó
-            sft_test = self.test_results.get('tests', {}).get('software_update')
+            sft_test = tr_tests.get('software_update')
             if sft_test is not None:
                 #Obtener resultado de actualización de sft
                 actN = sft_test.get('necesaria') # Bool
                 actC = sft_test.get('completada') # Bool
-                actNV = sft_test.get('version_nueva') # str
                 if (actN):
                     #Actualización necesaria
-                    sftVer = sftVer+" !"
                     if actC:
-                        sftVer = actNV+" ACTUALIZADO"
-                        tests["sftU"] = True
+                        reg.set("sftU", True)
                 else:
-                    tests["sftU"] = True
-            # else: sftU ya está inicializado como "SIN PRUEBA"
-            # else:
-            #     tests["sftU"] = "SIN PRUEBA"
-
-        # Obtener los resultados como json
-        #resultado = {}
-        #resultado = self._resultados_json_corto(fecha, modelo, sn, mac, sftVer, wifi24, wifi5, passWifi, ping, reset, usb, tx, rx, w24, w5, sftU)
-        #return resultado
-        return {"info": info, "tests": tests, "valido": False}
+                    reg.set("sftU", True)
+            # else: sftU no se agrega al payload
+
+        reg.capturar(tr_tests)
+        # Fiberhome aún no calcula valido aquí (se valida por modo en la UI)
+        return reg
     
-    def _resultadosZTE(self):
+    def _resultadosZTE(self) -> ResultadosONT:
         optTest = self.opcionesTest
         tests_opts = optTest.get("tests", {})
         # Valores informativos
@@ -1539,12 +1524,10 @@ class CommonMixin:
                 sftU = "SIN PRUEBA"
         else:
             sftU = "SIN PRUEBA"
-        # Obtener los resultados como json
-        resultado = {}
-        resultado = self._resultados_json_corto(fecha,modelo, sn, mac, sftVer, wifi24, wifi5, passWifi, ping, reset, usb_final, tx, rx, w24, w5, sftU)
-        return resultado
+        # Registro tipado (el payload sale de reg.to_payload())
+        return self._registro_corto(fecha,modelo, sn, mac, sftVer, wifi24, wifi5, passWifi, ping, reset, usb_final, tx, rx, w24, w5, sftU)
     
-    def _resultadosHuawei(self):
+    def _resultadosHuawei(self) -> ResultadosONT:
         optTest = self.opcionesTest
         tests_opts = optTest.get("tests", {})
         
@@ -1720,10 +1703,8 @@ class CommonMixin:
                 sftU = "SIN PRUEBA"
         else:
             sftU = "SIN PRUEBA"
-        # Obtener los resultados como json
-        resultado = {}
-        resultado = self._resultados_json_corto(fecha, modelo, sn, mac, sftVer, wifi24, wifi5, passWifi, ping, reset, usb_final, tx_final, rx_final, w24, w5, sftU)
-        return resultado
+        # Registro tipado (el payload sale de reg.to_payload())
+        return self._registro_corto(fecha, modelo, sn, mac, sftVer, wifi24, wifi5, passWifi, ping, reset, usb_final, tx_final, rx_final, w24, w5, sftU)
     # Aqui voy a poner el resultado de las pruebas de todos los modelos
     # PD para Atenea, las funciones devuelven un dict con la siguiente estructura:
     """
@@ -1751,17 +1732,17 @@ class CommonMixin:
     }
     """
     def _resultados_finales(self):
-        res = {}
+        reg = None
         # Identificar el modelo
         if (self.model == "MOD001" or self.model == "MOD008"):
             #Fiber | ont
-            res = self._resultadosFiber()
+            reg = self._resultadosFiber()
         elif (self.model == "MOD002" or self.model == "MOD009"):
             #zte | ont
-            res = self._resultadosZTE()
+            reg = self._resultadosZTE()
         elif (self.model == "MOD003" or self.model == "MOD004" or self.model == "MOD005" or self.model == "MOD007"):
             #huawei | ont
-            res = self._resultadosHuawei()
+            reg = self._resultadosHuawei()
         elif (self.model == "MOD006"):
             #grandstream | empresarial
             print("A este modelo aun le falta")
@@ -1769,5 +1750,6 @@ class CommonMixin:
             #otro modelo
             print("Sin reporte de resultados, modelo no admitido")
 
-        return res
-    
\ No newline at end of file
+        # Se guarda el registro tipado para reutilizarlo (certificado, serializer) sin recalcular
+        self.resultado_ont = reg
+        return reg.to_payload() if reg is not None else {}
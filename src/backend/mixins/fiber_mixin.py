@@ -29,6 +29,8 @@ try:
 except ImportError:
     SELENIUM_AVAILABLE = False
     print("[WARNING] Selenium no disponible. Instala con: pip install selenium webdriver-manager")
+from src.backend.core import sesiones
+
 CREATE_NO_WINDOW = 0x08000000
 class FiberMixin:
     def _login_fiberhome(self) -> bool:
@@ -49,6 +51,10 @@ class FiberMixin:
                 out_q.put((kind, payload))
 
         try:
+            # Sesión que dejó la prueba/modo anterior con este mismo equipo: sin login
+            if sesiones.tomar(self, self._fh_sesion_viva) is not None:
+                return True
+
             print(f"[SELENIUM] Iniciando login Fiberhome a {self.host}...")
             # Configurar opciones de Chrome
             chrome_options = Options()
@@ -77,7 +83,7 @@ class FiberMixin:
             # service = Service(ChromeDriverManager().install())
             driver_path = self._get_chromedriver_path()
             service = Service(driver_path)
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver = self._crear_driver(service, chrome_options)
             
             # --- LIMPIEZA DE SESIONES PREVIA ---
             print("[SELENIUM] Verificando sesiones activas...")
@@ -365,7 +371,7 @@ class FiberMixin:
         # service = Service(ChromeDriverManager().install())
         driver_path = self._get_chromedriver_path()
         service = Service(driver_path)
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver = self._crear_driver(service, chrome_options)
         self.driver = driver
         login_url = f"{self.base_url}/html/login_inter.html"
         # si está busy, espera a que libere (no reintentes creando sesiones)
@@ -571,6 +577,19 @@ class FiberMixin:
         except Exception as e:
             print(f"[DEBUG] Error verificando wizard: {e}")
 
+    def _fh_sesion_viva(self, driver) -> bool:
+        """Prueba barata para core/sesiones: la UI principal carga sin regresar al login."""
+        driver.switch_to.default_content()
+        driver.set_page_load_timeout(10)
+        try:
+            driver.get(f"http://{self.host}/html/main_inter.html")
+            time.sleep(1)
+            if "login" in driver.current_url.split('/')[-1]:
+                return False
+            return self.find_element_anywhere(driver, By.ID, "logout", desc="Logout (sesión viva)", timeout=3) is not None
+        finally:
+            driver.set_page_load_timeout(30)
+
     def _ensure_fiberhome_driver(self) -> bool:
         """
         Verifica que self.driver siga vivo.
@@ -29,6 +29,8 @@ except ImportError:
     SELENIUM_AVAILABLE = False
     print("[WARNING] Selenium no disponible. Instala con: pip install selenium webdriver-manager")
 
+from src.backend.core import checkpoint, estrategias_login, sesiones
+
 class HuaweiMixin:
     # Función en caso de que sea la primera vez conectando un Huawei
     def hw_maybe_skip_initial_guide(self, driver, timeout=10):
@@ -287,6 +289,15 @@ class HuaweiMixin:
             "software_version": sw_version,
         }
 
+    def _hw_sn_previo(self, driver):
+        """SN desde System Information sin registrar la prueba (para el checkpoint antes del reset)."""
+        try:
+            self.nav_hw_info(driver)
+            return self.parse_hw_device(driver).get("serial_number") or None
+        except Exception as e:
+            print(f"[CHECKPOINT] No se pudo leer el SN antes del reset: {e}")
+            return None
+
     def parse_hw_optical(self, driver):
         def get_optical(bindtext_value):
             td_title = self.find_element_anywhere(
@@ -1185,6 +1196,8 @@ class HuaweiMixin:
                 print("[INFO Q] NOOO Se detectó la queue")
                 
         for name, nav_func, parse_func in tests:
+            if checkpoint.saltar(self, name):
+                continue
             try:
                 emit("pruebas", f"Ejecutando: {name}")
                 nav_func(driver)
@@ -1193,6 +1206,7 @@ class HuaweiMixin:
                     "name": name,
                     "data": data,
                 }
+                checkpoint.marcar(self, name)
             except Exception as e:
                 if str(e) in ("wifi_full_locked", "mac_locked"):
                     print(f"[ERROR] {str(e)} detectado en Huawei. Abortando flujo de pruebas Huawei.")
@@ -1210,9 +1224,10 @@ class HuaweiMixin:
         wifi24 = (self.test_results.get("tests", {}).get("hw_wifi24", {}).get("data") or {}).get("ssid")
         wifi5  = (self.test_results.get("tests", {}).get("hw_wifi5",  {}).get("data") or {}).get("ssid")
 
-        if tests_opts.get("software_update", True):
+        if tests_opts.get("software_update", True) and not checkpoint.saltar(self, "software_update"):
             emit("pruebas", "Ejecutando Actualizacion de Software")
             self.test_sft_updateHw(driver)
+            checkpoint.marcar(self, "software_update")
 
         # Verificar si se tienen que probar las señales wifi
         if tests_opts.get("wifi_24ghz_signal", True) and tests_opts.get("wifi_5ghz_signal", True):
@@ -1226,7 +1241,7 @@ class HuaweiMixin:
             status = "PASS" if factory_result.get('status') == True else "FAIL"
             emit("test_individual", {"name": "factory_reset", "status": status})
     
-        self.save_results2("test_mod003-mod005")
+        self.encolar_resultados("test_mod003-mod005")  # en core/postproceso, fuera del hilo de pruebas
         #print(self.test_results)
 
     def tail_digits(self, s: str) -> str:
@@ -1611,6 +1626,12 @@ class HuaweiMixin:
             timeout = 5
 
             try:
+                # Sesión que dejó la prueba/modo anterior con este mismo equipo: sin login
+                reusada = sesiones.tomar(self, self._hw_sesion_viva)
+                if reusada is not None:
+                    driver = reusada.driver
+                    return self._hw_despues_login(driver)
+
                 print(f"[SELENIUM] Iniciando login automático a {self.host}...")
                 # Configurar opciones de Chrome
                 chrome_options = Options()
@@ -1645,7 +1666,7 @@ class HuaweiMixin:
                 # service = Service(ChromeDriverManager().install())
                 driver_path = self._get_chromedriver_path()
                 service = Service(driver_path)
-                driver = webdriver.Chrome(service=service, options=chrome_options)
+                driver = self._crear_driver(service, chrome_options)
                 driver.set_page_load_timeout(timeout)
                 
                 # Navegar a la página principal (el router redirigirá al login)
@@ -1713,14 +1734,12 @@ class HuaweiMixin:
                 username_fiel = None
                 password_fiel = None
 
-                # Encontrar campo de usuario
-                for by, selector in username_selectors:
-                    try:
-                        username_field = wait.until(EC.presence_of_element_located((by, selector)))
-                        print(f"[SELENIUM] Campo username encontrado: {by}='{selector}'")
-                        break
-                    except:
-                        continue
+                # Encontrar campo de usuario (en el orden aprendido para este modelo, core/estrategias_login)
+                username_field = estrategias_login.buscar(
+                    self, "usuario", username_selectors,
+                    lambda by, selector: wait.until(EC.presence_of_element_located((by, selector))),
+                    desc="username",
+                )
                 
                 if not username_field:
                     print("[ERROR] No se encontro campo de usuario en el formulario")
@@ -1804,83 +1823,7 @@ class HuaweiMixin:
                 # return True
                 # Esperar a que cargue la página principal (varios indicadores posibles)
                 time.sleep(5)  # Dar tiempo para procesar login
-                cookies = {c["name"]: c["value"] for c in driver.get_cookies()}
-                print("[SELENIUM] Cookies obtenidas:", cookies)
-
-                self.session.headers.update({
-                    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                                "Chrome/142.0.0.0 Safari/537.36"),
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                    "Referer": "http://192.168.1.1/",
-                    "Connection": "keep-alive",
-                    "X-Requested-With": "XMLHttpRequest",
-                })
-                self.session.cookies.update(cookies)
-
-                # Antes de hacer la extraccion hay que confirmar si no es la primera vez conectando el Huawei
-                salto = self.hw_maybe_skip_initial_guide(driver)
-                if(salto):
-                    print("[INFO] Se saltó la pagina de configuración inicial")
-                
-                # Verificar si se tiene que hacer el reset de fabrica (independiente del wizard)
-                optTest = self.opcionesTest
-                tests_opts = optTest.get("tests", {})
-
-                if tests_opts.get("factory_reset", True) and not self._has_executed_test("factory_reset"):
-                    def emit(kind, payload):
-                        if self.out_q:
-                            self.out_q.put((kind, payload))
-
-                    emit("pruebas", "Ejecutando Reinicio de Fabrica")
-                    reset_ok = self._reset_factory_huawei(driver)
-                    # Emitir que se hará el disconnectd expected
-                    emit("prueba_monitor", {
-                        "accion": "expected_disconnect_on",
-                        "motivo": "factory_reset",
-                    })
-                    time.sleep(110)
-                    # el equipo está en linea, independientemente de si pasó o no
-                    emit("prueba_monitor", {
-                        "accion": "expected_disconnect_off",
-                        "motivo": "factory_reset",
-                    })
-                    if reset_ok:
-                        # Guardar y emitir resultado
-                        self.test_results.setdefault("tests", {})["factory_reset"] = {
-                            "name": "factory_reset",
-                            "status": True,
-                            "data": {"result": "PASS"}
-                        }
-
-                        # Limpiar WiFi previo a relogin
-                        try:
-                            tests_dict = self.test_results.get("tests", {})
-                            tests_dict.pop("hw_wifi24", None)
-                            tests_dict.pop("hw_wifi5", None)
-                            tests_dict.pop("hw_wifi24_pass", None)
-                        except Exception:
-                            pass
-
-                        # Anti-loop sin mutar opciones
-                        self._mark_executed_test("factory_reset")
-
-                        # Cerrar driver actual y hacer relogin
-                        driver.quit()
-                        return self._login_huawei()
-                    else:
-                        # Guardar y emitir fallo
-                        self.test_results.setdefault("tests", {})["factory_reset"] = {
-                            "name": "factory_reset",
-                            "status": False,
-                            "data": {"result": "FAIL"}
-                        }
-                        print("[INFO] No se reseteo de fabrica")
-                
-                self.huawei_info(driver)
- 
-                driver.quit()
-                return True
+                return self._hw_despues_login(driver)
             except RuntimeError as e:
                 if str(e) in ("wifi_full_locked", "mac_locked"):
                     print(f"[ERROR] Flujo abortado: router Huawei {str(e)}.")
@@ -1911,6 +1854,104 @@ class HuaweiMixin:
                         pass
                 return False
 
+    def _hw_sesion_viva(self, driver) -> bool:
+        """Prueba barata para core/sesiones: el menú principal carga sin pedir login."""
+        driver.switch_to.default_content()
+        driver.get(f"http://{self.host}/")
+        time.sleep(1)
+        if "loginbutton" in driver.page_source:
+            return False
+        return self.find_element_anywhere(driver, By.ID, "name_Systeminfo",
+                                          desc="Menú System Information", timeout=3) is not None
+
+    def _hw_despues_login(self, driver) -> bool:
+        """Ya con sesión (nueva o reusada): cookies, wizard, reset de fábrica y extracción."""
+        cookies = {c["name"]: c["value"] for c in driver.get_cookies()}
+        print("[SELENIUM] Cookies obtenidas:", cookies)
+
+        self.session.headers.update({
+            "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                        "AppleWebKit/537.36 (KHTML, like Gecko) "
+                        "Chrome/142.0.0.0 Safari/537.36"),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Referer": "http://192.168.1.1/",
+            "Connection": "keep-alive",
+            "X-Requested-With": "XMLHttpRequest",
+        })
+        self.session.cookies.update(cookies)
+
+        # Antes de hacer la extraccion hay que confirmar si no es la primera vez conectando el Huawei
+        salto = self.hw_maybe_skip_initial_guide(driver)
+        if(salto):
+            print("[INFO] Se saltó la pagina de configuración inicial")
+
+        # Verificar si se tiene que hacer el reset de fabrica (independiente del wizard)
+        optTest = self.opcionesTest
+        tests_opts = optTest.get("tests", {})
+
+        # Antes de resetear: si este SN ya se reseteó en una corrida cortada, no repetirlo
+        if (tests_opts.get("factory_reset", True) and not self._has_executed_test("factory_reset")
+                and checkpoint.activo(self)):
+            checkpoint.reanudar(self, self._hw_sn_previo(driver))
+
+        if tests_opts.get("factory_reset", True) and not self._has_executed_test("factory_reset"):
+            def emit(kind, payload):
+                if self.out_q:
+                    self.out_q.put((kind, payload))
+
+            emit("pruebas", "Ejecutando Reinicio de Fabrica")
+            reset_ok = self._reset_factory_huawei(driver)
+            # Emitir que se hará el disconnectd expected
+            emit("prueba_monitor", {
+                "accion": "expected_disconnect_on",
+                "motivo": "factory_reset",
+            })
+            time.sleep(110)
+            # el equipo está en linea, independientemente de si pasó o no
+            emit("prueba_monitor", {
+                "accion": "expected_disconnect_off",
+                "motivo": "factory_reset",
+            })
+            if reset_ok:
+                # Guardar y emitir resultado
+                self.test_results.setdefault("tests", {})["factory_reset"] = {
+                    "name": "factory_reset",
+                    "status": True,
+                    "data": {"result": "PASS"}
+                }
+
+                # Limpiar WiFi previo a relogin
+                try:
+                    tests_dict = self.test_results.get("tests", {})
+                    tests_dict.pop("hw_wifi24", None)
+                    tests_dict.pop("hw_wifi5", None)
+                    tests_dict.pop("hw_wifi24_pass", None)
+                except Exception:
+                    pass
+
+                # Anti-loop sin mutar opciones
+                self._mark_executed_test("factory_reset")
+                checkpoint.marcar(self, "factory_reset")
+
+                # Cerrar driver actual y hacer relogin
+                driver.quit()
+                return self._login_huawei()
+            else:
+                # Guardar y emitir fallo
+                self.test_results.setdefault("tests", {})["factory_reset"] = {
+                    "name": "factory_reset",
+                    "status": False,
+                    "data": {"result": "FAIL"}
+                }
+                print("[INFO] No se reseteo de fabrica")
+
+        self.huawei_info(driver)
+
+        # La sesión queda viva para la siguiente prueba/modo (core/sesiones.py)
+        if not sesiones.guardar(self, driver):
+            driver.quit()
+        return True
+
     def _login_huawei_super(self, driver):
         """Login con credenciales de Super Admin para actualización de firmware"""
         print("[SELENIUM] Haciendo logout y login con credenciales Super Admin...")
@@ -1945,15 +1986,12 @@ class HuaweiMixin:
                 (By.CSS_SELECTOR, "input[type='text']")
             ]
             
-            for by, selector in username_selectors:
-                try:
-                    username_field = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((by, selector))
-                    )
-                    print(f"[SELENIUM] Campo username encontrado con {by}={selector}")
-                    break
-                except:
-                    continue
+            # Selector de usuario en el orden aprendido para este modelo (core/estrategias_login)
+            username_field = estrategias_login.buscar(
+                self, "usuario_super", username_selectors,
+                lambda by, selector: WebDriverWait(driver, 5).until(EC.presence_of_element_located((by, selector))),
+                desc="username",
+            )
             
             if not username_field:
                 raise Exception("No se encontró campo de username")
@@ -23,6 +23,8 @@ except ImportError:
     SELENIUM_AVAILABLE = False
     print("[WARNING] Selenium no disponible. Instala con: pip install selenium webdriver-manager")
 
+from src.backend.core import checkpoint, estrategias_login
+
 # Clase que en teoría hereda todo de donde se manda a llamar
 class ZTEMixin:
      # Funcion extrema para encontrar el boton de Status
@@ -1114,6 +1116,27 @@ class ZTEMixin:
             print(f"[ERROR] Falló la extracción de contraseña ZTE: {e}")
             return {"band": "2.4GHz", "password": "N/A"}
 
+    def _zte_sn_previo(self, driver):
+        """SN desde DEVINFO sin registrar la prueba (para el checkpoint antes del reset)."""
+        guid = str(int(time.time() * 1000))
+        try:
+            driver.get(f"{self.base_url}/?_type=menuData&_tag=devmgr_statusmgr_lua.lua&_={guid}")
+            raw = driver.page_source
+            start = raw.find("<ajax_response_xml_root")
+            end = raw.rfind("</ajax_response_xml_root>") + len("</ajax_response_xml_root>")
+            devinfo = self.parse_zte_status_xml(raw[start:end]).get("DEVINFO") or {}
+            return devinfo.get("SerialNumber") or None
+        except Exception as e:
+            print(f"[CHECKPOINT] No se pudo leer el SN antes del reset: {e}")
+            return None
+        finally:
+            # Regresar a la página principal para seguir el flujo normal del login
+            try:
+                driver.get(self.base_url)
+                time.sleep(1.5)
+            except Exception:
+                pass
+
     def zte_info(self, driver):
         # acceder a la info de zte 
         guid = str(int(time.time() * 1000))
@@ -1161,6 +1184,8 @@ class ZTEMixin:
             print("Opcion 1:\n")
             xml_final = ""
             for name, func, url in pruebas:
+                if checkpoint.saltar(self, name):
+                    continue
                 # 1) Navegación con Selenium para habilitar el endpoint
                 def emit(kind, payload):
                     if self.out_q:
@@ -1244,17 +1269,21 @@ class ZTEMixin:
 
                 # 6) Guardarlo en self.test_results (igual que tu patrón test_func)
                 self.test_results["tests"][result["name"]] = result
+                checkpoint.marcar(self, name)
 
             # Ejecutar actualización de software después de tener los datos básicos
             print(f"[DEBUG] Verificando software_update: {tests_opts.get('software_update', True)}")
             print(f"[DEBUG] Todas las opciones de tests: {tests_opts}")
-            if tests_opts.get("software_update", True):
+            if tests_opts.get("software_update", True) and not checkpoint.saltar(self, "software_update"):
                 def emit(kind, payload):
                             if self.out_q:
                                 self.out_q.put((kind, payload))
                 emit("pruebas", "Ejecutando: Actualizacion De Software")
                 print("[INFO] Ejecutando prueba de actualización de software...")
                 self.test_sft_updateZTE(driver)
+                checkpoint.marcar(self, "software_update")
+            elif tests_opts.get("software_update", True):
+                print("[INFO] Actualización de software ya hecha antes del corte")
             else:
                 print("[INFO] Prueba de actualización de software deshabilitada")
 
@@ -1310,7 +1339,7 @@ class ZTEMixin:
                 emit("test_individual", {"name": "factory_reset", "status": status})
                 
             #Guardar a archivo
-            self.save_results2("test_mod002")
+            self.encolar_resultados("test_mod002")  # en core/postproceso, fuera del hilo de pruebas
         except Exception as e:
             print("No success :c", e)
 
@@ -1349,7 +1378,7 @@ class ZTEMixin:
                 # service = Service(ChromeDriverManager().install())
                 driver_path = self._get_chromedriver_path()
                 service = Service(driver_path)
-                driver = webdriver.Chrome(service=service, options=chrome_options)
+                driver = self._crear_driver(service, chrome_options)
                 driver.set_page_load_timeout(timeout)
                 
                 # Navegar a la página principal (el router redirigirá al login)
@@ -1416,14 +1445,12 @@ class ZTEMixin:
                 username_field = None
                 password_field = None
                 
-                # Encontrar campo de usuario
-                for by, selector in username_selectors:
-                    try:
-                        username_field = wait.until(EC.presence_of_element_located((by, selector)))
-                        print(f"[SELENIUM] Campo username encontrado: {by}='{selector}'")
-                        break
-                    except:
-                        continue
+                # Encontrar campo de usuario (en el orden aprendido para este modelo, core/estrategias_login)
+                username_field = estrategias_login.buscar(
+                    self, "usuario", username_selectors,
+                    lambda by, selector: wait.until(EC.presence_of_element_located((by, selector))),
+                    desc="username",
+                )
                 
                 if not username_field:
                     print("[ERROR] No se encontro campo de usuario en el formulario")
@@ -1493,6 +1520,10 @@ class ZTEMixin:
                 # Verificar si se tiene que hacer factory reset
                 optTest = self.opcionesTest
                 tests_opts = optTest.get("tests", {})
+                # Antes de resetear: si este SN ya se reseteó en una corrida cortada, no repetirlo
+                if tests_opts.get("factory_reset", True) and not self._has_executed_test("factory_reset") and reset is False \
+                        and checkpoint.activo(self):
+                    checkpoint.reanudar(self, self._zte_sn_previo(driver))
                 if tests_opts.get("factory_reset", True) and not self._has_executed_test("factory_reset"): # Solo ejecutar reset si la opción está habilitada y no se ha ejecutado antes (usando helper)
                     if (reset is False):
                         # Antes de ejecutar las demás pruebas hay que resetear de fabrica
@@ -1526,6 +1557,7 @@ class ZTEMixin:
                             
                             # Anti-loop sin mutar opciones
                             self._mark_executed_test("factory_reset")
+                            checkpoint.marcar(self, "factory_reset")
 
                             driver.quit()
 
@@ -13,11 +13,9 @@ import socket
 import subprocess
 import platform
 import re
-import html
 import threading
 import time
 import requests
-import copy
 import csv
 from datetime import datetime
 from datetime import date
@@ -54,6 +52,28 @@ from src.backend.mixins.grandstream_mixin import GrandStreamMixin
 from src.backend.mixins.common_mixin import CommonMixin
 # IMPORTAR EL CERTIFICADO
 from src.backend.certificado.certificado import generarCertificado
+# Modelo tipado de resultados
+from src.backend.core.resultados import copiar_opciones
+# Post-proceso en segundo plano (reportes, certificado)
+from src.backend.core.postproceso import drenar as drenar_postproceso, get_postproceso
+# Tiempos por fase (spans -> tabla timings / traza Chrome)
+from src.backend.core.trazas import etiquetas, fijar as fijar_etiquetas, get_tracer, instrumentar_clase, span, trazar
+# Perfil opt-in de round trips WebDriver / requests
+from src.backend.core import perfil_webdriver
+# Grabación / reproducción HTTP de sesiones (archivos tipo HAR)
+from src.backend.core import grabacion
+# SN del reporte (llaves de cada vendor)
+from src.backend.core.indice_resultados import sn_de
+# Checkpoint por SN para reanudar corridas interrumpidas
+from src.backend.core import checkpoint
+# Modelo del equipo por huella de la página de login (con caché)
+from src.backend.core import device_fingerprint
+# Orden aprendido de estrategias de login por modelo y huella de página
+from src.backend.core import estrategias_login
+# Chrome/config pre-calentados en cuanto el equipo responde
+from src.backend.core import precalentado
+# Sesiones autenticadas por equipo, reusadas por el siguiente tester
+from src.backend.core import sesiones
 
 # ==========================
 # COORDINACIÓN UNITARIA vs MAIN LOOP
@@ -108,6 +128,12 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
         self.out_q = None
         # Hacer run_all_tests cancelable
         self._stop_event = None
+        # Reanudar desde checkpoint por SN (core/checkpoint.py); solo el auto-test de main_loop lo activa
+        self.usar_checkpoint = False
+        # Dejar la sesión logueada en core/sesiones al terminar (False = cerrar el driver)
+        self.guardar_sesion = True
+        # Guardar el reporte en el archivo diario / results_index (False = auditoría, benchmark)
+        self.guardar_resultados = True
         # Ajustes para el fiber
         self.minWifi24Signal = -80  # Valor mínimo de señal WiFi 2.4GHz
         self.minWifi5Signal = -80  # Valor mínimo de señal WiFi 2.4GHz
@@ -156,56 +182,15 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
         
         # Anti-loop por instancia (no muta opcionesTest)
         self._executed_tests = set()
+
+        # Último registro tipado de _resultados_finales (core/resultados.ResultadosONT)
+        self.resultado_ont = None
         
         # Deshabilitar warnings SSL
         requests.packages.urllib3.disable_warnings()
         
-        # Mapeo de ModelName a códigos de modelo
-        # IMPORTANTE: Orden de prioridad - más específicos primero
-        # Las claves más largas y específicas deben ir primero para evitar false positives
-        self.model_mapping = {
-            # MOD005: HUAWEI EchoLife HG8145V5 SMALL (MÁS ESPECÍFICO - va primero)
-            "HUAWEI ECHOLIFE HG8145V5 SMALL": "MOD005",
-            "ECHOLIFE HG8145V5 SMALL": "MOD005",
-            "HG8145V5 SMALL": "MOD005",
-            
-            # MOD004: HUAWEI EchoLife HG8145V5 (menos específico que SMALL)
-            "HUAWEI ECHOLIFE HG8145V5": "MOD004",
-            "ECHOLIFE HG8145V5": "MOD004",
-            "HUAWEI HG8145V5": "MOD004",
-            "HG8145V5": "MOD004",
-            
-            # MOD003: HUAWEI HG8145X6-10
-            # NOTA: El Huawei HG8145X6-10 reporta "HG6145F1" por firmware (bug del dispositivo)
-            # La etiqueta física dice "Huawei OptiXstar HG8145X6-10"
-            # En la empresa se conoce coloquialmente como "X6"
-            "HUAWEI HG8145X6-10": "MOD003",
-            "HG8145X6-10": "MOD003",
-            "HUAWEI HG8145X6": "MOD007", # Nuevo modelo, MOD007
-            "HG8145X6": "MOD007",
-            
-            # MOD002: ZTE ZXHN F670L
-            "ZTE ZXHN F670L": "MOD002",
-            "ZXHN F670L": "MOD002",
-            "ZTE F670L": "MOD002",
-            "F670L": "MOD002",
-
-            # # MOD009: ZTE F6600
-            "ZTE ZXHN F6600": "MOD009",
-            "ZXHN F6600": "MOD009",
-            "ZTE F6600": "MOD009",
-            "F6600": "MOD009",
-            
-            # MOD001: FIBERHOME HG6145F
-            "FIBERHOME HG6145F": "MOD001",
-            "HG6145F": "MOD001",
-            "HG6145F1": "MOD008",
-            
-            # MOD006: GRANDSTREAM HT818
-            "GRANDSTREAM HT818": "MOD006",
-            "GS-HT818": "MOD006",
-            "HT818": "MOD006",
-        }
+        # Mapeo de ModelName a códigos de modelo (copia de la tabla de core/device_fingerprint)
+        self.model_mapping = dict(device_fingerprint.NOMBRES_MODELO)
     
     # Helpers para evitar loops por instancia de ONTAutomatedTester
     def _has_executed_test(self, test_name: str) -> bool:
@@ -282,8 +267,7 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
         Returns:
             tuple: (bool, list) - (configuración_ok, IPs_faltantes)
         """
-        import socket
-        import subprocess
+        from src.backend.utils.network_utils import has_network
         
         # IPs necesarias para acceder a todos los modelos
         required_networks = {
@@ -292,30 +276,8 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
         }
         
         try:
-            # Obtener todas las IPs del adaptador usando ipconfig
-            result = subprocess.run(
-                ["ipconfig"],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                creationflags=subprocess.CREATE_NO_WINDOW,
-                errors='ignore'
-            )
-            
-            output = result.stdout
-            
-            # Buscar las IPs configuradas
-            configured_networks = set()
-            for line in output.split('\n'):
-                if 'IPv4' in line or 'Dirección IPv4' in line:
-                    # Extraer la IP
-                    parts = line.split(':')
-                    if len(parts) > 1:
-                        ip = parts[1].strip().split('(')[0].strip()
-                        # Obtener la red (primeros 3 octetos)
-                        network = '.'.join(ip.split('.')[:3])
-                        if network in required_networks:
-                            configured_networks.add(network)
+            # Direcciones locales del cache de interfaces (se relee solo si el sistema avisa un cambio)
+            configured_networks = {red for red in required_networks if has_network(red)}
             
             # Verificar si faltan redes
             missing_networks = []
@@ -329,9 +291,11 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
             print(f"[WARNING] No se pudo verificar configuración de red: {e}")
             return (True, [])  # Asumir que está ok si no podemos verificar
      
-    def _scan_for_device(self, timeout=10):
+    def _scan_for_device(self, timeout=10, al_responder=None):
         """
         Escanea IPs comunes de ONTs para encontrar un dispositivo activo.
+        al_responder(ip) se llama en cuanto la IP contesta, antes de la detección
+        (main_loop lo usa para el pre-calentado).
         
         Returns:
             tuple: (ip, device_type) si encuentra dispositivo, (None, None) si no
@@ -362,6 +326,8 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
                     self.base_url = f"http://{ip}"
                     self.ajax_url = f"http://{ip}/cgi-bin/ajax"
                     self.type_url = f"http://{ip}/?_type=menuData&_tag="
+                    if al_responder:
+                        al_responder(ip)
                     
                     device_type = self._detect_device_type()
                     print(f"[DISCOVERY] ✓ Dispositivo {device_type} encontrado en {ip}")
@@ -409,92 +375,33 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
                 allow_redirects=True
             )
             
-            # Preparar versiones del HTML para búsqueda
             raw_html = response.text 
-            html_lower = raw_html.lower()
-            server_header = response.headers.get('Server', '').lower()
-            
-            # Normalización básica para detección general (eliminar espacios y saltos)
-            html_normalized = html_lower.replace(' ', '').replace('\n', '').replace('\t', '')
+            # Huella de la página de login para el orden aprendido de estrategias
+            self._huella_login = estrategias_login.huella_pagina(raw_html)
+            identidad = device_fingerprint.identificar(raw_html, response.headers)
             
-            # --- 1. DETECCIÓN GRANDSTREAM ---
-            if 'grandstream' in html_lower or 'grandstream' in server_header or 'ht818' in html_lower:
+            if identidad.vendor == "GRANDSTREAM":
                 return "GRANDSTREAM"
             
-            # --- 2. DETECCIÓN FIBERHOME ---
-            if any(k in html_lower for k in ['fiberhome', 'hg6145f', 'user_name', 'loginpp', 'fh-text-security']):
+            if identidad.vendor == "FIBERHOME":
                 print("[AUTH] Dispositivo Fiberhome detectado automáticamente")
-                if 'hg6145f1' in html_lower:
-                    self.model = "MOD008"
-                    print(f"[AUTH] Modelo asignado: {self.model}")
-                elif not self.model:
-                    self.model = "MOD001"
+                # Sin HG6145F1 explícito se respeta el modelo ya elegido
+                if identidad.exacto or not self.model:
+                    self.model = identidad.modelo
                 print(f"[AUTH] Modelo asignado: {self.model}")
                 return "FIBERHOME"
             
-            # --- 3. DETECCIÓN HUAWEI ---
-            if any(k in html_normalized for k in ['huawei', 'hg8145', 'txt_username', 'txt_password']):
+            if identidad.vendor == "HUAWEI":
                 print("[AUTH] Dispositivo Huawei detectado automáticamente")
-                
-                product_name = ""
-                
-                # Paso A: Intentar leer <title> (Generalmente limpio y fiable)
-                title_match = re.search(r"<title>(.*?)</title>", raw_html, re.IGNORECASE)
-                if title_match:
-                    product_name = title_match.group(1).upper().strip()
-                
-                # Paso B: Si el título no contiene el modelo, buscar en JS var ProductName
-                # Solo aquí aplicamos la limpieza del guion codificado (\x2d) típica del X6-10
-                if "HG8145" not in product_name:
-                    js_match = re.search(r"var\s+ProductName\s*=\s*['\"]([^'\"]+)['\"]", raw_html, re.IGNORECASE)
-                    if js_match:
-                        raw_js = js_match.group(1).upper()
-                        # Aquí corregimos el bug del X6-10 (HG8145X6\x2d10 -> HG8145X6-10)
-                        product_name = raw_js.replace('\\X2D', '-').replace('\\x2d', '-').strip()
-
-                # Paso C: Asignación de Modelo basada en el nombre encontrado
-                if product_name:
-                    if 'HG8145X6-10' in product_name:
-                        self.model = "MOD003" # Huawei X6-10 (El del bug del guion)
-                    elif 'HG8145X6' in product_name:
-                        self.model = "MOD007" # Huawei X6 (Nuevo/Normal)
-                    elif 'HG8145V5' in product_name:
-                        if 'SMALL' in product_name:
-                            self.model = "MOD005" # V5 Small
-                        else:
-                            self.model = "MOD004" # V5 Normal
-                    else:
-                        # Si es un Huawei desconocido, usamos V5 como base segura
-                        self.model = "MOD004"
-                else:
-                    # Si detectamos Huawei pero no pudimos leer el nombre
-                    self.model = "MOD004"
-
-                print(f"[AUTH] Modelo Huawei asignado: {self.model} ({product_name if product_name else 'Indeterminado'})")
+                self.model = identidad.modelo
+                print(f"[AUTH] Modelo Huawei asignado: {self.model} ({identidad.producto or 'Indeterminado'})")
                 return "HUAWEI"
             
-            # --- 4. DETECCIÓN ZTE ---
-            if any(k in html_lower for k in ['zte', 'zxhn', 'f670l', 'f6600', 'frm_username', 'frm_password']):
+            if identidad.vendor == "ZTE":
                 print("[AUTH] Dispositivo ZTE detectado automáticamente")
-                
-                zte_model = ""
-
-                # Extraer modelo desde <title> (misma lógica que Huawei)
-                title_match = re.search(r"<title>(.*?)</title>", raw_html, re.IGNORECASE)
-                if title_match:
-                    zte_model = html.unescape(title_match.group(1)).upper().strip()
-
-                print(f"[AUTH] ZTE <title> extraído: '{zte_model}'")
-
-                # Asignación directa (mismo patrón que Huawei)
-                if "F6600" in zte_model:
-                    self.model = "MOD009"
-                elif "F670L" in zte_model:
-                    self.model = "MOD002"
-                else:
-                    self.model = "MOD002"  # fallback
-
-                print(f"[AUTH] Modelo ZTE asignado: {self.model} ({zte_model if zte_model else 'Indeterminado'})")
+                print(f"[AUTH] ZTE <title> extraído: '{identidad.producto}'")
+                self.model = identidad.modelo
+                print(f"[AUTH] Modelo ZTE asignado: {self.model} ({identidad.producto or 'Indeterminado'})")
                 return "ZTE"
             
             return "ONT"
@@ -505,24 +412,9 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
                 
     def _detect_model(self, model_name: str) -> str:
         """Detecta el codigo de modelo basado en el ModelName"""
-        # Normalizar el nombre del modelo
-        model_name_clean = model_name.strip()
-        model_name_upper = model_name_clean.upper()
-        
-        # Paso 1: Buscar coincidencia exacta (case-insensitive)
-        for key, value in self.model_mapping.items():
-            if key.upper() == model_name_upper:
-                return value
-        
-        # Paso 2: Buscar coincidencias más largas primero (más específicas)
-        # Ordenar las claves por longitud descendente para priorizar matches más específicos
-        sorted_keys = sorted(self.model_mapping.keys(), key=len, reverse=True)
-        
-        for key in sorted_keys:
-            key_upper = key.upper()
-            # Verificar si el nombre del modelo contiene la clave completa
-            if key_upper in model_name_upper:
-                return self.model_mapping[key]
+        codigo = device_fingerprint.modelo_por_nombre(model_name)
+        if codigo:
+            return codigo
         
         # Si no se encuentra, usar el ModelName como codigo
         print(f"[WARN] Modelo desconocido: {model_name}, usando como codigo")
@@ -530,23 +422,12 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
     
     def _get_model_display_name(self, model_code: str, reported_name: str = None) -> str:
         """Retorna el nombre de display correcto según el código de modelo"""
-        display_names = {
-            "MOD003": "HG8145X6-10",  # Nombre comercial usado en la empresa (coloquialmente "X6")
-            "MOD001": "HG6145F",
-            "MOD008": "HG6145F1",
-            "MOD002": "F670L",
-            "MOD009": "F6600",
-            "MOD004": "HG8145V5",
-            "MOD005": "HG8145V5 SMALL",
-            "MOD006": "HT818",
-            "MOD007": "HG8145X6",
-        }
-        
-        return display_names.get(model_code, reported_name or model_code)
+        return device_fingerprint.nombre_display(model_code, reported_name)
          
     def setConfig(self):
         from src.backend.endpoints.conexion import cargarConfig
-        config = cargarConfig()
+        # Si el pre-calentado ya la leyó mientras se detectaba el equipo, se usa esa
+        config = precalentado.tomar_config() or cargarConfig()
 
         # --- WIFI ---
         wifi_cfg = config.get("wifi", {})
@@ -611,6 +492,12 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
             # if(self.model == "MOD001"):
             #     return self.test_results
             return {'error': 'CREDENCIALES'}
+
+        # Desde aquí los spans del equipo ya llevan su SN
+        fijar_etiquetas(sn=sn_de(self.test_results), modelo=self.model)
+
+        # Si este SN tiene una corrida interrumpida (reset, update o desconexión), seguir desde ahí
+        checkpoint.reanudar(self)
             
         # Determinar qué tests ejecutar según el tipo de dispositivo
         device_type = self.test_results['metadata'].get('device_type', 'ONT')
@@ -671,19 +558,23 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
                         self.out_q.put(("log", "CANCELADO POR CAMBIO DE MODO"))
                     return self.test_results
 
+                if checkpoint.saltar(self, test_func.__name__):
+                    continue
                 test_name = test_func.__name__.replace('test_', '').replace('_', ' ').title()
                 emit("pruebas", f"Ejecutando: {test_name}")
                 result = test_func()
                 self.test_results["tests"][result["name"]] = result
 
                 emit("test_individual", {"name": result.get("name",""), "status": result.get("status","FAIL")})
+                checkpoint.marcar(self, test_func.__name__, result["name"], result.get("status","FAIL"))
             
-            if tests_opts.get("software_update", True):
+            if tests_opts.get("software_update", True) and not checkpoint.saltar(self, "software_update"):
                 if self.driver:
                     self.driver.quit()
                     self.driver = None
                 emit("pruebas", "Ejecutando: Actualizacion De Software")
                 self.test_sft_update() # Se tiene que ejecutar después de lo demás ya que requiere otro login
+                checkpoint.marcar(self, "software_update")
             # print(json.dumps(self.test_results, indent=2, ensure_ascii=False)) 
         # Ejecutar tests específicos según el tipo
         if device_type == "ATA":
@@ -707,17 +598,22 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
                 def emit(kind, payload):
                     if self.out_q:
                         self.out_q.put((kind, payload))
+                if checkpoint.saltar(self, test_func.__name__):
+                    continue
                 test_name = test_func.__name__.replace('test_', '').replace('_', ' ').title()
                 emit("pruebas", f"Ejecutando: {test_name}")
                 result = test_func()
                 self.test_results["tests"][result["name"]] = result
 
                 emit("test_individual", {"name": result.get("name",""), "status": result.get("status","FAIL")})
+                checkpoint.marcar(self, test_func.__name__, result["name"], result.get("status","FAIL"))
 
-        # Cerrar sesión FiberHome al finalizar diccionario de pruebas
+        # Al finalizar, la sesión FiberHome queda viva para la siguiente prueba/modo
+        # (core/sesiones.py); sin driver que guardar se cierra como antes
         if self.model in ("MOD001", "MOD008"):
             try:
-                self._router_logout_best_effort()
+                if not sesiones.guardar(self, self.driver, logout=self._router_logout_best_effort):
+                    self._router_logout_best_effort()
             except Exception as e:
                 print(f"[LOGOUT] Error cerrando sesión post-pruebas: {e}")
 
@@ -727,8 +623,11 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
         # Provisionalmente aqui se va a generar el certificado
         generar = True # bandera para seleccionar si se hace o no el certificado (se fuerza porque no se pasa la fibra)
         # Posteriormente se puede validar con la ultima variable del JSON que contiene si es valido o no
-        # Obtener el dict con la info
-        res = self._resultados_finales()
+        # Obtener el dict con la info (reutiliza el registro si ya se calculó en esta corrida)
+        if self.resultado_ont is not None:
+            res = self.resultado_ont.to_payload()
+        else:
+            res = self._resultados_finales()
         if(generar):
             ruta = generarCertificado(res)
             print(f"\n[REPORT] Certificado generado en: {ruta}")
@@ -846,6 +745,9 @@ class ONTAutomatedTester(ZTEMixin, HuaweiMixin, FiberMixin, GrandStreamMixin, Co
 
         #     writer.writerow(registro)
 
+# login, nav_*, parse_*, test_*, reset/reinicio y guardado quedan medidos por método
+instrumentar_clase(ONTAutomatedTester)
+
 def main():
     parser = argparse.ArgumentParser(description="ONT Automated Test Suite")
     parser.add_argument("--host", help="IP de la ONT (opcional, se detecta automáticamente si se omite)")
@@ -855,8 +757,26 @@ def main():
                        choices=['test', 'retest', 'label'], 
                        default='test',
                        help="Modo de operacion: test (todos), retest (solo fallidos), label (generar etiqueta)")
+    parser.add_argument("--perfil", action="store_true",
+                        help="Contar y medir cada round trip de Selenium/requests y mostrar los hot spots")
+    parser.add_argument("--grabar", metavar="DIR",
+                        help="Grabar todo el HTTP de la sesión (requests + Chrome) en DIR como .har.json")
+    parser.add_argument("--reproducir", metavar="HAR",
+                        help="Correr contra una grabación en lugar del equipo (sin red)")
+    parser.add_argument("--escala", type=float, default=0.0,
+                        help="Con --reproducir: 1 respeta los tiempos grabados, 0 contesta de inmediato")
     
     args = parser.parse_args()
+    if args.perfil or perfil_webdriver.habilitado_por_entorno():
+        perfil_webdriver.activar()
+    # Escaneo y pruebas suman al mismo perfil
+    slot_perfil = perfil_webdriver.nuevo_slot()
+    if args.reproducir:
+        rep = grabacion.reproducir(args.reproducir, args.escala)
+        args.host = args.host or rep.meta.get("host")
+        args.model = args.model or rep.meta.get("modelo")
+    elif args.grabar or grabacion.habilitado_por_entorno():
+        grabacion.grabar()
     
    # Auto-discovery si no se proporciona --host
     if not args.host:
@@ -866,6 +786,7 @@ def main():
         
         # Crear tester temporal para verificar red y escanear
         temp_tester = ONTAutomatedTester(host="0.0.0.0", model=None)
+        temp_tester.perfil_slot = slot_perfil
         
         # Verificar configuración de red
         print("[NETWORK] Verificando configuración de red...")
@@ -933,6 +854,7 @@ def main():
     - WiFi 5GHz Signal
     """
     tester = ONTAutomatedTester(args.host, args.model)
+    tester.perfil_slot = slot_perfil
     opc = tester.opcionesTest
     opc["tests"]["factory_reset"] =     True # Deshabilitar factory reset automatico
     opc["tests"]["software_update"] =   True 
@@ -952,6 +874,19 @@ def main():
     todo_tests_on = all(tester.opcionesTest["tests"].values())
     if(todo_tests_on):
         tester._generarCertificado()
+
+    if perfil_webdriver.activo():
+        perfil_webdriver.volcar_equipo(slot_perfil)
+    if grabacion.activo() == "grabar":
+        firmware = tester.test_results.get("metadata", {}).get("software_version")
+        grabacion.guardar_equipo(tester.host, tester.model, firmware, base_dir=args.grabar)
+    elif grabacion.activo() == "reproducir":
+        rep = grabacion._reproductor
+        print(f"[GRABACION] {rep.servidas} respuestas servidas, {len(rep.faltantes)} sin grabar")
+        for f in rep.faltantes[:20]:
+            print(f"  sin grabar: {f}")
+    # Huawei/ZTE encolan su reporte en core/postproceso: esperarlo antes de salir
+    drenar_postproceso(POSTPROCESO_CIERRE_S)
     
 
 def monitor_device_connection(ip: str, interval: int = 1, max_failures: int = 1, stop_event = None):
@@ -1111,52 +1046,100 @@ def generate_label(host: str, model: str = None):
     
     print(f"\n[+] Etiqueta guardada en: {label_file}")
 
+def _sn_del_equipo(tester):
+    """
+    SN leído directo del equipo cuando el login no lo dejó en metadata
+    (ZTE: DEVINFO, Huawei: System Information, Fiberhome: get_base_info).
+    None si no se pudo.
+    """
+    sn = None
+    try:
+        if tester.model in ("MOD001", "MOD008"):
+            sn = (tester._extract_base_info() or {}).get("serial_number_physical")
+        elif tester.model in ("MOD002", "MOD009", "MOD003", "MOD004", "MOD005", "MOD007"):
+            # El login deja su Chrome en el registro de sesiones; se toma prestado y se regresa
+            sesion = sesiones.tomar(tester, lambda driver: True)
+            if sesion is None:
+                return None
+            try:
+                if tester.model in ("MOD002", "MOD009"):
+                    sn = tester._zte_sn_previo(sesion.driver)
+                else:
+                    sn = tester._hw_sn_previo(sesion.driver)
+            finally:
+                sesiones.guardar(tester, sesion.driver, logout=sesion.logout)
+    except Exception as e:
+        print(f"[RETEST] No se pudo leer el SN del equipo: {e}")
+    if sn:
+        # Para que el reporte del retest quede indexado con su SN
+        tester.test_results["metadata"]["serial_number"] = sn
+        print(f"[RETEST] SN leído del equipo: {sn}")
+    return sn or None
+
+
+def _soltar_login(tester):
+    """
+    Antes de que run_all_tests vuelva a hacer login: el Chrome que dejó el login
+    del retest (Fiberhome lo deja en tester.driver) pasa a core/sesiones para que
+    ese login lo reuse. Si no se puede guardar se cierra la sesión en el router y
+    el Chrome (un segundo login encima choca con "usuario ya logueado").
+    """
+    driver = getattr(tester, "driver", None)
+    if driver is None:
+        return
+    logout = tester._router_logout_best_effort if tester.model in ("MOD001", "MOD008") else None
+    try:
+        if sesiones.guardar(tester, driver, logout=logout):
+            return
+        if logout is not None:
+            logout(driver)
+    except Exception as e:
+        print(f"[RETEST] Error cerrando la sesión del login: {e}")
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    tester.driver = None
+
+
 def run_retest_mode(host: str, model: str = None, output: str = None):
     """RF 031: Ejecuta solo los tests que fallaron anteriormente"""
     print("\n" + "="*60)
     print("MODO RETEST - Solo tests fallidos")
     print("="*60 + "\n")
     
-    # Buscar el último reporte en subdirectorios por fecha
-    reports_base_dir = Path("reports/automated_tests")
-    if not reports_base_dir.exists():
-        print("[!] No se encontraron reportes previos")
-        print("[*] Ejecutando suite completo...")
-        tester = ONTAutomatedTester(host, model)
-        tester.run_all_tests()
-        print("\n" + tester.generate_report())
-        tester.save_results(output)
+    # El último reporte se busca en el índice (sn, modelo), no recorriendo carpetas
+    from src.backend.core import indice_resultados as indice
+
+    reports_base_dir = Path(output) if output else Path("reports/automated_tests")
+    # JSON sueltos de antes del índice: se indexan una sola vez por carpeta
+    indice.migrar_legado([reports_base_dir, Path(__file__).parent / "reports" / "automated_tests"])
+
+    tester = ONTAutomatedTester(host, model)
+
+    if not tester.login():
+        print("[!] Error: No se pudo autenticar")
         return
-    
-    # Buscar todos los archivos JSON en subdirectorios
-    json_files = []
-    for date_dir in sorted(reports_base_dir.iterdir(), reverse=True):
-        if date_dir.is_dir():
-            json_files.extend(date_dir.glob("*_automated_results.json"))
-    
-    json_files = sorted(json_files, key=lambda x: x.stat().st_mtime, reverse=True)
-    
-    if not json_files:
-        print("[!] No se encontraron reportes previos")
+
+    sn = indice.sn_de(tester.test_results) or _sn_del_equipo(tester)
+    last_report, failed_tests = indice.ultimo_fallido(sn, tester.model)
+
+    if last_report is None:
+        if sn:
+            print("[!] No se encontraron reportes previos para este equipo")
+        else:
+            # Sin SN no se sabe qué reporte es de esta ONT: nunca se toma el último del modelo
+            print("[!] No se pudo leer el SN del equipo")
         print("[*] Ejecutando suite completo...")
-        tester = ONTAutomatedTester(host, model)
+        # run_all_tests hace su propio login: que tome esta sesión en lugar de abrir otro Chrome
+        _soltar_login(tester)
         tester.run_all_tests()
         print("\n" + tester.generate_report())
         tester.save_results(output)
         return
-    
-    last_report = json_files[0]
-    print(f"[*] Cargando último reporte: {last_report.parent.name}/{last_report.name}")
-    
-    with open(last_report, 'r') as f:
-        previous_results = json.load(f)
-    
-    # Identificar tests fallidos
-    failed_tests = []
-    for test_name, test_data in previous_results.get("tests", {}).items():
-        if test_data.get("status") == "FAIL":
-            failed_tests.append(test_name)
-    
+
+    print(f"[*] Último reporte del equipo (SN {sn}, {tester.model}): {last_report}")
+
     if not failed_tests:
         print("[✓] Todos los tests pasaron en la ejecución anterior")
         print("[*] Nada que re-testear")
@@ -1167,13 +1150,6 @@ def run_retest_mode(host: str, model: str = None, output: str = None):
         print(f"    - {test}")
     print()
     
-    # Crear tester y ejecutar solo tests fallidos
-    tester = ONTAutomatedTester(host, model)
-    
-    if not tester.login():
-        print("[!] Error: No se pudo autenticar")
-        return
-    
     # Mapeo de nombres de tests a métodos
     test_methods = {
         "PWD_PASS": tester.test_pwd_pass,
@@ -1221,11 +1197,11 @@ def run_retest_mode(host: str, model: str = None, output: str = None):
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    json_file = output_dir / f"{timestamp}_{tester.model}_retest_results.json"
     txt_file = output_dir / f"{timestamp}_{tester.model}_retest_report.txt"
     
-    with open(json_file, 'w') as f:
-        json.dump(tester.test_results, f, indent=2)
+    from src.backend.core.archivo_resultados import get_archivo
+    json_file = get_archivo().agregar(tester.test_results, origen=f"retest:{output_dir}")
+    indice.registrar(tester.test_results, json_file)
     
     with open(txt_file, 'w') as f:
         f.write(tester.generate_report())
@@ -1361,22 +1337,30 @@ def pruebaUnitariaONT(opcionesTest, out_q=None, modelo=None, stop_event=None):
     emit("resume_monitor", None)
 
 # Función helper para ping único
-def _ping_once(ip: str, timeout_ms: int = 1) -> bool:
-    """Ping 1 vez"""
-    cmd = ["ping", "-n", "1", "-w", str(int(timeout_ms)), ip]
-    try:
-        r = subprocess.run(
-            cmd,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            creationflags=subprocess.CREATE_NO_WINDOW,
-            timeout=max(2, int(timeout_ms / 1000) + 1)
-        )
-        return r.returncode == 0
-    except Exception:
-        return False
+# El ping vive en utils/network_utils para que el monitoreo no tenga que importar
+# este módulo completo (selenium, mixins, etc.). Se conserva el alias por compatibilidad.
+from src.backend.utils.network_utils import ping_once as _ping_once
+
+# Tareas del post-proceso (corren en core/postproceso, fuera del hilo de pruebas)
+# Espera máxima al terminar main_loop para que no se pierdan en silencio
+POSTPROCESO_CIERRE_S = 30.0
+
+def _guardar_reporte(tester, base_dir: str):
+    # Al terminar la FASE 2 el tester ya no se modifica, se puede leer desde otro hilo
+    print("\n" + tester.generate_report())
+    tester.save_results2(base_dir)
+
+def _certificado_desde_payload(payload: dict):
+    # Render en el proceso dedicado (template/CSS ya cargados ahí)
+    from src.backend.certificado.renderer import get_renderer
+    info = (payload or {}).get("info", {})
+    with span("certificado", cat="certificado", sn=info.get("sn"), modelo=info.get("modelo")):
+        ruta = get_renderer().renderizar(payload)
+    print(f"\n[REPORT] Certificado generado en: {ruta}")
+    return ruta
 
 # Helper para esperar reconexión sin reiniciar ciclo
+@trazar(cat="reinicio")
 def wait_for_reconnect(ip: str, grace_s: int = 240, interval_s: float = 2.0, stop_event=None) -> bool:
     """
     Espera a que el ONT vuelva a responder ping (típico reboot).
@@ -1412,6 +1396,12 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
     last_tested_ip = None
     auto_test_default = auto_test_on_detect  # para restaurar al desconectar
     fase2_executed = start_in_monitor # Indica si ya se ejecutó fase2 en esta sesión (se resetea al desconectar)
+    from src.backend.core.archivo_resultados import _estacion_actual
+    estacion_traza = _estacion_actual()
+    if perfil_webdriver.habilitado_por_entorno():
+        perfil_webdriver.activar()
+    if grabacion.habilitado_por_entorno():
+        grabacion.grabar()
 
     def is_etiqueta_mode(opc: dict) -> bool:
         tests = (opc or {}).get("tests", {})
@@ -1440,6 +1430,9 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
             print("-" * 60)
             
             temp_tester = ONTAutomatedTester(host="0.0.0.0", model=None)
+            # Escaneo y pruebas de este ciclo suman al mismo perfil (no por IP: todas las ONT comparten IP)
+            slot_perfil = perfil_webdriver.nuevo_slot()
+            temp_tester.perfil_slot = slot_perfil
 
             # Definir la q como globar para poder acceder a ella desde todos lados
             def emit(kind, payload):
@@ -1456,7 +1449,13 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
             else:
                 print("[OK] Configuración de red correcta\n")
             
-            ip, device_type = temp_tester._scan_for_device()
+            # En cuanto la IP responda arranca Chrome/config en paralelo a la detección,
+            # solo si la FASE 2 va a loguearse (pruebas o etiqueta); en monitoreo sería un Chrome de más
+            fase2_con_login = (not UNIT_TEST_ACTIVE.is_set() and not UNIT_TEST_JUST_FINISHED.is_set()
+                               and not fase2_executed
+                               and (auto_test_on_detect or is_etiqueta_mode(opciones)))
+            ip, device_type = temp_tester._scan_for_device(
+                al_responder=precalentado.iniciar if fase2_con_login else None)
             
             if not ip:
                 print("\n[!] No se encontró ningún dispositivo")
@@ -1465,6 +1464,8 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
                 continue
             
             detected_model = temp_tester.model
+            if fase2_con_login:
+                precalentado.confirmar(ip, detected_model)
             
             print(f"\n[OK] {device_type} detectado: {ip} (Modelo: {detected_model})")
             # Decir que ya se hizo la conexión
@@ -1503,8 +1504,11 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
 
                 tester = ONTAutomatedTester(ip, detected_model)
                 tester.out_q = out_q
-                tester.opcionesTest = copy.deepcopy(opciones)
+                tester.opcionesTest = copiar_opciones(opciones)
                 tester.stop_event = stop_event # el evento real para interrumpir
+                tester.perfil_slot = slot_perfil
+                # Si se corta (reset, update, desconexión) el mismo SN sigue donde iba
+                tester.usar_checkpoint = True
 
                 # Debugeo
                 print("[DEBUG] factory_reset opt:", tester.opcionesTest.get("tests", {}).get("factory_reset"))
@@ -1512,7 +1516,9 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
 
                 print("Las opciones elegidas son: " + str(opciones))
                 emit("pruebas", "Autenticando dispositivo")
-                pruebas = tester.run_all_tests()
+                with etiquetas(host=ip, modelo=detected_model, estacion=estacion_traza):
+                    with span("pruebas", cat="fase"):
+                        pruebas = tester.run_all_tests()
 
                 if stop_event and stop_event.is_set():
                     emit("log", "Ejecución cancelada por desconexión inesperada.")
@@ -1523,11 +1529,20 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
                     print("[*] Flujo abortado por full locked/login.")
                     break
                 
+                resultados = None
                 if not pruebas.get("error") == "CREDENCIALES":
-                    resultados = tester._resultados_finales()
-                    # Guardar para base diaria y global
-                    tester.saveBDiaria(resultados)
+                    with etiquetas(host=ip, modelo=tester.model, estacion=estacion_traza,
+                                   sn=sn_de(tester.test_results)):
+                        resultados = tester._resultados_finales()
+                        # Guardar para base diaria y global
+                        tester.saveBDiaria(resultados)
                     emit("resultados", resultados)
+                    # Corrida completa: ya no hay nada que reanudar para este SN
+                    checkpoint.cerrar(tester)
+
+                # Archivos (reporte, certificado) en segundo plano: no bloquean la FASE 3
+                pp = get_postproceso()
+                sn_pp = (resultados or {}).get("info", {}).get("sn")
 
                 # print("[RESULTADOS] El modelo es: "+str(tester.model))
                 if (tester.model == "MOD001" or tester.model == "MOD008"):
@@ -1537,12 +1552,23 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
                         print("[ERROR DE CREDENCIALES] Sin guardar nada")
                     else:
                         print("[RESULTADOS] Entrando a opción guardar resultados")
-                        print("\n" + tester.generate_report())
-                        tester.save_results2("test_mod001_mod008")
+                        pp.enviar("reporte_json", _guardar_reporte, tester, "test_mod001_mod008", sn=sn_pp, out_q=out_q)
 
                 todo_tests_on = all(tester.opcionesTest["tests"].values())
-                if todo_tests_on:
-                    tester._generarCertificado()
+                if todo_tests_on and tester.resultado_ont is not None:
+                    # Snapshot del payload: el worker no toca el tester
+                    pp.enviar("certificado", _certificado_desde_payload, tester.resultado_ont.to_payload(), sn=sn_pp, out_q=out_q)
+
+                # Los spans del equipo se vuelcan al final de la cola (después del certificado)
+                pp.enviar("trazas", get_tracer().volcar, sn=sn_pp)
+                if perfil_webdriver.activo():
+                    # Se toma aquí (no en el worker) para que no se mezcle con el siguiente equipo
+                    pp.enviar("perfil", perfil_webdriver.guardar, perfil_webdriver.tomar(slot_perfil), sn_pp, sn=sn_pp)
+                if grabacion.activo() == "grabar":
+                    # Se toma aquí (no en el worker) para que no se mezcle con el siguiente equipo
+                    har = grabacion.archivo_har(grabacion.tomar(), host=ip, modelo=tester.model,
+                                                firmware=(resultados or {}).get("info", {}).get("sftVer"), sn=sn_pp)
+                    pp.enviar("grabacion", grabacion.guardar_har, har, sn=sn_pp)
 
                 emit("log", "Pruebas completadas")
                 emit("pruebas", "Fin de pruebas")
@@ -1563,7 +1589,7 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
 
                 et = ONTAutomatedTester(ip, detected_model)
                 et.out_q = out_q
-                et.opcionesTest = copy.deepcopy(opciones)
+                et.opcionesTest = copiar_opciones(opciones)
 
                 emit("pruebas", "Extrayendo datos de etiqueta")
                 pruebas = et.run_all_tests()
@@ -1587,8 +1613,8 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
                         print("[ERROR DE CREDENCIALES] Sin guardar nada")
                     else:
                         print("[RESULTADOS] Entrando a opción guardar resultados")
-                        print("\n" + et.generate_report())
-                        et.save_results2("test_mod001_mod008")
+                        sn_pp = et.resultado_ont.info.sn if et.resultado_ont is not None else None
+                        get_postproceso().enviar("reporte_json", _guardar_reporte, et, "test_mod001_mod008", sn=sn_pp, out_q=out_q)
                 emit("log", "Etiqueta completada")
                 emit("pruebas", "Fin etiqueta")
 
@@ -1600,6 +1626,9 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
                 emit("log", "Dispositivo detectado. En monitoreo: esperando acción del usuario...")
             
             
+            # Chrome pre-calentado que nadie tomó (monitoreo, Grandstream, login fallido...)
+            precalentado.descartar()
+
             # FASE 3: MONITOREO
             print(f"\n[FASE 3/3] MONITOREO DE CONEXIÓN")
             print("-" * 60)
@@ -1615,6 +1644,8 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
             # Ping perdido = desconexión real → nuevo ciclo de escaneo
             print("\n[*] Dispositivo desconectado. Iniciando nuevo ciclo de escaneo...")
             emit("con", "DESCONECTADO")
+            # La sesión guardada era de ese equipo; el siguiente hace login
+            sesiones.descartar()
             fase2_executed = False  # Resetear para que el próximo dispositivo ejecute fase2
             time.sleep(1)
             # Vuelve al while principal (nuevo ciclo)
@@ -1627,6 +1658,12 @@ def main_loop(opciones, out_q = None, stop_event = None, dispatcher = None, auto
         if last_tested_ip:
             print(f"Último dispositivo testeado: {last_tested_ip}")
         print("\n[*] Programa finalizado")
+    finally:
+        precalentado.descartar()
+        # Reportes/certificados/etiquetas en cola: que terminen antes de soltar el hilo
+        restantes = drenar_postproceso(POSTPROCESO_CIERRE_S)
+        if restantes and out_q:
+            out_q.put(("log", f"Post-proceso sin terminar: {', '.join(restantes)}"))
 
 #def pruebaUnitariaONT():
 
@@ -1,6 +1,8 @@
 # Metodos para la bd
 import sqlite3
+import json
 from src.backend.sua_client.local_db import get_conn
+from src.backend.core.trazas import trazar
 from datetime import datetime
 
 def now_local_iso():
@@ -231,6 +233,7 @@ def actualizar_operacion(payload, modo, id_user):
         con.commit()
         return cur.rowcount #1 si act, 0 si no encontró 
     
+@trazar(cat="bd")
 def insertar_operacion(payload, modo, id_user):
     # Función para agregar datos del tester a la bd sqlite
     # Por el diseño de la bd cada prueba a la que no se le asigne valor tendrá por defecto SIN PRUEBA
@@ -620,4 +623,415 @@ def get_baseGlobal_por_dia(day: str):
         """, (day,)).fetchall()
         return rows
 
-    
\ No newline at end of file
+    
+# ===========================
+# Export (streaming)
+# ===========================
+EXPORT_COLUMNS = [
+    "id", "tipo", "fecha_test", "modelo", "sn", "mac", "sftVer",
+    "wifi24", "wifi5", "passWifi",
+    "ping", "reset", "usb", "tx", "rx", "w24", "w5", "sftU",
+    "valido", "version_ont_tester",
+]
+
+def _filtros_export(desde=None, hasta=None, modelo=None, valido=None, sns=None):
+    """
+    desde / hasta: 'YYYY-MM-DD' (inclusive). modelo: texto exacto. valido: True/False/None.
+    sns: lista de números de serie (opcional).
+    """
+    where, params = [], []
+    if sns:
+        sns = list(sns)
+        where.append(f"o.sn IN ({','.join('?' * len(sns))})")
+        params.extend(sns)
+    if desde:
+        where.append("substr(o.fecha_test, 1, 10) >= ?")
+        params.append(desde)
+    if hasta:
+        where.append("substr(o.fecha_test, 1, 10) <= ?")
+        params.append(hasta)
+    if modelo:
+        where.append("o.modelo = ?")
+        params.append(modelo)
+    if valido is not None:
+        where.append("o.valido = ?")
+        params.append(1 if valido else 0)
+    sql_where = ("WHERE " + " AND ".join(where)) if where else ""
+    return sql_where, params
+
+def modelos_operaciones() -> list:
+    """Modelos distintos presentes en operations (para el filtro del export)."""
+    with get_conn() as con:
+        rows = con.execute("""
+            SELECT DISTINCT modelo FROM operations
+            WHERE modelo IS NOT NULL AND modelo <> ''
+            ORDER BY modelo;
+        """).fetchall()
+        return [r[0] for r in rows]
+
+def contar_operaciones_export(desde=None, hasta=None, modelo=None, valido=None) -> int:
+    sql_where, params = _filtros_export(desde, hasta, modelo, valido)
+    con = get_conn()
+    try:
+        row = con.execute(f"SELECT COUNT(*) FROM operations o {sql_where};", params).fetchone()
+        return int(row[0] or 0)
+    finally:
+        con.close()
+
+def iter_operaciones_export(desde=None, hasta=None, modelo=None, valido=None, batch: int = 2000, sns=None):
+    """
+    Generador de tuplas (en el orden de EXPORT_COLUMNS) leídas por lotes con fetchmany.
+    No carga la tabla completa en memoria; la conexión se cierra al agotar/cerrar el generador.
+    """
+    sql_where, params = _filtros_export(desde, hasta, modelo, valido, sns)
+    con = get_conn()
+    con.row_factory = None  # tuplas simples: más ligeras que sqlite3.Row
+    try:
+        cur = con.execute(f"""
+            SELECT
+                o.id, o.tipo, o.fecha_test, o.modelo, o.sn, o.mac, o.sftVer,
+                o.wifi24, o.wifi5, o.passWifi,
+                o.ping, o.reset, o.usb, o.tx, o.rx, o.w24, o.w5, o.sftU,
+                o.valido, cm.version
+            FROM operations o
+            LEFT JOIN catalog_meta cm
+              ON cm.id = o.id_catalog_meta
+            {sql_where}
+            ORDER BY o.fecha_test ASC, o.id ASC;
+        """, params)
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                break
+            for r in rows:
+                yield r
+    finally:
+        con.close()
+
+# ===========================
+# Índice de reportes (retest)
+# ===========================
+def indexar_resultado(sn, modelo, ts: str, ruta: str, fallidos) -> None:
+    with get_conn() as con:
+        con.execute("""
+            INSERT INTO results_index (sn, modelo, ts, ruta, fallidos)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(ruta) DO UPDATE SET
+                sn = excluded.sn, modelo = excluded.modelo,
+                ts = excluded.ts, fallidos = excluded.fallidos;
+        """, (sn, modelo, ts, ruta, json.dumps(list(fallidos))))
+        con.commit()
+
+def ultimo_resultado_indexado(sn: str, modelo=None):
+    """
+    Último reporte del equipo sn (y modelo, si viene) usando el índice (sn, modelo, ts).
+    Sin sn no se busca: el último del modelo puede ser de otra ONT. Regresa Row o None.
+    """
+    if not sn:
+        return None
+    where, params = ["sn = ?"], [sn]
+    if modelo:
+        where.append("modelo = ?")
+        params.append(modelo)
+    with get_conn() as con:
+        return con.execute(f"""
+            SELECT id, sn, modelo, ts, ruta, fallidos
+            FROM results_index
+            WHERE {" AND ".join(where)}
+            ORDER BY ts DESC
+            LIMIT 1;
+        """, params).fetchone()
+
+def resultado_indexado_de(sn: str, fecha_test: str):
+    """
+    Reporte indexado de una operación: mismo SN y mismo timestamp (fecha_test
+    de operations sale del metadata.timestamp del reporte). Regresa Row o None.
+    """
+    ts = (fecha_test or "").replace(" ", "T")[:19]
+    if not sn or len(ts) < 19:
+        return None
+    with get_conn() as con:
+        return con.execute("""
+            SELECT id, sn, modelo, ts, ruta, fallidos
+            FROM results_index
+            WHERE sn = ? AND substr(replace(ts, ' ', 'T'), 1, 19) = ?
+            ORDER BY ts DESC
+            LIMIT 1;
+        """, (sn, ts)).fetchone()
+
+def migracion_hecha(nombre: str) -> bool:
+    with get_conn() as con:
+        return con.execute("SELECT 1 FROM migraciones WHERE nombre = ?;", (nombre,)).fetchone() is not None
+
+def marcar_migracion(nombre: str) -> None:
+    with get_conn() as con:
+        con.execute("""
+            INSERT OR IGNORE INTO migraciones (nombre, hecha_en)
+            VALUES (?, datetime('now'));
+        """, (nombre,))
+        con.commit()
+
+# ===========================
+# Importación de históricos
+# ===========================
+OPERATION_COLUMNS = [
+    "id_station", "id_user", "id_settings", "id_catalog_meta", "tipo",
+    "fecha_test", "modelo", "sn", "mac", "sftVer", "wifi24", "wifi5", "passWifi",
+    "ping", "reset", "usb", "tx", "rx", "w24", "w5", "sftU",
+    "valido",
+]
+
+def archivos_importados():
+    """
+    Regresa (hashes, firmas) de lo ya importado:
+    hashes = set de sha1, firmas = {ruta: (size, mtime_ns)} para saltar sin leer el archivo.
+    """
+    con = get_conn()
+    con.row_factory = None
+    try:
+        hashes, firmas = set(), {}
+        cur = con.execute("SELECT hash, ruta, size, mtime_ns FROM imported_files;")
+        while True:
+            rows = cur.fetchmany(5000)
+            if not rows:
+                break
+            for h, ruta, size, mtime_ns in rows:
+                hashes.add(h)
+                firmas[ruta] = (size, mtime_ns)
+        return hashes, firmas
+    finally:
+        con.close()
+
+def _vinculos_importados(con, rutas) -> dict:
+    """{ruta: (hash, id_operation)} de las rutas que ya estaban en imported_files."""
+    out = {}
+    rutas = list(rutas)
+    for i in range(0, len(rutas), 500):
+        chunk = rutas[i:i + 500]
+        marks = ", ".join("?" * len(chunk))
+        for ruta, h, id_op in con.execute(
+            f"SELECT ruta, hash, id_operation FROM imported_files WHERE ruta IN ({marks});", chunk
+        ):
+            out[ruta] = (h, id_op)
+    return out
+
+def importar_lote_operaciones(con, operaciones, archivos, indice) -> None:
+    """
+    Inserta un lote completo en UNA transacción (con = conexión abierta por el importador):
+      operaciones: (ruta, fila) con fila en el orden de OPERATION_COLUMNS
+      archivos:    (hash, ruta, size, mtime_ns, imported_at)
+      indice:      (sn, modelo, ts, ruta, fallidos_json) para results_index
+    Una ruta ya importada cuyo contenido cambió actualiza su operación vinculada
+    en vez de crear otra; si ahora es copia de otro reporte ya importado, la
+    operación vieja de esa ruta se borra. Si algo falla se hace rollback y no
+    queda el lote a medias.
+    """
+    cols = ", ".join(OPERATION_COLUMNS)
+    marks = ", ".join("?" * len(OPERATION_COLUMNS))
+    sets = ", ".join(f"{c} = ?" for c in OPERATION_COLUMNS)
+    try:
+        previos = _vinculos_importados(con, (a[1] for a in archivos))
+        ids = {}
+        for ruta, fila in operaciones:
+            id_op = previos.get(ruta, (None, None))[1]
+            if id_op is not None and con.execute(
+                f"UPDATE operations SET {sets} WHERE id = ?;", (*fila, id_op)
+            ).rowcount:
+                ids[ruta] = id_op
+            else:
+                ids[ruta] = con.execute(f"INSERT INTO operations ({cols}) VALUES ({marks});", fila).lastrowid
+
+        filas_archivos = []
+        for h, ruta, size, mtime_ns, imported_at in archivos:
+            id_op = ids.get(ruta)
+            if id_op is None:
+                h_prev, id_prev = previos.get(ruta, (None, None))
+                if h_prev == h:
+                    id_op = id_prev  # mismo contenido, solo cambió la firma
+                elif id_prev is not None:
+                    con.execute("DELETE FROM operations WHERE id = ?;", (id_prev,))
+                    con.execute("DELETE FROM results_index WHERE ruta = ?;", (ruta,))
+            filas_archivos.append((h, ruta, size, mtime_ns, imported_at, id_op))
+
+        con.executemany("""
+            INSERT INTO imported_files (hash, ruta, size, mtime_ns, imported_at, id_operation)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(ruta) DO UPDATE SET
+                hash = excluded.hash, size = excluded.size,
+                mtime_ns = excluded.mtime_ns, imported_at = excluded.imported_at,
+                id_operation = excluded.id_operation;
+        """, filas_archivos)
+        con.executemany("""
+            INSERT INTO results_index (sn, modelo, ts, ruta, fallidos)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(ruta) DO UPDATE SET
+                sn = excluded.sn, modelo = excluded.modelo,
+                ts = excluded.ts, fallidos = excluded.fallidos;
+        """, indice)
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+
+# ===========================
+# Tiempos por fase (trazas)
+# ===========================
+TIMINGS_COLUMNS = ["inicio_us", "dur_ms", "nombre", "categoria", "host", "modelo",
+                   "estacion", "sn", "hilo", "error"]
+
+def insertar_timings(filas) -> None:
+    """filas: tuplas en el orden de TIMINGS_COLUMNS; todo en una sola transacción."""
+    cols = ", ".join(TIMINGS_COLUMNS)
+    marks = ", ".join("?" * len(TIMINGS_COLUMNS))
+    with get_conn() as con:
+        con.executemany(f"INSERT INTO timings ({cols}) VALUES ({marks});", filas)
+        con.commit()
+
+def _filtros_timings(desde_us=None, hasta_us=None, modelo=None):
+    where, params = [], []
+    if desde_us is not None:
+        where.append("inicio_us >= ?")
+        params.append(desde_us)
+    if hasta_us is not None:
+        where.append("inicio_us < ?")
+        params.append(hasta_us)
+    if modelo:
+        where.append("modelo = ?")
+        params.append(modelo)
+    return (("WHERE " + " AND ".join(where)) if where else ""), params
+
+def resumen_timings(desde_us=None, hasta_us=None, modelo=None) -> list:
+    """(modelo, categoria, nombre, n, prom_ms, max_ms, total_s) ordenado por tiempo total."""
+    sql_where, params = _filtros_timings(desde_us, hasta_us, modelo)
+    with get_conn() as con:
+        rows = con.execute(f"""
+            SELECT modelo, categoria, nombre, COUNT(*),
+                   ROUND(AVG(dur_ms), 1), ROUND(MAX(dur_ms), 1), ROUND(SUM(dur_ms) / 1000.0, 1)
+            FROM timings
+            {sql_where}
+            GROUP BY modelo, categoria, nombre
+            ORDER BY SUM(dur_ms) DESC;
+        """, params).fetchall()
+        return [tuple(r) for r in rows]
+
+def iter_timings(desde_us=None, hasta_us=None, modelo=None, batch: int = 5000):
+    sql_where, params = _filtros_timings(desde_us, hasta_us, modelo)
+    cols = ", ".join(TIMINGS_COLUMNS)
+    con = get_conn()
+    con.row_factory = None
+    try:
+        cur = con.execute(f"SELECT {cols} FROM timings {sql_where} ORDER BY inicio_us;", params)
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                break
+            for r in rows:
+                yield r
+    finally:
+        con.close()
+
+# ===========================
+# Auditoría de flota
+# ===========================
+AUDITORIA_COLUMNS = ["corrida", "host", "ts", "estado", "tipo", "modelo", "sn", "mac",
+                     "firmware", "tx_dbm", "rx_dbm", "metodo", "seg", "error"]
+
+def insertar_auditoria(filas) -> None:
+    """filas: tuplas en el orden de AUDITORIA_COLUMNS; todo en una sola transacción."""
+    cols = ", ".join(AUDITORIA_COLUMNS)
+    marks = ", ".join("?" * len(AUDITORIA_COLUMNS))
+    with get_conn() as con:
+        con.executemany(f"INSERT INTO auditoria ({cols}) VALUES ({marks});", filas)
+        con.commit()
+
+def resumen_auditoria(corrida: str) -> list:
+    """(estado, tipo, modelo, firmware, n) de una corrida."""
+    with get_conn() as con:
+        rows = con.execute("""
+            SELECT estado, tipo, modelo, firmware, COUNT(*)
+            FROM auditoria
+            WHERE corrida = ?
+            GROUP BY estado, tipo, modelo, firmware
+            ORDER BY COUNT(*) DESC;
+        """, (corrida,)).fetchall()
+        return [tuple(r) for r in rows]
+
+# ===========================
+# Checkpoints por SN
+# ===========================
+def guardar_checkpoint(sn: str, modelo, opciones: str, actualizado: float,
+                       pasos: str, tests: str, metadata: str) -> None:
+    with get_conn() as con:
+        con.execute("""
+            INSERT INTO checkpoints (sn, modelo, opciones, actualizado, pasos, tests, metadata)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(sn) DO UPDATE SET
+                modelo = excluded.modelo, opciones = excluded.opciones,
+                actualizado = excluded.actualizado, pasos = excluded.pasos,
+                tests = excluded.tests, metadata = excluded.metadata;
+        """, (sn, modelo, opciones, actualizado, pasos, tests, metadata))
+        con.commit()
+
+def leer_checkpoint(sn: str):
+    with get_conn() as con:
+        return con.execute("""
+            SELECT sn, modelo, opciones, actualizado, pasos, tests, metadata
+            FROM checkpoints
+            WHERE sn = ?;
+        """, (sn,)).fetchone()
+
+def borrar_checkpoint(sn: str) -> None:
+    with get_conn() as con:
+        con.execute("DELETE FROM checkpoints WHERE sn = ?;", (sn,))
+        con.commit()
+
+def purgar_checkpoints(antes_de: float) -> int:
+    """Borra checkpoints sin actividad desde antes_de (epoch). Regresa cuántos."""
+    with get_conn() as con:
+        cur = con.execute("DELETE FROM checkpoints WHERE actualizado < ?;", (antes_de,))
+        con.commit()
+        return cur.rowcount
+
+# ===========================
+# Estrategias de login aprendidas
+# ===========================
+def registrar_estrategia_login(grupo: str, modelo: str, huella: str,
+                               estrategia: str, ok: bool, ms: float) -> None:
+    with get_conn() as con:
+        con.execute("""
+            INSERT INTO login_estrategias (grupo, modelo, huella, estrategia,
+                                           exitos, fallos, ms_exito, ms_fallo, ultimo)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+            ON CONFLICT(grupo, modelo, huella, estrategia) DO UPDATE SET
+                exitos = exitos + excluded.exitos,
+                fallos = fallos + excluded.fallos,
+                ms_exito = ms_exito + excluded.ms_exito,
+                ms_fallo = ms_fallo + excluded.ms_fallo,
+                ultimo = excluded.ultimo;
+        """, (grupo, modelo or "", huella or "", estrategia,
+              1 if ok else 0, 0 if ok else 1,
+              float(ms) if ok else 0.0, 0.0 if ok else float(ms)))
+        con.commit()
+
+def estadisticas_estrategias_login(grupo: str, modelo: str, huella: str = None) -> dict:
+    """
+    {estrategia: (exitos, fallos, ms_promedio_exito, ms_promedio_fallo)} sumando lo que
+    coincida con los filtros dados.
+    """
+    where, params = ["grupo = ?", "modelo = ?"], [grupo, modelo or ""]
+    if huella is not None:
+        where.append("huella = ?")
+        params.append(huella)
+    with get_conn() as con:
+        rows = con.execute(f"""
+            SELECT estrategia, SUM(exitos), SUM(fallos), SUM(ms_exito), SUM(ms_fallo)
+            FROM login_estrategias
+            WHERE {" AND ".join(where)}
+            GROUP BY estrategia;
+        """, params).fetchall()
+    return {
+        r[0]: (int(r[1] or 0), int(r[2] or 0),
+               (float(r[3] or 0) / r[1]) if r[1] else None,
+               (float(r[4] or 0) / r[2]) if r[2] else None)
+        for r in rows
+    }
@@ -135,4 +135,135 @@ CREATE TABLE IF NOT EXISTS operations (
     CHECK (w24   IN ('PASS','FAIL','SIN_PRUEBA')),
     CHECK (w5    IN ('PASS','FAIL','SIN_PRUEBA')),
     CHECK (sftU  IN ('PASS','FAIL','SIN_PRUEBA'))
-);
\ No newline at end of file
+);
+-- ===========================
+-- 8) Índice de reportes JSON (retest)
+-- ===========================
+-- Un renglón por reporte guardado en disco; retest busca el último por (sn, modelo)
+CREATE TABLE IF NOT EXISTS results_index (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    sn          TEXT,
+    modelo      TEXT,
+    ts          TEXT    NOT NULL,        -- ISO, del metadata.timestamp del reporte
+    ruta        TEXT    NOT NULL UNIQUE,
+    fallidos    TEXT    NOT NULL DEFAULT '[]'   -- JSON: nombres de tests en FAIL
+);
+
+CREATE INDEX IF NOT EXISTS idx_results_index_sn_modelo_ts
+    ON results_index (sn, modelo, ts);
+CREATE INDEX IF NOT EXISTS idx_results_index_modelo_ts
+    ON results_index (modelo, ts);
+
+-- ===========================
+-- 9) Archivos JSON históricos ya importados a operations
+-- ===========================
+-- hash = sha1 del contenido: el mismo reporte copiado a otra carpeta no se duplica
+-- id_operation = operación creada desde esa ruta: si el archivo cambia se actualiza esa fila
+CREATE TABLE IF NOT EXISTS imported_files (
+    ruta         TEXT PRIMARY KEY,
+    hash         TEXT NOT NULL,
+    size         INTEGER NOT NULL DEFAULT 0,
+    mtime_ns     INTEGER NOT NULL DEFAULT 0,
+    imported_at  TEXT NOT NULL,
+    id_operation INTEGER,
+
+    FOREIGN KEY (id_operation) REFERENCES operations(id)
+        ON DELETE SET NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_imported_files_hash
+    ON imported_files (hash);
+
+-- ===========================
+-- 10) Tiempos por fase (core/trazas.py)
+-- ===========================
+-- Un renglón por span: login, nav_*, test_*, esperas de reinicio, escrituras a BD...
+CREATE TABLE IF NOT EXISTS timings (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    inicio_us   INTEGER NOT NULL,        -- epoch en microsegundos
+    dur_ms      REAL    NOT NULL,
+    nombre      TEXT    NOT NULL,
+    categoria   TEXT    NOT NULL,
+    host        TEXT,
+    modelo      TEXT,
+    estacion    INTEGER,
+    sn          TEXT,
+    hilo        INTEGER,
+    error       TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_timings_inicio
+    ON timings (inicio_us);
+CREATE INDEX IF NOT EXISTS idx_timings_modelo_nombre
+    ON timings (modelo, nombre);
+
+-- ===========================
+-- 11) Auditoría de flota (core/auditoria.py)
+-- ===========================
+-- Un renglón por host auditado; corrida agrupa los hosts de una misma ejecución
+CREATE TABLE IF NOT EXISTS auditoria (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    corrida     TEXT    NOT NULL,
+    host        TEXT    NOT NULL,
+    ts          TEXT    NOT NULL,
+    estado      TEXT    NOT NULL,        -- ok | parcial | sin_respuesta | no_identificado | error
+    tipo        TEXT,                    -- FIBERHOME, ZTE, HUAWEI, GRANDSTREAM...
+    modelo      TEXT,
+    sn          TEXT,
+    mac         TEXT,
+    firmware    TEXT,
+    tx_dbm      REAL,
+    rx_dbm      REAL,
+    metodo      TEXT,                    -- http | navegador | deteccion
+    seg         REAL,
+    error       TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_auditoria_corrida
+    ON auditoria (corrida);
+CREATE INDEX IF NOT EXISTS idx_auditoria_sn
+    ON auditoria (sn);
+
+-- ===========================
+-- 12) Checkpoints por SN (core/checkpoint.py)
+-- ===========================
+-- Pasos ya completados de una corrida interrumpida (reset, update, desconexión)
+-- para reanudarla cuando el mismo SN vuelve a aparecer
+CREATE TABLE IF NOT EXISTS checkpoints (
+    sn          TEXT    PRIMARY KEY,
+    modelo      TEXT,
+    opciones    TEXT,                    -- JSON de opcionesTest con que se corrió
+    actualizado REAL    NOT NULL,        -- epoch (time.time())
+    pasos       TEXT    NOT NULL,        -- JSON {paso: {"clave", "status"}}
+    tests       TEXT    NOT NULL,        -- JSON {clave: resultado}
+    metadata    TEXT                     -- JSON de test_results["metadata"]
+);
+
+-- ===========================
+-- 13) Estrategias de login aprendidas (core/estrategias_login.py)
+-- ===========================
+-- Qué estrategia/selector de login funcionó y qué tan rápido, por modelo y
+-- huella de la página de login ('' = desconocido). El firmware no se conoce
+-- antes de autenticarse; la huella es lo que distingue versiones de la página.
+CREATE TABLE IF NOT EXISTS login_estrategias (
+    grupo       TEXT    NOT NULL,        -- login_post, ont_standard, usuario...
+    modelo      TEXT    NOT NULL DEFAULT '',
+    huella      TEXT    NOT NULL DEFAULT '',
+    estrategia  TEXT    NOT NULL,
+    exitos      INTEGER NOT NULL DEFAULT 0,
+    fallos      INTEGER NOT NULL DEFAULT 0,
+    ms_exito    REAL    NOT NULL DEFAULT 0,  -- suma de ms de los intentos exitosos
+    ms_fallo    REAL    NOT NULL DEFAULT 0,  -- suma de ms de los intentos fallidos (timeouts)
+    ultimo      TEXT,
+    PRIMARY KEY (grupo, modelo, huella, estrategia)
+);
+
+-- ===========================
+-- 14) Migraciones de una sola vez
+-- ===========================
+-- Marca de lo que ya se hizo (p.ej. indexar los JSON sueltos de una carpeta);
+-- no se deduce de si la tabla destino está vacía
+CREATE TABLE IF NOT EXISTS migraciones (
+    nombre      TEXT PRIMARY KEY,
+    hecha_en    TEXT NOT NULL
+);
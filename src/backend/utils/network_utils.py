@@ -0,0 +1,328 @@
+# src/backend/utils/network_utils.py
+# Helpers de red ligeros (solo stdlib). Se usan desde el monitoreo y desde
+# ont_automatico sin arrastrar selenium / requests / mixins al importar.
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+# Enlace del hilo actual (multi-slot): IPs locales y/o interfaz por la que debe salir
+# todo lo que haga este hilo (ping, requests, proxy de Chrome). None = ruta del sistema.
+_enlace = threading.local()
+
+
+def enlace_actual():
+    """(ips_locales, interfaz) del hilo o None."""
+    return getattr(_enlace, "valor", None)
+
+
+def fijar_enlace(ips_locales=(), interfaz: str = None) -> None:
+    ips = tuple(ips_locales or ())
+    _enlace.valor = (ips, interfaz) if (ips or interfaz) else None
+
+
+@contextmanager
+def con_enlace(enlace):
+    """Aplica un enlace ya capturado (p. ej. en un hilo hijo) y lo restaura al salir."""
+    previo = enlace_actual()
+    _enlace.valor = enlace
+    try:
+        yield
+    finally:
+        _enlace.valor = previo
+
+
+def ip_origen(destino: str, enlace=None):
+    """IP local del enlace que está en la misma /24 que el destino (o None)."""
+    enlace = enlace if enlace is not None else enlace_actual()
+    if not enlace:
+        return None
+    red = destino.rsplit(".", 1)[0] + "."
+    for ip in enlace[0]:
+        if ip.startswith(red):
+            return ip
+    return None
+
+
+def ping_once(ip: str, timeout_ms: int = 1) -> bool:
+    """Ping 1 vez (por la interfaz / IP del enlace del hilo, si hay)"""
+    enlace = enlace_actual()
+    origen = ip_origen(ip, enlace)
+    if sys.platform == "win32":
+        cmd = ["ping", "-n", "1", "-w", str(int(timeout_ms))]
+        if origen:
+            cmd += ["-S", origen]
+        flags = subprocess.CREATE_NO_WINDOW
+    else:
+        cmd = ["ping", "-c", "1", "-W", str(max(1, int(round(timeout_ms / 1000))))]
+        if enlace and (enlace[1] or origen):
+            cmd += ["-I", enlace[1] or origen]
+        flags = 0
+    cmd.append(ip)
+    try:
+        r = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=flags,
+            timeout=max(2, int(timeout_ms / 1000) + 1)
+        )
+        return r.returncode == 0
+    except Exception:
+        return False
+
+
+# ---------- netlink (Linux) ----------
+NETLINK_ROUTE = 0
+NLM_F_REQUEST, NLM_F_DUMP = 0x1, 0x300
+NLMSG_DONE, NLMSG_ERROR = 3, 2
+RTMGRP_LINK, RTMGRP_IPV4_IFADDR = 0x1, 0x10
+RTM_GETADDR, RTM_NEWADDR = 22, 20
+IFA_ADDRESS, IFA_LOCAL = 1, 2
+
+_NLMSG = struct.Struct("=IHHII")     # len, type, flags, seq, pid
+_IFADDR = struct.Struct("=BBBBI")    # family, prefixlen, flags, scope, index
+_RTA = struct.Struct("=HH")
+
+
+def nl_mensajes(buf: bytes) -> Iterator[Tuple[int, int, int]]:
+    """(tipo, inicio del cuerpo, fin) de cada mensaje netlink del buffer."""
+    off = 0
+    while off + _NLMSG.size <= len(buf):
+        largo, tipo, _, _, _ = _NLMSG.unpack_from(buf, off)
+        if largo < _NLMSG.size:
+            return
+        yield tipo, off + _NLMSG.size, off + largo
+        off += (largo + 3) & ~3
+
+
+def nl_atributos(buf: bytes, off: int, fin: int) -> Dict[int, bytes]:
+    attrs = {}
+    while off + _RTA.size <= fin:
+        largo, tipo = _RTA.unpack_from(buf, off)
+        if largo < _RTA.size:
+            break
+        attrs[tipo] = buf[off + _RTA.size: off + largo]
+        off += (largo + 3) & ~3
+    return attrs
+
+
+# ---------- interfaces y direcciones locales ----------
+# _check_network_configuration corría ipconfig y parseaba texto localizado en cada
+# ciclo de main_loop. Ahora se enumeran las direcciones con la API nativa
+# (netlink en Linux, GetAdaptersAddresses en Windows) y se guardan hasta que el
+# sistema avisa de un cambio de dirección o de enlace. Sin avisos el cache dura
+# VIGENCIA_SIN_AVISOS_S.
+VIGENCIA_SIN_AVISOS_S = 5.0
+VIGENCIA_CON_AVISOS_S = 300.0
+
+_if_lock = threading.Lock()
+_if_cache = None          # (t, {interfaz: (ips...)}, frozenset de redes /24)
+_if_gen = 0               # sube con cada aviso de cambio
+_if_avisos = None         # None = sin intentar, True/False = hay avisos de cambio
+_if_callback = None       # referencia viva al callback de Windows
+
+
+def _interfaces_netlink() -> Dict[str, Tuple[str, ...]]:
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+    try:
+        sock.bind((0, 0))
+        cuerpo = _IFADDR.pack(socket.AF_INET, 0, 0, 0, 0)
+        sock.send(_NLMSG.pack(_NLMSG.size + len(cuerpo), RTM_GETADDR, NLM_F_REQUEST | NLM_F_DUMP, 1, 0) + cuerpo)
+        res = {}
+        while True:
+            buf = sock.recv(65536)
+            for tipo, ini, fin in nl_mensajes(buf):
+                if tipo == NLMSG_DONE:
+                    return res
+                if tipo == NLMSG_ERROR:
+                    raise OSError("netlink RTM_GETADDR")
+                if tipo != RTM_NEWADDR:
+                    continue
+                familia, _, _, _, idx = _IFADDR.unpack_from(buf, ini)
+                if familia != socket.AF_INET:
+                    continue
+                attrs = nl_atributos(buf, ini + _IFADDR.size, fin)
+                raw = attrs.get(IFA_LOCAL) or attrs.get(IFA_ADDRESS)
+                if raw and len(raw) == 4:
+                    try:
+                        nombre = socket.if_indextoname(idx)
+                    except OSError:
+                        nombre = str(idx)
+                    res[nombre] = res.get(nombre, ()) + (socket.inet_ntoa(raw),)
+    finally:
+        sock.close()
+
+
+def _interfaces_windows() -> Dict[str, Tuple[str, ...]]:
+    import ctypes
+    from ctypes import wintypes
+
+    class SOCKET_ADDRESS(ctypes.Structure):
+        _fields_ = [("lpSockaddr", ctypes.c_void_p), ("iSockaddrLength", ctypes.c_int)]
+
+    class IP_ADAPTER_UNICAST_ADDRESS(ctypes.Structure):
+        pass
+    IP_ADAPTER_UNICAST_ADDRESS._fields_ = [
+        ("Length", wintypes.ULONG), ("Flags", wintypes.DWORD),
+        ("Next", ctypes.POINTER(IP_ADAPTER_UNICAST_ADDRESS)),
+        ("Address", SOCKET_ADDRESS),
+    ]
+
+    # Solo el inicio de la estructura (lo demás no se lee)
+    class IP_ADAPTER_ADDRESSES(ctypes.Structure):
+        pass
+    IP_ADAPTER_ADDRESSES._fields_ = [
+        ("Length", wintypes.ULONG), ("IfIndex", wintypes.DWORD),
+        ("Next", ctypes.POINTER(IP_ADAPTER_ADDRESSES)),
+        ("AdapterName", ctypes.c_char_p),
+        ("FirstUnicastAddress", ctypes.POINTER(IP_ADAPTER_UNICAST_ADDRESS)),
+        ("FirstAnycastAddress", ctypes.c_void_p),
+        ("FirstMulticastAddress", ctypes.c_void_p),
+        ("FirstDnsServerAddress", ctypes.c_void_p),
+        ("DnsSuffix", ctypes.c_wchar_p),
+        ("Description", ctypes.c_wchar_p),
+        ("FriendlyName", ctypes.c_wchar_p),
+    ]
+
+    GAA_FLAG_SKIP_ANYCAST_MULTICAST_DNS = 0x2 | 0x4 | 0x8
+    ERROR_BUFFER_OVERFLOW = 111
+    tam = wintypes.ULONG(16 * 1024)
+    for _ in range(3):
+        buf = ctypes.create_string_buffer(tam.value)
+        rc = ctypes.windll.iphlpapi.GetAdaptersAddresses(
+            socket.AF_INET, GAA_FLAG_SKIP_ANYCAST_MULTICAST_DNS, None, buf, ctypes.byref(tam))
+        if rc != ERROR_BUFFER_OVERFLOW:
+            break
+    if rc != 0:
+        raise OSError(f"GetAdaptersAddresses: {rc}")
+
+    res = {}
+    nodo = ctypes.cast(buf, ctypes.POINTER(IP_ADAPTER_ADDRESSES))
+    while nodo:
+        ad = nodo.contents
+        ips = []
+        uni = ad.FirstUnicastAddress
+        while uni:
+            sa = uni.contents.Address
+            if sa.lpSockaddr and sa.iSockaddrLength >= 8:
+                raw = ctypes.string_at(sa.lpSockaddr, 8)
+                if struct.unpack_from("<H", raw)[0] == socket.AF_INET:
+                    ips.append(socket.inet_ntoa(raw[4:8]))
+            uni = uni.contents.Next
+        if ips:
+            res[ad.FriendlyName or str(ad.IfIndex)] = tuple(ips)
+        nodo = ad.Next
+    return res
+
+
+def _interfaces_resolver() -> Dict[str, Tuple[str, ...]]:
+    # Último recurso: sin nombres de interfaz
+    infos = socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET)
+    return {"?": tuple(sorted({i[4][0] for i in infos}))}
+
+
+def _enumerar() -> Dict[str, Tuple[str, ...]]:
+    try:
+        if sys.platform.startswith("linux"):
+            return _interfaces_netlink()
+        if sys.platform == "win32":
+            return _interfaces_windows()
+    except Exception as e:
+        print(f"[RED] Enumeración nativa de interfaces falló: {e}")
+    try:
+        return _interfaces_resolver()
+    except Exception as e:
+        print(f"[RED] No se pudieron leer las IPs locales: {e}")
+        return {}
+
+
+def invalidar_interfaces() -> None:
+    global _if_cache, _if_gen
+    _if_gen += 1
+    _if_cache = None
+
+
+def _avisos_netlink() -> bool:
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+    sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+
+    def _escuchar():
+        while True:
+            try:
+                sock.recv(65536)
+            except OSError:
+                return
+            invalidar_interfaces()
+
+    threading.Thread(target=_escuchar, name="red-avisos", daemon=True).start()
+    return True
+
+
+def _avisos_windows() -> bool:
+    global _if_callback
+    import ctypes
+    # VOID (PVOID CallerContext, PMIB_UNICASTIPADDRESS_ROW Row, MIB_NOTIFICATION_TYPE Tipo)
+    CALLBACK = ctypes.WINFUNCTYPE(None, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int)
+    _if_callback = CALLBACK(lambda ctx, fila, tipo: invalidar_interfaces())
+    handle = ctypes.c_void_p()
+    rc = ctypes.windll.iphlpapi.NotifyUnicastIpAddressChange(
+        socket.AF_INET, _if_callback, None, False, ctypes.byref(handle))
+    return rc == 0
+
+
+def _suscribir_avisos() -> bool:
+    try:
+        if sys.platform.startswith("linux"):
+            return _avisos_netlink()
+        if sys.platform == "win32":
+            return _avisos_windows()
+    except Exception as e:
+        print(f"[RED] Sin avisos de cambio de red ({e}); el cache se renueva cada {VIGENCIA_SIN_AVISOS_S:.0f} s")
+    return False
+
+
+def interfaces() -> Dict[str, Tuple[str, ...]]:
+    """{interfaz: (IPv4 locales...)} del cache; se vuelve a leer solo si el sistema avisó un cambio."""
+    global _if_cache, _if_avisos
+    cache = _if_cache
+    vigencia = VIGENCIA_CON_AVISOS_S if _if_avisos else VIGENCIA_SIN_AVISOS_S
+    if cache is not None and time.monotonic() - cache[0] < vigencia:
+        return cache[1]
+    with _if_lock:
+        if _if_avisos is None:
+            _if_avisos = _suscribir_avisos()
+        gen = _if_gen
+        datos = _enumerar()
+        redes = frozenset(ip.rsplit(".", 1)[0] for ips in datos.values() for ip in ips)
+        # Si llegó un aviso mientras se leía, la lectura ya nace vencida
+        _if_cache = (time.monotonic() if gen == _if_gen else 0.0, datos, redes)
+    return datos
+
+
+def ipv4_locales(enlace=None) -> Tuple[str, ...]:
+    """IPs locales del enlace (su interfaz o sus IPs) o de todas las interfaces."""
+    enlace = enlace if enlace is not None else enlace_actual()
+    datos = interfaces()
+    if enlace and enlace[1] in datos:
+        return datos[enlace[1]]
+    if enlace and enlace[0]:
+        return tuple(enlace[0])
+    return tuple(ip for ips in datos.values() for ip in ips)
+
+
+def has_network(red: str, enlace=None) -> bool:
+    """True si hay una IP local en la red dada por prefijo de octetos (p. ej. "192.168.100")."""
+    enlace = enlace if enlace is not None else enlace_actual()
+    red = red.rstrip(".")
+    if not enlace and red.count(".") == 2:
+        interfaces()
+        cache = _if_cache
+        if cache is not None:
+            return red in cache[2]
+    prefijo = red + "."
+    return any(ip.startswith(prefijo) for ip in ipv4_locales(enlace))
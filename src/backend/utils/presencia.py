@@ -0,0 +1,324 @@
+# src/backend/utils/presencia.py
+"""
+Presencia del equipo por eventos del enlace y de la tabla de vecinos (ARP).
+
+iniciar_monitoreo, snFinal y DisconnectMonitor detectaban la ONT con un ping
+cada 0.5-1 s cada uno por su lado. Aquí hay una sola fuente por enlace (slot):
+
+  - Linux: socket netlink (NETLINK_ROUTE, grupos LINK y NEIGH). Cuando el
+    carrier de la tarjeta cae, las IPs de esa tarjeta quedan ausentes al
+    instante. Cuando el carrier regresa se sondean las IPs conocidas. La
+    respuesta ARP llega como RTM_NEWNEIGH REACHABLE, y con ella la MAC.
+    El sondeo es un datagrama UDP al puerto discard para que el kernel
+    resuelva ARP por la tarjeta y la IP de origen correctas (un ARP crudo
+    necesitaría CAP_NET_RAW). Solo el estado inicial se confirma con un ping,
+    porque una entrada STALE tarda 5 s en revalidarse.
+  - Otros sistemas (o si netlink no abre): un hilo por IP con el ping de
+    siempre, compartido por todos los consumidores. En Windows la MAC se lee
+    una vez con SendARP al aparecer el equipo.
+
+Cada fuente() cuenta un consumidor; al salir se llama soltar(). Cuando el
+último consumidor la suelta, la fuente para sus hilos (y cierra el socket
+netlink) y la siguiente fuente() arranca una nueva.
+
+Uso:
+    pres = presencia.fuente(COMMON_IPS)
+    try:
+        while ...:
+            if pres.presente(ip): ...
+            pres.esperar_cambio(0.5)   # despierta en cuanto cambia algo
+    finally:
+        presencia.soltar(pres)
+"""
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Optional
+
+from src.backend.utils.network_utils import (
+    NETLINK_ROUTE, RTMGRP_LINK, con_enlace, enlace_actual, ip_origen, nl_atributos, nl_mensajes, ping_once,
+)
+
+COMMON_IPS = ("192.168.100.1", "192.168.1.1")
+
+# Reintento de sondeo mientras la IP está ausente (solo ARP, sin ICMP)
+SONDEO_AUSENTE_S = 1.0
+# Revalidación de una IP presente (por si el equipo se quita sin bajar el carrier, p. ej. tras un switch)
+REVALIDAR_S = 5.0
+# Ciclo del ping en el modo sondeo
+INTERVALO_PING_S = 0.5
+
+# ---------- netlink ----------
+RTMGRP_NEIGH = 0x4
+RTM_NEWLINK, RTM_DELLINK = 16, 17
+RTM_NEWNEIGH, RTM_DELNEIGH = 28, 29
+IFF_LOWER_UP = 0x10000
+IFLA_IFNAME = 3
+NDA_DST, NDA_LLADDR = 1, 2
+NUD_REACHABLE, NUD_FAILED, NUD_PERMANENT = 0x02, 0x20, 0x80
+
+_IFINFO = struct.Struct("=BBHiII")   # family, pad, type, index, flags, change
+_NDMSG = struct.Struct("=BBHiHBB")   # family, pad1, pad2, ifindex, state, flags, type
+
+
+def _mac_texto(raw: bytes) -> Optional[str]:
+    if len(raw) != 6 or raw == b"\x00" * 6:
+        return None
+    return ":".join(f"{b:02X}" for b in raw)
+
+
+def _mac_sendarp(ip: str, origen: str = None) -> Optional[str]:
+    """MAC por SendARP (iphlpapi); solo Windows."""
+    try:
+        import ctypes
+        dest = int.from_bytes(socket.inet_aton(ip), "little")
+        src = int.from_bytes(socket.inet_aton(origen), "little") if origen else 0
+        buf = (ctypes.c_ulong * 2)()
+        largo = ctypes.c_ulong(6)
+        if ctypes.windll.iphlpapi.SendARP(dest, src, ctypes.byref(buf), ctypes.byref(largo)) != 0:
+            return None
+        return _mac_texto(bytes(buf)[:largo.value])
+    except Exception as e:
+        print(f"[PRESENCIA] SendARP a {ip} falló: {e}")
+        return None
+
+
+class Presencia:
+    def __init__(self, ips, enlace=None):
+        self.ips = tuple(ips)
+        self.enlace = enlace
+        self.interfaz = enlace[1] if enlace else None
+        self.por_eventos = False
+
+        self._cambio = threading.Condition()
+        self._estado = {ip: False for ip in self.ips}
+        self._mac = {}
+        self._sondeado = {}     # ip -> monotonic del último sondeo
+        self._ifindex_ip = {}   # ip -> ifindex donde se vio
+        self._carrier = {}      # ifindex -> bool
+        self._ifindex = None
+        self._parar = threading.Event()
+
+    # ---------- consulta ----------
+    def presente(self, ip: str) -> bool:
+        return bool(self._estado.get(ip))
+
+    def mac(self, ip: str) -> Optional[str]:
+        return self._mac.get(ip) if self.presente(ip) else None
+
+    def alguna(self) -> Optional[str]:
+        """Primera IP presente (en el orden de ips) o None."""
+        return next((ip for ip in self.ips if self.presente(ip)), None)
+
+    def esperar_cambio(self, timeout: float) -> bool:
+        """Bloquea hasta que cambie la presencia de alguna IP (True) o pase timeout (False)."""
+        with self._cambio:
+            return self._cambio.wait(timeout)
+
+    def _marcar(self, ip: str, presente: bool, mac: str = None, motivo: str = "") -> None:
+        if presente and mac:
+            self._mac[ip] = mac
+        if self._estado.get(ip) == presente:
+            return
+        with self._cambio:
+            self._estado[ip] = presente
+            self._cambio.notify_all()
+        if presente:
+            print(f"[PRESENCIA] {ip} presente ({self._mac.get(ip) or 'MAC ?'}){motivo}")
+        else:
+            print(f"[PRESENCIA] {ip} ausente{motivo}")
+
+    # ---------- arranque ----------
+    def iniciar(self) -> "Presencia":
+        sock = self._abrir_netlink() if sys.platform.startswith("linux") else None
+        if sock is not None:
+            self.por_eventos = True
+            threading.Thread(target=self._con_enlace, args=(self._eventos, sock),
+                             name="presencia-netlink", daemon=True).start()
+            for ip in self.ips:
+                threading.Thread(target=self._con_enlace, args=(self._confirmar_inicial, ip),
+                                 name=f"presencia-{ip}", daemon=True).start()
+        else:
+            for ip in self.ips:
+                threading.Thread(target=self._con_enlace, args=(self._sondeo_ping, ip),
+                                 name=f"presencia-{ip}", daemon=True).start()
+        modo = "eventos netlink" if self.por_eventos else "sondeo por ping"
+        print(f"[PRESENCIA] {', '.join(self.ips)} por {modo} ({self.interfaz or 'todas las tarjetas'})")
+        return self
+
+    def detener(self) -> None:
+        """Para los hilos de la fuente; los que esperan cambio se despiertan."""
+        self._parar.set()
+        with self._cambio:
+            self._cambio.notify_all()
+        print(f"[PRESENCIA] Fuente de {', '.join(self.ips)} detenida ({self.interfaz or 'todas las tarjetas'})")
+
+    def _con_enlace(self, fn, *args):
+        with con_enlace(self.enlace):
+            fn(*args)
+
+    def _abrir_netlink(self):
+        try:
+            if self.interfaz:
+                self._ifindex = socket.if_nametoindex(self.interfaz)
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+            sock.bind((0, RTMGRP_LINK | RTMGRP_NEIGH))
+            return sock
+        except Exception as e:
+            print(f"[PRESENCIA] Netlink no disponible ({e}); se usa sondeo por ping")
+            return None
+
+    # ---------- modo sondeo ----------
+    def _sondeo_ping(self, ip: str) -> None:
+        while not self._parar.is_set():
+            ok = ping_once(ip, timeout_ms=500)
+            if self._parar.is_set():
+                return
+            mac = None
+            if ok and not self.presente(ip) and sys.platform == "win32":
+                mac = _mac_sendarp(ip, ip_origen(ip, self.enlace))
+            self._marcar(ip, ok, mac)
+            self._parar.wait(INTERVALO_PING_S)
+
+    # ---------- modo eventos ----------
+    def _confirmar_inicial(self, ip: str) -> None:
+        # Un solo ping: la entrada ARP puede estar STALE y el kernel tarda en revalidarla
+        if ping_once(ip, timeout_ms=500) and not self._parar.is_set():
+            self._marcar(ip, True, motivo=" (inicial)")
+        self.sondear(ip)
+
+    def sondear(self, ip: str) -> None:
+        """Hace que el kernel resuelva ARP de la IP; la respuesta llega por netlink."""
+        self._sondeado[ip] = time.monotonic()
+        idx = self._ifindex_ip.get(ip, self._ifindex)
+        if idx is not None and self._carrier.get(idx) is False:
+            return
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                if self.interfaz:
+                    s.setsockopt(socket.SOL_SOCKET, getattr(socket, "SO_BINDTODEVICE", 25),
+                                 self.interfaz.encode())
+                origen = ip_origen(ip, self.enlace)
+                if origen:
+                    s.bind((origen, 0))
+                s.sendto(b"", (ip, 9))
+            finally:
+                s.close()
+        except OSError:
+            # Sin ruta (carrier abajo): no hay nada que sondear
+            pass
+
+    def _eventos(self, sock) -> None:
+        try:
+            while not self._parar.is_set():
+                try:
+                    listo, _, _ = select.select([sock], [], [], SONDEO_AUSENTE_S)
+                    if listo:
+                        self._procesar(sock.recv(65536))
+                except Exception as e:
+                    print(f"[PRESENCIA] Error leyendo netlink: {e}")
+                    self._parar.wait(SONDEO_AUSENTE_S)
+                if not self._parar.is_set():
+                    self._revisar()
+        finally:
+            sock.close()
+
+    def _revisar(self) -> None:
+        ahora = time.monotonic()
+        for ip in self.ips:
+            espera = REVALIDAR_S if self.presente(ip) else SONDEO_AUSENTE_S
+            if ahora - self._sondeado.get(ip, 0.0) >= espera:
+                self.sondear(ip)
+
+    def _procesar(self, buf: bytes) -> None:
+        for tipo, cuerpo, fin in nl_mensajes(buf):
+            if tipo in (RTM_NEWLINK, RTM_DELLINK):
+                self._evento_link(tipo, buf, cuerpo, fin)
+            elif tipo in (RTM_NEWNEIGH, RTM_DELNEIGH):
+                self._evento_vecino(tipo, buf, cuerpo, fin)
+
+    def _evento_link(self, tipo: int, buf: bytes, cuerpo: int, fin: int) -> None:
+        _, _, _, idx, flags, _ = _IFINFO.unpack_from(buf, cuerpo)
+        if self._ifindex is not None and idx != self._ifindex:
+            return
+        carrier = tipo == RTM_NEWLINK and bool(flags & IFF_LOWER_UP)
+        previo = self._carrier.get(idx)
+        self._carrier[idx] = carrier
+        if previo == carrier:
+            return
+        nombre = nl_atributos(buf, cuerpo + _IFINFO.size, fin).get(IFLA_IFNAME, b"").rstrip(b"\x00").decode(errors="ignore")
+        if carrier:
+            print(f"[PRESENCIA] Enlace arriba en {nombre or idx}; sondeando {', '.join(self.ips)}")
+            for ip in self.ips:
+                self.sondear(ip)
+            return
+        for ip in self.ips:
+            if self._ifindex_ip.get(ip, self._ifindex) == idx:
+                self._marcar(ip, False, motivo=f" (sin carrier en {nombre or idx})")
+
+    def _evento_vecino(self, tipo: int, buf: bytes, cuerpo: int, fin: int) -> None:
+        _, _, _, idx, estado, _, _ = _NDMSG.unpack_from(buf, cuerpo)
+        if self._ifindex is not None and idx != self._ifindex:
+            return
+        attrs = nl_atributos(buf, cuerpo + _NDMSG.size, fin)
+        dst = attrs.get(NDA_DST)
+        if dst is None or len(dst) != 4:
+            return
+        ip = socket.inet_ntoa(dst)
+        if ip not in self._estado:
+            return
+        self._ifindex_ip[ip] = idx
+        if tipo == RTM_DELNEIGH:
+            # El kernel recoge entradas viejas aunque el equipo siga ahí: se pregunta de nuevo
+            self.sondear(ip)
+        elif estado & (NUD_REACHABLE | NUD_PERMANENT):
+            self._marcar(ip, True, _mac_texto(attrs.get(NDA_LLADDR, b"")))
+        elif estado & NUD_FAILED:
+            self._marcar(ip, False, motivo=" (ARP sin respuesta)")
+
+
+_lock = threading.Lock()
+_fuentes = {}   # (enlace, ips) -> Presencia
+_usos = {}      # (enlace, ips) -> consumidores activos
+
+
+def fuente(ips=COMMON_IPS) -> Presencia:
+    """
+    Fuente de presencia del enlace del hilo actual (una por slot, arrancada al primer uso).
+    Cada llamada cuenta un consumidor; hay que devolverla con soltar().
+    """
+    enlace = enlace_actual()
+    llave = (enlace, tuple(ips))
+    with _lock:
+        pres = _fuentes.get(llave)
+        if pres is None:
+            pres = _fuentes[llave] = Presencia(ips, enlace).iniciar()
+        _usos[llave] = _usos.get(llave, 0) + 1
+    return pres
+
+
+def soltar(pres: Presencia) -> None:
+    """Devuelve una fuente obtenida con fuente(); con el último consumidor se detiene."""
+    llave = (pres.enlace, pres.ips)
+    with _lock:
+        if _fuentes.get(llave) is not pres:
+            return
+        restantes = _usos.get(llave, 0) - 1
+        if restantes > 0:
+            _usos[llave] = restantes
+            return
+        _usos.pop(llave, None)
+        del _fuentes[llave]
+    pres.detener()
+
+
+def mac_conocida(ip: str) -> Optional[str]:
+    """MAC ya vista por alguna fuente de este enlace (sin tocar ARP) o None."""
+    enlace = enlace_actual()
+    with _lock:
+        candidatas = [p for (e, _), p in _fuentes.items() if e == enlace]
+    return next((p.mac(ip) for p in candidatas if p.mac(ip)), None)
@@ -0,0 +1,25 @@
+# tests/conftest.py
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parents[1]
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+SCHEMA = RAIZ / "src" / "backend" / "sua_client" / "db" / "schema.sql"
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """bd local temporal con el schema completo (en lugar de C:\\ONT\\localONT.db)."""
+    from src.backend.sua_client import local_db
+    ruta = tmp_path / "localONT.db"
+    con = sqlite3.connect(ruta)
+    con.executescript(SCHEMA.read_text(encoding="utf-8"))
+    con.commit()
+    con.close()
+    monkeypatch.setattr(local_db, "DB_PATH", ruta)
+    return ruta
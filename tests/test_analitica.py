@@ -0,0 +1,45 @@
+# tests/test_analitica.py
+import numpy as np
+
+from src.backend.core.analitica import PERCENTILES, percentiles_por_grupo
+
+
+def _referencia(claves, valores, qs):
+    out = {}
+    for g in np.unique(claves):
+        v = valores[(claves == g) & np.isfinite(valores)]
+        if len(v):
+            out[int(g)] = (len(v), np.percentile(v, qs))
+    return out
+
+
+def test_igual_a_np_percentile_por_grupo():
+    rng = np.random.default_rng(7)
+    claves = rng.integers(3, 40, size=5000)
+    valores = rng.normal(-18.0, 2.5, size=5000).astype(np.float32)
+    valores[rng.random(5000) < 0.05] = np.nan
+
+    grupos, cuentas, pct = percentiles_por_grupo(claves, valores)
+    ref = _referencia(claves, valores.astype(np.float64), PERCENTILES)
+
+    assert list(grupos) == sorted(ref)
+    for g, n, fila in zip(grupos, cuentas, pct):
+        assert n == ref[int(g)][0]
+        np.testing.assert_allclose(fila, ref[int(g)][1], atol=1e-9)
+
+
+def test_grupos_de_un_valor_y_huecos():
+    claves = np.array([10, 12, 12, 12, 15])
+    valores = np.array([-20.0, 1.0, 3.0, 2.0, np.nan])
+    grupos, cuentas, pct = percentiles_por_grupo(claves, valores, qs=(0, 50, 100))
+
+    # El 15 solo trae NaN y el 11/13/14 no existen: no aparecen
+    assert list(grupos) == [10, 12]
+    assert list(cuentas) == [1, 3]
+    np.testing.assert_allclose(pct, [[-20.0, -20.0, -20.0], [1.0, 2.0, 3.0]])
+
+
+def test_sin_valores():
+    grupos, cuentas, pct = percentiles_por_grupo(np.array([1, 2]), np.array([np.nan, np.nan]))
+    assert len(grupos) == len(cuentas) == 0
+    assert pct.shape == (0, len(PERCENTILES))
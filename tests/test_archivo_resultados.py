@@ -0,0 +1,116 @@
+# tests/test_archivo_resultados.py
+import gzip
+import json
+
+import pytest
+
+from src.backend.core import archivo_resultados as ar
+
+
+def _reporte(sn, modelo="MOD002", ts="2025-11-28T10:00:00", rx=-18.5):
+    return {
+        "metadata": {"serial_number": sn, "model": modelo, "timestamp": ts},
+        "tests": {"fibra": {"status": "PASS", "details": {"rx": rx}}},
+    }
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    a = ar.ArchivoResultados(base_dir=tmp_path, compresion="gzip")
+    yield a
+    a.cerrar()
+
+
+def test_agregar_y_leer_por_referencia(archivo):
+    refs = [archivo.agregar(_reporte(f"SN{i}", rx=-18.0 - i), origen="t", estacion=None) for i in range(3)]
+    archivo.sincronizar()
+    for i, ref in enumerate(refs):
+        reg = ar.leer(ref)
+        assert reg["sn"] == f"SN{i}"
+        assert reg["modelo"] == "MOD002"
+        assert reg["origen"] == "t"
+        assert reg["test_results"] == _reporte(f"SN{i}", rx=-18.0 - i)
+
+
+def test_offsets_del_indice(archivo, tmp_path):
+    refs = [archivo.agregar(_reporte(f"SN{i}"), estacion=None) for i in range(4)]
+    archivo.cerrar()
+    ruta = ar.ruta_dia("2025-11-28", tmp_path, "gzip")
+    entradas = ar.leer_indice(ruta)
+
+    assert [e[0] for e in entradas] == ["SN0", "SN1", "SN2", "SN3"]
+    assert [e[3] for e in entradas] == [int(r.rpartition("#")[2]) for r in refs]
+    # Los miembros quedan contiguos: cada offset es el anterior + su largo
+    assert entradas[0][3] == 0
+    for prev, e in zip(entradas, entradas[1:]):
+        assert e[3] == prev[3] + prev[4]
+    assert entradas[-1][3] + entradas[-1][4] == ruta.stat().st_size
+    # Y el archivo completo sigue siendo un gzip normal
+    with gzip.open(ruta, "rt", encoding="utf-8") as f:
+        assert [json.loads(ln)["sn"] for ln in f] == ["SN0", "SN1", "SN2", "SN3"]
+
+
+def test_leer_sin_indice(archivo, tmp_path):
+    ref = archivo.agregar(_reporte("SN9"), estacion=None)
+    archivo.cerrar()
+    ar.ruta_indice(ref.rpartition("#")[0]).unlink()
+    assert ar.leer(ref)["sn"] == "SN9"
+
+
+def test_buscar_mas_reciente_primero(archivo, tmp_path):
+    archivo.agregar(_reporte("SN1", ts="2025-11-27T09:00:00"), estacion=None)
+    archivo.agregar(_reporte("SN2", ts="2025-11-28T09:00:00"), estacion=None)
+    archivo.agregar(_reporte("SN1", ts="2025-11-28T11:00:00"), estacion=None)
+    archivo.cerrar()
+    assert [r["ts"] for r in ar.buscar("SN1", tmp_path)] == ["2025-11-28T11:00:00", "2025-11-27T09:00:00"]
+    assert [r["sn"] for r in ar.iterar(tmp_path, desde="2025-11-28")] == ["SN2", "SN1"]
+
+
+def test_reindexar_reconstruye_offsets(archivo, tmp_path):
+    for i in range(3):
+        archivo.agregar(_reporte(f"SN{i}"), estacion=None)
+    archivo.cerrar()
+    ruta = ar.ruta_dia("2025-11-28", tmp_path, "gzip")
+    originales = ar.leer_indice(ruta)
+
+    # Último miembro cortado (corte de luz a media escritura) e índice perdido
+    datos = ruta.read_bytes()
+    ruta.write_bytes(datos[:-5])
+    ar.ruta_indice(ruta).unlink()
+
+    assert ar.reindexar(ruta) == 2
+    assert ar.leer_indice(ruta) == originales[:2]
+
+
+def test_dos_escritores_mismo_dia(tmp_path):
+    # La app y `convertir` (otro proceso) agregando al mismo archivo del día
+    app = ar.ArchivoResultados(base_dir=tmp_path, compresion="gzip")
+    otro = ar.ArchivoResultados(base_dir=tmp_path, compresion="gzip")
+    try:
+        refs = []
+        for i in range(6):
+            escritor = app if i % 2 else otro
+            refs.append(escritor.agregar(_reporte(f"SN{i}"), estacion=None))
+    finally:
+        app.cerrar()
+        otro.cerrar()
+
+    ruta = ar.ruta_dia("2025-11-28", tmp_path, "gzip")
+    entradas = sorted(ar.leer_indice(ruta), key=lambda e: e[3])
+    assert len(entradas) == 6
+    for prev, e in zip(entradas, entradas[1:]):
+        assert e[3] == prev[3] + prev[4]
+    assert [ar.leer(r)["sn"] for r in refs] == [f"SN{i}" for i in range(6)]
+
+
+def test_fsync_por_tiempo_sin_otro_registro(tmp_path):
+    import time
+    a = ar.ArchivoResultados(base_dir=tmp_path, compresion="gzip", fsync_seg=0.05)
+    try:
+        a._ultimo_fsync = time.monotonic()
+        a.agregar(_reporte("SN1"), estacion=None)
+        assert a._pendientes == 1
+        time.sleep(0.3)
+        assert a._pendientes == 0
+    finally:
+        a.cerrar()
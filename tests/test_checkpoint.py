@@ -0,0 +1,87 @@
+# tests/test_checkpoint.py
+import threading
+
+from src.backend.core import checkpoint
+from src.backend.sua_client.dao import leer_checkpoint
+
+
+class FakeTester:
+    """Lo mínimo que checkpoint usa del tester."""
+
+    def __init__(self, sn="ZTEG00000001", model="MOD002", opciones=None, usar=True):
+        self.usar_checkpoint = usar
+        self.model = model
+        self.opcionesTest = opciones or {"tests": {"ping": True, "usb_port": True}}
+        self.test_results = {"metadata": {"serial_number": sn, "model": model}, "tests": {}}
+        self.stop_event = threading.Event()
+        self.ejecutados = []
+
+    def _mark_executed_test(self, paso):
+        self.ejecutados.append(paso)
+
+
+def _correr(t, paso, status="PASS"):
+    t.test_results["tests"][paso] = {"status": status, "details": {"paso": paso}}
+    checkpoint.marcar(t, paso, status=status)
+
+
+def test_reanuda_y_salta_lo_hecho(db):
+    t1 = FakeTester()
+    checkpoint.reanudar(t1)
+    _correr(t1, "ping")
+    _correr(t1, "usb_port", "FAIL")
+    t1.test_results["metadata"]["mac"] = "AA:BB:CC:00:11:22"
+    _correr(t1, "wifi_24")
+    # Se corta antes de cerrar
+
+    t2 = FakeTester()
+    assert sorted(checkpoint.reanudar(t2)) == ["ping", "usb_port", "wifi_24"]
+    assert checkpoint.saltar(t2, "ping")
+    assert checkpoint.saltar(t2, "usb_port")
+    assert not checkpoint.saltar(t2, "wifi_5")
+    assert t2.test_results["tests"]["usb_port"] == {"status": "FAIL", "details": {"paso": "usb_port"}}
+    assert t2.test_results["metadata"]["mac"] == "AA:BB:CC:00:11:22"
+    assert sorted(t2.ejecutados) == ["ping", "usb_port", "wifi_24"]
+    # Una sola carga por tester
+    assert checkpoint.reanudar(t2) == []
+
+    checkpoint.cerrar(t2)
+    assert leer_checkpoint("ZTEG00000001") is None
+
+
+def test_no_aplica_con_otras_opciones_o_modelo(db):
+    t1 = FakeTester()
+    _correr(t1, "ping")
+
+    otro_modelo = FakeTester(model="MOD009")
+    assert checkpoint.reanudar(otro_modelo) == []
+    assert not checkpoint.saltar(otro_modelo, "ping")
+    # El que no aplica se descarta
+    assert leer_checkpoint("ZTEG00000001") is None
+
+    _correr(FakeTester(), "ping")
+    assert checkpoint.reanudar(FakeTester(opciones={"tests": {"ping": True}})) == []
+
+
+def test_inactivo_no_guarda_ni_salta(db):
+    t1 = FakeTester(usar=False)
+    _correr(t1, "ping")
+    assert t1.ejecutados == []
+    assert leer_checkpoint("ZTEG00000001") is None
+
+    _correr(FakeTester(), "ping")
+    t2 = FakeTester(usar=False)
+    assert checkpoint.reanudar(t2) == []
+    assert not checkpoint.saltar(t2, "ping")
+    checkpoint.cerrar(t2)
+    assert leer_checkpoint("ZTEG00000001") is not None
+
+
+def test_cancelada_no_marca(db):
+    t1 = FakeTester()
+    _correr(t1, "ping")
+    t1.stop_event.set()
+    _correr(t1, "usb_port")
+    assert t1.ejecutados == ["ping"]
+
+    assert checkpoint.reanudar(FakeTester()) == ["ping"]
@@ -0,0 +1,154 @@
+# tests/test_device_fingerprint.py
+import html
+import re
+
+import pytest
+
+from src.backend.core import device_fingerprint as fp
+
+
+def _detect_device_type(raw_html, server=""):
+    """
+    Copia de la lógica de OntAutomatedTester._detect_device_type (antes de
+    device_fingerprint) sin la petición HTTP: regresa (vendor, modelo).
+    """
+    model = None
+    html_lower = raw_html.lower()
+    server_header = server.lower()
+    html_normalized = html_lower.replace(' ', '').replace('\n', '').replace('\t', '')
+
+    if 'grandstream' in html_lower or 'grandstream' in server_header or 'ht818' in html_lower:
+        return "GRANDSTREAM", model
+
+    if any(k in html_lower for k in ['fiberhome', 'hg6145f', 'user_name', 'loginpp', 'fh-text-security']):
+        if 'hg6145f1' in html_lower:
+            model = "MOD008"
+        elif not model:
+            model = "MOD001"
+        return "FIBERHOME", model
+
+    if any(k in html_normalized for k in ['huawei', 'hg8145', 'txt_username', 'txt_password']):
+        product_name = ""
+        title_match = re.search(r"<title>(.*?)</title>", raw_html, re.IGNORECASE)
+        if title_match:
+            product_name = title_match.group(1).upper().strip()
+        if "HG8145" not in product_name:
+            js_match = re.search(r"var\s+ProductName\s*=\s*['\"]([^'\"]+)['\"]", raw_html, re.IGNORECASE)
+            if js_match:
+                raw_js = js_match.group(1).upper()
+                product_name = raw_js.replace('\\X2D', '-').replace('\\x2d', '-').strip()
+        if product_name:
+            if 'HG8145X6-10' in product_name:
+                model = "MOD003"
+            elif 'HG8145X6' in product_name:
+                model = "MOD007"
+            elif 'HG8145V5' in product_name:
+                model = "MOD005" if 'SMALL' in product_name else "MOD004"
+            else:
+                model = "MOD004"
+        else:
+            model = "MOD004"
+        return "HUAWEI", model
+
+    if any(k in html_lower for k in ['zte', 'zxhn', 'f670l', 'f6600', 'frm_username', 'frm_password']):
+        zte_model = ""
+        title_match = re.search(r"<title>(.*?)</title>", raw_html, re.IGNORECASE)
+        if title_match:
+            zte_model = html.unescape(title_match.group(1)).upper().strip()
+        if "F6600" in zte_model:
+            model = "MOD009"
+        else:
+            model = "MOD002"
+        return "ZTE", model
+
+    return "ONT", None
+
+
+PAGINAS = [
+    # Grandstream (cuerpo o solo la cabecera Server)
+    ("<html><title>Grandstream Device Configuration</title></html>", ""),
+    ("<html><title>HT818</title><form id='login'></form></html>", ""),
+    ("<html><title>Login</title></html>", "Grandstream/1.10"),
+    # Fiberhome
+    ("<html><title>HG6145F</title><input id='user_name'></html>", ""),
+    ("<html><title>HG6145F1</title><input id='user_name'></html>", ""),
+    ("<html><div class='fh-text-security'></div><button id='loginpp'></button></html>", ""),
+    ("<html><script>var vendor='FiberHome';</script></html>", ""),
+    # Huawei
+    ("<html><title>HG8145X6-10</title><input id='txt_Username'></html>", ""),
+    ("<html><title>Login</title><script>var ProductName = 'HG8145X6\\x2d10';</script>"
+     "<input id='txt_Username'></html>", ""),
+    ("<html><title>HG8145X6</title><input id='txt_Password'></html>", ""),
+    ("<html><title>HG8145V5</title><input id='txt_Username'></html>", ""),
+    ("<html><title>HG8145V5 SMALL</title><input id='txt_Username'></html>", ""),
+    ("<html><title>EchoLife</title><p>HUA\nWEI</p></html>", ""),
+    ("<html><input id='txt_Username'></html>", ""),
+    ("<html><title>HG8245H</title><p>Huawei</p></html>", ""),
+    # ZTE
+    ("<html><title>F670L</title><input id='Frm_Username'></html>", ""),
+    ("<html><title>ZXHN F6600</title><input id='Frm_Username'></html>", ""),
+    ("<html><title>F6600&#x20;P</title><input id='Frm_Password'></html>", ""),
+    ("<html><title>Login</title><p>ZTE Corporation</p></html>", ""),
+    # Nada reconocible
+    ("<html><title>Router</title><input id='username'></html>", ""),
+    ("", ""),
+]
+
+
+@pytest.fixture(autouse=True)
+def _sin_cache():
+    fp.limpiar_cache()
+    yield
+    fp.limpiar_cache()
+
+
+@pytest.mark.parametrize("pagina,server", PAGINAS)
+def test_paridad_con_detect_device_type(pagina, server):
+    vendor, modelo = _detect_device_type(pagina, server)
+    ident = fp.identificar(pagina, {"Server": server} if server else None)
+    assert ident.vendor == vendor
+    if vendor == "GRANDSTREAM":
+        # Antes no se asignaba modelo; ahora sale el único que hay
+        assert ident.modelo == "MOD006"
+    else:
+        assert (ident.modelo or None) == modelo
+
+
+def test_nombre_y_confianza():
+    x6 = fp.identificar("<html><title>HG8145X6-10</title><input id='txt_Username'></html>")
+    assert (x6.nombre, x6.exacto) == ("HG8145X6-10", True)
+    solo_campos = fp.identificar("<html><input id='txt_Username'></html>")
+    assert not solo_campos.exacto
+    assert solo_campos.confianza < x6.confianza
+    assert fp.identificar("<html></html>") == fp.DESCONOCIDO
+
+
+def test_cache_por_server_etag_y_oui():
+    headers = {"Server": "mini_httpd", "ETag": '"abc"'}
+    zte = fp.identificar("<html><title>F6600</title><input id='Frm_Username'></html>", headers, "AA:BB:CC:00:11:22")
+    # Misma llave: no se vuelve a recorrer la página
+    assert fp.identificar("", headers, "aa-bb-cc-99-88-77") is zte
+    # Otro OUI: otra llave
+    assert fp.identificar("", headers, "11:22:33:00:11:22") == fp.DESCONOCIDO
+    # Sin ETag la llave es el hash del cuerpo
+    pagina = "<html><title>F6600</title><input id='Frm_Username'></html>"
+    sin_etag = fp.identificar(pagina, {"Server": "mini_httpd"})
+    assert fp.identificar(pagina, {"Server": "mini_httpd"}) is sin_etag
+    assert fp.identificar("", {"Server": "mini_httpd"}) == fp.DESCONOCIDO
+    assert fp.identificar(pagina.replace("F6600", "F670L"), {"Server": "mini_httpd"}) is not sin_etag
+
+
+@pytest.mark.parametrize("nombre,codigo", [
+    ("HUAWEI EchoLife HG8145V5 SMALL", "MOD005"),
+    ("HG8145V5", "MOD004"),
+    ("Huawei OptiXstar HG8145X6-10", "MOD003"),
+    ("HG8145X6", "MOD007"),
+    ("ZXHN F670L V9.0", "MOD002"),
+    ("ZTE F6600P", "MOD009"),
+    ("HG6145F1", "MOD008"),
+    ("FiberHome HG6145F", "MOD001"),
+    ("GS-HT818", "MOD006"),
+    ("Desconocido", None),
+])
+def test_modelo_por_nombre(nombre, codigo):
+    assert fp.modelo_por_nombre(nombre) == codigo
@@ -0,0 +1,109 @@
+# tests/test_estrategias_login.py
+from src.backend.core import estrategias_login as el
+
+HTML_X6 = '<input id="txt_Username"><script src="/js/login.js?v=1"></script><input value="{}">'
+
+
+class FakeTester:
+    def __init__(self, model="MOD003", html=HTML_X6.format("tok1")):
+        self.model = model
+        self._huella_login = el.huella_pagina(html)
+
+
+def test_huella_ignora_tokens():
+    assert el.huella_pagina(HTML_X6.format("tok1")) == el.huella_pagina(HTML_X6.format("tok2"))
+    assert el.huella_pagina(HTML_X6.format("tok1")) != el.huella_pagina(
+        HTML_X6.replace("v=1", "v=2").format("tok1"))
+    assert el.huella_pagina("<html></html>") == ""
+
+
+def test_sin_historia_orden_original(db):
+    assert el.ordenar(FakeTester(), "login_post", ["form", "ajax", "main_html"]) == ["form", "ajax", "main_html"]
+
+
+def test_ordenar_por_costo_esperado(db):
+    t = FakeTester()
+    el.registrar(t, "login_post", "form", False, 3000)
+    el.registrar(t, "login_post", "ajax", True, 900)
+    el.registrar(t, "login_post", "main_html", True, 200)
+    el.registrar(t, "login_post", "main_html", False, 0)
+    # main_html: 200 ms / 50 % = 400 < ajax 900; luego el nunca probado; al final el que solo falla
+    orden = el.ordenar(t, "login_post", ["form", "ajax", "nuevo", "main_html"])
+    assert orden == ["main_html", "ajax", "nuevo", "form"]
+
+
+def test_historia_por_huella_y_modelo(db):
+    t = FakeTester()
+    el.registrar(t, "login_post", "ajax", True, 100)
+    # Otra página del mismo modelo: sin historia propia usa la del modelo
+    assert el.ordenar(FakeTester(html="<form name='otra'>"), "login_post", ["form", "ajax"]) == ["ajax", "form"]
+    # Otro modelo no se ve afectado
+    assert el.ordenar(FakeTester(model="MOD004"), "login_post", ["form", "ajax"]) == ["form", "ajax"]
+    # Con historia propia la huella manda sobre el modelo
+    otra = FakeTester(html="<form name='otra'>")
+    el.registrar(otra, "login_post", "form", True, 100)
+    el.registrar(otra, "login_post", "ajax", False, 0)
+    assert el.ordenar(otra, "login_post", ["ajax", "form"]) == ["form", "ajax"]
+    assert el.ordenar(t, "login_post", ["form", "ajax"]) == ["ajax", "form"]
+
+
+def test_primera_aprende(db):
+    t = FakeTester()
+    llamadas = []
+
+    def estrategia(nombre, ok):
+        def fn():
+            llamadas.append(nombre)
+            if ok is None:
+                raise RuntimeError("timeout")
+            return ok
+        return fn
+
+    estrategias = {"form": estrategia("form", None), "ajax": estrategia("ajax", False),
+                   "main_html": estrategia("main_html", True)}
+    assert el.primera(t, "login_post", estrategias) == "main_html"
+    assert llamadas == ["form", "ajax", "main_html"]
+
+    llamadas.clear()
+    assert el.primera(t, "login_post", estrategias) == "main_html"
+    assert llamadas == ["main_html"]
+
+
+def test_buscar_selectores(db):
+    t = FakeTester()
+    selectores = [("id", "user_name"), ("name", "user_name"), ("id", "txt_Username")]
+
+    def encontrar(by, sel):
+        if sel != "txt_Username":
+            raise LookupError(sel)
+        return "elemento"
+
+    assert el.buscar(t, "usuario", selectores, encontrar) == "elemento"
+    assert el.ordenar(t, "usuario", selectores)[0] == ("id", "txt_Username")
+    assert el.buscar(t, "usuario", [("id", "nada")], encontrar) is None
+
+
+def test_costo_incluye_tiempo_de_fallos(db):
+    t = FakeTester()
+    # rapido cuando funciona, pero cuando falla se come el timeout completo
+    el.registrar(t, "usuario", "rapido", True, 100)
+    el.registrar(t, "usuario", "rapido", False, 5000)
+    el.registrar(t, "usuario", "seguro", True, 900)
+    # rapido: (0.5 * 100 + 0.5 * 5000) / 0.5 = 5100 > seguro 900
+    assert el.ordenar(t, "usuario", ["rapido", "seguro"]) == ["seguro", "rapido"]
+
+
+def test_buscar_registra_tiempo_del_fallo(db):
+    import time
+    from src.backend.sua_client.dao import estadisticas_estrategias_login
+
+    t = FakeTester()
+
+    def encontrar(by, sel):
+        time.sleep(0.02)
+        raise LookupError(sel)
+
+    assert el.buscar(t, "usuario", [("id", "nada")], encontrar) is None
+    exitos, fallos, _, ms_fallo = estadisticas_estrategias_login("usuario", t.model)["id=nada"]
+    assert (exitos, fallos) == (0, 1)
+    assert ms_fallo >= 15
@@ -0,0 +1,63 @@
+# tests/test_importador_historico.py
+import json
+import shutil
+import sqlite3
+
+import pytest
+
+from src.backend.core import importador_historico
+
+
+def _reporte(sn):
+    return {
+        "metadata": {"serial_number": sn, "model": "MOD002", "timestamp": "2025-11-28T10:00:00"},
+        "tests": {"ping": {"status": "PASS"}, "usb_port": {"status": "FAIL"}},
+    }
+
+
+@pytest.fixture
+def db_estacion(db):
+    """bd temporal con lo mínimo que pide _contexto_bd (estación, settings, catálogo, usuario)."""
+    con = sqlite3.connect(db)
+    con.execute("INSERT INTO catalog_meta (version, updated_at) VALUES ('1.7.4', 'x');")
+    con.execute("INSERT INTO wifi_set (rssi_min, rssi_max, min_percent) VALUES (-80, -5, 60);")
+    con.execute("INSERT INTO fibra_set (min_tx, max_tx, min_rx, max_rx) VALUES (0, 5, -28, -13);")
+    con.execute("INSERT INTO settings (id_wifi, id_fibra, etiqueta) VALUES (1, 1, 1);")
+    con.execute("INSERT INTO users (name, created_at) VALUES ('u', 'x');")
+    con.execute("INSERT INTO stations (descripcion, id_settings, created_at) VALUES ('s', 1, 'x');")
+    con.execute("INSERT INTO user_station (id_user, id_station) VALUES (1, 1);")
+    con.commit()
+    con.close()
+    return db
+
+
+def _contar(db, tabla):
+    con = sqlite3.connect(db)
+    try:
+        return con.execute(f"SELECT COUNT(*) FROM {tabla};").fetchone()[0]
+    finally:
+        con.close()
+
+
+def test_reimportar_y_copia_no_duplican(db_estacion, tmp_path):
+    raiz = tmp_path / "reports"
+    original = raiz / "28_11_25" / "ZTEG00000001_automated_results.json"
+    original.parent.mkdir(parents=True)
+    original.write_text(json.dumps(_reporte("ZTEG00000001")), encoding="utf-8")
+
+    res = importador_historico.importar([raiz], workers=1)
+    assert res["importados"] == 1
+
+    # Mismo archivo otra vez: ni se vuelve a leer
+    res = importador_historico.importar([raiz], workers=1)
+    assert res["importados"] == 0 and res["sin_cambio"] == 1
+
+    # Copia del mismo reporte en otra carpeta: duplicado por sha1
+    copia = raiz / "copia" / original.name
+    copia.parent.mkdir()
+    shutil.copy2(original, copia)
+    res = importador_historico.importar([raiz], workers=1)
+    assert res["importados"] == 0 and res["duplicados"] == 1
+
+    assert _contar(db_estacion, "operations") == 1
+    assert _contar(db_estacion, "results_index") == 1
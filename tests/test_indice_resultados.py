@@ -0,0 +1,61 @@
+# tests/test_indice_resultados.py
+from src.backend.core import indice_resultados as indice
+
+
+def _reporte(sn, modelo, ts, fallidos=()):
+    tests = {"ping": {"status": "PASS"}}
+    tests.update({n: {"status": "FAIL"} for n in fallidos})
+    return {"metadata": {"serial_number": sn, "model": modelo, "timestamp": ts}, "tests": tests}
+
+
+def test_ultimo_fallido_por_sn(db, tmp_path):
+    indice.registrar(_reporte("ZTEG00000001", "MOD002", "2025-11-28T10:00:00", ["wifi_5"]), tmp_path / "a.json")
+    indice.registrar(_reporte("ZTEG00000001", "MOD002", "2025-11-28T11:00:00", ["usb_port"]), tmp_path / "b.json")
+    indice.registrar(_reporte("ZTEG00000002", "MOD002", "2025-11-28T12:00:00", ["ping"]), tmp_path / "c.json")
+
+    ruta, fallidos = indice.ultimo_fallido("ZTEG00000001", "MOD002")
+    assert ruta == str((tmp_path / "b.json").resolve())
+    assert fallidos == ["usb_port"]
+
+
+def test_ultimo_fallido_filtra_modelo(db, tmp_path):
+    indice.registrar(_reporte("SN1", "MOD004", "2025-11-28T10:00:00", ["wifi_24"]), tmp_path / "a.json")
+    assert indice.ultimo_fallido("SN1", "MOD005") == (None, None)
+    assert indice.ultimo_fallido("SN1")[1] == ["wifi_24"]
+
+
+def test_sin_sn_no_regresa_el_de_otro_equipo(db, tmp_path):
+    indice.registrar(_reporte("SN1", "MOD002", "2025-11-28T10:00:00", ["ping"]), tmp_path / "a.json")
+    assert indice.ultimo_fallido(None, "MOD002") == (None, None)
+    assert indice.ultimo_fallido("", "MOD002") == (None, None)
+
+
+def test_registrar_misma_ruta_actualiza(db, tmp_path):
+    ruta = tmp_path / "a.json"
+    indice.registrar(_reporte("SN1", "MOD002", "2025-11-28T10:00:00", ["ping"]), ruta)
+    indice.registrar(_reporte("SN1", "MOD002", "2025-11-28T10:00:00"), ruta)
+    assert indice.ultimo_fallido("SN1") == (str(ruta.resolve()), [])
+
+
+def test_sn_de_llaves_por_vendor():
+    assert indice.sn_de({"metadata": {"serial_number_physical": "48575443ABCD"}}) == "48575443ABCD"
+    raw = {"metadata": {"base_info": {"raw_data": {"gponsn": "FHTT1234ABCD"}}}}
+    assert indice.sn_de(raw) == "FHTT1234ABCD"
+    assert indice.sn_de({}) is None
+
+
+def test_migrar_legado_una_vez_aunque_ya_haya_indice(db, tmp_path):
+    import json
+    # Un reporte nuevo ya está indexado: results_index no está vacío
+    indice.registrar(_reporte("SN_NUEVO", "MOD002", "2025-11-29T10:00:00"), tmp_path / "nuevo.json")
+
+    legado = tmp_path / "automated_tests" / "28_11_25"
+    legado.mkdir(parents=True)
+    (legado / "281125_MOD004_automated_results.json").write_text(
+        json.dumps(_reporte("SN_VIEJO", "MOD004", "2025-11-28T09:00:00", ["usb_port"])), encoding="utf-8")
+
+    base = tmp_path / "automated_tests"
+    assert indice.migrar_legado([base, tmp_path / "no_existe"]) == 1
+    assert indice.ultimo_fallido("SN_VIEJO")[1] == ["usb_port"]
+    # Segunda vez: la carpeta ya está marcada
+    assert indice.migrar_legado([base]) == 0
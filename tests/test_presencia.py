@@ -0,0 +1,30 @@
+# tests/test_presencia.py
+from src.backend.utils import presencia
+
+IPS = ("10.255.255.1",)
+
+
+def test_la_fuente_se_detiene_con_el_ultimo_consumidor(monkeypatch):
+    # Sin hilos ni sockets: solo el conteo de consumidores
+    monkeypatch.setattr(presencia.Presencia, "iniciar", lambda self: self)
+    monkeypatch.setattr(presencia, "_fuentes", {})
+    monkeypatch.setattr(presencia, "_usos", {})
+
+    a = presencia.fuente(IPS)
+    b = presencia.fuente(IPS)
+    assert a is b
+
+    presencia.soltar(a)
+    assert not a._parar.is_set()
+    assert presencia._fuentes
+
+    presencia.soltar(b)
+    assert a._parar.is_set()
+    assert presencia._fuentes == {} and presencia._usos == {}
+
+    # Después de detenerse, el siguiente consumidor arranca una fuente nueva
+    c = presencia.fuente(IPS)
+    assert c is not a
+    presencia.soltar(c)
+    # Soltar de más no rompe nada
+    presencia.soltar(c)
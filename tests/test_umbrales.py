@@ -0,0 +1,96 @@
+# tests/test_umbrales.py
+import numpy as np
+
+from src.backend.core.analitica import COLUMNAS, Historial
+from src.backend.core.umbrales import BINS, Histogramas, _n_bins, cuantil
+
+
+def _historial(modelo, tx, rx, w24, w5, modelos=("MOD002", "MOD004")):
+    n = len(modelo)
+    cols = {c: np.zeros(n, dtype=dt) for c, dt in COLUMNAS.items()}
+    cols.update(
+        modelo=np.asarray(modelo, dtype=np.int16),
+        tx=np.asarray(tx, dtype=np.float32), rx=np.asarray(rx, dtype=np.float32),
+        w24=np.asarray(w24, dtype=np.float32), w5=np.asarray(w5, dtype=np.float32),
+    )
+    return Historial(cols, list(modelos))
+
+
+def _aleatorio(n, semilla=3):
+    rng = np.random.default_rng(semilla)
+    w5 = rng.uniform(40, 100, n)
+    w5[rng.random(n) < 0.1] = np.nan
+    return _historial(rng.integers(0, 2, n), rng.normal(2.0, 0.8, n), rng.normal(-19.0, 2.0, n),
+                      rng.uniform(40, 100, n), w5)
+
+
+def _prefijo(h, n):
+    return Historial({c: v[:n] for c, v in h.cols.items()}, h.modelos)
+
+
+def test_bins_por_modelo():
+    h = _historial([0, 0, 1, 1], tx=[1.0, 1.02, -50.0, np.nan], rx=[-20.0] * 4,
+                   w24=[80, 70, np.nan, 90], w5=[60, np.nan, np.nan, 95])
+    hs = Histogramas()
+    assert hs.actualizar(h) == 4
+
+    tx = hs.hist["tx"]
+    assert tx.shape == (2, _n_bins("tx"))
+    lo, _hi, paso = BINS["tx"]
+    # 1.0 y 1.02 caen en el mismo bin de 0.05; -50 se va al primero; el NaN no cuenta
+    assert tx[0, int((1.0 - lo) / paso)] == 2
+    assert tx[1, 0] == 1 and tx[1].sum() == 1
+    # wifi = min de las dos bandas (o la que haya); el equipo sin ninguna no cuenta
+    wifi = hs.hist["wifi"]
+    assert wifi[0, 60] == 1 and wifi[0, 70] == 1
+    assert wifi[1, 90] == 1 and wifi[1].sum() == 1
+
+
+def test_incremental_igual_a_completo():
+    h = _aleatorio(3000)
+    completo = Histogramas()
+    completo.actualizar(h)
+
+    inc = Histogramas()
+    for n in (700, 700, 1900, 3000):
+        inc.actualizar(_prefijo(h, n))
+    assert inc.filas == 3000
+    for campo in BINS:
+        np.testing.assert_array_equal(inc.hist[campo], completo.hist[campo])
+        assert inc.hist[campo].sum() == np.isfinite(
+            h["tx"] if campo == "tx" else h["rx"] if campo == "rx" else np.fmin(h["w24"], h["w5"])).sum()
+
+
+def test_cache_reconstruido_empieza_de_cero():
+    hs = Histogramas()
+    hs.actualizar(_aleatorio(500))
+    chico = _aleatorio(100, semilla=9)
+    hs.actualizar(chico)
+    ref = Histogramas()
+    ref.actualizar(chico)
+    assert hs.filas == 100
+    np.testing.assert_array_equal(hs.hist["rx"], ref.hist["rx"])
+
+
+def test_guardar_y_cargar(tmp_path):
+    hs = Histogramas()
+    hs.actualizar(_aleatorio(400))
+    hs.guardar(tmp_path)
+    otro = Histogramas.cargar(tmp_path)
+    assert otro.filas == 400
+    for campo in BINS:
+        np.testing.assert_array_equal(otro.hist[campo], hs.hist[campo])
+    assert Histogramas.cargar(tmp_path / "vacio").filas == 0
+
+
+def test_cuantil_bordes_del_bin():
+    hs = Histogramas()
+    hs.actualizar(_historial([0] * 4, tx=[1.0] * 4, rx=[-30.0, -20.0, -20.0, -10.0],
+                             w24=[50] * 4, w5=[50] * 4))
+    rx = hs.de("rx", 0)
+    # Cola baja: borde inferior del bin; cola alta: borde superior
+    np.testing.assert_allclose(cuantil(rx, "rx", 0.25), -30.0)
+    np.testing.assert_allclose(cuantil(rx, "rx", 0.5), -19.95)
+    np.testing.assert_allclose(cuantil(rx, "rx", 1.0), -9.95)
+    assert cuantil(hs.de("rx", 1), "rx", 0.5) is None
+    np.testing.assert_array_equal(hs.de("wifi"), hs.hist["wifi"].sum(axis=0))